@@ -3,18 +3,31 @@
 import logging
 import os
 import sys
+
+# 無介面的命令（python src/__main__.py batch|watch ...）在載入 Tk 與介面模組之前就轉交給對應入口；
+# 以 runpy 執行讓工作程序（spawn）載入的主模組是命令入口而不是這個檔案
+HEADLESS_COMMANDS = {
+    'batch': 'services.batch.batch_runner',
+    'watch': 'services.batch.watch_service',
+}
+if __name__ == '__main__' and len(sys.argv) > 1 and sys.argv[1] in HEADLESS_COMMANDS:
+    import runpy
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    command = sys.argv[1]
+    sys.argv = [sys.argv[0]] + sys.argv[2:]
+    runpy.run_module(HEADLESS_COMMANDS[command], run_name='__main__', alter_sys=True)
+    sys.exit(0)
+
 import tkinter as tk
 import threading
 import time
 
+# 只匯入顯示登入視窗所需的模組；校正、對齊與更新對話框等介面在使用時才載入
 from database.db_manager import DatabaseManager
-from gui.alignment_gui import AlignmentGUI
-from gui.correction_tool import CorrectionTool
 from gui.login_window import LoginWindow
-from gui.update_dialog import UpdateCheckDialog
 from services.config_manager import ConfigManager
-from services.update.update_manager import UpdateManager
 from utils.logging_utils import setup_logging
+from utils import tracing
 
 
 # 添加必要的路徑到 Python 模組搜尋路徑
@@ -55,13 +68,20 @@ class ApplicationManager:
         """初始化應用程式管理器"""
         logger.info("初始化應用程式管理器")
         self.config = self.setup_environment()
-
-        # 初始化更新管理器
-        self.update_manager = UpdateManager(self.config)
+        tracing.configure_from_config(self.config)
+        self._update_manager = None
 
         # 初始化資料庫
         self.init_database()
 
+    @property
+    def update_manager(self):
+        """更新管理器，第一次使用時才建立（更新模組會載入 requests/urllib3，不在啟動時匯入）"""
+        if self._update_manager is None:
+            from services.update.update_manager import UpdateManager
+            self._update_manager = UpdateManager(self.config)
+        return self._update_manager
+
     @staticmethod
     def setup_environment():
         """設置環境"""
@@ -69,15 +89,17 @@ class ApplicationManager:
         return ConfigManager()
 
     def init_database(self):
-        """初始化資料庫"""
+        """初始化資料庫（在背景連接並創建資料表，不阻塞登入視窗）"""
         logger.info("初始化資料庫")
-        try:
-            db_manager = DatabaseManager()
-            db_manager.create_tables()
-            logger.info("資料庫初始化成功")
-        except Exception as e:
-            logger.error(f"資料庫初始化失敗: {e}", exc_info=True)
-            raise
+
+        def on_done(future):
+            error = future.exception()
+            if error is None:
+                logger.info("資料庫初始化成功")
+            else:
+                logger.error(f"資料庫初始化失敗: {error}")
+
+        DatabaseManager.shared().connect_async().add_done_callback(on_done)
 
     def check_for_updates(self):
         """檢查更新"""
@@ -114,6 +136,7 @@ class ApplicationManager:
             temp_root.withdraw()  # 隱藏臨時窗口
 
             # 創建並顯示更新檢查對話框
+            from gui.update_dialog import UpdateCheckDialog
             dialog = UpdateCheckDialog(temp_root, self.update_manager)
             result, has_update, latest_version = dialog.run()
 
@@ -132,6 +155,7 @@ class ApplicationManager:
         :param project_path: 專案路徑
         :return: 是否成功完成校正
         """
+        from gui.correction_tool import CorrectionTool
         root = tk.Tk()
         tool = CorrectionTool(master=root, project_path=project_path)
         root.mainloop()
@@ -145,15 +169,16 @@ class ApplicationManager:
         初始化並運行文本對齊工具
         :param project_path: 專案路徑
         """
+        from gui.alignment_gui import AlignmentGUI
         root = tk.Tk()
         app = AlignmentGUI(master=root)
         app.current_project_path = project_path
         app.database_file = os.path.join(project_path, "corrections.csv")
 
-        # 檢查並載入 SRT 文件
-        srt_files = [f for f in os.listdir(project_path) if f.endswith('.srt')]
-        if srt_files:
-            srt_path = os.path.join(project_path, srt_files[0])
+        # 檢查並載入 SRT 文件（排除批次處理的輸出）
+        from services.file.project_files import find_project_srt
+        srt_path = find_project_srt(project_path)
+        if srt_path:
             app.srt_file_path = srt_path
             app.load_srt(file_path=srt_path)
 
@@ -241,6 +266,9 @@ def main():
     except Exception as e:
         logger.error(f"主程序執行錯誤: {e}", exc_info=True)
         sys.exit(1)
+    finally:
+        # 寫入延遲保存中的配置
+        ConfigManager.flush_all()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
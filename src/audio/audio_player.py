@@ -26,6 +26,7 @@ from gui.custom_messagebox import (
 )
 
 from audio.audio_range_manager import AudioRangeManager
+from utils.tracing import traced
 class AudioPlayer(ttk.Frame):
     """音頻播放器類別"""
 
@@ -220,6 +221,7 @@ class AudioPlayer(ttk.Frame):
             self.logger.error(f"同步音頻段落時出錯: {e}")
             return False
 
+    @traced("audio.segment_audio", category="audio")
     def segment_audio(self, srt_data):
         """
         分割音頻為段落，完全依照 SRT 時間軸而非索引
@@ -2,7 +2,6 @@
 
 import logging
 from typing import Tuple, Optional, Dict, Any
-import numpy as np
 
 
 class AudioRangeManager:
@@ -20,11 +20,20 @@ class AudioSegmentManager:
         self.audio_segments = {}
         self.sample_rate = sample_rate
         self.full_audio = None
+        # 獲取專案封裝檔的函數，返回 ProjectBundleStore 或 None
+        self.cache_provider = None
 
     def load_audio(self, file_path):
-        """載入音頻文件"""
+        """載入音頻文件，專案中有預先解碼的音頻快取時直接使用"""
         try:
-            audio = AudioSegment.from_file(file_path)
+            audio = None
+            bundle = self.cache_provider() if self.cache_provider else None
+            if bundle:
+                audio = bundle.load_audio(file_path)
+                if audio is not None:
+                    self.logger.info(f"已從專案快取載入音頻: {file_path}")
+            if audio is None:
+                audio = AudioSegment.from_file(file_path)
             self.full_audio = audio  # 保存完整音頻
             return audio
         except Exception as e:
@@ -5,7 +5,6 @@ import os
 from typing import Dict, List, Optional, Any
 
 import pysrt
-from pydub import AudioSegment
 
 from audio.audio_player import AudioPlayer
 from audio.audio_range_manager import AudioRangeManager
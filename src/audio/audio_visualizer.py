@@ -2,10 +2,19 @@
 
 import logging
 import tkinter as tk
-from typing import Optional, Tuple, Union, Dict
-import numpy as np
-from PIL import Image, ImageTk, ImageDraw
-from pydub import AudioSegment
+from typing import TYPE_CHECKING, Optional, Tuple, Union, Dict
+
+from utils.lazy_import import lazy_module
+from utils.tracing import traced
+
+# numpy 與 PIL 在第一次繪製波形時才載入
+np = lazy_module('numpy')
+Image = lazy_module('PIL.Image')
+ImageTk = lazy_module('PIL.ImageTk')
+ImageDraw = lazy_module('PIL.ImageDraw')
+
+if TYPE_CHECKING:
+    from pydub import AudioSegment
 
 class AudioVisualizer:
     """高效能音頻波形可視化類別，提供穩定、清晰的波形顯示"""
@@ -69,7 +78,7 @@ class AudioVisualizer:
         # 初始狀態設置為空白波形
         self._create_empty_waveform("等待音頻...")
 
-    def set_audio_segment(self, audio_segment: AudioSegment) -> None:
+    def set_audio_segment(self, audio_segment: "AudioSegment") -> None:
         """設置音頻段落並預處理"""
         try:
             if audio_segment is None or len(audio_segment) == 0:
@@ -341,6 +350,7 @@ class AudioVisualizer:
 
         return zoom_level
 
+    @traced("waveform.draw", category="audio")
     def _draw_waveform(self, view_start, view_end, sel_start, sel_end, zoom_level, is_animation_frame=False):
         """
         繪製波形圖 - 優化版本
@@ -1 +1,10 @@
-from .base import Base, init_db
\ No newline at end of file
+"""資料庫模組包；Base 與 init_db 在第一次存取時才載入（會載入 SQLAlchemy）"""
+
+__all__ = ['Base', 'init_db']
+
+
+def __getattr__(name):
+    if name in __all__:
+        from . import base
+        return getattr(base, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -5,26 +5,56 @@ from sqlalchemy.pool import QueuePool
 # 創建基類
 Base = declarative_base()
 
-def init_db(connection_string):
-    """初始化資料庫"""
+# 連接池預設值，可由設定檔 database.pool 覆寫
+DEFAULT_POOL_OPTIONS = {
+    'pool_size': 5,          # 連接池大小
+    'max_overflow': 10,      # 最大超出連接數
+    'pool_timeout': 30,      # 等待可用連接的時間（秒）
+    'pool_recycle': 1800,    # 連接回收時間（秒）
+    'pool_pre_ping': True,   # 取出連接前先測試是否有效
+    'connect_timeout': 10,   # 建立連接的超時（秒）
+}
+
+
+def init_db(connection_string, pool_options=None, create_tables=True):
+    """
+    初始化資料庫
+    :param connection_string: 資料庫連接字串
+    :param pool_options: 連接池設定，未提供的項目使用 DEFAULT_POOL_OPTIONS
+    :param create_tables: 是否立即創建所有表（會實際連接資料庫），False 時只建立引擎
+    """
     # 檢查是否使用 SQLite
     is_sqlite = connection_string.startswith('sqlite://')
 
+    options = dict(DEFAULT_POOL_OPTIONS)
+    options.update({key: value for key, value in (pool_options or {}).items() if key in DEFAULT_POOL_OPTIONS})
+
     # 創建引擎，對 SQLite 使用不同的參數
     if is_sqlite:
         engine = create_engine(
             connection_string,
             connect_args={"check_same_thread": False},  # 允許多線程訪問 SQLite
         )
+
+        # pysqlite 不會在 SAVEPOINT 前開始交易，釋放最外層的 SAVEPOINT 就等於提交，
+        # 背景寫入佇列的批次因而無法整批回滾；改由 SQLAlchemy 自行發出 BEGIN
+        @event.listens_for(engine, "connect")
+        def disable_pysqlite_transactions(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine, "begin")
+        def begin_sqlite_transaction(conn):
+            conn.exec_driver_sql("BEGIN")
     else:
         engine = create_engine(
             connection_string,
             poolclass=QueuePool,
-            pool_size=5,          # 連接池大小
-            max_overflow=10,      # 最大超出連接數
-            pool_timeout=30,      # 連接超時（秒）
-            pool_recycle=1800,    # 連接回收時間（秒）
-            pool_pre_ping=True    # 預先測試連接是否有效
+            pool_size=int(options['pool_size']),
+            max_overflow=int(options['max_overflow']),
+            pool_timeout=options['pool_timeout'],
+            pool_recycle=options['pool_recycle'],
+            pool_pre_ping=bool(options['pool_pre_ping']),
+            connect_args={"connect_timeout": int(options['connect_timeout'])}
         )
 
         # 設置特定於 PostgreSQL 的參數
@@ -35,5 +65,6 @@ def init_db(connection_string):
             cursor.close()
 
     # 創建所有表
-    Base.metadata.create_all(engine)
-    return engine
\ No newline at end of file
+    if create_tables:
+        Base.metadata.create_all(engine)
+    return engine
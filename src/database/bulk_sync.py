@@ -0,0 +1,187 @@
+"""資料庫批次同步模組，以 SQLAlchemy Core 批次寫入專案的字幕與校正資料"""
+
+import hashlib
+import logging
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import bindparam, select
+
+from database.models import Correction, Subtitle
+
+DEFAULT_CHUNK_SIZE = 500
+
+SUBTITLE_FIELDS = ('index', 'start_time', 'end_time', 'text', 'word_text', 'is_corrected')
+CORRECTION_FIELDS = ('error_text', 'correction_text')
+
+
+def content_hash(values: Sequence[Any]) -> str:
+    """
+    計算一列資料的內容雜湊
+    :param values: 欄位值
+    :return: 雜湊字串
+    """
+    digest = hashlib.sha1()
+    for value in values:
+        if isinstance(value, bool):
+            value = int(value)
+        digest.update(('' if value is None else str(value)).encode('utf-8'))
+        digest.update(b'\x1f')
+    return digest.hexdigest()
+
+
+def subtitle_row(item: Any) -> Dict[str, Any]:
+    """
+    把字幕項目轉為 subtitles 表的欄位
+    :param item: dict（欄位同 SUBTITLE_FIELDS）或 pysrt.SubRipItem
+    :return: 欄位字典
+    """
+    if isinstance(item, dict):
+        row = {field: item.get(field) for field in SUBTITLE_FIELDS}
+    else:
+        row = {
+            'index': item.index,
+            'start_time': str(item.start),
+            'end_time': str(item.end),
+            'text': item.text,
+            'word_text': None,
+            'is_corrected': False,
+        }
+    row['index'] = int(row['index'])
+    row['is_corrected'] = bool(row.get('is_corrected'))
+    return row
+
+
+def _chunks(rows: List[Any], size: int) -> Iterable[List[Any]]:
+    """把列表切成固定大小的區塊"""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+class BulkSync:
+    """
+    批次同步服務
+    先一次讀出專案現有的資料並計算每列的內容雜湊，與要寫入的資料比對後只寫入新增、變更與刪除的列；
+    寫入使用 Core 的 executemany（PostgreSQL 使用多列 VALUES），分塊執行並包在同一個交易中
+    """
+
+    def __init__(self, engine, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        初始化批次同步服務
+        :param engine: SQLAlchemy 引擎
+        :param chunk_size: 每個語句處理的列數
+        """
+        self.engine = engine
+        self.chunk_size = max(1, int(chunk_size))
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @property
+    def is_postgresql(self) -> bool:
+        """是否連線到 PostgreSQL"""
+        return self.engine.dialect.name == 'postgresql'
+
+    def sync_subtitles(self, project_id: int, subtitles: Iterable[Any]) -> Dict[str, int]:
+        """
+        同步專案的字幕，以字幕序號為鍵
+        :param project_id: 專案 ID
+        :param subtitles: 字幕項目（見 subtitle_row）
+        :return: {'inserted', 'updated', 'deleted', 'unchanged'}
+        """
+        rows = {}
+        for item in subtitles:
+            row = subtitle_row(item)
+            rows[row['index']] = row
+        return self._sync(Subtitle.__table__, project_id, 'index', SUBTITLE_FIELDS, rows)
+
+    def sync_corrections(self, project_id: int, corrections: Dict[str, str]) -> Dict[str, int]:
+        """
+        同步專案的校正對照表，以錯誤字為鍵
+        :param project_id: 專案 ID
+        :param corrections: {錯誤字: 校正字}
+        :return: {'inserted', 'updated', 'deleted', 'unchanged'}
+        """
+        rows = {error: {'error_text': error, 'correction_text': correction}
+                for error, correction in corrections.items()}
+        return self._sync(Correction.__table__, project_id, 'error_text', CORRECTION_FIELDS, rows)
+
+    def _sync(self, table, project_id: int, key_field: str, fields: Tuple[str, ...],
+              rows: Dict[Any, Dict[str, Any]]) -> Dict[str, int]:
+        """
+        以內容雜湊比對後寫入差異
+        :param table: 資料表
+        :param project_id: 專案 ID
+        :param key_field: 用於比對的鍵欄位
+        :param fields: 參與雜湊的欄位
+        :param rows: {鍵: 欄位字典}
+        :return: 各類操作的列數
+        """
+        columns = [table.c.id] + [table.c[field] for field in fields]
+        inserts, updates, deletes = [], [], []
+        unchanged = 0
+
+        with self.engine.begin() as conn:
+            existing = {}
+            duplicates = []
+            query = select(*columns).where(table.c.project_id == project_id)
+            for record in conn.execute(query):
+                key = record._mapping[key_field]
+                if key in existing:
+                    # 同一個鍵有多列時只保留第一列
+                    duplicates.append(record._mapping['id'])
+                    continue
+                existing[key] = (record._mapping['id'],
+                                 content_hash([record._mapping[field] for field in fields]))
+
+            for key, row in rows.items():
+                current = existing.pop(key, None)
+                if current is None:
+                    inserts.append(dict(row, project_id=project_id))
+                elif current[1] != content_hash([row[field] for field in fields]):
+                    updates.append(dict({f'b_{field}': row[field] for field in fields}, b_id=current[0]))
+                else:
+                    unchanged += 1
+            deletes = [record_id for record_id, _ in existing.values()] + duplicates
+
+            for chunk in _chunks(deletes, self.chunk_size):
+                conn.execute(table.delete().where(table.c.id.in_(chunk)))
+
+            if updates:
+                statement = table.update().where(table.c.id == bindparam('b_id')).values(
+                    {field: bindparam(f'b_{field}') for field in fields})
+                for chunk in _chunks(updates, self.chunk_size):
+                    conn.execute(statement, chunk)
+
+            for chunk in _chunks(inserts, self.chunk_size):
+                if self.is_postgresql:
+                    # 多列 VALUES：整個區塊只需一次往返
+                    conn.execute(table.insert().values(chunk))
+                else:
+                    conn.execute(table.insert(), chunk)
+
+        stats = {'inserted': len(inserts), 'updated': len(updates), 'deleted': len(deletes),
+                 'unchanged': unchanged}
+        self.logger.info(f"已同步 {table.name}（專案 {project_id}）: {stats}")
+        return stats
+
+    def load_subtitles(self, project_id: int) -> List[Dict[str, Any]]:
+        """
+        讀取專案的字幕
+        :param project_id: 專案 ID
+        :return: 依序號排序的欄位字典列表
+        """
+        table = Subtitle.__table__
+        query = (select(*[table.c[field] for field in SUBTITLE_FIELDS])
+                 .where(table.c.project_id == project_id)
+                 .order_by(table.c['index']))
+        with self.engine.connect() as conn:
+            return [dict(record._mapping) for record in conn.execute(query)]
+
+    def load_corrections(self, project_id: int) -> Dict[str, str]:
+        """
+        讀取專案的校正對照表
+        :param project_id: 專案 ID
+        :return: {錯誤字: 校正字}
+        """
+        table = Correction.__table__
+        query = select(table.c.error_text, table.c.correction_text).where(table.c.project_id == project_id)
+        with self.engine.connect() as conn:
+            return {record.error_text: record.correction_text for record in conn.execute(query)}
@@ -1,31 +1,49 @@
 import logging
 import sys
 import os
+import threading
+from concurrent.futures import Future
 
 # 獲取項目根目錄並加入 Python 路徑 (只需一次)
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from database.base import Base, init_db
 # 修改導入路徑，與貼上代碼保持一致
 from services.config_manager import ConfigManager
 
-from sqlalchemy.orm import sessionmaker, scoped_session
 
 # 獲取 logger
 logger = logging.getLogger(__name__)
 
+# 無法使用 PostgreSQL 時的備用資料庫
+SQLITE_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "text_alignment.db")
+
+
 class DatabaseManager:
-    """資料庫管理器"""
+    """
+    資料庫管理器
+    建立時只讀取連接設定，第一次使用引擎或 session 時才連接；介面可先呼叫 connect_async 在背景連接
+    """
+
+    STATUS_IDLE = 'idle'
+    STATUS_CONNECTING = 'connecting'
+    STATUS_CONNECTED = 'connected'
+    STATUS_FAILED = 'failed'
+
+    _shared_instance = None
+    _shared_lock = threading.Lock()
 
-    def __init__(self, connection_string=None):
+    def __init__(self, connection_string=None, pool_options=None):
         """
         初始化資料庫管理器
         :param connection_string: 資料庫連接字符串
+        :param pool_options: 連接池設定（見 database.base.DEFAULT_POOL_OPTIONS），None 時讀取設定檔 database.pool
         """
         # 先設置 logger 屬性
         self.logger = logger
+        self._write_queue = None
+        self._queue_session_factory = None
         password = ""  # 初始化 password 變數，避免 UnboundLocalError
 
         if connection_string is None:
@@ -36,6 +54,8 @@ class DatabaseManager:
             self.logger.info(f"嘗試讀取配置文件: {config.config_path}")  # 修改這裡，從 config_file 改為 config_path
 
             db_config = config.get("database", {})
+            if pool_options is None:
+                pool_options = db_config.get("pool", {})
 
             # 輸出讀取到的資料庫配置，幫助调试
             self.logger.info(f"讀取到的資料庫配置: {db_config}")
@@ -53,42 +73,143 @@ class DatabaseManager:
                 connection_string = f"postgresql://{username}:{password}@{host}:{port}/"
             else:
                 # 嘗試使用 SQLite 作為備用方案
-                db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "text_alignment.db")
-                connection_string = f"sqlite:///{db_path}"
-                self.logger.info(f"無法讀取資料庫配置，改用 SQLite: {db_path}")
+                connection_string = f"sqlite:///{SQLITE_DB_PATH}"
+                self.logger.info(f"無法讀取資料庫配置，改用 SQLite: {SQLITE_DB_PATH}")
 
             # 輸出最終使用的連接字串（隱藏密碼）
             display_conn_string = connection_string.replace(password, "*****") if password else connection_string
             self.logger.info(f"使用的連接字串: {display_conn_string}")
 
-        try:
-            self.engine = init_db(connection_string)
-            self.session_factory = sessionmaker(bind=self.engine)
-            self.Session = scoped_session(self.session_factory)
-        except Exception as e:
-            self.logger.error(f"數據庫連接失敗: {e}")
+        self.connection_string = connection_string
+        self.pool_options = pool_options
+        self.status = self.STATUS_IDLE
+        self.last_error = None
+        self._engine = None
+        self._session_factory = None
+        self._scoped_session = None
+        self._connect_lock = threading.Lock()
+        self._connect_future = None
 
-            # 嘗試使用 SQLite 作為備用方案（如果失敗是由於 PostgreSQL）
-            if "postgresql" in connection_string.lower():
-                try:
-                    self.logger.info("嘗試切換到 SQLite 資料庫...")
-                    db_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "text_alignment.db")
-                    sqlite_connection_string = f"sqlite:///{db_path}"
+    @classmethod
+    def shared(cls):
+        """
+        獲取程式共用的資料庫管理器（使用設定檔中的連接設定）
+        :return: DatabaseManager
+        """
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls()
+            return cls._shared_instance
+
+    @property
+    def engine(self):
+        """資料庫引擎，尚未連接時會先連接（阻塞）"""
+        self.connect()
+        return self._engine
+
+    @property
+    def session_factory(self):
+        """session 工廠，尚未連接時會先連接（阻塞）"""
+        self.connect()
+        return self._session_factory
+
+    @property
+    def Session(self):
+        """scoped_session，尚未連接時會先連接（阻塞）"""
+        self.connect()
+        return self._scoped_session
+
+    @property
+    def is_connected(self):
+        """是否已完成連接"""
+        return self.status == self.STATUS_CONNECTED
 
-                    self.engine = init_db(sqlite_connection_string)
-                    self.session_factory = sessionmaker(bind=self.engine)
-                    self.Session = scoped_session(self.session_factory)
+    @property
+    def backend(self):
+        """已連接的資料庫類型（postgresql、sqlite），尚未連接時為 None"""
+        return self._engine.dialect.name if self._engine is not None else None
 
-                    self.logger.info(f"成功切換到 SQLite 資料庫: {db_path}")
+    def connect(self):
+        """
+        建立引擎並創建資料表（阻塞），已連接時直接返回；PostgreSQL 連接失敗時改用 SQLite
+        :return: 資料庫引擎
+        """
+        with self._connect_lock:
+            if self._engine is not None:
+                return self._engine
+
+            self.status = self.STATUS_CONNECTING
+            try:
+                engine = self._open(self.connection_string)
+            except Exception as e:
+                self.logger.error(f"數據庫連接失敗: {e}")
+
+                # 嘗試使用 SQLite 作為備用方案（如果失敗是由於 PostgreSQL）
+                if "postgresql" not in self.connection_string.lower():
+                    self.status = self.STATUS_FAILED
+                    self.last_error = e
+                    raise
+                try:
+                    self.logger.info("嘗試切換到 SQLite 資料庫...")
+                    engine = self._open(f"sqlite:///{SQLITE_DB_PATH}")
+                    self.logger.info(f"成功切換到 SQLite 資料庫: {SQLITE_DB_PATH}")
                 except Exception as sqlite_error:
                     self.logger.error(f"切換到 SQLite 也失敗: {sqlite_error}")
+                    self.status = self.STATUS_FAILED
+                    self.last_error = sqlite_error
                     raise
-            else:
-                raise
+
+            from sqlalchemy.orm import sessionmaker, scoped_session
+            self._session_factory = sessionmaker(bind=engine)
+            self._scoped_session = scoped_session(self._session_factory)
+            self._engine = engine
+            self.last_error = None
+            self.status = self.STATUS_CONNECTED
+            return engine
+
+    def _open(self, connection_string):
+        """
+        建立引擎並創建資料表，失敗時釋放引擎
+        :param connection_string: 資料庫連接字符串
+        :return: 資料庫引擎
+        """
+        # SQLAlchemy 與資料表定義在連接時才載入（通常在背景連接執行緒中）
+        from database.base import Base, init_db
+        import database.models  # noqa: F401  註冊所有資料表，create_all 才會創建
+        engine = init_db(connection_string, self.pool_options, create_tables=False)
+        try:
+            # 第一次實際連接資料庫
+            Base.metadata.create_all(engine)
+        except Exception:
+            engine.dispose()
+            raise
+        return engine
+
+    def connect_async(self):
+        """
+        在背景執行緒中連接資料庫並創建資料表，重複呼叫時返回同一個 Future（失敗後可重試）
+        :return: Future，結果為資料庫引擎
+        """
+        with self._connect_lock:
+            future = self._connect_future
+            if future is not None and not (future.done() and future.exception() is not None):
+                return future
+            future = self._connect_future = Future()
+
+        def run():
+            try:
+                future.set_result(self.connect())
+            except Exception as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name="DatabaseConnect", daemon=True).start()
+        return future
 
     def create_tables(self):
         """創建所有表"""
         try:
+            from database.base import Base
+            import database.models  # noqa: F401
             Base.metadata.create_all(self.engine)
             self.logger.info("資料庫表創建成功")
             return True
@@ -111,6 +232,69 @@ class DatabaseManager:
             self.logger.warning(f"資料庫會話無效: {e}")
             return False
 
+    def get_bulk_sync(self, chunk_size=None):
+        """
+        獲取批次同步服務
+        :param chunk_size: 每個語句處理的列數，None 時使用預設值
+        :return: BulkSync
+        """
+        from database.bulk_sync import BulkSync, DEFAULT_CHUNK_SIZE
+        return BulkSync(self.engine, chunk_size or DEFAULT_CHUNK_SIZE)
+
+    def sync_subtitles(self, project_id, subtitles, chunk_size=None):
+        """
+        以批次寫入同步專案的字幕，只寫入內容有變化的列
+        :param project_id: 專案 ID
+        :param subtitles: 字幕項目（dict 或 pysrt.SubRipItem）
+        :param chunk_size: 每個語句處理的列數
+        :return: {'inserted', 'updated', 'deleted', 'unchanged'}
+        """
+        return self.get_bulk_sync(chunk_size).sync_subtitles(project_id, subtitles)
+
+    def sync_corrections(self, project_id, corrections, chunk_size=None):
+        """
+        以批次寫入同步專案的校正對照表，只寫入內容有變化的列
+        :param project_id: 專案 ID
+        :param corrections: {錯誤字: 校正字}
+        :param chunk_size: 每個語句處理的列數
+        :return: {'inserted', 'updated', 'deleted', 'unchanged'}
+        """
+        return self.get_bulk_sync(chunk_size).sync_corrections(project_id, corrections)
+
+    def get_write_queue(self):
+        """
+        獲取背景寫入佇列（第一次使用時建立）
+        :return: DatabaseWriteQueue
+        """
+        if self._write_queue is None:
+            from database.write_queue import DatabaseWriteQueue
+            self._write_queue = DatabaseWriteQueue(self._create_queue_session)
+        return self._write_queue
+
+    def _create_queue_session(self):
+        """為背景寫入佇列建立 session（在佇列執行緒中呼叫，尚未連接時在此連接）"""
+        if self._queue_session_factory is None:
+            # 背景執行緒提交後，結果物件仍需在介面執行緒讀取，因此提交時不讓屬性過期
+            from sqlalchemy.orm import sessionmaker
+            self._queue_session_factory = sessionmaker(bind=self.engine, expire_on_commit=False)
+        return self._queue_session_factory()
+
+    def submit(self, func, *args, **kwargs):
+        """
+        在背景執行緒中執行資料庫操作
+        :param func: 第一個參數為 session 的函數，不需要自行提交
+        :return: Future，可用 utils.tk_async.resolve_in_tk 在介面執行緒取得結果
+        """
+        return self.get_write_queue().submit(func, *args, **kwargs)
+
+    def close(self):
+        """執行完已排入的背景工作後釋放連接池"""
+        if self._write_queue is not None:
+            self._write_queue.stop(flush=True)
+            self._write_queue = None
+        if self._engine is not None:
+            self._engine.dispose()
+
     def get_session(self):
         """獲取一個新的 session"""
         return self.Session()
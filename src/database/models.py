@@ -3,7 +3,6 @@ import datetime
 from database.base import Base
 from sqlalchemy import Column, Float, Integer, String, Boolean, DateTime, ForeignKey, Date
 from sqlalchemy.orm import relationship
-from werkzeug.security import generate_password_hash, check_password_hash
 class User(Base):
     """使用者資料表"""
     __tablename__ = 'users'
@@ -26,10 +25,12 @@ class User(Base):
 
     def set_password(self, password):
         """設置密碼，使用安全的雜湊函數儲存"""
+        from werkzeug.security import generate_password_hash
         self.password_hash = generate_password_hash(password)
 
     def check_password(self, password):
         """驗證密碼是否正確"""
+        from werkzeug.security import check_password_hash
         return check_password_hash(self.password_hash, password)
 
     def update_premium_status(self, is_premium=True, duration_months=1):
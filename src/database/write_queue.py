@@ -0,0 +1,149 @@
+"""資料庫背景寫入佇列模組，讓介面執行緒不必等待資料庫往返"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+# 佇列中的工作：(在 session 中執行的函數, 結果 Future)
+Job = Tuple[Callable[[Any], Any], Future]
+
+
+class DatabaseQueueFull(RuntimeError):
+    """背景寫入佇列已滿"""
+
+
+class DatabaseWriteQueue:
+    """
+    資料庫背景寫入佇列
+    所有工作都在單一背景執行緒中依序執行；一次取出多個已排入的工作，在同一個 session 中執行，
+    每個工作包在 SAVEPOINT 中（失敗時只回滾該工作），最後一次提交
+    """
+
+    def __init__(self, session_factory: Callable[[], Any], max_pending: int = 256,
+                 batch_size: int = 50, batch_delay: float = 0.02):
+        """
+        初始化背景寫入佇列
+        :param session_factory: 建立 session 的函數（應設定 expire_on_commit=False，讓結果可在提交後使用）
+        :param max_pending: 等待執行的工作數上限
+        :param batch_size: 每次提交最多包含的工作數
+        :param batch_delay: 取得第一個工作後，等待更多工作加入同一批次的秒數
+        """
+        self.session_factory = session_factory
+        self.batch_size = max(1, int(batch_size))
+        self.batch_delay = max(0.0, float(batch_delay))
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._queue: "queue.Queue[Optional[Job]]" = queue.Queue(maxsize=max(1, int(max_pending)))
+        self._stopped = False
+        self._worker = threading.Thread(target=self._run, name="DatabaseWriteQueue", daemon=True)
+        self._worker.start()
+        atexit.register(self.stop)
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        排入一個工作
+        :param func: 在背景執行緒執行的函數，第一個參數為 session，不需要自行提交
+        :return: Future，工作所在批次提交後才會完成；佇列已滿或已停止時回傳已失敗的 Future
+        """
+        future: Future = Future()
+        if self._stopped:
+            future.set_exception(RuntimeError("資料庫背景寫入佇列已停止"))
+            return future
+
+        job = (lambda session: func(session, *args, **kwargs), future)
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            future.set_exception(DatabaseQueueFull("資料庫背景寫入佇列已滿"))
+        return future
+
+    def stop(self, flush: bool = True, timeout: Optional[float] = 10.0) -> None:
+        """
+        停止佇列
+        :param flush: 是否先執行完已排入的工作，False 時捨棄尚未執行的工作
+        :param timeout: 等待背景執行緒結束的最長秒數
+        """
+        if self._stopped:
+            return
+        self._stopped = True
+        if not flush:
+            while True:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is not None:
+                    job[1].cancel()
+        # 佇列已滿時也要能送出結束訊號
+        self._queue.put(None)
+        self._worker.join(timeout)
+
+    def _run(self) -> None:
+        """背景執行緒主迴圈"""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            batch = [job]
+            finished = False
+            deadline = time.monotonic() + self.batch_delay
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    job = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    finished = True
+                    break
+                batch.append(job)
+
+            self._run_batch(batch)
+            if finished:
+                return
+
+    def _run_batch(self, batch: List[Job]) -> None:
+        """在同一個 session 中執行一批工作並一次提交"""
+        batch = [job for job in batch if job[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        results = []
+        session = None
+        try:
+            session = self.session_factory()
+            for func, future in batch:
+                savepoint = session.begin_nested()
+                try:
+                    result = func(session)
+                    savepoint.commit()
+                    results.append((future, result, None))
+                except Exception as e:
+                    savepoint.rollback()
+                    self.logger.error(f"資料庫背景工作失敗: {e}", exc_info=True)
+                    results.append((future, None, e))
+            session.commit()
+        except Exception as e:
+            self.logger.error(f"提交資料庫背景工作時出錯: {e}", exc_info=True)
+            if session is not None:
+                try:
+                    session.rollback()
+                except Exception:
+                    pass
+            done = {id(future) for future, _, _ in results}
+            results = [(future, None, e) for future, _, _ in results]
+            results += [(future, None, e) for _, future in batch if id(future) not in done]
+        finally:
+            if session is not None:
+                session.close()
+
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
@@ -25,15 +25,17 @@ from gui.ui_manager import UIManager
 from services.text_processing.combine_service import CombineService
 from services.config_manager import ConfigManager
 from services.correction.correction_service import CorrectionService
+from services.file.autosave_service import AutosaveService
 from services.file.file_manager import FileManager
+from services.file.project_bundle import ProjectBundleStore
 from services.text_processing.split_service import SplitService
-from services.text_processing.word_processor import WordProcessor
 from utils.image_manager import ImageManager
 from utils.text_utils import simplify_to_traditional
 from utils.time_utils import parse_time,time_to_milliseconds, milliseconds_to_time, time_to_seconds
-from gui.slider_controller import TimeSliderController
+from utils.cue_index import CueIntervalIndex
 from services.state import EnhancedStateManager, CorrectionStateManager
 from services.text_processing.segmentation_service import SegmentationService
+from utils.tracing import traced
 
 # 添加項目根目錄到路徑以確保絕對導入能正常工作
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -44,8 +46,23 @@ if project_root not in sys.path:
 
 class AlignmentGUI(BaseWindow):
     """文本對齊工具主界面類別"""
+
+    # 第一次使用時才建立的子系統
+    SUBSYSTEM_AUDIO = 'audio'    # 音頻服務與播放器（第一次匯入音頻時）
+    SUBSYSTEM_SLIDER = 'slider'  # 時間滑桿與波形（第一次開啟滑桿時）
+    SUBSYSTEM_WORD = 'word'      # Word 處理器（第一次使用 Word 功能時）
+
     def __init__(self, master: Optional[tk.Tk] = None) -> None:
         """初始化主界面"""
+        # 記錄開始時間，用於量測介面可互動所需時間
+        self._init_started = time.perf_counter()
+        self.time_to_interactive_ms = None
+
+        # 延遲建立的子系統狀態
+        self._ready_subsystems = set()
+        self._subsystem_callbacks: Dict[str, List] = {}
+        self._word_processor = None
+
         # 加載配置
         self.config = ConfigManager()
         window_config = self.config.get_window_config()
@@ -97,11 +114,11 @@ class AlignmentGUI(BaseWindow):
         # 初始化檔案管理器
         self.initialize_file_manager()
 
-        # 初始化音頻播放器
-        self.initialize_audio_player()
+        # 初始化自動儲存服務
+        self.initialize_autosave()
 
-        callback_manager = self._create_slider_callbacks()
-        self.slider_controller = TimeSliderController(self.master, self.tree, callback_manager)
+        # 音頻播放器、時間滑桿與 Word 處理器在第一次使用時才建立
+        # （見 ensure_audio_player、ensure_slider_controller、word_processor）
 
         # 綁定事件
         self.bind_all_events()
@@ -134,6 +151,74 @@ class AlignmentGUI(BaseWindow):
         # 添加窗口聚焦事件處理，用於在窗口聚焦時恢復置頂狀態
         self.master.bind("<FocusIn>", self.on_window_focus)
 
+        # 第一次閒置時（介面已繪製、開啟專案時的載入已完成）記錄可互動時間
+        self.master.after_idle(self._report_time_to_interactive)
+
+    def _report_time_to_interactive(self) -> None:
+        """記錄從建立視窗到介面可互動的時間，以及此時已建立的子系統"""
+        self.time_to_interactive_ms = (time.perf_counter() - self._init_started) * 1000
+        subsystems = ', '.join(sorted(self._ready_subsystems)) or '無'
+        self.logger.info(f"介面可互動耗時: {self.time_to_interactive_ms:.0f} ms（已建立的子系統: {subsystems}）")
+
+    def is_subsystem_ready(self, name: str) -> bool:
+        """
+        檢查子系統是否已建立
+        :param name: 子系統名稱（SUBSYSTEM_AUDIO、SUBSYSTEM_SLIDER、SUBSYSTEM_WORD）
+        :return: 是否已建立
+        """
+        return name in self._ready_subsystems
+
+    def on_subsystem_ready(self, name: str, callback) -> None:
+        """
+        註冊子系統建立後的回調，子系統已建立時立即呼叫
+        :param name: 子系統名稱
+        :param callback: 無參數的回調函數
+        """
+        if name in self._ready_subsystems:
+            callback()
+        else:
+            self._subsystem_callbacks.setdefault(name, []).append(callback)
+
+    def _mark_subsystem_ready(self, name: str) -> None:
+        """標記子系統已建立並執行等待中的回調"""
+        self._ready_subsystems.add(name)
+        self.logger.debug(f"子系統已建立: {name}")
+        for callback in self._subsystem_callbacks.pop(name, []):
+            try:
+                callback()
+            except Exception as e:
+                self.logger.error(f"執行子系統 {name} 的就緒回調時出錯: {e}")
+
+    def ensure_audio_player(self):
+        """
+        獲取音頻播放器，第一次呼叫時建立音頻服務與播放器
+        :return: AudioPlayer
+        """
+        self.initialize_audio_player()
+        return self.audio_player
+
+    def ensure_slider_controller(self):
+        """
+        獲取時間滑桿控制器，第一次開啟滑桿時建立
+        :return: TimeSliderController
+        """
+        if not hasattr(self, 'slider_controller'):
+            from gui.slider_controller import TimeSliderController
+            callback_manager = self._create_slider_callbacks()
+            self.slider_controller = TimeSliderController(self.master, self.tree, callback_manager)
+            self.logger.info("已初始化時間滑桿控制器")
+            self._mark_subsystem_ready(self.SUBSYSTEM_SLIDER)
+        return self.slider_controller
+
+    @property
+    def word_processor(self):
+        """Word 處理器，第一次使用時建立"""
+        if self._word_processor is None:
+            from services.text_processing.word_processor import WordProcessor
+            self._word_processor = WordProcessor()
+            self._mark_subsystem_ready(self.SUBSYSTEM_WORD)
+        return self._word_processor
+
     def on_window_focus(self, event=None):
         """處理窗口獲得焦點的事件"""
         try:
@@ -186,6 +271,11 @@ class AlignmentGUI(BaseWindow):
         self.tree = self.ui_manager.tree
         self.tree_manager = self.ui_manager.tree_manager
 
+        # 以完整模式的欄位作為列模型結構，切換顯示模式時只需改變可見欄位
+        if hasattr(self.tree, 'set_schema'):
+            self.tree.set_schema(self.columns[self.DISPLAY_MODE_ALL], {'V.O': self.PLAY_ICON},
+                                 key_column='Index')
+
         # 設置樹狀視圖列配置
         self.ui_manager.setup_treeview_columns(self.display_mode, self.columns)
 
@@ -221,7 +311,7 @@ class AlignmentGUI(BaseWindow):
             # 如果有樹視圖，更新顯示
             if hasattr(self, 'tree') and hasattr(self, 'correction_service'):
                 # 使用 correction_service 的方法更新顯示，而不是調用不存在的 refresh_all_correction_states
-                self.correction_service.update_display_status(self.tree, self.display_mode)
+                self.correction_service.update_display_status(self.tree, self.display_mode, self.tree_manager)
 
             # 更新 SRT 數據
             if hasattr(self, 'update_srt_data_from_treeview'):
@@ -262,6 +352,7 @@ class AlignmentGUI(BaseWindow):
             'get_corrections': self.load_corrections,
             'get_srt_data': self._get_current_srt_data,
             'get_tree_data': lambda: self.tree_manager.get_all_items(),
+            'get_project_bundle': self.get_project_bundle,
             'show_info': lambda title, msg: show_info(title, msg, self.master),
             'show_warning': lambda title, msg: show_warning(title, msg, self.master),
             'show_error': lambda title, msg: show_error(title, msg, self.master),
@@ -372,7 +463,7 @@ class AlignmentGUI(BaseWindow):
         self.logger.debug(f"預期列配置：{expected_columns}")
 
         # 檢查是否匹配
-        if columns != expected_columns:
+        if list(columns) != list(expected_columns):
             self.logger.error(f"樹視圖列配置不匹配！當前：{columns}，預期：{expected_columns}")
             # 嘗試修復
             self.refresh_treeview_structure()
@@ -401,14 +492,13 @@ class AlignmentGUI(BaseWindow):
                 self.file_manager.audio_imported = True
                 self.file_manager.audio_file_path = file_path
 
-            # 確保音頻播放器已初始化
-            if not hasattr(self, 'audio_player'):
-                self.initialize_audio_player()
+            # 確保音頻播放器已初始化（第一次載入音頻時才建立）
+            audio_player = self.ensure_audio_player()
 
             # 直接在這裡載入音頻，而不是依賴於回調
-            if self.audio_player:
+            if audio_player:
                 # 確保真正加載了音頻
-                audio_loaded = self.audio_player.load_audio(file_path)
+                audio_loaded = audio_player.load_audio(file_path)
                 if not audio_loaded:
                     self.logger.error(f"音頻加載失敗: {file_path}")
                     self.audio_imported = False  # 重置狀態
@@ -420,11 +510,6 @@ class AlignmentGUI(BaseWindow):
                     self.audio_player.segment_audio(self.srt_data)
                     self.logger.info(f"音頻已分割為 {len(self.audio_player.segment_manager.audio_segments) if hasattr(self.audio_player.segment_manager, 'audio_segments') else 0} 個段落")
 
-                # 初始化滑桿控制器 - 確保在音頻載入後創建
-                if not hasattr(self, 'slider_controller'):
-                    callback_manager = self._create_slider_callbacks()
-                    self.slider_controller = TimeSliderController(self.master, self.tree, callback_manager)
-                    self.logger.info("已初始化時間滑桿控制器")
 
             # 保存當前樹視圖數據
             current_data = []
@@ -434,7 +519,9 @@ class AlignmentGUI(BaseWindow):
             new_mode = self._get_appropriate_display_mode()
 
             # 只有在顯示模式需要變更時才更新樹視圖
-            if new_mode != old_mode:
+            if new_mode != old_mode and self._project_display_mode(new_mode):
+                self.logger.info(f"顯示模式變更: {old_mode} -> {new_mode}（僅切換可見欄位）")
+            elif new_mode != old_mode:
                 self.logger.info(f"顯示模式變更: {old_mode} -> {new_mode}")
 
                 # 收集當前樹視圖數據
@@ -497,7 +584,7 @@ class AlignmentGUI(BaseWindow):
     def _on_word_loaded(self, file_path) -> None:
         """Word 文檔載入後的回調"""
         # 確保 Word 處理器已載入文檔
-        if self.word_processor.load_document(file_path):
+        if self._load_word_document(file_path):
             self.word_imported = True
             self.word_file_path = file_path
             self.logger.info(f"成功載入 Word 文檔: {file_path}")
@@ -513,6 +600,36 @@ class AlignmentGUI(BaseWindow):
             # 檢查模式切換一致性
             self.check_display_mode_consistency()
 
+    def _load_word_document(self, file_path) -> bool:
+        """
+        載入 Word 文檔，專案封裝檔中有仍然有效的段落快取時直接使用，不重新解析 docx
+        :param file_path: Word 文檔路徑
+        :return: 是否成功載入
+        """
+        bundle = self.get_project_bundle()
+        paragraphs = bundle.load_word_paragraphs(file_path) if bundle else None
+        if paragraphs is not None:
+            return self.word_processor.load_paragraphs(file_path, paragraphs)
+
+        if not self.word_processor.load_document(file_path):
+            return False
+        if bundle:
+            bundle.store_word_paragraphs(file_path, self.word_processor.paragraphs)
+        return True
+
+    def get_project_bundle(self) -> Optional[ProjectBundleStore]:
+        """
+        獲取目前專案的封裝檔存取服務
+        :return: ProjectBundleStore，未開啟專案時回傳 None
+        """
+        project_path = getattr(self, 'current_project_path', None)
+        if not project_path:
+            return None
+        bundle = getattr(self, 'project_bundle', None)
+        if bundle is None or bundle.project_path != project_path:
+            self.project_bundle = ProjectBundleStore(project_path)
+        return self.project_bundle
+
     def _get_column_indices_for_mode(self, mode):
         """根據顯示模式獲取各列索引"""
         if mode in [self.DISPLAY_MODE_ALL, self.DISPLAY_MODE_AUDIO_SRT]:
@@ -534,6 +651,7 @@ class AlignmentGUI(BaseWindow):
                 'correction': 6 if mode == self.DISPLAY_MODE_SRT_WORD else 4
             }
 
+    @traced("correction.export_pass", category="text")
     def _get_current_srt_data(self) -> pysrt.SubRipFile:
         """獲取當前 SRT 數據"""
         # 創建新的 SRT 文件
@@ -664,7 +782,30 @@ class AlignmentGUI(BaseWindow):
 
     def export_srt(self, from_toolbar: bool = False) -> None:
         """匯出 SRT 檔案"""
-        self.file_manager.export_srt(from_toolbar)
+        if self.file_manager.export_srt(from_toolbar) and hasattr(self, 'autosave_service'):
+            self.autosave_service.mark_clean(self.file_manager.srt_file_path)
+
+    def initialize_autosave(self) -> None:
+        """初始化自動儲存服務，設定來自 config.json 的 auto_save 與 auto_save_interval（秒）"""
+        config = self.config.get_config()
+        self.autosave_service = AutosaveService(
+            self.master,
+            self._get_autosave_snapshot,
+            max_delay_ms=int(config.get('auto_save_interval', 300)) * 1000,
+            enabled=bool(config.get('auto_save', True)),
+            on_saved=lambda path: self.update_status(f"已自動儲存：{os.path.basename(path)}")
+        )
+
+    def _get_autosave_snapshot(self):
+        """
+        擷取自動儲存的快照（在 UI 執行緒執行）
+        :return: (SRT 檔案路徑, SubRipFile)，沒有可儲存的內容時回傳 None
+        """
+        if not self.srt_imported or not self.srt_file_path:
+            return None
+        if not self.tree_manager.get_all_items():
+            return None
+        return self.srt_file_path, self._get_current_srt_data()
 
     def switch_project(self) -> None:
         """切換專案"""
@@ -800,6 +941,10 @@ class AlignmentGUI(BaseWindow):
                     correction_state = self.correction_service.serialize_state()
                 self.save_operation_state('操作類型', '操作描述', {'key': 'value'})
 
+            # 寫出尚未自動儲存的變更並停止自動儲存
+            if hasattr(self, 'autosave_service'):
+                self.autosave_service.stop(flush=True)
+
             # 清除所有資料
             self.clear_current_data()
 
@@ -842,8 +987,7 @@ class AlignmentGUI(BaseWindow):
         # 添加編輯文本信息的存儲
         self.edited_text_info = {}  # {srt_index: {'edited': ['srt', 'word']}}
 
-        # 添加 Word 相關變數
-        self.word_processor = WordProcessor()
+        # 添加 Word 相關變數（Word 處理器見 word_processor 屬性）
         self.word_file_path = None
         self.word_comparison_results = {}
         # 添加用於追蹤哪些行使用 Word 文本的字典
@@ -875,6 +1019,8 @@ class AlignmentGUI(BaseWindow):
         self.audio_notification_shown = False
         self.correction_states = {}
         self.srt_data = []
+        # 字幕時間區間索引（鍵為樹狀視圖項目 ID）
+        self.cue_index = CueIntervalIndex()
         self.srt_file_path = None
         self.current_project_path = None
         self.database_file = None
@@ -930,6 +1076,13 @@ class AlignmentGUI(BaseWindow):
         # 先更新 SRT 數據，確保所有數據正確同步
         self.update_srt_data_from_treeview()
 
+        # 列模型保留所有欄位時只需切換可見欄位，項目、校正狀態與 use_word_text 都不受影響
+        if self._project_display_mode(new_mode):
+            if self.audio_imported and hasattr(self, 'audio_player') and hasattr(self, 'srt_data') and self.srt_data:
+                self.audio_player.segment_audio(self.srt_data)
+            self.update_status(f"顯示模式: {self.get_mode_description(new_mode)}")
+            return
+
         # 更新顯示模式
         self.display_mode = new_mode
 
@@ -1069,7 +1222,7 @@ class AlignmentGUI(BaseWindow):
                 return
 
             # 使用校正服務更新顯示
-            self.correction_service.update_display_status(self.tree, self.display_mode)
+            self.correction_service.update_display_status(self.tree, self.display_mode, self.tree_manager)
 
             # 強制界面更新
             self.master.update_idletasks()
@@ -1178,15 +1331,27 @@ class AlignmentGUI(BaseWindow):
     def compare_word_with_srt(self) -> None:
         """比對 SRT 和 Word 文本"""
         try:
-            if not self.srt_data or not hasattr(self, 'word_processor') or not self.word_processor.text_content:
+            if not self.srt_data or self._word_processor is None or not self.word_processor.text_content:
                 show_warning("警告", "請確保 SRT 和 Word 文件均已加載", self.master)
                 return
 
             # 提取 SRT 文本
             srt_texts = [sub.text for sub in self.srt_data]
 
-            # 比對文本
-            self.word_comparison_results = self.word_processor.compare_with_srt(srt_texts)
+            # 比對文本（輸入與上次相同時直接使用專案封裝檔中的結果）
+            bundle = self.get_project_bundle()
+            comparison_key = None
+            cached = None
+            if bundle:
+                comparison_key = bundle.comparison_key(srt_texts, self.word_processor.paragraphs)
+                cached = bundle.load_comparison(comparison_key)
+
+            if cached is not None:
+                self.word_comparison_results = cached
+            else:
+                self.word_comparison_results = self.word_processor.compare_with_srt(srt_texts)
+                if bundle:
+                    bundle.store_comparison(comparison_key, self.word_comparison_results)
 
             # 更新顯示
             self.update_display_with_comparison()
@@ -1209,34 +1374,19 @@ class AlignmentGUI(BaseWindow):
             show_error("錯誤", f"比對失敗: {str(e)}", self.master)
 
     # 添加更新顯示方法
+    @traced("correction.comparison_pass", category="text")
     def update_display_with_comparison(self) -> None:
         """根據比對結果更新顯示"""
         try:
             if not self.word_comparison_results:
                 return
 
-            # 備份當前選中和標籤以及值
+            # 備份當前選中項目
             selected = self.tree_manager.get_selected_items()
-            tags_backup = {}
-            values_backup = {}
             use_word_backup = self.use_word_text.copy()  # 備份 use_word_text 狀態
 
-            for item in self.tree_manager.get_all_items():
-                tags_backup[item] = self.tree_manager.get_item_tags(item)
-                values_backup[item] = self.tree_manager.get_item_values(item)
-
             # 建立索引到項目ID的映射
-            index_to_item = {}
-            for item_id, values in values_backup.items():
-                try:
-                    if self.display_mode in [self.DISPLAY_MODE_ALL, self.DISPLAY_MODE_AUDIO_SRT]:
-                        if len(values) > 1:
-                            index_to_item[str(values[1])] = item_id
-                    else:  # self.display_mode in [self.DISPLAY_MODE_SRT, self.DISPLAY_MODE_SRT_WORD]
-                        if values:
-                            index_to_item[str(values[0])] = item_id
-                except Exception as e:
-                    self.logger.error(f"處理項目索引映射時出錯: {e}")
+            index_to_item = self.tree_manager.get_index_map()
 
             # 清空樹
             self.tree_manager.clear_all()
@@ -1723,6 +1873,9 @@ class AlignmentGUI(BaseWindow):
             if not self.ui_manager.floating_icon_fixed:
                 self.ui_manager.hide_floating_icon()
 
+        # 第一次開啟滑桿時建立滑桿控制器
+        self.ensure_slider_controller()
+
         # 檢查是否有音頻並設置音頻段落
         self._setup_audio_segment_for_slider(item)
 
@@ -2047,6 +2200,10 @@ class AlignmentGUI(BaseWindow):
                 """獲取當前顯示模式"""
                 return self.gui.display_mode
 
+            def on_boundary_change(self, item, start_ms=None, end_ms=None):
+                """字幕邊界移動時增量更新時間索引"""
+                self.gui.cue_index.update(item, start_ms, end_ms)
+
         return SliderCallbacks(self)
 
 
@@ -2483,7 +2640,7 @@ class AlignmentGUI(BaseWindow):
                     )
 
                 # 更新Word處理器中的段落
-                if hasattr(self, 'word_processor'):
+                if self._word_processor is not None:
                     try:
                         # 確保索引有效
                         if i == 0:
@@ -2584,6 +2741,7 @@ class AlignmentGUI(BaseWindow):
 
         self.audio_service = AudioService(self)  # 傳入 self 作為 gui_reference
         self.audio_player = self.audio_service.initialize_player(self.main_frame)
+        self.audio_player.segment_manager.cache_provider = self.get_project_bundle
 
         # 設置音頻載入回調
         def on_audio_loaded_callback(file_path):
@@ -2615,11 +2773,11 @@ class AlignmentGUI(BaseWindow):
 
         self.on_audio_loaded_callback = on_audio_loaded_callback
 
-        # 如果尚未初始化滑桿控制器，現在初始化
-        if not hasattr(self, 'slider_controller'):
-            callback_manager = self._create_slider_callbacks()
-            self.slider_controller = TimeSliderController(self.master, self.tree, callback_manager)
-            self.logger.info("已初始化時間滑桿控制器")
+        # 狀態管理器在建立時還沒有播放器，現在補上音頻分割函數
+        if hasattr(self, 'state_manager'):
+            self.state_manager.segment_audio = self.audio_player.segment_audio
+
+        self._mark_subsystem_ready(self.SUBSYSTEM_AUDIO)
 
     def update_waveform(self, start_time, end_time):
         """更新音波視圖的回調函數"""
@@ -2657,7 +2815,8 @@ class AlignmentGUI(BaseWindow):
             self.display_mode = new_mode
 
             # 更新列結構
-            self.setup_treeview_columns()
+            if not self._project_display_mode(new_mode):
+                self.ui_manager.setup_treeview_columns(new_mode, self.columns)
 
             # 同步狀態管理器
             if hasattr(self, 'state_manager'):
@@ -2689,6 +2848,10 @@ class AlignmentGUI(BaseWindow):
             correction_state = self.correction_service.serialize_state()
             self.save_operation_state('操作類型', '操作描述', {'key': 'value'})
 
+            # 寫出尚未自動儲存的變更並停止自動儲存
+            if hasattr(self, 'autosave_service'):
+                self.autosave_service.stop(flush=True)
+
             # 先解除所有事件綁定
             for widget in self.master.winfo_children():
                 for binding in widget.bind():
@@ -2708,14 +2871,10 @@ class AlignmentGUI(BaseWindow):
         try:
             self.logger.info(f"===== 嘗試播放索引 {index} 的音頻段落 =====")
 
-            # 檢查音頻播放器是否已初始化
-            if not hasattr(self, 'audio_player'):
-                self.logger.error("音頻播放器未初始化")
-                # 嘗試初始化播放器
-                self.initialize_audio_player()
-                if not hasattr(self, 'audio_player'):
-                    show_error("錯誤", "無法初始化音頻播放器", self.master)
-                    return
+            # 確保音頻播放器已初始化
+            if not self.ensure_audio_player():
+                show_error("錯誤", "無法初始化音頻播放器", self.master)
+                return
 
             # 檢查播放器的音頻是否已載入
             if not hasattr(self.audio_player, 'audio') or self.audio_player.audio is None:
@@ -2924,8 +3083,12 @@ class AlignmentGUI(BaseWindow):
         return self.split_service.prepare_and_insert_subtitle_item(sub, corrections, tags, use_word)
 
     def process_srt_entries(self, srt_data, corrections):
-        """處理 SRT 條目"""
-        self.split_service.process_srt_entries(srt_data, corrections)
+        """處理 SRT 條目，專案封裝檔中有預先轉換的繁體文本時直接使用"""
+        traditional_texts = None
+        bundle = self.get_project_bundle()
+        if bundle and srt_data:
+            traditional_texts = bundle.load_traditional_texts([sub.text for sub in srt_data])
+        self.split_service.process_srt_entries(srt_data, corrections, traditional_texts)
 
     def update_audio_segments(self) -> None:
         """完全重建音頻段落映射，確保與當前 SRT 數據一致"""
@@ -2973,6 +3136,9 @@ class AlignmentGUI(BaseWindow):
             # 儲存已處理的索引，避免重複
             processed_indices = set()
 
+            # 收集字幕區間以重建時間索引
+            cue_intervals = []
+
             for item in all_items:
                 try:
                     # 確保使用列表而不是元組
@@ -3019,6 +3185,7 @@ class AlignmentGUI(BaseWindow):
                     if item_key not in processed_indices:
                         new_srt_data.append(sub)
                         processed_indices.add(item_key)
+                        cue_intervals.append((time_to_milliseconds(start), time_to_milliseconds(end), item))
 
                         # 更新樹視圖中顯示的索引 - 保持同步
                         if str(values[index_col]) != str(new_srt_index):
@@ -3038,6 +3205,7 @@ class AlignmentGUI(BaseWindow):
 
             # 更新 SRT 數據
             self.srt_data = new_srt_data
+            self.cue_index.build(cue_intervals)
             self.logger.info(f"從 Treeview 更新 SRT 數據，共 {len(new_srt_data)} 個項目")
 
         finally:
@@ -3618,6 +3786,7 @@ class AlignmentGUI(BaseWindow):
             return False
 
     # 在 renumber_items 函數中，確保校正狀態正確轉移
+    @traced("gui.renumber_items", category="text")
     def renumber_items(self, skip_correction_update=False) -> None:
         """重新編號項目並保持校正狀態 - 修正版本"""
         try:
@@ -3656,62 +3825,46 @@ class AlignmentGUI(BaseWindow):
                 # 清除當前所有校正狀態 - 稍後會根據映射恢復
                 self.correction_service.clear_correction_states()
 
-            # 先建立舊索引到新索引的映射
-            for i, item in enumerate(items, 1):
-                if not self.tree.exists(item):
-                    continue
+            text_pos = 4 if self.display_mode in [self.DISPLAY_MODE_ALL, self.DISPLAY_MODE_AUDIO_SRT] else 3
 
-                values = list(self.tree.item(item)['values'])
+            # 單次遍歷計算所有項目的新值，再批次寫入有變化的項目
+            updates = {}
+            for i, item in enumerate(items, 1):
+                values = self.tree_manager.get_item_values(item)
                 if not values or len(values) <= index_pos:
                     continue
 
-                # 獲取當前索引
+                # 獲取當前索引並保存舊索引到新索引的映射
                 old_index = str(values[index_pos])
+                new_index = str(i)
+                index_mapping[old_index] = new_index
 
-                # 保存舊索引到新索引的映射
-                index_mapping[old_index] = str(i)
-
-            # 然後更新值並恢復校正狀態
-            for i, item in enumerate(items, 1):
-                if not self.tree.exists(item):
-                    continue
+                # 更新值中的索引
+                values[index_pos] = new_index
 
-                values = list(self.tree.item(item)['values'])
-                if not values or len(values) <= index_pos:
-                    continue
+                # 如果不跳過校正狀態更新，則檢查是否需要更新校正狀態
+                if not skip_correction_update and old_index in old_correction_states:
+                    # 獲取該項目的原始校正信息
+                    correction_state = old_correction_states[old_index]
+                    original_text = old_original_texts.get(old_index, "")
+                    corrected_text = old_corrected_texts.get(old_index, "")
 
-                # 獲取當前索引
-                old_index = str(values[index_pos])
+                    # 使用新索引設置校正狀態
+                    self.correction_service.set_correction_state(
+                        new_index,
+                        original_text,
+                        corrected_text,
+                        correction_state
+                    )
 
-                # 更新值中的索引 - 確保使用列表類型
-                values = list(values)  # 確保轉換為列表
-                values[index_pos] = str(i)
-                self.tree_manager.update_item(item, values=tuple(values))
+                    # 更新樹視圖的文本顯示
+                    if correction_state == 'correct' and text_pos < len(values):
+                        values[text_pos] = corrected_text
 
-                # 如果不跳過校正狀態更新，則檢查是否需要更新校正狀態
-                if not skip_correction_update:
-                    if old_index in old_correction_states:
-                        # 獲取該項目的原始校正信息
-                        correction_state = old_correction_states[old_index]
-                        original_text = old_original_texts.get(old_index, "")
-                        corrected_text = old_corrected_texts.get(old_index, "")
-
-                        # 使用新索引設置校正狀態 - 修正部分：確保索引一致性
-                        new_index = str(i)
-                        self.correction_service.set_correction_state(
-                            new_index,
-                            original_text,
-                            corrected_text,
-                            correction_state
-                        )
+                updates[item] = {'values': tuple(values)}
 
-                        # 更新樹視圖的圖標顯示
-                        if correction_state == 'correct':
-                            text_pos = 4 if self.display_mode in [self.DISPLAY_MODE_ALL, self.DISPLAY_MODE_AUDIO_SRT] else 3
-                            if text_pos < len(values):
-                                values = list(values)  # 確保是列表
-                                values[text_pos] = corrected_text
-                                self.tree_manager.update_item(item, values=tuple(values))
+            writes = self.tree_manager.bulk_update(updates)
+            self.logger.debug(f"重新編號寫入 {writes}/{len(updates)} 個項目")
 
             # 重新排序完成後，更新 SRT 數據
             self.update_srt_data_from_treeview()
@@ -4058,6 +4211,9 @@ class AlignmentGUI(BaseWindow):
 
         try:
             self._handling_state_change = True
+            # 內容已變更，交給自動儲存服務合併處理
+            if hasattr(self, 'autosave_service'):
+                self.autosave_service.mark_dirty()
             # 更新撤銷/重做按鈕狀態
             self.update_undo_redo_buttons()
             self.update_status("狀態已更新")
@@ -4339,13 +4495,7 @@ class AlignmentGUI(BaseWindow):
                 # 選中第一個拆分項目
                 items = self.gui.tree.get_children()
                 if items:
-                    first_item = None
-                    for item in items:
-                        values = self.gui.tree.item(item, 'values')
-                        index_pos = 1 if self.gui.display_mode in [self.gui.DISPLAY_MODE_ALL, self.gui.DISPLAY_MODE_AUDIO_SRT] else 0
-                        if len(values) > index_pos and str(values[index_pos]) == str(srt_index):
-                            first_item = item
-                            break
+                    first_item = self.gui.tree_manager.find_item_by_index(srt_index)
 
                     if first_item:
                         self.gui.tree.selection_set(first_item)
@@ -4500,6 +4650,23 @@ class AlignmentGUI(BaseWindow):
             # 使用統一的方法切換顯示模式
             self._apply_display_mode_change(self.display_mode, expected_mode)
 
+    def _project_display_mode(self, new_mode) -> bool:
+        """
+        只切換樹狀視圖的可見欄位來套用顯示模式，不清空或重建任何項目
+        :param new_mode: 新顯示模式
+        :return: 樹狀視圖不支援欄位投影時回傳 False，由呼叫者改用重建流程
+        """
+        if not (hasattr(self.tree, 'get_schema') and self.tree.get_schema()):
+            return False
+
+        self.display_mode = new_mode
+        if not self.ui_manager.setup_treeview_columns(new_mode, self.columns):
+            return False
+
+        self.tree.tag_configure('mismatch', background='#FFDDDD')
+        self.tree.tag_configure('use_word_text', background='#00BFFF')
+        return True
+
     def refresh_treeview_structure(self) -> None:
         """
         根據當前的顯示模式重新配置 Treeview 結構
@@ -4507,6 +4674,12 @@ class AlignmentGUI(BaseWindow):
         try:
             self.logger.info(f"開始刷新樹狀視圖結構，目標模式: {self.display_mode}")
 
+            # 列模型保留所有欄位時，現有項目在新模式下的值已經正確，不需清空重建
+            if self._project_display_mode(self.display_mode):
+                self.master.bind("<Configure>", self.ui_manager.on_window_resize)
+                self.logger.info("樹狀視圖結構刷新完成（僅切換可見欄位）")
+                return
+
             # 保存當前樹中的數據
             current_data = []
 
@@ -4962,19 +5135,10 @@ class AlignmentGUI(BaseWindow):
             if not use_word_flags:
                 return
 
-            # 首先，建立一個從索引到樹項目 ID 的映射
-            index_to_item = {}
-            for item in self.tree_manager.get_all_items():
-                values = self.tree_manager.get_item_values(item)
-                index_position = 1 if self.display_mode in [self.DISPLAY_MODE_ALL, self.DISPLAY_MODE_AUDIO_SRT] else 0
-                if len(values) > index_position:
-                    index = str(values[index_position])
-                    index_to_item[index] = item
-
-            # 然後，根據保存的標記設置 use_word_text
+            # 根據保存的標記設置 use_word_text
             for index, use_word in use_word_flags.items():
-                if index in index_to_item:
-                    item_id = index_to_item[index]
+                item_id = self.tree_manager.find_item_by_index(index)
+                if item_id:
 
                     # 如果有 ID 映射，使用映射後的 ID
                     if id_mapping and item_id in id_mapping:
@@ -5319,6 +5483,7 @@ class AlignmentGUI(BaseWindow):
         if hasattr(self, 'ui_manager') and not self.ui_manager.floating_icon_fixed:
             self.ui_manager.hide_floating_icon()
 
+    @traced("correction.display_pass", category="text")
     def update_correction_display(self):
         """更新校正顯示，並立即應用校正"""
         try:
@@ -5328,7 +5493,7 @@ class AlignmentGUI(BaseWindow):
                 return
 
             # 直接調用 correction_service 的方法
-            self.correction_service.update_display_status(self.tree, self.display_mode)
+            self.correction_service.update_display_status(self.tree, self.display_mode, self.tree_manager)
 
             # 更新 SRT 數據以反映變化
             self.update_srt_data_from_treeview()
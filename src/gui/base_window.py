@@ -90,6 +90,9 @@ class BaseWindow:
         # 統一設定關閉協議
         self.master.protocol("WM_DELETE_WINDOW", self._handle_close)
 
+        # 視窗顯示後才在背景驗證字型快取，啟動時不等待列舉系統字型
+        self.font_manager.schedule_revalidation(self.master)
+
     def setup_styles(self) -> None:
         """設定通用樣式"""
         style = ttk.Style()
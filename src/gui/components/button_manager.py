@@ -4,9 +4,13 @@ import logging
 import os
 import tkinter as tk
 from tkinter import ttk
-from typing import Dict, List, Any, Optional, Callable, Tuple, Union
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Callable, Tuple, Union
 
-from PIL import Image, ImageTk
+from utils.icon_atlas import get_icon_atlas
+
+# PIL 只在圖集無法提供圖示時才載入，不在啟動時匯入
+if TYPE_CHECKING:
+    from PIL import ImageTk
 
 class ButtonManager:
     """按鈕管理器類別，統一處理圖片按鈕的創建和事件"""
@@ -123,6 +127,17 @@ class ButtonManager:
                 os.path.join(os.path.dirname(os.path.dirname(self.icon_base_path)), "assets", "icons")
             ]
 
+            # 先從圖示圖集一次取得所有圖標（缺少的尺寸只重建圖集一次）
+            atlas_requests = []
+            for normal_icon, hover_icon in icon_names:
+                for icon_dir in possible_icon_dirs:
+                    normal_path = os.path.exists(icon_dir) and self._find_icon_file(icon_dir, normal_icon)
+                    if normal_path:
+                        hover_path = self._find_icon_file(icon_dir, hover_icon)
+                        atlas_requests += [(path, tuple(size)) for path in (normal_path, hover_path) if path]
+                        break
+            atlas_icons = get_icon_atlas().get_icons(atlas_requests, self.parent)
+
             for normal_icon, hover_icon in icon_names:
                 loaded = False
 
@@ -137,16 +152,12 @@ class ButtonManager:
 
                     if normal_path and os.path.exists(normal_path):
                         try:
-                            img = Image.open(normal_path)
-                            img = img.resize(size, Image.LANCZOS)
-                            self.button_icons[normal_icon] = ImageTk.PhotoImage(img)
+                            self.button_icons[normal_icon] = self._load_icon_image(normal_path, size, atlas_icons)
                             self.logger.debug(f"已載入圖標: {normal_icon} ({normal_path})")
 
                             # 載入懸停狀態圖標
                             if hover_path and os.path.exists(hover_path):
-                                img = Image.open(hover_path)
-                                img = img.resize(size, Image.LANCZOS)
-                                self.button_icons[hover_icon] = ImageTk.PhotoImage(img)
+                                self.button_icons[hover_icon] = self._load_icon_image(hover_path, size, atlas_icons)
                                 self.logger.debug(f"已載入圖標: {hover_icon} ({hover_path})")
                             else:
                                 # 如果找不到懸停圖標，使用正常圖標作為替代
@@ -172,6 +183,23 @@ class ButtonManager:
         except Exception as e:
             self.logger.error(f"載入圖標時出錯: {e}")
 
+    @staticmethod
+    def _load_icon_image(path: str, size: Tuple[int, int], atlas_icons: Dict) -> Any:
+        """
+        載入並縮放圖標，優先使用圖示圖集中的圖片
+        :param path: 圖標文件路徑
+        :param size: 圖標尺寸
+        :param atlas_icons: IconAtlas.get_icons 的結果
+        :return: PhotoImage
+        """
+        photo = atlas_icons.get((path, tuple(size)))
+        if photo is None:
+            from PIL import Image, ImageTk
+            img = Image.open(path)
+            img = img.resize(size, Image.LANCZOS)
+            photo = ImageTk.PhotoImage(img)
+        return photo
+
     def _find_icon_file(self, directory: str, icon_name: str) -> str:
         """
         在目錄中尋找圖標文件
@@ -194,12 +222,13 @@ class ButtonManager:
         # 找不到圖標
         return ""
 
-    def _create_blank_icon(self, size: Tuple[int, int]) -> ImageTk.PhotoImage:
+    def _create_blank_icon(self, size: Tuple[int, int]) -> "ImageTk.PhotoImage":
         """
         創建空白圖標
         :param size: 圖標尺寸
         :return: 空白圖標
         """
+        from PIL import Image, ImageTk
         try:
             img = Image.new('RGBA', size, (200, 200, 200, 128))  # 半透明灰色
             return ImageTk.PhotoImage(img)
@@ -362,8 +391,9 @@ class ButtonManager:
             empty_frame.pack(side=pack_side, padx=padx, pady=pady)
             return empty_frame
 
-    def _create_placeholder_image(self) -> ImageTk.PhotoImage:
+    def _create_placeholder_image(self) -> "ImageTk.PhotoImage":
         """創建占位圖像"""
+        from PIL import Image, ImageTk
         try:
             # 創建一個簡單的占位圖像
             img = Image.new('RGB', (self.default_width, self.default_height), color='#cccccc')
@@ -6,6 +6,8 @@ import tkinter as tk
 from tkinter import ttk
 from typing import Dict, List, Any, Optional, Callable, Tuple
 
+from gui.components.virtual_tree_view import VirtualTreeView
+
 
 class GUIBuilder:
     """處理基礎 GUI 元素的建構，如菜單、工具列、內容區域等"""
@@ -265,15 +267,16 @@ class GUIBuilder:
         except Exception as e:
             self.logger.error(f"創建狀態列時出錯: {e}")
 
-    def create_treeview_with_scrollbar(self, frame) -> Tuple[ttk.Treeview, ttk.Scrollbar]:
+    def create_treeview_with_scrollbar(self, frame, virtual: bool = False) -> Tuple[ttk.Treeview, ttk.Scrollbar]:
         """
         創建帶捲軸的樹狀視圖
         :param frame: 父框架
+        :param virtual: 是否使用只實體化可見列的虛擬化樹狀視圖
         :return: (樹狀視圖, 捲軸)
         """
         try:
             # 創建樹狀視圖
-            tree = ttk.Treeview(frame)
+            tree = VirtualTreeView(frame) if virtual else ttk.Treeview(frame)
 
             # 垂直捲軸
             scrollbar = ttk.Scrollbar(
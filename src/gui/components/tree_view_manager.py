@@ -1,8 +1,11 @@
 """TreeView 管理器模組，負責處理所有 TreeView 操作"""
 
 import logging
+from contextlib import nullcontext
 from tkinter import ttk
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from gui.components.virtual_tree_view import VirtualTreeView
 
 
 class TreeViewManager:
@@ -25,8 +28,7 @@ class TreeViewManager:
         :return: 插入項目的 ID
         """
         try:
-            item_id = self.tree.insert(parent, position, values=values)
-            return item_id
+            return self.tree.insert(parent, position, values=values)
         except Exception as e:
             self.logger.error(f"插入項目時出錯: {e}")
             raise
@@ -58,9 +60,9 @@ class TreeViewManager:
         :param items: 項目 ID 列表
         """
         try:
-            for item_id in items:
-                if self.tree.exists(item_id):
-                    self.tree.delete(item_id)
+            existing = [item_id for item_id in items if self.tree.exists(item_id)]
+            if existing:
+                self.tree.delete(*existing)
         except Exception as e:
             self.logger.error(f"刪除多個項目時出錯: {e}")
 
@@ -86,6 +88,64 @@ class TreeViewManager:
         if self.tree.exists(item_id):
             self.tree.item(item_id, tags=tags)
 
+    def bulk_update(self, updates: Dict[str, Dict[str, Any]]) -> int:
+        """
+        批次更新多個項目，只對內容實際改變的項目寫入 TreeView
+        每次都從 TreeView 讀取目前內容來比對，不依賴可能過期的快取
+        :param updates: {項目ID: {'values': 值, 'tags': 標籤}}，省略的鍵保持不變
+        :return: 實際寫入的項目數
+        """
+        writes = 0
+        batch = self.tree.batch_update() if isinstance(self.tree, VirtualTreeView) else nullcontext()
+
+        try:
+            with batch:
+                for item_id, changes in updates.items():
+                    if not self.tree.exists(item_id):
+                        continue
+
+                    current_values, current_tags = self._get_current_row(item_id)
+                    kwargs = {}
+
+                    if 'values' in changes and changes['values'] is not None:
+                        new_values = self._normalize_values(changes['values'])
+                        if new_values != current_values:
+                            kwargs['values'] = tuple(changes['values'])
+
+                    if 'tags' in changes and changes['tags'] is not None:
+                        new_tags = self._normalize_tags(changes['tags'])
+                        if new_tags != current_tags:
+                            kwargs['tags'] = new_tags
+
+                    if kwargs:
+                        self.tree.item(item_id, **kwargs)
+                        writes += 1
+        except Exception as e:
+            self.logger.error(f"批次更新項目時出錯: {e}")
+
+        return writes
+
+    def _get_current_row(self, item_id: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """獲取項目目前的 (values, tags)，以比較用的格式回傳"""
+        return (self._normalize_values(self.tree.item(item_id, 'values')),
+                self._normalize_tags(self.tree.item(item_id, 'tags')))
+
+    @staticmethod
+    def _normalize_values(values) -> Tuple[str, ...]:
+        """統一值的比較格式（Tk 會把數字字串轉成整數）"""
+        if not values:
+            return ()
+        return tuple(str(v) for v in values)
+
+    @staticmethod
+    def _normalize_tags(tags) -> Tuple[str, ...]:
+        """統一標籤的比較格式"""
+        if not tags:
+            return ()
+        if isinstance(tags, str):
+            return tuple(tags.split())
+        return tuple(str(t) for t in tags)
+
     def set_selection(self, items) -> None:
         """設置選中的項目"""
         self.tree.selection_set(items)
@@ -108,8 +168,10 @@ class TreeViewManager:
     def clear_all(self) -> None:
         """清空 TreeView 中的所有項目"""
         try:
-            for item in self.tree.get_children():
-                self.tree.delete(item)
+            # 一次刪除所有項目，避免逐項刪除造成的重複佈局計算
+            items = self.tree.get_children()
+            if items:
+                self.tree.delete(*items)
         except Exception as e:
             self.logger.error(f"清空所有項目時出錯: {e}")
 
@@ -143,6 +205,78 @@ class TreeViewManager:
             return self.tree.index(item_id)
         return -1
 
+    def find_item_by_index(self, srt_index) -> Optional[str]:
+        """
+        以字幕序號查找項目，序號可為整數或字串
+        :param srt_index: 字幕序號
+        :return: 項目 ID，找不到時回傳 None
+        """
+        if getattr(self.tree, 'has_key_index', None) and self.tree.has_key_index():
+            return self.tree.find_by_key(srt_index)
+        return self._scan_index_map().get(str(srt_index))
+
+    def get_item_index(self, item_id: str) -> str:
+        """
+        獲取項目的字幕序號
+        :param item_id: 項目 ID
+        :return: 序號字串，項目不存在時回傳空字串
+        """
+        if getattr(self.tree, 'has_key_index', None) and self.tree.has_key_index():
+            return self.tree.get_key(item_id) or ''
+        if not self.tree.exists(item_id):
+            return ''
+        column = self._index_column()
+        values = self.tree.item(item_id, 'values')
+        return str(values[column]) if column is not None and len(values) > column else ''
+
+    def get_index_map(self) -> Dict[str, str]:
+        """
+        獲取字幕序號到項目 ID 的映射
+        :return: {序號字串: 項目 ID}
+        """
+        if getattr(self.tree, 'has_key_index', None) and self.tree.has_key_index():
+            return self.tree.get_key_map()
+        return self._scan_index_map()
+
+    def _index_column(self) -> Optional[int]:
+        """獲取序號欄位在目前可見欄位中的位置"""
+        columns = list(self.tree['columns'] or ())
+        return columns.index('Index') if 'Index' in columns else None
+
+    def _scan_index_map(self) -> Dict[str, str]:
+        """逐列建立序號映射（一般 Treeview 的後備做法），重複序號保留位置最前者"""
+        column = self._index_column()
+        index_map: Dict[str, str] = {}
+        if column is None:
+            return index_map
+        for item in self.tree.get_children():
+            values = self.tree.item(item, 'values')
+            if len(values) > column:
+                index_map.setdefault(str(values[column]), item)
+        return index_map
+
+    def get_item_at(self, position: int) -> str:
+        """
+        獲取指定位置的項目 ID
+        :param position: 項目位置
+        :return: 項目 ID，超出範圍時回傳空字串
+        """
+        if hasattr(self.tree, 'get_item_at'):
+            return self.tree.get_item_at(position)
+        items = self.tree.get_children()
+        return items[position] if 0 <= position < len(items) else ''
+
+    def get_visible_range(self) -> Tuple[int, int]:
+        """
+        獲取目前可見的項目位置範圍
+        :return: (起始位置, 結束位置)，結束位置不包含在內
+        """
+        if hasattr(self.tree, 'get_visible_range'):
+            return self.tree.get_visible_range()
+        items = self.tree.get_children()
+        first, last = self.tree.yview()
+        return int(first * len(items)), int(round(last * len(items)))
+
     def select_item(self, item_id: str) -> None:
         """選擇指定項目"""
         if self.tree.exists(item_id):
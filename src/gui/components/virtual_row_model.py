@@ -0,0 +1,343 @@
+"""虛擬化 TreeView 的列模型，不依賴任何 Tk 視窗即可操作與測試"""
+
+import tkinter as tk
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+
+class VirtualRowModel:
+    """
+    虛擬化樹狀視圖的列模型
+    保存所有列的順序與內容、位置快取、鍵欄位索引以及欄位結構與可見欄位投影；
+    錯誤以 tk.TclError 拋出，讓 VirtualTreeView 的行為與 ttk.Treeview 一致
+    """
+
+    def __init__(self):
+        """初始化空的列模型"""
+        # 虛擬項目 ID 的順序與各列內容
+        self.order: List[str] = []
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        self._positions: Dict[str, int] = {}
+        self._positions_dirty = False
+        self._id_counter = 0
+
+        # 欄位結構：列以完整結構儲存，顯示模式只改變投影（可見欄位）
+        self.schema: List[str] = []
+        self._schema_defaults: Tuple[Any, ...] = ()
+        self._projection: Optional[List[int]] = None
+        self.display_columns: Tuple[str, ...] = ()
+
+        # 鍵欄位索引：鍵值（字串）與項目 ID 的雙向映射，隨插入、修改與刪除增量維護
+        self._key_position: Optional[int] = None
+        self._key_items: Dict[str, List[str]] = {}
+        self._item_keys: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __contains__(self, item) -> bool:
+        return item in self.rows
+
+    # ------------------------------------------------------------------
+    # 欄位結構與投影
+    # ------------------------------------------------------------------
+    def set_schema(self, columns, defaults: Optional[Dict[str, Any]] = None,
+                   key_column: Optional[str] = None) -> None:
+        """
+        設定完整的欄位結構
+        :param columns: 完整欄位列表
+        :param defaults: 各欄位在未提供值時的預設值
+        :param key_column: 建立鍵索引的欄位，None 表示不建立
+        """
+        if self.rows:
+            raise tk.TclError("VirtualTreeView 只能在沒有項目時設定欄位結構")
+
+        defaults = defaults or {}
+        self.schema = list(columns)
+        self._schema_defaults = tuple(defaults.get(col, '') for col in self.schema)
+        self._key_position = self.schema.index(key_column) if key_column in self.schema else None
+        self.set_projection(self.schema)
+
+    def set_projection(self, columns: Iterable[str]) -> bool:
+        """
+        切換可見欄位，列的內容保持不變
+        結構外的欄位會擴充到結構末尾，已存在的列以空值補齊
+        :param columns: 可見欄位
+        :return: 是否擴充了欄位結構（已存在的列內容因此改變）
+        """
+        columns = [str(col) for col in columns]
+
+        missing = [col for col in columns if col not in self.schema]
+        if missing:
+            self.schema.extend(missing)
+            self._schema_defaults += ('',) * len(missing)
+            for row in self.rows.values():
+                row['values'] = self._pad_values(row['values'])
+                row['version'] += 1
+
+        self.display_columns = tuple(columns)
+        if self.display_columns == tuple(self.schema):
+            self._projection = None
+        else:
+            self._projection = [self.schema.index(col) for col in columns]
+        return bool(missing)
+
+    def project(self, values: Tuple[Any, ...]) -> Tuple[Any, ...]:
+        """把完整結構的值投影到目前可見欄位"""
+        if not self.schema or not values:
+            return values
+        if self._projection is None:
+            return values[:len(self.schema)]
+        return tuple(values[i] for i in self._projection)
+
+    def to_model_values(self, values, base: Optional[Tuple[Any, ...]] = None) -> Tuple[Any, ...]:
+        """
+        把以可見欄位提供的值寫入完整結構
+        :param values: 依目前可見欄位排列的值
+        :param base: 原有的完整值，隱藏欄位沿用其內容
+        :return: 完整結構的值
+        """
+        values = tuple(values) if values not in ('', None) else ()
+        if not self.schema:
+            return values
+
+        full = list(self._pad_values(base)) if base else list(self._schema_defaults)
+        indexes = self._projection if self._projection is not None else range(len(full))
+        for position, model_index in enumerate(indexes):
+            full[model_index] = values[position] if position < len(values) else ''
+        return tuple(full)
+
+    def _pad_values(self, values: Tuple[Any, ...]) -> Tuple[Any, ...]:
+        """把值補齊到完整結構的長度"""
+        if len(values) >= len(self.schema):
+            return values
+        return tuple(values) + self._schema_defaults[len(values):]
+
+    # ------------------------------------------------------------------
+    # 列操作
+    # ------------------------------------------------------------------
+    def insert(self, index, iid: Optional[str] = None, **kw) -> str:
+        """
+        插入新列
+        :param index: 插入位置（'end' 或整數）
+        :param iid: 指定的項目 ID，None 時自動產生
+        :param kw: 列的選項（text、image、values、open、tags）
+        :return: 新項目 ID
+        """
+        if iid is None:
+            self._id_counter += 1
+            iid = f"I{self._id_counter:03X}"
+            while iid in self.rows:
+                self._id_counter += 1
+                iid = f"I{self._id_counter:03X}"
+        elif iid in self.rows:
+            raise tk.TclError(f"Item {iid} already exists")
+
+        self.rows[iid] = self._new_row(kw)
+        self._register_key(iid)
+
+        if index == 'end':
+            self.order.append(iid)
+            if not self._positions_dirty:
+                self._positions[iid] = len(self.order) - 1
+        else:
+            position = max(0, min(int(index), len(self.order)))
+            self.order.insert(position, iid)
+            self._positions_dirty = True
+        return iid
+
+    def get(self, item) -> Dict[str, Any]:
+        """獲取列，項目不存在時拋出與 Tk 相同的錯誤"""
+        row = self.rows.get(item)
+        if row is None:
+            raise tk.TclError(f"Item {item} not found")
+        return row
+
+    def update(self, item, **kw) -> Dict[str, Any]:
+        """
+        修改列的選項，每次修改都會遞增列的版本號
+        :param item: 項目 ID
+        :return: 修改後的列
+        """
+        row = self.get(item)
+        if 'values' in kw:
+            row['values'] = self.to_model_values(kw['values'], row['values'])
+        if 'tags' in kw:
+            row['tags'] = self._normalize_tags(kw['tags'])
+        if 'text' in kw:
+            row['text'] = kw['text']
+        if 'image' in kw:
+            row['image'] = kw['image']
+        if 'open' in kw:
+            row['open'] = int(bool(kw['open']))
+        row['version'] += 1
+        if 'values' in kw:
+            self._register_key(item)
+        return row
+
+    def option(self, item, option: str) -> Any:
+        """讀取列的單一選項（values 回傳可見欄位的投影）"""
+        row = self.get(item)
+        if option == 'values':
+            return self.project(row['values']) if row['values'] else ''
+        if option == 'tags':
+            return row['tags'] if row['tags'] else ''
+        if option in ('text', 'open'):
+            return row[option]
+        if option == 'image':
+            return row['image'] or ''
+        raise tk.TclError(f'unknown option "-{option}"')
+
+    def delete(self, items: List[str]) -> Set[str]:
+        """
+        刪除多個列，任何一個項目不存在時不做任何修改
+        :param items: 項目 ID 列表
+        :return: 被刪除的項目 ID 集合
+        """
+        for item in items:
+            if item not in self.rows:
+                raise tk.TclError(f"Item {item} not found")
+
+        to_remove = set(items)
+        if not to_remove:
+            return to_remove
+        if len(to_remove) == len(self.order):
+            self.order = []
+            self._positions = {}
+            self._positions_dirty = False
+            self._key_items = {}
+            self._item_keys = {}
+        elif len(to_remove) == 1:
+            self.order.remove(items[0])
+            self._positions_dirty = True
+        else:
+            self.order = [iid for iid in self.order if iid not in to_remove]
+            self._positions_dirty = True
+
+        for item in to_remove:
+            del self.rows[item]
+            self._unregister_key(item)
+        return to_remove
+
+    def move(self, item, index) -> None:
+        """移動列到新位置（'end' 或整數）"""
+        self.get(item)
+        self.order.remove(item)
+        if index == 'end':
+            self.order.append(item)
+        else:
+            self.order.insert(max(0, min(int(index), len(self.order))), item)
+        self._positions_dirty = True
+
+    def index(self, item) -> int:
+        """獲取列的位置，結構變更後才重建位置快取"""
+        self.get(item)
+        if self._positions_dirty:
+            self._positions = {iid: i for i, iid in enumerate(self.order)}
+            self._positions_dirty = False
+        return self._positions[item]
+
+    def item_at(self, position: int) -> str:
+        """獲取指定位置的項目 ID，超出範圍時回傳空字串"""
+        if 0 <= position < len(self.order):
+            return self.order[position]
+        return ''
+
+    def next(self, item) -> str:
+        """獲取下一個項目"""
+        return self.item_at(self.index(item) + 1)
+
+    def prev(self, item) -> str:
+        """獲取上一個項目"""
+        return self.item_at(self.index(item) - 1)
+
+    def tagged(self, tagname: str) -> Tuple[str, ...]:
+        """列出擁有指定標籤的所有項目"""
+        return tuple(iid for iid in self.order if tagname in self.rows[iid]['tags'])
+
+    def window(self, top: int, visible: int, margin: int) -> Tuple[int, int, int]:
+        """
+        計算需要實體化的列範圍
+        :param top: 期望的第一個可見列
+        :param visible: 可見列數
+        :param margin: 上下各保留的緩衝列數
+        :return: (修正後的第一個可見列, 起始列, 結束列)，結束列不包含在內
+        """
+        total = len(self.order)
+        top = max(0, min(top, max(0, total - visible)))
+        return top, max(0, top - margin), min(total, top + visible + margin)
+
+    # ------------------------------------------------------------------
+    # 鍵欄位索引
+    # ------------------------------------------------------------------
+    def has_key_index(self) -> bool:
+        """是否已建立鍵欄位索引"""
+        return self._key_position is not None
+
+    def find_by_key(self, key) -> Optional[str]:
+        """
+        以鍵欄位的值查找項目（O(1)），鍵值 1 與 '1' 視為相同
+        :param key: 鍵值
+        :return: 項目 ID；多個項目暫時擁有相同鍵值時回傳位置最前者，找不到時回傳 None
+        """
+        items = self._key_items.get(str(key))
+        if not items:
+            return None
+        if len(items) == 1:
+            return items[0]
+        return min(items, key=self.index)
+
+    def get_key(self, item) -> Optional[str]:
+        """獲取項目的鍵值，項目不存在或未建立索引時回傳 None"""
+        return self._item_keys.get(item)
+
+    def get_key_map(self) -> Dict[str, str]:
+        """獲取鍵值到項目 ID 的映射快照"""
+        return {key: items[0] if len(items) == 1 else min(items, key=self.index)
+                for key, items in self._key_items.items() if items}
+
+    def _register_key(self, item: str) -> None:
+        """依列目前的值更新項目的鍵索引"""
+        if self._key_position is None:
+            return
+        values = self.rows[item]['values']
+        key = str(values[self._key_position]) if len(values) > self._key_position else ''
+        if self._item_keys.get(item) == key:
+            return
+        self._unregister_key(item)
+        if key:
+            self._item_keys[item] = key
+            self._key_items.setdefault(key, []).append(item)
+
+    def _unregister_key(self, item: str) -> None:
+        """從鍵索引移除項目"""
+        key = self._item_keys.pop(item, None)
+        if key is None:
+            return
+        items = self._key_items.get(key)
+        if items:
+            items.remove(item)
+            if not items:
+                del self._key_items[key]
+
+    # ------------------------------------------------------------------
+    # 內部實作
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _normalize_tags(tags) -> Tuple[str, ...]:
+        """統一標籤格式為元組"""
+        if not tags:
+            return ()
+        if isinstance(tags, str):
+            return tuple(tags.split())
+        return tuple(tags)
+
+    def _new_row(self, kw: Dict[str, Any]) -> Dict[str, Any]:
+        """建立列"""
+        return {
+            'text': kw.get('text', ''),
+            'image': kw.get('image', ''),
+            'values': self.to_model_values(kw.get('values', ())),
+            'open': int(bool(kw.get('open', False))),
+            'tags': self._normalize_tags(kw.get('tags')),
+            'version': 0,
+        }
@@ -0,0 +1,639 @@
+"""虛擬化 TreeView 模組，只實體化可見範圍內的字幕列"""
+
+import logging
+import tkinter as tk
+from contextlib import contextmanager
+from tkinter import ttk
+from typing import Any, Dict, List, Optional, Tuple
+
+from gui.components.virtual_row_model import VirtualRowModel
+
+
+def _convert_stringval(value: Any) -> Any:
+    """模擬 Tk 回傳值的轉換：能轉成整數的字串轉為整數"""
+    value = str(value)
+    try:
+        value = int(value)
+    except (ValueError, TypeError):
+        pass
+    return value
+
+
+class VirtualTreeView(ttk.Treeview):
+    """
+    虛擬化樹狀視圖
+    對外提供與 ttk.Treeview 相同的項目 API（insert、item、delete、index、see、selection 等），
+    但所有列只存在於記憶體的列模型（VirtualRowModel）中，實際的 Treeview 只保留
+    「可見範圍 + 緩衝列」的實體列，捲動時重用這些實體列並替換其內容
+    """
+
+    # 實體列 ID 前綴，與虛擬項目 ID 區分
+    POOL_PREFIX = "_row"
+
+    # 無法取得實際尺寸時的預設值
+    DEFAULT_ROW_HEIGHT = 20
+    DEFAULT_VISIBLE_ROWS = 30
+
+    def __init__(self, master=None, margin: int = 20, **kw):
+        """
+        初始化虛擬化樹狀視圖
+        :param master: 父元件
+        :param margin: 可見範圍上下各保留的緩衝列數
+        :param kw: 傳給 ttk.Treeview 的參數
+        """
+        user_scroll_command = kw.pop('yscrollcommand', None)
+        super().__init__(master, **kw)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._margin = max(1, margin)
+
+        # 列模型：虛擬項目 ID 的順序、各列內容、鍵索引與欄位投影
+        self._model = VirtualRowModel()
+
+        # 實體列池與映射
+        self._pool: List[str] = []
+        self._pool_counter = 0
+        self._pool_to_virtual: Dict[str, str] = {}
+        self._virtual_to_pool: Dict[str, str] = {}
+        self._pushed: Dict[str, Tuple[str, int]] = {}
+        self._window_start = 0
+        self._top = 0
+        self._row_height = 0
+        self._heading_height = 0
+
+        # 選取與焦點（以虛擬項目 ID 記錄）
+        self._virtual_selection: List[str] = []
+        self._pushed_selection: Tuple[str, ...] = ()
+        self._virtual_focus = ''
+
+        # 捲動與刷新
+        self._user_yscrollcommand = user_scroll_command
+        self._refresh_pending = False
+        self._batch_depth = 0
+        self._batch_dirty = False
+
+        super().configure(yscrollcommand=self._on_physical_scroll)
+        self.bind('<Configure>', lambda e: self._schedule_refresh(), add='+')
+
+    # ------------------------------------------------------------------
+    # 配置
+    # ------------------------------------------------------------------
+    def configure(self, cnf=None, **kw):
+        """攔截 yscrollcommand 與 columns，其餘配置交給 ttk.Treeview"""
+        if cnf is None and not kw:
+            return super().configure()
+        if isinstance(cnf, dict) and ('yscrollcommand' in cnf or 'columns' in cnf):
+            kw = {**cnf, **kw}
+            cnf = None
+        if 'yscrollcommand' in kw:
+            self._user_yscrollcommand = kw.pop('yscrollcommand')
+            self._report_scroll()
+        if 'columns' in kw and self._model.schema:
+            self._set_projection(kw.pop('columns'))
+        if not cnf and not kw:
+            return None
+        return super().configure(cnf, **kw)
+
+    config = configure
+
+    def cget(self, key):
+        """讀取配置，yscrollcommand 回傳使用者設定的回調，columns 回傳目前可見欄位"""
+        if key == 'yscrollcommand':
+            return self._user_yscrollcommand or ''
+        if key == 'columns' and self._model.schema:
+            return self._model.display_columns
+        return super().cget(key)
+
+    __getitem__ = cget
+
+    def set_schema(self, columns, defaults: Optional[Dict[str, Any]] = None,
+                   key_column: Optional[str] = None) -> None:
+        """
+        設定完整的欄位結構
+        設定後列模型以完整結構儲存所有欄位，configure(columns=...) 只切換可見欄位與
+        item() 的值投影，不需要重建任何列；隱藏欄位的值會保留下來
+        :param columns: 完整欄位列表（需包含所有顯示模式會用到的欄位）
+        :param defaults: 各欄位在未提供值時的預設值
+        :param key_column: 建立鍵索引的欄位（例如字幕序號），None 表示不建立
+        """
+        self._model.set_schema(columns, defaults, key_column)
+        super().configure(columns=self._model.schema)
+        self._set_projection(self._model.schema)
+
+    def get_schema(self) -> List[str]:
+        """獲取完整欄位結構，未設定時為空列表"""
+        return list(self._model.schema)
+
+    def has_key_index(self) -> bool:
+        """是否已建立鍵欄位索引"""
+        return self._model.has_key_index()
+
+    def find_by_key(self, key) -> Optional[str]:
+        """
+        以鍵欄位的值查找項目（O(1)），鍵值 1 與 '1' 視為相同
+        :param key: 鍵值
+        :return: 項目 ID；多個項目暫時擁有相同鍵值時回傳位置最前者，找不到時回傳 None
+        """
+        return self._model.find_by_key(key)
+
+    def get_key(self, item) -> Optional[str]:
+        """
+        獲取項目的鍵值
+        :param item: 項目 ID
+        :return: 鍵值字串，項目不存在或未建立索引時回傳 None
+        """
+        return self._model.get_key(item)
+
+    def get_key_map(self) -> Dict[str, str]:
+        """
+        獲取鍵值到項目 ID 的映射快照
+        :return: {鍵值: 項目 ID}
+        """
+        return self._model.get_key_map()
+
+    # ------------------------------------------------------------------
+    # 列模型操作（與 ttk.Treeview 相同的介面）
+    # ------------------------------------------------------------------
+    def insert(self, parent, index, iid=None, **kw):
+        """
+        插入項目到列模型
+        :param parent: 父項目 ID（僅支援頂層 ''）
+        :param index: 插入位置（'end' 或整數）
+        :param iid: 指定的項目 ID
+        :return: 新項目的虛擬 ID
+        """
+        if parent not in ('', None):
+            raise tk.TclError(f"VirtualTreeView 不支援巢狀項目: {parent}")
+
+        iid = self._model.insert(index, iid, **kw)
+        self._schedule_refresh()
+        return iid
+
+    def item(self, item, option=None, **kw):
+        """
+        查詢或修改項目
+        :param item: 虛擬項目 ID
+        :param option: 要查詢的選項
+        :return: 選項值或選項字典
+        """
+        if option is not None:
+            return self._model.option(item, option)
+
+        if kw:
+            row = self._model.update(item, **kw)
+            pool_id = self._virtual_to_pool.get(item)
+            if pool_id:
+                if self._batch_depth:
+                    self._batch_dirty = True
+                elif not self._refresh_pending:
+                    self._push_row(pool_id, item, row)
+            return None
+
+        row = self._model.get(item)
+        values = [_convert_stringval(v) for v in self._model.project(row['values'])]
+        return {
+            'text': row['text'],
+            'image': row['image'] or '',
+            'values': values if values else '',
+            'open': row['open'],
+            'tags': list(row['tags']) if row['tags'] else '',
+        }
+
+    def set(self, item, column=None, value=None):
+        """查詢或設定單一欄位值"""
+        row = self._model.get(item)
+        columns = list(self.cget('columns') or ())
+        projected = self._model.project(row['values'])
+        values = list(projected) + [''] * max(0, len(columns) - len(projected))
+
+        if column is None:
+            return {col: values[i] for i, col in enumerate(columns)}
+
+        col_index = self._column_index(column, columns)
+        if value is None:
+            return values[col_index]
+
+        values[col_index] = value
+        self.item(item, values=tuple(values))
+        return None
+
+    @staticmethod
+    def _column_index(column, columns: List[str]) -> int:
+        """
+        把欄位識別轉為可見欄位中的位置（與 Tk 相同：欄位名稱、從 0 開始的整數，或從 1 開始的 #N）
+        :param column: 欄位識別
+        :param columns: 目前可見欄位
+        :return: 欄位位置
+        """
+        if column in columns:
+            return columns.index(column)
+        text = str(column)
+        try:
+            index = int(text[1:]) - 1 if text.startswith('#') else int(text)
+        except ValueError:
+            raise tk.TclError(f"Invalid column index {column}") from None
+        if text == '#0':
+            raise tk.TclError("Display column #0 cannot be set")
+        if not 0 <= index < len(columns):
+            raise tk.TclError(f"Column index {column} out of bounds")
+        return index
+
+    def delete(self, *items):
+        """刪除一個或多個項目"""
+        items = self._flatten(items)
+        if not items:
+            return
+
+        to_remove = self._model.delete(items)
+        if self._virtual_selection:
+            self._virtual_selection = [iid for iid in self._virtual_selection if iid not in to_remove]
+        if self._virtual_focus in to_remove:
+            self._virtual_focus = ''
+
+        self._schedule_refresh()
+
+    def detach(self, *items):
+        """VirtualTreeView 沒有分離狀態，等同於刪除"""
+        self.delete(*items)
+
+    def move(self, item, parent, index):
+        """移動項目到新位置"""
+        self._model.move(item, index)
+        self._schedule_refresh()
+
+    reattach = move
+
+    def exists(self, item):
+        """檢查項目是否存在"""
+        return item in self._model
+
+    def get_children(self, item=None):
+        """獲取所有頂層項目 ID"""
+        if item:
+            return ()
+        return tuple(self._model.order)
+
+    def index(self, item):
+        """獲取項目在列表中的位置"""
+        return self._model.index(item)
+
+    def parent(self, item):
+        """所有項目都是頂層項目"""
+        return ''
+
+    def next(self, item):
+        """獲取下一個項目"""
+        return self._model.next(item)
+
+    def prev(self, item):
+        """獲取上一個項目"""
+        return self._model.prev(item)
+
+    def tag_has(self, tagname, item=None):
+        """檢查項目是否有指定標籤，或列出擁有該標籤的所有項目"""
+        if item is None:
+            return self._model.tagged(tagname)
+        return tagname in self._model.get(item)['tags']
+
+    # ------------------------------------------------------------------
+    # 可見性、選取與焦點
+    # ------------------------------------------------------------------
+    def see(self, item):
+        """捲動使項目可見"""
+        position = self.index(item)
+        visible = self._visible_rows()
+        if position < self._top:
+            self._top = position
+        elif position >= self._top + visible:
+            self._top = position - visible + 1
+        self._refresh()
+
+        pool_id = self._virtual_to_pool.get(item)
+        if pool_id:
+            super().see(pool_id)
+
+    def bbox(self, item, column=None):
+        """獲取項目（或單元格）的邊界框，未實體化的項目回傳空字串"""
+        self._ensure_window()
+        pool_id = self._virtual_to_pool.get(item)
+        if not pool_id:
+            return ''
+        return super().bbox(pool_id, column)
+
+    def identify_row(self, y):
+        """獲取指定 y 坐標的虛擬項目 ID"""
+        self._ensure_window()
+        return self._pool_to_virtual.get(super().identify_row(y), '')
+
+    def identify(self, component, x, y):
+        """識別指定位置的元件，項目會轉換為虛擬項目 ID"""
+        self._ensure_window()
+        result = super().identify(component, x, y)
+        if component in ('item', 'row'):
+            return self._pool_to_virtual.get(result, '')
+        return result
+
+    def focus(self, item=None):
+        """查詢或設定焦點項目"""
+        self._ensure_window()
+        if item is None:
+            physical = super().focus()
+            if physical in self._pool_to_virtual:
+                self._virtual_focus = self._pool_to_virtual[physical]
+            return self._virtual_focus
+
+        self._model.get(item)
+        self._virtual_focus = item
+        pool_id = self._virtual_to_pool.get(item)
+        if pool_id:
+            super().focus(pool_id)
+        return None
+
+    def selection(self):
+        """獲取所有選中的虛擬項目 ID"""
+        self._ensure_window()
+        self._sync_selection_from_physical()
+        return tuple(self._virtual_selection)
+
+    def selection_set(self, *items):
+        """設定選取項目"""
+        items = self._flatten(items)
+        self._virtual_selection = [iid for iid in items if iid in self._model]
+        self._push_selection()
+
+    def selection_add(self, *items):
+        """加入選取項目"""
+        self._sync_selection_from_physical()
+        for iid in self._flatten(items):
+            if iid in self._model and iid not in self._virtual_selection:
+                self._virtual_selection.append(iid)
+        self._push_selection()
+
+    def selection_remove(self, *items):
+        """移除選取項目"""
+        self._sync_selection_from_physical()
+        to_remove = set(self._flatten(items))
+        self._virtual_selection = [iid for iid in self._virtual_selection if iid not in to_remove]
+        self._push_selection()
+
+    def selection_toggle(self, *items):
+        """切換選取狀態"""
+        self._sync_selection_from_physical()
+        for iid in self._flatten(items):
+            if iid in self._virtual_selection:
+                self._virtual_selection.remove(iid)
+            elif iid in self._model:
+                self._virtual_selection.append(iid)
+        self._push_selection()
+
+    @contextmanager
+    def batch_update(self):
+        """
+        批次更新區塊：區塊內對項目的修改只更新列模型，
+        結束時才一次性寫入有變化的實體列
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_dirty:
+                self._batch_dirty = False
+                self._refresh()
+
+    # ------------------------------------------------------------------
+    # 虛擬捲動
+    # ------------------------------------------------------------------
+    def yview(self, *args):
+        """
+        處理垂直捲動（捲軸與程式呼叫）
+        無參數時回傳虛擬範圍 (first, last)
+        """
+        total = len(self._model)
+        visible = self._visible_rows()
+
+        if not args:
+            if total == 0:
+                return 0.0, 1.0
+            return self._top / total, min(1.0, (self._top + visible) / total)
+
+        if args[0] == 'moveto':
+            self._top = int(float(args[1]) * total)
+        elif args[0] == 'scroll':
+            step = int(args[1])
+            if len(args) > 2 and args[2] == 'pages':
+                step *= max(1, visible - 1)
+            self._top += step
+
+        self._refresh()
+        return None
+
+    def yview_moveto(self, fraction):
+        """捲動到指定比例位置"""
+        self.yview('moveto', fraction)
+
+    def yview_scroll(self, number, what):
+        """依單位或頁數捲動"""
+        self.yview('scroll', number, what)
+
+    def get_visible_range(self) -> Tuple[int, int]:
+        """
+        獲取目前可見的列範圍
+        :return: (起始列, 結束列)，結束列不包含在內
+        """
+        self._ensure_window()
+        return self._top, min(len(self._model), self._top + self._visible_rows())
+
+    def get_item_at(self, row: int) -> str:
+        """
+        獲取指定列位置的虛擬項目 ID
+        :param row: 列位置
+        :return: 項目 ID，超出範圍時回傳空字串
+        """
+        return self._model.item_at(row)
+
+    def get_materialized_items(self) -> List[str]:
+        """獲取目前已實體化的虛擬項目 ID"""
+        self._ensure_window()
+        return [self._pool_to_virtual[pool_id] for pool_id in self._pool]
+
+    # ------------------------------------------------------------------
+    # 內部實作
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _flatten(items) -> List[str]:
+        """展開 (items,) 或 ([items],) 形式的參數"""
+        if len(items) == 1 and isinstance(items[0], (list, tuple)):
+            items = items[0]
+        return [item for item in items if item != '']
+
+    def _set_projection(self, columns) -> None:
+        """切換可見欄位：只更新 displaycolumns 與值投影，列模型保持不變"""
+        if isinstance(columns, str):
+            columns = self.tk.splitlist(columns)
+        columns = [str(col) for col in columns]
+
+        if self._model.set_projection(columns):
+            # 結構外的欄位已擴充到結構末尾，實體列需要重新寫入
+            super().configure(columns=self._model.schema)
+            self._pushed.clear()
+            self._schedule_refresh()
+
+        super().configure(displaycolumns=list(columns) or ['#all'])
+
+    def _push_row(self, pool_id: str, item: str, row: Dict[str, Any]) -> None:
+        """把列模型的內容寫入實體列（內容未變時跳過）"""
+        stamp = (item, row['version'])
+        if self._pushed.get(pool_id) == stamp:
+            return
+        super().item(
+            pool_id,
+            text=row['text'],
+            image=row['image'] or '',
+            values=list(row['values']),
+            tags=list(row['tags']),
+        )
+        self._pushed[pool_id] = stamp
+
+    def _schedule_refresh(self) -> None:
+        """排程在閒置時刷新實體列（合併多次結構變更）"""
+        if self._refresh_pending:
+            return
+        self._refresh_pending = True
+        try:
+            self.after_idle(self._refresh)
+        except tk.TclError:
+            self._refresh_pending = False
+
+    def _ensure_window(self) -> None:
+        """如果有待處理的刷新，立即執行以保證實體列與模型一致"""
+        if self._refresh_pending:
+            self._refresh()
+
+    def _visible_rows(self) -> int:
+        """估算可見列數"""
+        try:
+            height = self.winfo_height()
+        except tk.TclError:
+            return self.DEFAULT_VISIBLE_ROWS
+        if height <= 1:
+            return self.DEFAULT_VISIBLE_ROWS
+
+        row_height = self._row_height or self.DEFAULT_ROW_HEIGHT
+        return max(1, (height - self._heading_height) // row_height + 1)
+
+    def _measure_rows(self) -> None:
+        """從實體列測量列高與標題高度"""
+        if self._row_height or not self._pool:
+            return
+        try:
+            box = super().bbox(self._pool[0])
+        except tk.TclError:
+            return
+        if box and box[3] > 0:
+            self._row_height = box[3]
+            self._heading_height = box[1]
+
+    def _refresh(self) -> None:
+        """依目前捲動位置重建實體列窗口，重用既有的實體列"""
+        self._refresh_pending = False
+        try:
+            self._top, start, end = self._model.window(self._top, self._visible_rows(), self._margin)
+            needed = end - start
+
+            # 擴充或縮減實體列池
+            while len(self._pool) < needed:
+                self._pool_counter += 1
+                pool_id = f"{self.POOL_PREFIX}{self._pool_counter}"
+                super().insert('', 'end', iid=pool_id)
+                self._pool.append(pool_id)
+            if len(self._pool) > needed:
+                excess = self._pool[needed:]
+                super().delete(*excess)
+                del self._pool[needed:]
+                for pool_id in excess:
+                    self._pushed.pop(pool_id, None)
+
+            # 重新映射並只更新內容有變的實體列
+            self._pool_to_virtual = {}
+            self._virtual_to_pool = {}
+            for offset, pool_id in enumerate(self._pool):
+                item = self._model.order[start + offset]
+                self._push_row(pool_id, item, self._model.rows[item])
+                self._pool_to_virtual[pool_id] = item
+                self._virtual_to_pool[item] = pool_id
+
+            self._window_start = start
+
+            self._push_selection()
+            if self._virtual_focus in self._virtual_to_pool:
+                super().focus(self._virtual_to_pool[self._virtual_focus])
+
+            if needed:
+                self._measure_rows()
+                super().yview_moveto((self._top - start) / needed)
+
+            self._report_scroll()
+        except tk.TclError as e:
+            self.logger.error(f"刷新虛擬列時出錯: {e}")
+
+    def _physical_selection(self) -> Tuple[str, ...]:
+        """讀取實體列的選取狀態"""
+        return tuple(self.tk.splitlist(self.tk.call(self._w, 'selection')))
+
+    def _push_selection(self) -> None:
+        """把虛擬選取同步到實體列"""
+        physical = tuple(
+            self._virtual_to_pool[iid] for iid in self._virtual_selection
+            if iid in self._virtual_to_pool
+        )
+        if set(physical) != set(self._physical_selection()):
+            self.tk.call(self._w, 'selection', 'set', physical)
+        self._pushed_selection = physical
+
+    def _sync_selection_from_physical(self) -> None:
+        """使用者在實體列上改變了選取時，更新虛擬選取"""
+        physical = self._physical_selection()
+        if set(physical) == set(self._pushed_selection):
+            return
+
+        selected = [self._pool_to_virtual[p] for p in physical if p in self._pool_to_virtual]
+
+        # 只有在先前可見的選取全部保留（延伸選取）時，才保留窗口外的選取
+        kept_visible = all(p in physical for p in self._pushed_selection)
+        if kept_visible:
+            outside = [iid for iid in self._virtual_selection
+                       if iid not in self._virtual_to_pool and iid not in selected]
+            selected = outside + selected
+
+        self._virtual_selection = selected
+        self._pushed_selection = physical
+
+    def _on_physical_scroll(self, first, last) -> None:
+        """實體 Treeview 捲動（滾輪、鍵盤、see）時的回調"""
+        if self._pool and not self._refresh_pending:
+            self._top = self._window_start + int(round(float(first) * len(self._pool)))
+
+            window_end = self._window_start + len(self._pool)
+            visible = self._visible_rows()
+            threshold = self._margin // 2
+            near_top = self._window_start > 0 and self._top - self._window_start < threshold
+            near_bottom = (window_end < len(self._model) and
+                           window_end - (self._top + visible) < threshold)
+            if near_top or near_bottom:
+                self._schedule_refresh()
+
+        self._report_scroll()
+
+    def _report_scroll(self) -> None:
+        """把虛擬捲動位置回報給外部捲軸"""
+        if not self._user_yscrollcommand:
+            return
+        try:
+            first, last = self.yview()
+            if isinstance(self._user_yscrollcommand, str):
+                self.tk.call(self._user_yscrollcommand, first, last)
+            else:
+                self._user_yscrollcommand(first, last)
+        except tk.TclError:
+            pass
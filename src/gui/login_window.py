@@ -11,19 +11,21 @@ from gui.base_dialog import BaseDialog
 from gui.base_window import BaseWindow
 from gui.custom_messagebox import show_info, show_warning, show_error
 from database.db_manager import DatabaseManager
-from database.models import User
-from gui.project_manager import ProjectManager
+from utils.tk_async import resolve_in_tk
 from utils.font_manager import FontManager
 from services.config_manager import ConfigManager
-from gui.alignment_gui import AlignmentGUI
 from gui.components.button_manager import ButtonManager  # 導入按鈕管理器
+from utils.lazy_import import lazy_module
+
+# 資料表定義（SQLAlchemy）在背景執行緒第一次查詢時才載入
+models = lazy_module('database.models')
 
 class LoginWindow(BaseWindow):
     """登入視窗類別"""
 
     def __init__(self, master=None):
         """初始化登入視窗"""
-        super().__init__(title="文本對齊工具 - 登入", width=400, height=300, master=master)
+        super().__init__(title="文本對齊工具 - 登入", width=400, height=320, master=master)
 
         # 確保字型管理器存在
         if not hasattr(self, 'font_manager'):
@@ -32,10 +34,10 @@ class LoginWindow(BaseWindow):
         # 初始化按鈕管理器
         self.button_manager = ButtonManager(self.main_frame)
 
-        # 初始化資料庫連接
-        self.db_manager = DatabaseManager()
-        self.db_session = self.db_manager.get_session()
+        # 初始化資料庫管理器（在背景連接，不阻塞視窗顯示）
+        self.db_manager = DatabaseManager.shared()
         self.current_user = None
+        self._login_pending = False
 
         # 設置記住帳號變數（記得先初始化這個變數）
         self.remember_var = tk.BooleanVar(value=False)
@@ -50,6 +52,9 @@ class LoginWindow(BaseWindow):
         # 載入已保存的帳號
         self.load_saved_username()
 
+        # 在背景連接資料庫並顯示連接狀態
+        self.watch_database_connection()
+
     def apply_font_settings(self):
         """應用字型設定到所有控制項"""
         try:
@@ -198,6 +203,10 @@ class LoginWindow(BaseWindow):
         # 創建按鈕
         self.login_buttons = self.button_manager.create_button_set(inner_button_frame, button_configs)
 
+        # 資料庫連接狀態
+        self.db_status_label = ttk.Label(main_frame, text="", font=("Noto Sans TC", 9))
+        self.db_status_label.pack(pady=(10, 0))
+
         # 設置焦點和綁定 Enter 鍵
         self.username_entry.focus_set()
         self.username_entry.bind("<Return>", lambda e: self.password_entry.focus_set())
@@ -206,6 +215,33 @@ class LoginWindow(BaseWindow):
         # 在初始化時重置所有用戶的登入狀態
         self.reset_all_login_states()
 
+    def watch_database_connection(self):
+        """在背景連接資料庫，連接完成或失敗後更新狀態標籤"""
+        if self.db_manager.is_connected:
+            self._on_database_connected(None)
+            return
+        self.db_status_label.config(text="正在連接資料庫…")
+        resolve_in_tk(self.master, self.db_manager.connect_async(),
+                      self._on_database_connected, self._on_database_failed)
+
+    def _on_database_connected(self, engine):
+        """資料庫連接完成"""
+        backend = {'postgresql': "PostgreSQL", 'sqlite': "本機 SQLite"}.get(self.db_manager.backend,
+                                                                          self.db_manager.backend)
+        self._set_database_status(f"資料庫已連接（{backend}）")
+
+    def _on_database_failed(self, error):
+        """資料庫連接失敗"""
+        self.logger.error(f"資料庫連接失敗: {error}")
+        self._set_database_status("資料庫連接失敗，登入時將重新嘗試")
+
+    def _set_database_status(self, text):
+        """更新資料庫狀態標籤（視窗可能已關閉）"""
+        try:
+            self.db_status_label.config(text=text)
+        except tk.TclError:
+            pass
+
     def load_saved_username(self):
         """載入保存的帳號"""
         try:
@@ -262,27 +298,68 @@ class LoginWindow(BaseWindow):
             self.logger.error(f"保存帳號時出錯: {e}", exc_info=True)
 
     def reset_all_login_states(self):
-        """重置所有用戶的登入狀態"""
-        try:
+        """重置所有用戶的登入狀態（在資料庫背景佇列中執行）"""
+        def reset(session):
             # 查詢所有已登入的用戶
-            logged_in_users = self.db_session.query(User).filter_by(is_logged_in=True).all()
+            logged_in_users = session.query(models.User).filter_by(is_logged_in=True).all()
 
-            if logged_in_users:
-                # 更新所有用戶的登入狀態為 False
-                for user in logged_in_users:
-                    user.is_logged_in = False
-                    self.logger.info(f"重置用戶 {user.username} 的登入狀態")
+            # 更新所有用戶的登入狀態為 False
+            for user in logged_in_users:
+                user.is_logged_in = False
+                self.logger.info(f"重置用戶 {user.username} 的登入狀態")
+            return len(logged_in_users)
+
+        def on_done(count):
+            if count:
+                self.logger.info(f"已重置 {count} 個用戶的登入狀態")
+
+        # 不需要向用戶顯示錯誤，因為這是一個後台操作
+        resolve_in_tk(self.master, self.db_manager.submit(reset), on_done,
+                      lambda e: self.logger.error(f"重置登入狀態時出錯: {e}"))
+
+    @staticmethod
+    def _authenticate(session, username, password):
+        """
+        驗證帳號並更新登入狀態（在資料庫背景執行緒中執行）
+        :param session: 資料庫會話
+        :param username: 使用者名稱
+        :param password: 密碼
+        :return: (狀態, 使用者)，狀態為 invalid、already_logged_in、not_premium、expired 或 ok
+        """
+        logger = logging.getLogger("LoginWindow")
+        # 查詢使用者
+        user = session.query(models.User).filter_by(username=username).first()
+        if not user or not user.check_password(password):
+            return 'invalid', None
+
+        now = datetime.datetime.now()
+        # 檢查用戶是否已經登入
+        if user.is_logged_in:
+            # 檢查最後登入時間，如果超過 8 小時，認為是過時的狀態
+            if not user.last_login or (now - user.last_login).total_seconds() > 28800:  # 8小時
+                # 過時的狀態，允許登入
+                logger.info(f"用戶 {username} 的上次登入狀態可能未正確清除，允許重新登入")
+            else:
+                # 真實的重複登入
+                return 'already_logged_in', user
 
-                # 提交更改
-                self.db_session.commit()
-                self.logger.info(f"已重置 {len(logged_in_users)} 個用戶的登入狀態")
+        # 檢查付費狀態
+        if not getattr(user, 'is_premium', False):
+            return 'not_premium', user
 
-        except Exception as e:
-            self.logger.error(f"重置登入狀態時出錯: {e}")
-            # 不需要向用戶顯示錯誤，因為這是一個後台操作
+        # 檢查付費狀態是否過期
+        if user.premium_end_date and now > user.premium_end_date:
+            user.is_premium = False
+            logger.info(f"用戶 {username} 的付費已過期")
+            return 'expired', user
+
+        # 更新登入狀態和最後登入時間
+        user.is_logged_in = True
+        user.last_login = now
+        return 'ok', user
 
     def login(self):
-        """登入處理"""
+        """登入處理（資料庫查詢在背景執行，完成後回到介面執行緒處理結果）"""
         username = self.username_entry.get().strip()
         password = self.password_entry.get()
 
@@ -290,64 +367,65 @@ class LoginWindow(BaseWindow):
             show_warning("警告", "請輸入使用者名稱和密碼", self.master)
             return
 
+        # 前一次登入尚未完成時忽略重複點擊
+        if self._login_pending:
+            return
+        self._login_pending = True
+
+        # 之前連接失敗時重新連接（佇列中的工作會等待連接完成）
+        if self.db_manager.status == DatabaseManager.STATUS_FAILED:
+            self.watch_database_connection()
+
+        def on_error(e):
+            self._login_pending = False
+            self.logger.error(f"登入時出錯: {e}")
+            show_error("錯誤", f"登入失敗：{str(e)}", self.master)
+
+        future = self.db_manager.submit(self._authenticate, username, password)
+        resolve_in_tk(self.master, future, lambda result: self._on_login_result(username, *result), on_error)
+
+    def _on_login_result(self, username, status, user):
+        """
+        處理登入驗證結果
+        :param username: 使用者名稱
+        :param status: 驗證狀態（見 _authenticate）
+        :param user: 使用者
+        """
+        self._login_pending = False
+        if status == 'invalid':
+            # 登入失敗
+            show_error("錯誤", "使用者名稱或密碼錯誤", self.master)
+            return
+        if status == 'already_logged_in':
+            show_warning("警告", "此帳號已在其他裝置登入中", self.master)
+            return
+        if status == 'not_premium':
+            show_warning("付費提示", "您的帳號尚未付費，請先完成付費後再登入。\n請將款項匯入指定帳戶，並在付款備註填寫您的用戶名稱。", self.master)
+            return
+        if status == 'expired':
+            show_warning("付費提示", "您的付費已過期，請重新付費後再登入。", self.master)
+            return
+
         try:
-            # 查詢使用者
-            user = self.db_session.query(User).filter_by(username=username).first()
-
-            if user and user.check_password(password):
-                # 檢查用戶是否已經登入
-                if user.is_logged_in:
-                    # 檢查最後登入時間，如果超過 8 小時，認為是過時的狀態
-                    now = datetime.datetime.now()
-                    if not user.last_login or (now - user.last_login).total_seconds() > 28800:  # 8小時
-                        # 過時的狀態，允許登入
-                        self.logger.info(f"用戶 {username} 的上次登入狀態可能未正確清除，允許重新登入")
-                    else:
-                        # 真實的重複登入
-                        show_warning("警告", "此帳號已在其他裝置登入中", self.master)
-                        return
-
-                # 檢查付費狀態
-                if not hasattr(user, 'is_premium') or not user.is_premium:
-                    show_warning("付費提示", "您的帳號尚未付費，請先完成付費後再登入。\n請將款項匯入指定帳戶，並在付款備註填寫您的用戶名稱。", self.master)
-                    return
-
-                # 檢查付費狀態是否過期
-                if hasattr(user, 'is_premium') and user.is_premium:
-                    now = datetime.datetime.now()
-                    if user.premium_end_date and now > user.premium_end_date:
-                        user.is_premium = False
-                        self.db_session.commit()
-                        show_warning("付費提示", "您的付費已過期，請重新付費後再登入。", self.master)
-                        self.logger.info(f"用戶 {username} 的付費已過期")
-                        return
-
-                # 保存帳號（在登入成功前先保存）
-                self.save_username(username)
-
-                self.logger.info(f"用戶 {username} 登入成功，記住帳號狀態: {self.remember_var.get()}")
-
-                # 登入成功
-                self.current_user = user
-                # 更新登入狀態和最後登入時間
-                user.is_logged_in = True
-                user.last_login = datetime.datetime.now()
-                self.db_session.commit()
-
-                # 關閉登入視窗
-                self.master.destroy()
-
-                # 開啟專案管理器
-                root = tk.Tk()
-                project_manager = ProjectManager(root, user_id=user.id)
-                # 綁定關閉事件來確保登出狀態更新
-                root.protocol("WM_DELETE_WINDOW", lambda: self.logout_user(user.id, root))
-                # 使用 mainloop 替代 run
-                project_manager.master.mainloop()
+            # 保存帳號
+            self.save_username(username)
 
-            else:
-                # 登入失敗
-                show_error("錯誤", "使用者名稱或密碼錯誤", self.master)
+            self.logger.info(f"用戶 {username} 登入成功，記住帳號狀態: {self.remember_var.get()}")
+
+            # 登入成功
+            self.current_user = user
+
+            # 關閉登入視窗
+            self.master.destroy()
+
+            # 開啟專案管理器
+            from gui.project_manager import ProjectManager
+            root = tk.Tk()
+            project_manager = ProjectManager(root, user_id=user.id)
+            # 綁定關閉事件來確保登出狀態更新
+            root.protocol("WM_DELETE_WINDOW", lambda: self.logout_user(user.id, root))
+            # 使用 mainloop 替代 run
+            project_manager.master.mainloop()
 
         except Exception as e:
             self.logger.error(f"登入時出錯: {e}")
@@ -355,21 +433,16 @@ class LoginWindow(BaseWindow):
 
     def logout_user(self, user_id, root):
         """處理用戶登出"""
-        try:
-            # 創建新的數據庫連接
-            db_manager = DatabaseManager()
-            session = db_manager.get_session()
-
+        def logout(session):
             # 更新用戶登入狀態
-            user = session.query(User).filter_by(id=user_id).first()
+            user = session.query(models.User).filter_by(id=user_id).first()
             if user:
                 user.is_logged_in = False
-                session.commit()
                 self.logger.info(f"用戶 {user.username} 已登出")
 
-            # 關閉資料庫連接
-            db_manager.close_session(session)
-
+        try:
+            # 程式即將結束，等待登出狀態寫入後再關閉視窗
+            self.db_manager.submit(logout).result(timeout=10)
         except Exception as e:
             self.logger.error(f"登出更新失敗: {e}")
         finally:
@@ -410,10 +483,6 @@ class LoginWindow(BaseWindow):
 
     def cleanup(self):
         """清理資源"""
-        # 關閉資料庫連接
-        if hasattr(self, 'db_session'):
-            self.db_manager.close_session(self.db_session)
-
         # 調用父類清理
         super().cleanup()
 class RegisterDialog(BaseDialog):
@@ -439,9 +508,9 @@ class RegisterDialog(BaseDialog):
             from gui.components.button_manager import ButtonManager
             self.button_manager = ButtonManager(self.window)
 
-        # 初始化資料庫連接
-        self.db_manager = DatabaseManager()
-        self.db_session = self.db_manager.get_session()
+        # 使用共用的資料庫管理器
+        self.db_manager = DatabaseManager.shared()
+        self._register_pending = False
 
         # 建立註冊表單
         self.create_register_form()
@@ -679,41 +748,51 @@ class RegisterDialog(BaseDialog):
             show_warning("警告", "兩次輸入的密碼不一致", self.window)
             return
 
-        try:
+        # 前一次註冊尚未完成時忽略重複點擊
+        if self._register_pending:
+            return
+        self._register_pending = True
+
+        def create_user(session):
             # 檢查使用者名稱是否已存在
-            existing_user = self.db_session.query(User).filter_by(username=username).first()
-            if existing_user:
-                show_warning("警告", "使用者名稱已被使用", self.window)
-                return
+            if session.query(models.User).filter_by(username=username).first():
+                return 'username_taken'
 
             # 檢查電子郵件是否已存在
-            existing_email = self.db_session.query(User).filter_by(email=email).first()
-            if existing_email:
-                show_warning("警告", "電子郵件已被使用", self.window)
-                return
+            if session.query(models.User).filter_by(email=email).first():
+                return 'email_taken'
 
-            # 創建新使用者
-            new_user = User(username=username, email=email)
+            # 創建新使用者並添加到資料庫
+            new_user = models.User(username=username, email=email)
             new_user.set_password(password)
+            session.add(new_user)
+            return 'ok'
 
-            # 添加到資料庫
-            self.db_session.add(new_user)
-            self.db_session.commit()
+        def on_done(status):
+            self._register_pending = False
+            if status == 'username_taken':
+                show_warning("警告", "使用者名稱已被使用", self.window)
+                return
+            if status == 'email_taken':
+                show_warning("警告", "電子郵件已被使用", self.window)
+                return
 
             # 註冊成功
             show_info("成功", "註冊成功，請使用新帳號登入", self.window)
             self.result = username
             self.close()
 
-        except Exception as e:
+        def on_error(e):
+            self._register_pending = False
             self.logger.error(f"註冊時出錯: {e}")
             show_error("錯誤", f"註冊失敗：{str(e)}", self.window)
 
+        resolve_in_tk(self.window, self.db_manager.submit(create_user), on_done, on_error)
+
     def cleanup(self):
         """清理資源"""
-        # 關閉資料庫連接
-        if hasattr(self, 'db_session'):
-            self.db_manager.close_session(self.db_session)
+        # 共用的資料庫管理器在程式結束時才關閉
+        pass
 
     def ok(self, event=None):
         """確定按鈕事件"""
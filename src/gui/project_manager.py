@@ -1,17 +1,21 @@
 import logging
 import os
 import sys
+import time
 import tkinter as tk
 from tkinter import ttk
 
 from gui.base_dialog import BaseDialog
 from gui.base_window import BaseWindow
-from gui.correction_tool import CorrectionTool
 from gui.custom_messagebox import show_warning, show_error, ask_question
 from database.db_manager import DatabaseManager
-from database.models import Project, User
 from utils.file_utils import get_current_directory
 from services.file.project_service import ProjectService
+from utils.icon_atlas import get_icon_atlas
+from utils.lazy_import import lazy_module
+
+# 資料表定義（SQLAlchemy）在第一次查詢時才載入
+models = lazy_module('database.models')
 class ProjectInputDialog(BaseDialog):
     def __init__(self, parent=None):
         """初始化專案管理器"""
@@ -102,7 +106,7 @@ class ProjectManager(BaseWindow):
         :param user_id: 使用者 ID (本地版本不使用，但保留參數相容性)
         :param icon_size: 圖示大小，格式為 (寬, 高)
         """
-        super().__init__(title="專案管理", width=400, height=200, master=master)
+        super().__init__(title="專案管理", width=400, height=220, master=master)
 
         # 保存用戶ID用於相容性
         self.user_id = user_id
@@ -196,28 +200,21 @@ class ProjectManager(BaseWindow):
 
     def update_logout_status(self, user_id):
         """更新用戶登出狀態"""
-        try:
-            # 創建新的數據庫連接
-            db_manager = DatabaseManager()
-            session = db_manager.get_session()
-
+        def logout(session):
             # 更新用戶登入狀態
-            user = session.query(User).filter_by(id=user_id).first()
+            user = session.query(models.User).filter_by(id=user_id).first()
             if user:
                 user.is_logged_in = False
-                session.commit()
                 self.logger.info(f"用戶 {user.username} 已登出")
 
-            # 關閉資料庫連接
-            db_manager.close_session(session)
-
+        try:
+            # 視窗即將關閉，等待登出狀態寫入
+            DatabaseManager.shared().submit(logout).result(timeout=10)
         except Exception as e:
             self.logger.error(f"更新登出狀態失敗: {e}")
 
     def load_icons(self):
         """載入所需的圖示"""
-        from PIL import Image, ImageTk
-
         # 取得圖示檔案的目錄路徑 - 更新為assets/icons
         current_dir = os.path.dirname(os.path.abspath(__file__))
         project_root = os.path.dirname(current_dir)
@@ -230,48 +227,33 @@ class ProjectManager(BaseWindow):
                 os.makedirs(icons_dir)
                 self.logger.info(f"已創建圖示目錄: {icons_dir}")
 
-            # 定義圖示檔案的完整路徑
-            add_normal_path = os.path.join(icons_dir, "add_normal.png")
-            add_hover_path = os.path.join(icons_dir, "add_hover.png")
-            delete_normal_path = os.path.join(icons_dir, "delete_normal.png")
-            delete_hover_path = os.path.join(icons_dir, "delete_hover.png")
-
-            # 檢查並載入圖示檔案
-            if os.path.exists(add_normal_path):
-                img = Image.open(add_normal_path)
-                img = img.resize(self.icon_size, Image.Resampling.LANCZOS)
-                self.add_icon = ImageTk.PhotoImage(img)
-                self.logger.debug(f"成功載入圖標: add_normal")
-            else:
-                self.logger.warning(f"找不到新增按鈕圖示: {add_normal_path}")
-                self.add_icon = tk.PhotoImage()
-
-            if os.path.exists(add_hover_path):
-                img = Image.open(add_hover_path)
-                img = img.resize(self.icon_size, Image.Resampling.LANCZOS)
-                self.add_hover_icon = ImageTk.PhotoImage(img)
-                self.logger.debug(f"成功載入圖標: add_hover")
-            else:
-                self.logger.warning(f"找不到新增按鈕懸停圖示: {add_hover_path}")
-                self.add_hover_icon = tk.PhotoImage()
-
-            if os.path.exists(delete_normal_path):
-                img = Image.open(delete_normal_path)
-                img = img.resize(self.icon_size, Image.Resampling.LANCZOS)
-                self.delete_normal_icon = ImageTk.PhotoImage(img)
-                self.logger.debug(f"成功載入圖標: delete_normal")
-            else:
-                self.logger.warning(f"找不到刪除按鈕圖示: {delete_normal_path}")
-                self.delete_normal_icon = tk.PhotoImage()
-
-            if os.path.exists(delete_hover_path):
-                img = Image.open(delete_hover_path)
-                img = img.resize(self.icon_size, Image.Resampling.LANCZOS)
-                self.delete_hover_icon = ImageTk.PhotoImage(img)
-                self.logger.debug(f"成功載入圖標: delete_hover")
-            else:
-                self.logger.warning(f"找不到刪除按鈕圖示: {delete_hover_path}")
-                self.delete_hover_icon = tk.PhotoImage()
+            # 定義圖示檔案：屬性名稱 -> (檔名, 找不到時的警告)
+            icon_files = {
+                'add_icon': ("add_normal.png", "找不到新增按鈕圖示"),
+                'add_hover_icon': ("add_hover.png", "找不到新增按鈕懸停圖示"),
+                'delete_normal_icon': ("delete_normal.png", "找不到刪除按鈕圖示"),
+                'delete_hover_icon': ("delete_hover.png", "找不到刪除按鈕懸停圖示"),
+            }
+
+            # 從圖示圖集一次取得所有圖示，圖集無法使用時才逐一以 PIL 載入
+            size = tuple(self.icon_size)
+            paths = {name: os.path.join(icons_dir, file_name) for name, (file_name, _) in icon_files.items()}
+            atlas_icons = get_icon_atlas().get_icons([(path, size) for path in paths.values()], self.master)
+
+            for name, (file_name, warning) in icon_files.items():
+                path = paths[name]
+                icon = atlas_icons.get((path, size))
+                if icon is None and os.path.exists(path):
+                    from PIL import Image, ImageTk
+                    img = Image.open(path)
+                    img = img.resize(self.icon_size, Image.Resampling.LANCZOS)
+                    icon = ImageTk.PhotoImage(img)
+                if icon is not None:
+                    self.logger.debug(f"成功載入圖標: {os.path.splitext(file_name)[0]}")
+                else:
+                    self.logger.warning(f"{warning}: {path}")
+                    icon = tk.PhotoImage()
+                setattr(self, name, icon)
 
         except Exception as e:
             self.logger.error(f"載入圖示時出錯: {e}")
@@ -327,6 +309,12 @@ class ProjectManager(BaseWindow):
             width=30
         )
         self.project_combobox.pack(fill=tk.X)
+
+        # 專案資訊（字幕數、音頻長度、不匹配數、大小與修改時間）
+        self.project_info_label = ttk.Label(combo_container, text="", font=("Arial", 9))
+        self.project_info_label.pack(fill=tk.X, pady=(4, 0))
+        self.project_combobox.bind('<<ComboboxSelected>>', lambda e: self.update_project_info())
+
         self.update_project_list()
 
         # 綁定按鈕事件
@@ -389,11 +377,41 @@ class ProjectManager(BaseWindow):
             else:
                 self.project_combobox.set('')
 
+            self.update_project_info()
+
         except Exception as e:
             self.logger.error(f"更新專案列表時出錯: {e}")
         finally:
             self.project_combobox.configure(state='readonly')  # 重新啟用
 
+    def update_project_info(self):
+        """顯示目前選擇專案的資訊（來自專案目錄索引，不重新掃描資料夾）"""
+        if not hasattr(self, 'project_info_label'):
+            return
+        selected = self.selected_project.get()
+        info = self.project_service.get_project_info(selected) if selected else None
+        self.project_info_label.configure(text=self.format_project_info(info) if info else "")
+
+    @staticmethod
+    def format_project_info(info) -> str:
+        """
+        格式化專案資訊
+        :param info: ProjectService.get_project_info 回傳的專案資訊
+        :return: 顯示文字
+        """
+        parts = []
+        if info.get('cue_count') is not None:
+            parts.append(f"{info['cue_count']} 句")
+        if info.get('audio_duration_ms') is not None:
+            seconds = info['audio_duration_ms'] // 1000
+            parts.append(f"音頻 {seconds // 60}:{seconds % 60:02d}")
+        if info.get('mismatch_count') is not None:
+            parts.append(f"不匹配 {info['mismatch_count']}")
+        parts.append(f"{info.get('size', 0) / (1024 * 1024):.1f} MB")
+        if info.get('modified'):
+            parts.append(time.strftime("%Y-%m-%d %H:%M", time.localtime(info['modified'])))
+        return " · ".join(parts)
+
     def add_project(self):
         """新增專案"""
         try:
@@ -481,7 +499,8 @@ class ProjectManager(BaseWindow):
             from utils.window_utils import close_window_safely
             close_window_safely(self.master)
 
-            # 創建新的 root 和校正工具
+            # 創建新的 root 和校正工具（校正與對齊介面在此時才載入）
+            from gui.correction_tool import CorrectionTool
             root = tk.Tk()
             correction_tool = CorrectionTool(root, project_path)
             root.mainloop()
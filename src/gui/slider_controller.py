@@ -118,11 +118,9 @@ class TimeSliderController:
             return None
 
         values = self.tree.item(item, "values")
-        all_items = list(self.tree.get_children())
-        item_index = all_items.index(item) if item in all_items else -1
-
-        if item_index == -1:
+        if not self.tree.exists(item):
             return None
+        prev_item, next_item = self._get_neighbours(item)
 
         # 根據顯示模式確定索引位置
         display_mode = self.callbacks.get_display_mode() if hasattr(self.callbacks, 'get_display_mode') else None
@@ -139,14 +137,25 @@ class TimeSliderController:
         return {
             'bbox': bbox,
             'values': values,
-            'all_items': all_items,
-            'item_index': item_index,
+            'item': item,
+            'prev_item': prev_item,
+            'next_item': next_item,
             'index_pos': index_pos,
             'start_pos': start_pos,
             'end_pos': end_pos,
             'column_name': column_name  # 確保包含列名
         }
 
+    def _get_neighbours(self, item):
+        """
+        獲取項目的前一個與後一個項目
+        直接使用樹狀視圖的 prev/next（兩者皆為 O(1)）；時間索引只在 update_srt_data_from_treeview
+        時重建，插入、拆分或合併字幕後可能尚未更新，不能作為相鄰列的依據
+        :param item: 項目 ID
+        :return: (前一個項目 ID, 後一個項目 ID)，不存在時為 None
+        """
+        return self.tree.prev(item) or None, self.tree.next(item) or None
+
     def _parse_time_values(self, column_info):
         """解析時間值"""
         values = column_info['values']
@@ -196,15 +205,15 @@ class TimeSliderController:
             current_value = time_values['end_time']
 
         return {
-            'item': column_info['all_items'][column_info['item_index']],
+            'item': column_info['item'],
             'column_name': column_name,
             'is_adjusting_start': is_adjusting_start,
             'fixed_point': fixed_point,
             'current_value': current_value,
             'item_start_time': time_values['start_time'],
             'item_end_time': time_values['end_time'],
-            'item_index': column_info['item_index'],
-            'all_items': column_info['all_items'],
+            'prev_item': column_info['prev_item'],
+            'next_item': column_info['next_item'],
             'index_pos': column_info['index_pos'],
             'start_pos': column_info['start_pos'],
             'end_pos': column_info['end_pos']
@@ -569,6 +578,7 @@ class TimeSliderController:
 
             # 更新樹視圖值
             self.tree.item(target_item, values=tuple(values))
+            self._notify_boundary_change(target_item, start_time, end_time)
 
             # 更新相鄰項目
             self._update_adjacent_items(target_item, new_value, new_time)
@@ -583,31 +593,40 @@ class TimeSliderController:
         if not self.slider_target:
             return
 
-        item_index = self.slider_target.get("item_index")
         column_name = self.slider_target.get("column_name")
-        all_items = self.slider_target.get("all_items", [])
-
-        if not all_items or item_index is None:
-            return
+        prev_item = self.slider_target.get("prev_item")
+        next_item = self.slider_target.get("next_item")
 
         # 更新相鄰行
-        if column_name == "Start" and item_index > 0:
+        if column_name == "Start" and prev_item:
             # 更新上一行結束時間
-            prev_item = all_items[item_index - 1]
             if self.tree.exists(prev_item):
                 prev_values = list(self.tree.item(prev_item, "values"))
                 if len(prev_values) > self.slider_target["end_pos"]:
                     prev_values[self.slider_target["end_pos"]] = str(new_time)
                     self.tree.item(prev_item, values=tuple(prev_values))
+                    self._notify_boundary_change(prev_item, end_ms=new_value)
 
-        elif column_name == "End" and item_index < len(all_items) - 1:
+        elif column_name == "End" and next_item:
             # 更新下一行開始時間
-            next_item = all_items[item_index + 1]
             if self.tree.exists(next_item):
                 next_values = list(self.tree.item(next_item, "values"))
                 if len(next_values) > self.slider_target["start_pos"]:
                     next_values[self.slider_target["start_pos"]] = str(new_time)
                     self.tree.item(next_item, values=tuple(next_values))
+                    self._notify_boundary_change(next_item, start_ms=new_value)
+
+    def _notify_boundary_change(self, item, start_ms=None, end_ms=None):
+        """通知字幕邊界已移動，讓時間索引增量更新"""
+        if hasattr(self.callbacks, 'on_boundary_change'):
+            try:
+                self.callbacks.on_boundary_change(
+                    item,
+                    int(start_ms) if start_ms is not None else None,
+                    int(end_ms) if end_ms is not None else None
+                )
+            except Exception as e:
+                self.logger.error(f"更新字幕時間索引時出錯: {e}")
 
     def _update_time_label(self, time_range):
         """更新時間標籤"""
@@ -791,8 +810,9 @@ class TimeSliderController:
     def _calculate_slider_range(self, slider_params):
         """計算滑桿範圍"""
         column_name = slider_params['column_name']
-        item_index = slider_params['item_index']
-        all_items = slider_params['all_items']
+        item = slider_params['item']
+        prev_item = slider_params['prev_item']
+        next_item = slider_params['next_item']
         start_pos = slider_params['start_pos']
         end_pos = slider_params['end_pos']
         current_value = slider_params['current_value']
@@ -802,7 +822,7 @@ class TimeSliderController:
 
         if column_name == "Start":
             # 獲取當前項的結束時間作為最大值
-            values = self.tree.item(all_items[item_index], "values")
+            values = self.tree.item(item, "values")
             if len(values) > end_pos:
                 try:
                     end_time = parse_time(values[end_pos])
@@ -813,8 +833,8 @@ class TimeSliderController:
                     max_value = current_value + 10000
 
             # 獲取上一項的結束時間作為最小值（如果有）
-            if item_index > 0:
-                prev_values = self.tree.item(all_items[item_index - 1], "values")
+            if prev_item and self.tree.exists(prev_item):
+                prev_values = self.tree.item(prev_item, "values")
                 if len(prev_values) > end_pos:
                     try:
                         prev_end_time = parse_time(prev_values[end_pos])
@@ -826,7 +846,7 @@ class TimeSliderController:
                         min_value = 0
         else:  # End column
             # 獲取當前項的開始時間作為最小值
-            values = self.tree.item(all_items[item_index], "values")
+            values = self.tree.item(item, "values")
             if len(values) > start_pos:
                 try:
                     start_time = parse_time(values[start_pos])
@@ -837,8 +857,8 @@ class TimeSliderController:
                     min_value = max(0, current_value - 10000)
 
             # 獲取下一項的開始時間作為最大值（如果有）
-            if item_index < len(all_items) - 1:
-                next_values = self.tree.item(all_items[item_index + 1], "values")
+            if next_item and self.tree.exists(next_item):
+                next_values = self.tree.item(next_item, "values")
                 if len(next_values) > start_pos:
                     try:
                         next_start_time = parse_time(next_values[start_pos])
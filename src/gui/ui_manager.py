@@ -205,8 +205,10 @@ class UIManager:
 
     def create_treeview(self):
         """創建樹狀視圖及其管理器"""
-        # 使用 GUIBuilder 創建樹狀視圖和捲軸
-        self.tree, self.tree_scrollbar = self.gui_builder.create_treeview_with_scrollbar(self.result_frame)
+        # 使用 GUIBuilder 創建樹狀視圖和捲軸（虛擬化，只實體化可見範圍內的列）
+        self.tree, self.tree_scrollbar = self.gui_builder.create_treeview_with_scrollbar(
+            self.result_frame, virtual=True
+        )
 
         # 設置樹狀視圖字型
         if self.font_manager:
@@ -164,8 +164,8 @@ class UpdateCheckDialog(BaseDialog):
     def _check_update_thread(self):
         """檢查更新線程"""
         try:
-            # 調用更新管理器檢查更新
-            self.update_manager.check_for_updates(callback=self._update_check_callback)
+            # 調用更新管理器檢查更新（使用者手動檢查，不受連線失敗後的等待時間限制）
+            self.update_manager.check_for_updates(callback=self._update_check_callback, force=True)
         except Exception as e:
             # 在主線程中處理錯誤
             self.window.after(0, lambda: self._show_check_error(str(e)))
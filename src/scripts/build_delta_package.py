@@ -0,0 +1,49 @@
+"""差異更新封包產生腳本
+
+比較兩個版本的程式目錄，產生只包含變更內容的差異封包，與完整更新包一起上傳到同一個發佈。
+封包名稱需符合 <名稱>-delta-<舊版本>-to-<新版本>.zip，UpdateManager 才會找到它。
+
+用法:
+    python src/scripts/build_delta_package.py old_release/ new_release/ 1.2.0 1.3.0 -o dist/
+"""
+
+import argparse
+import os
+import sys
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from services.update.delta_update import build_delta_package, file_sha256  # noqa: E402
+
+
+def main(argv=None) -> int:
+    """
+    命令列入口
+    :param argv: 命令列參數
+    :return: 結束代碼
+    """
+    parser = argparse.ArgumentParser(description="產生差異更新封包")
+    parser.add_argument('old_root', help="舊版本的程式目錄")
+    parser.add_argument('new_root', help="新版本的程式目錄")
+    parser.add_argument('from_version', help="舊版本號")
+    parser.add_argument('to_version', help="新版本號")
+    parser.add_argument('-o', '--output-dir', default='.', help="輸出目錄")
+    parser.add_argument('--name', default='text-alignment-tool', help="封包名稱前綴")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    output_path = os.path.join(args.output_dir,
+                               f"{args.name}-delta-{args.from_version}-to-{args.to_version}.zip")
+    stats = build_delta_package(args.old_root, args.new_root, output_path, args.from_version, args.to_version)
+
+    print(f"已產生 {output_path}（{os.path.getsize(output_path)} 位元組）")
+    print(f"新增 {stats['added']}，差異 {stats['patched']}，整檔取代 {stats['replaced']}，"
+          f"刪除 {stats['deleted']}，未變更 {stats['unchanged']}")
+    print(f"SHA-256: {file_sha256(output_path)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
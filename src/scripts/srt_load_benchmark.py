@@ -0,0 +1,152 @@
+"""SRT 載入基準測試腳本
+
+量測 FileManager.load_srt 的各個階段：以 read_srt 解析為欄位陣列、從專案封裝檔載入快取，
+以及目前仍需要的 to_subrip_file 轉換，並與直接使用 pysrt.open 比較。
+未提供 --file 時產生指定字幕數的測試檔案。載入時間（解析 + 轉換）超出時間預算時結束代碼為 1。
+
+用法:
+    python src/scripts/srt_load_benchmark.py
+    python src/scripts/srt_load_benchmark.py --cues 20000 --runs 7 --budget-ms 400 --json srt_load.json
+    python src/scripts/srt_load_benchmark.py --file projects/demo/demo.srt
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import pysrt  # noqa: E402
+
+from services.file.project_bundle import ProjectBundleStore  # noqa: E402
+from services.file.srt_stream import read_srt  # noqa: E402
+
+# 產生的測試檔案字幕數
+DEFAULT_CUES = 5000
+
+# 解析加上轉換為 SubRipFile 的時間預算（毫秒）
+DEFAULT_BUDGET_MS = 500
+
+
+def generate_srt(path: str, cues: int) -> None:
+    """
+    產生測試用的 SRT 檔案
+    :param path: 輸出路徑
+    :param cues: 字幕數
+    """
+    blocks = []
+    for i in range(cues):
+        start = i * 2000
+        end = start + 1500
+        blocks.append(f"{i + 1}\n{_format_ms(start)} --> {_format_ms(end)}\n"
+                      f"第 {i + 1} 句字幕，用於量測載入時間\n")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(blocks))
+
+
+def _format_ms(ms: int) -> str:
+    """把毫秒格式化為 SRT 時間"""
+    hours, ms = divmod(ms, 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{ms:03d}"
+
+
+def measure(func: Callable[[], object], runs: int) -> List[float]:
+    """
+    重複執行並量測時間
+    :param func: 要量測的函數
+    :param runs: 次數
+    :return: 每次的毫秒數
+    """
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def run_benchmark(srt_path: str, runs: int) -> Dict[str, Dict[str, float]]:
+    """
+    量測各個載入階段
+    :param srt_path: SRT 檔案路徑
+    :param runs: 每個階段的量測次數
+    :return: {階段: {'median_ms', 'min_ms'}}
+    """
+    columns = read_srt(srt_path)
+    stages = {
+        'pysrt_open': lambda: pysrt.open(srt_path),
+        'read_srt': lambda: read_srt(srt_path),
+        'to_subrip_file': lambda: columns.to_subrip_file(srt_path),
+    }
+
+    # 專案封裝檔放在暫存目錄，避免修改來源資料夾
+    with tempfile.TemporaryDirectory() as project_dir:
+        store = ProjectBundleStore(project_dir)
+        store.store_subtitles(srt_path, columns)
+        stages['bundle_load'] = lambda: store.load_subtitles(srt_path)
+
+        results = {}
+        for name, func in stages.items():
+            timings = measure(func, runs)
+            results[name] = {'median_ms': statistics.median(timings), 'min_ms': min(timings)}
+    results['cues'] = len(columns)
+    return results
+
+
+def main(argv=None) -> int:
+    """
+    命令列入口
+    :param argv: 命令列參數
+    :return: 結束代碼，0 表示在預算內
+    """
+    parser = argparse.ArgumentParser(description="量測 SRT 檔案的載入時間")
+    parser.add_argument('--file', help="要量測的 SRT 檔案（預設產生測試檔案）")
+    parser.add_argument('--cues', type=int, default=DEFAULT_CUES, help="產生的測試檔案字幕數")
+    parser.add_argument('--runs', type=int, default=5, help="每個階段的量測次數（取中位數）")
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help="解析加上轉換為 SubRipFile 的時間預算（毫秒）")
+    parser.add_argument('--json', help="把結果寫入 JSON 檔案")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        srt_path = args.file
+        if not srt_path:
+            srt_path = os.path.join(work_dir, "benchmark.srt")
+            generate_srt(srt_path, max(1, args.cues))
+        if not os.path.exists(srt_path):
+            print(f"找不到 SRT 檔案: {srt_path}", file=sys.stderr)
+            return 2
+        results = run_benchmark(srt_path, max(1, args.runs))
+
+    cues = results.pop('cues')
+    load_ms = results['read_srt']['median_ms'] + results['to_subrip_file']['median_ms']
+    print(f"字幕數: {cues}")
+    for name, timing in results.items():
+        print(f"  {name:<16} {timing['median_ms']:8.1f} ms（最快 {timing['min_ms']:.1f} ms）")
+    print(f"load_srt（read_srt + to_subrip_file）: {load_ms:.1f} ms，"
+          f"pysrt.open: {results['pysrt_open']['median_ms']:.1f} ms")
+    print(f"時間預算: {args.budget_ms:.0f} ms")
+
+    over_budget = load_ms > args.budget_ms
+    if over_budget:
+        print(f"超出時間預算 {load_ms - args.budget_ms:.0f} ms")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'cues': cues, 'load_ms': load_ms, 'budget_ms': args.budget_ms, 'stages': results},
+                      f, ensure_ascii=False, indent=2)
+
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
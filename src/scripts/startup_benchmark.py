@@ -0,0 +1,218 @@
+"""啟動時間基準測試腳本
+
+在子程序中以 -X importtime 載入程式入口（不執行 main），量測到登入視窗可以顯示所需的時間，
+並檢查應延遲載入的套件是否在啟動時就被匯入。超出時間預算或有套件提早載入時結束代碼為 1。
+加上 --project 時改為量測以對齊介面開啟只有 SRT 的專案到可互動所需的時間（需要圖形介面）。
+
+用法:
+    python src/scripts/startup_benchmark.py
+    python src/scripts/startup_benchmark.py --runs 10 --budget-ms 1200 --window --json startup.json
+    python src/scripts/startup_benchmark.py --project projects/demo --budget-ms 2500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_PATH = os.path.join(SRC_DIR, "__main__.py")
+
+# 到登入視窗為止的時間預算（毫秒，包含直譯器啟動）
+DEFAULT_BUDGET_MS = 1500
+
+# 顯示登入視窗前不應載入的模組（含子模組）
+DEFERRED_MODULES = (
+    'numpy', 'pydub', 'pygame', 'docx', 'opencc', 'sqlalchemy', 'werkzeug', 'requests', 'PIL',
+    'audio', 'gui.alignment_gui', 'gui.correction_tool', 'gui.project_manager',
+)
+
+# 開啟只有文字的專案時不應建立的子系統所需的模組
+TEXT_PROJECT_DEFERRED_MODULES = (
+    'numpy', 'pydub', 'pygame', 'docx', 'gui.slider_controller', 'audio.audio_player', 'audio.audio_service',
+)
+
+READY_MARKER = "STARTUP_BENCHMARK "
+
+# 在子程序中執行的程式碼：載入入口模組，選擇性建立登入視窗，最後輸出時間點與已載入的延遲模組
+CHILD_CODE = """
+import json, runpy, sys, time
+sys.argv = [{main!r}]
+runpy.run_path({main!r}, run_name='startup_benchmark')
+imported_at = time.time()
+deferred = {deferred!r}
+loaded = sorted(name for name in sys.modules
+                if any(name == prefix or name.startswith(prefix + '.') for prefix in deferred))
+ready_at = imported_at
+if {window!r}:
+    import tkinter as tk
+    from gui.login_window import LoginWindow
+    root = tk.Tk()
+    LoginWindow(master=root)
+    root.update()
+    ready_at = time.time()
+    root.destroy()
+print({marker!r} + json.dumps({{'imported_at': imported_at, 'ready_at': ready_at, 'loaded': loaded}}), flush=True)
+"""
+
+
+# 在子程序中開啟專案：與 ApplicationManager.init_alignment_tool 相同的流程，等到介面回報可互動時間
+PROJECT_CHILD_CODE = """
+import json, os, sys, time
+import tkinter as tk
+from gui.alignment_gui import AlignmentGUI
+from services.file.project_files import find_project_srt
+project_path = {project!r}
+root = tk.Tk()
+app = AlignmentGUI(master=root)
+app.current_project_path = project_path
+app.database_file = os.path.join(project_path, "corrections.csv")
+srt_path = find_project_srt(project_path)
+if srt_path:
+    app.srt_file_path = srt_path
+    app.load_srt(file_path=app.srt_file_path)
+while app.time_to_interactive_ms is None:
+    root.update()
+imported_at = ready_at = time.time()
+deferred = {deferred!r}
+loaded = sorted(name for name in sys.modules
+                if any(name == prefix or name.startswith(prefix + '.') for prefix in deferred))
+report = {{'imported_at': imported_at, 'ready_at': ready_at, 'loaded': loaded,
+          'tti_ms': app.time_to_interactive_ms, 'subsystems': sorted(app._ready_subsystems)}}
+root.destroy()
+print({marker!r} + json.dumps(report), flush=True)
+"""
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """
+    解析 -X importtime 的輸出
+    :param stderr: 子程序的標準錯誤輸出
+    :return: [{'module', 'self_us', 'cumulative_us', 'depth'}]
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            # 標題列
+            continue
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        entries.append({
+            'module': stripped,
+            'self_us': self_us,
+            'cumulative_us': cumulative_us,
+            'depth': (len(name) - len(stripped) - 1) // 2,
+        })
+    return entries
+
+
+def run_once(window: bool = False, project: Optional[str] = None) -> Dict[str, Any]:
+    """
+    執行一次啟動量測
+    :param window: 是否實際建立登入視窗（需要圖形介面）
+    :param project: 專案資料夾，提供時改為量測開啟專案的時間（需要圖形介面）
+    :return: {'import_ms', 'ready_ms', 'loaded', 'imports'}，專案模式另有 'tti_ms' 與 'subsystems'
+    """
+    if project:
+        code = PROJECT_CHILD_CODE.format(project=os.path.abspath(project), deferred=TEXT_PROJECT_DEFERRED_MODULES,
+                                         marker=READY_MARKER)
+    else:
+        code = CHILD_CODE.format(main=MAIN_PATH, deferred=DEFERRED_MODULES, window=window, marker=READY_MARKER)
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [SRC_DIR, env.get('PYTHONPATH')]))
+
+    # 在暫存目錄中執行，避免日誌等檔案寫入工作目錄
+    with tempfile.TemporaryDirectory() as work_dir:
+        started_at = time.time()
+        process = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=work_dir, env=env,
+                                 capture_output=True, text=True, encoding='utf-8', errors='replace')
+
+    report = None
+    for line in process.stdout.splitlines():
+        if line.startswith(READY_MARKER):
+            report = json.loads(line[len(READY_MARKER):])
+    if process.returncode != 0 or report is None:
+        errors = [line for line in process.stderr.splitlines() if not line.startswith("import time:")]
+        raise RuntimeError("啟動量測失敗:\n" + "\n".join(errors[-20:]))
+
+    return {
+        'import_ms': (report['imported_at'] - started_at) * 1000,
+        'ready_ms': (report['ready_at'] - started_at) * 1000,
+        'loaded': report['loaded'],
+        'imports': parse_importtime(process.stderr),
+        'tti_ms': report.get('tti_ms'),
+        'subsystems': report.get('subsystems', []),
+    }
+
+
+def main(argv=None) -> int:
+    """
+    命令列入口
+    :param argv: 命令列參數
+    :return: 結束代碼，0 表示在預算內
+    """
+    parser = argparse.ArgumentParser(description="量測程式啟動到登入視窗的時間")
+    parser.add_argument('--runs', type=int, default=5, help="量測次數（取中位數）")
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS, help="時間預算（毫秒）")
+    parser.add_argument('--window', action='store_true', help="實際建立登入視窗（需要圖形介面）")
+    parser.add_argument('--project', help="改為量測開啟此專案（只使用 SRT）到介面可互動的時間")
+    parser.add_argument('--top', type=int, default=15, help="列出累計時間最長的匯入數量")
+    parser.add_argument('--json', help="把結果寫入 JSON 檔案")
+    args = parser.parse_args(argv)
+
+    runs = []
+    for _ in range(max(1, args.runs)):
+        try:
+            runs.append(run_once(args.window, args.project))
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            return 2
+
+    import_ms = statistics.median(run['import_ms'] for run in runs)
+    ready_ms = statistics.median(run['ready_ms'] for run in runs)
+    loaded = sorted({name for run in runs for name in run['loaded']})
+    slowest = sorted(runs[-1]['imports'], key=lambda entry: entry['cumulative_us'], reverse=True)[:args.top]
+
+    if args.project:
+        tti_ms = statistics.median(run['tti_ms'] for run in runs)
+        subsystems = sorted({name for run in runs for name in run['subsystems']})
+        print(f"開啟專案到可互動（中位數）: {ready_ms:.0f} ms，其中介面建立與載入 {tti_ms:.0f} ms")
+        print("已建立的延遲子系統: " + (", ".join(subsystems) or "無"))
+    else:
+        print(f"匯入完成（中位數）: {import_ms:.0f} ms")
+    if args.window:
+        print(f"登入視窗顯示（中位數）: {ready_ms:.0f} ms")
+    print(f"時間預算: {args.budget_ms:.0f} ms")
+    print("累計時間最長的匯入:")
+    for entry in slowest:
+        print(f"  {entry['cumulative_us'] / 1000:8.1f} ms  {entry['module']}")
+
+    over_budget = ready_ms > args.budget_ms
+    if over_budget:
+        print(f"超出時間預算 {ready_ms - args.budget_ms:.0f} ms")
+    if loaded:
+        print("不應載入的模組: " + ", ".join(loaded))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'import_ms': import_ms, 'ready_ms': ready_ms, 'budget_ms': args.budget_ms,
+                       'runs': [run['ready_ms'] for run in runs], 'deferred_loaded': loaded,
+                       'slowest': slowest}, f, ensure_ascii=False, indent=2)
+
+    return 1 if over_budget or loaded else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,275 @@
+"""批次處理工作模組，在不載入 Tk 的情況下處理單一集數的字幕"""
+
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from services.file.project_files import AUDIO_EXTENSIONS, WORD_EXTENSIONS, aligned_output_path, find_project_srt
+from services.file.srt_stream import SrtColumns, read_srt, render_srt
+from utils.file_utils import atomic_write_bytes
+
+if TYPE_CHECKING:
+    from services.correction.correction_service import CorrectionService
+
+CORRECTIONS_FILENAME = "corrections.csv"
+
+
+def discover_job(folder: str, output: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    從資料夾中找出一組工作檔案（與 AlignmentGUI 開啟專案時相同，取第一個來源 SRT）
+    :param folder: 專案資料夾
+    :param output: 輸出檔案路徑，None 時輸出到同資料夾的 <名稱>.aligned.srt
+    :return: 工作設定，找不到 SRT 時回傳 None
+    """
+    try:
+        names = sorted(os.listdir(folder))
+    except OSError:
+        return None
+
+    def first(extensions):
+        for name in names:
+            if name.lower().endswith(extensions):
+                return os.path.join(folder, name)
+        return None
+
+    srt = find_project_srt(folder)
+    if not srt:
+        return None
+
+    corrections = os.path.join(folder, CORRECTIONS_FILENAME)
+    return {
+        'name': os.path.basename(os.path.normpath(folder)),
+        'srt': srt,
+        'audio': first(AUDIO_EXTENSIONS),
+        'word': first(WORD_EXTENSIONS),
+        'corrections': corrections if os.path.exists(corrections) else None,
+        'output': output or aligned_output_path(srt),
+    }
+
+
+def load_corrections(path: Optional[str]) -> "CorrectionService":
+    """
+    載入校正資料庫（與編輯器使用相同的 CorrectionService）
+    :param path: CSV 路徑，None 時回傳沒有校正規則的服務
+    :return: 校正服務
+    """
+    from services.correction.correction_service import CorrectionService
+    return CorrectionService(path)
+
+
+def apply_corrections(columns: SrtColumns, correction_service: "CorrectionService") -> int:
+    """
+    轉換為繁體中文並套用校正
+    :param columns: 字幕欄位陣列（就地修改）
+    :param correction_service: 校正服務
+    :return: 被修改的字幕數
+    """
+    from utils.text_utils import simplify_to_traditional
+
+    changed = 0
+    texts = columns.texts
+    for i, text in enumerate(texts):
+        _, corrected, _, _ = correction_service.correct_text(simplify_to_traditional(text.strip()))
+        if corrected != text:
+            texts[i] = corrected
+            changed += 1
+    return changed
+
+
+def align_end_times(columns: SrtColumns, audio_duration_ms: Optional[int] = None) -> int:
+    """
+    調整結束時間：每句的結束時間設為下一句的開始時間（與 AlignmentGUI.align_end_times 相同），
+    有音頻長度時最後一句不超過音頻結尾
+    :param columns: 字幕欄位陣列（就地修改）
+    :param audio_duration_ms: 音頻長度（毫秒）
+    :return: 被調整的字幕數
+    """
+    starts = columns.starts
+    ends = columns.ends
+    adjusted = 0
+    for i in range(len(starts) - 1):
+        if ends[i] != starts[i + 1]:
+            ends[i] = starts[i + 1]
+            adjusted += 1
+    if audio_duration_ms is not None and len(ends) and ends[-1] > audio_duration_ms:
+        ends[-1] = max(starts[-1], audio_duration_ms)
+        adjusted += 1
+    return adjusted
+
+
+def compare_with_word(columns: SrtColumns, word_path: str) -> Dict[int, Dict[str, Any]]:
+    """
+    與 Word 文檔比對
+    :param columns: 字幕欄位陣列
+    :param word_path: Word 文檔路徑
+    :return: {字幕位置: 比對結果}
+    """
+    from services.text_processing.word_processor import WordProcessor
+
+    processor = WordProcessor()
+    if not processor.load_document(word_path):
+        raise ValueError(f"無法載入 Word 文檔: {word_path}")
+    return processor.compare_with_srt(list(columns.texts))
+
+
+def probe_audio_duration(audio_path: str) -> int:
+    """
+    讀取音頻長度
+    :param audio_path: 音頻路徑
+    :return: 長度（毫秒）
+    """
+    from pydub import AudioSegment
+    return len(AudioSegment.from_file(audio_path))
+
+
+def run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    處理單一工作：載入 SRT、套用校正、比對 Word、調整結束時間並匯出
+    此函數在工作程序中執行，不丟出例外，失敗資訊記錄在回傳的結果中
+    :param job: 工作設定 {'name', 'srt', 'audio', 'word', 'corrections', 'output'}
+    :return: 工作結果（可序列化為 JSON）
+    """
+    logger = logging.getLogger(__name__)
+    result: Dict[str, Any] = {
+        'name': job.get('name') or os.path.basename(job.get('srt', '')),
+        'srt': job.get('srt'),
+        'output': job.get('output'),
+        'status': 'ok',
+        'timings': {},
+    }
+    timings = result['timings']
+    started = time.perf_counter()
+
+    def timed(stage: str, func, *args):
+        stage_start = time.perf_counter()
+        value = func(*args)
+        timings[stage] = round(time.perf_counter() - stage_start, 4)
+        return value
+
+    try:
+        if not job.get('srt'):
+            raise ValueError("缺少 SRT 檔案")
+        if not job.get('output'):
+            raise ValueError("缺少輸出路徑")
+
+        columns = timed('load_srt', read_srt, job['srt'])
+        result['cues'] = len(columns)
+        result['parse_errors'] = [{'line': e.line, 'message': e.message} for e in columns.errors]
+        if not len(columns):
+            raise ValueError("SRT 檔案沒有有效的字幕")
+
+        correction_service = timed('load_corrections', load_corrections, job.get('corrections'))
+        result['corrected'] = timed('apply_corrections', apply_corrections, columns, correction_service)
+
+        if job.get('word'):
+            comparison = timed('compare_word', compare_with_word, columns, job['word'])
+            result['mismatches'] = sum(1 for item in comparison.values() if not item.get('match', True))
+
+        audio_duration = None
+        if job.get('audio'):
+            audio_duration = timed('probe_audio', probe_audio_duration, job['audio'])
+            result['audio_duration_ms'] = audio_duration
+
+        result['end_times_adjusted'] = timed('align_end_times', align_end_times, columns, audio_duration)
+
+        content = render_srt(columns).encode('utf-8')
+        timed('export', atomic_write_bytes, job['output'], content)
+
+    except Exception as e:
+        logger.error(f"批次工作 {result['name']} 失敗: {e}", exc_info=True)
+        result['status'] = 'failed'
+        result['error'] = f"{type(e).__name__}: {e}"
+
+    result['elapsed'] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def warm_project_cache(folder: str) -> Dict[str, Any]:
+    """
+    預先計算專案的快取（SRT 欄位陣列、Word 段落、繁體轉換、比對結果與解碼音頻），
+    寫入專案封裝檔，讓編輯器開啟專案時直接使用；已有效的快取不會重算
+    此函數在工作程序中執行，不丟出例外，失敗資訊記錄在回傳的結果中
+    :param folder: 專案資料夾
+    :return: 結果（可序列化為 JSON）
+    """
+    from services.file.project_bundle import ProjectBundleStore
+
+    logger = logging.getLogger(__name__)
+    result: Dict[str, Any] = {
+        'name': os.path.basename(os.path.normpath(folder)),
+        'folder': folder,
+        'status': 'ok',
+        'computed': [],
+        'timings': {},
+    }
+    started = time.perf_counter()
+
+    def timed(stage: str, func, *args):
+        stage_start = time.perf_counter()
+        value = func(*args)
+        result['timings'][stage] = round(time.perf_counter() - stage_start, 4)
+        result['computed'].append(stage)
+        return value
+
+    job = discover_job(folder)
+    if not job:
+        result['status'] = 'skipped'
+        return result
+
+    store = ProjectBundleStore(folder)
+    try:
+        columns = store.load_subtitles(job['srt'])
+        if columns is None:
+            columns = timed('srt', read_srt, job['srt'])
+            store.store_subtitles(job['srt'], columns)
+        result['cues'] = len(columns)
+        srt_texts = list(columns.texts)
+
+        if store.load_traditional_texts(srt_texts) is None:
+            from utils.text_utils import simplify_to_traditional
+            traditional = timed('traditional', lambda: [
+                simplify_to_traditional(text.strip()) if text else "" for text in srt_texts])
+            store.store_traditional_texts(srt_texts, traditional)
+
+        if job.get('word'):
+            from services.text_processing.word_processor import WordProcessor
+
+            processor = WordProcessor()
+            paragraphs = store.load_word_paragraphs(job['word'])
+            if paragraphs is None:
+                if not timed('word', processor.load_document, job['word']):
+                    raise ValueError(f"無法載入 Word 文檔: {job['word']}")
+                store.store_word_paragraphs(job['word'], processor.paragraphs)
+            else:
+                processor.load_paragraphs(job['word'], paragraphs)
+
+            key = store.comparison_key(srt_texts, processor.paragraphs)
+            comparison = store.load_comparison(key)
+            if comparison is None:
+                comparison = timed('comparison', processor.compare_with_srt, srt_texts)
+                store.store_comparison(key, comparison)
+            result['mismatches'] = sum(1 for item in comparison.values() if not item.get('match', True))
+
+        if job.get('audio'):
+            info = store.get_audio_info(job['audio'])
+            if info is None:
+                from pydub import AudioSegment
+                audio = timed('audio', AudioSegment.from_file, job['audio'])
+                store.store_audio(job['audio'], audio)
+                result['audio_duration_ms'] = len(audio)
+            else:
+                result['audio_duration_ms'] = info['duration_ms']
+
+    except Exception as e:
+        logger.error(f"預先處理專案 {result['name']} 失敗: {e}", exc_info=True)
+        result['status'] = 'failed'
+        result['error'] = f"{type(e).__name__}: {e}"
+
+    result['elapsed'] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def run_jobs_sequentially(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """依序處理多個工作（單一程序時使用）"""
+    return [run_job(job) for job in jobs]
@@ -0,0 +1,190 @@
+"""批次處理命令列入口，以多個程序平行處理多集字幕並輸出 JSON 報告
+
+用法:
+    python src/__main__.py batch --manifest jobs.json --report report.json
+    python src/__main__.py batch --scan D:/episodes --workers 4
+    python src/__main__.py batch --srt ep01.srt --word ep01.docx --corrections corrections.csv --output ep01.aligned.srt
+
+manifest 為工作清單（或 {"jobs": [...]}），每個工作的欄位為
+name、srt、audio、word、corrections、output，相對路徑以 manifest 所在資料夾為準
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+from services.batch.batch_job import discover_job, run_job
+from services.file.project_files import aligned_output_path
+from utils.file_utils import atomic_write_bytes
+
+JOB_PATH_FIELDS = ('srt', 'audio', 'word', 'corrections', 'output')
+
+
+def load_manifest(path: str) -> List[Dict[str, Any]]:
+    """
+    載入工作清單
+    :param path: manifest JSON 路徑
+    :return: 工作清單（路徑已轉為絕對路徑）
+    """
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        data = json.load(f)
+    jobs = data.get('jobs', []) if isinstance(data, dict) else data
+    if not isinstance(jobs, list):
+        raise ValueError(f"工作清單格式錯誤: {path}")
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    resolved = []
+    for job in jobs:
+        job = dict(job)
+        for field in JOB_PATH_FIELDS:
+            if job.get(field):
+                job[field] = os.path.join(base_dir, job[field])
+        if job.get('srt') and not job.get('output'):
+            job['output'] = aligned_output_path(job['srt'])
+        resolved.append(job)
+    return resolved
+
+
+def scan_jobs(root: str) -> List[Dict[str, Any]]:
+    """
+    掃描資料夾下的每個子資料夾（專案），每個含有 SRT 的專案為一個工作
+    :param root: 根資料夾
+    :return: 工作清單
+    """
+    jobs = []
+    for name in sorted(os.listdir(root)):
+        folder = os.path.join(root, name)
+        if os.path.isdir(folder):
+            job = discover_job(folder)
+            if job:
+                jobs.append(job)
+    return jobs
+
+
+def run_batch(jobs: List[Dict[str, Any]], workers: Optional[int] = None,
+              progress=None) -> Dict[str, Any]:
+    """
+    平行處理工作
+    :param jobs: 工作清單
+    :param workers: 工作程序數量，None 時使用 CPU 數量，1 時在目前程序依序執行
+    :param progress: 每完成一個工作時呼叫的函數，參數為 (已完成數, 總數, 工作結果)
+    :return: 報告
+    """
+    started = time.perf_counter()
+    total = len(jobs)
+    results: List[Optional[Dict[str, Any]]] = [None] * total
+
+    def report_progress(done, result):
+        if progress:
+            progress(done, total, result)
+
+    if workers == 1 or total <= 1:
+        for i, job in enumerate(jobs):
+            results[i] = run_job(job)
+            report_progress(i + 1, results[i])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run_job, job): i for i, job in enumerate(jobs)}
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    # 工作程序異常結束（run_job 本身不會丟出例外）
+                    results[i] = {
+                        'name': jobs[i].get('name') or jobs[i].get('srt'),
+                        'srt': jobs[i].get('srt'),
+                        'output': jobs[i].get('output'),
+                        'status': 'failed',
+                        'error': f"{type(e).__name__}: {e}",
+                        'timings': {},
+                    }
+                report_progress(done, results[i])
+
+    failed = sum(1 for result in results if result['status'] != 'ok')
+    return {
+        'total': total,
+        'succeeded': total - failed,
+        'failed': failed,
+        'elapsed': round(time.perf_counter() - started, 4),
+        'jobs': results,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """建立命令列參數解析器"""
+    parser = argparse.ArgumentParser(prog="python src/__main__.py batch",
+                                     description="批次處理字幕：校正、Word 比對、調整結束時間並匯出")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--manifest', help="工作清單 JSON 檔案")
+    source.add_argument('--scan', help="掃描資料夾下的每個專案子資料夾")
+    source.add_argument('--srt', help="單一工作的 SRT 檔案")
+    parser.add_argument('--audio', help="單一工作的音頻檔案")
+    parser.add_argument('--word', help="單一工作的 Word 文檔")
+    parser.add_argument('--corrections', help="校正資料庫 CSV（--scan 時套用到沒有自己校正檔的專案）")
+    parser.add_argument('--output', help="單一工作的輸出 SRT 檔案")
+    parser.add_argument('--workers', type=int, default=None, help="工作程序數量（預設為 CPU 數量）")
+    parser.add_argument('--report', default='batch_report.json', help="JSON 報告輸出路徑")
+    parser.add_argument('--quiet', action='store_true', help="不顯示進度")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令列入口
+    :param argv: 命令列參數
+    :return: 結束代碼，有任何工作失敗時為 1
+    """
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    try:
+        if args.manifest:
+            jobs = load_manifest(args.manifest)
+        elif args.scan:
+            jobs = scan_jobs(args.scan)
+            if args.corrections:
+                for job in jobs:
+                    job['corrections'] = job.get('corrections') or os.path.abspath(args.corrections)
+        else:
+            jobs = [{
+                'name': os.path.basename(args.srt),
+                'srt': os.path.abspath(args.srt),
+                'audio': args.audio and os.path.abspath(args.audio),
+                'word': args.word and os.path.abspath(args.word),
+                'corrections': args.corrections and os.path.abspath(args.corrections),
+                'output': os.path.abspath(args.output or aligned_output_path(args.srt)),
+            }]
+    except Exception as e:
+        print(f"無法建立工作清單: {e}", file=sys.stderr)
+        return 2
+
+    if not jobs:
+        print("沒有找到要處理的工作", file=sys.stderr)
+        return 2
+
+    def print_progress(done, total, result):
+        if args.quiet:
+            return
+        status = "完成" if result['status'] == 'ok' else f"失敗 ({result.get('error')})"
+        print(f"[{done}/{total}] {result['name']}: {status} {result.get('elapsed', 0):.2f}s",
+              file=sys.stderr)
+
+    report = run_batch(jobs, args.workers, print_progress)
+    atomic_write_bytes(os.path.abspath(args.report),
+                       json.dumps(report, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    if not args.quiet:
+        print(f"共 {report['total']} 個工作，成功 {report['succeeded']}，失敗 {report['failed']}，"
+              f"耗時 {report['elapsed']:.2f}s，報告: {args.report}", file=sys.stderr)
+    return 1 if report['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
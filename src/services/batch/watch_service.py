@@ -0,0 +1,285 @@
+"""監看資料夾服務模組，偵測專案資料夾中新放入的檔案並在背景預先計算專案快取
+
+用法:
+    python src/__main__.py watch
+    python src/__main__.py watch --projects D:/projects --workers 2 --queue 8 --settle 10
+"""
+
+import argparse
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from services.batch.batch_job import CORRECTIONS_FILENAME, warm_project_cache
+from services.file.project_files import ALIGNED_SRT_SUFFIX, AUDIO_EXTENSIONS, WORD_EXTENSIONS
+
+WATCHED_EXTENSIONS = ('.srt',) + AUDIO_EXTENSIONS + WORD_EXTENSIONS
+
+# 專案資料夾的快照：((檔名, 大小, 修改時間), ...)
+FolderSnapshot = Tuple[Tuple[str, int, int], ...]
+
+
+def snapshot_folder(folder: str) -> Optional[FolderSnapshot]:
+    """
+    擷取專案資料夾中輸入檔案的大小與修改時間
+    :param folder: 專案資料夾
+    :return: 快照，資料夾無法讀取時回傳 None
+    """
+    entries = []
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                name = entry.name.lower()
+                if not entry.is_file():
+                    continue
+                if name.endswith(ALIGNED_SRT_SUFFIX):
+                    continue
+                if name.endswith(WATCHED_EXTENSIONS) or name == CORRECTIONS_FILENAME:
+                    stat = entry.stat()
+                    entries.append((entry.name, stat.st_size, stat.st_mtime_ns))
+    except OSError:
+        return None
+    return tuple(sorted(entries))
+
+
+class ProjectWatchService:
+    """
+    監看專案目錄的服務
+    以輪詢方式比對每個專案資料夾的快照；快照持續 settle_seconds 沒有變化（檔案已寫完）才排入佇列，
+    佇列有上限，佇列已滿時該專案留待下一輪再排入；工作程序池負責實際的預先計算
+    """
+
+    def __init__(self, projects_dir: str, workers: int = 2, max_queue: int = 8,
+                 settle_seconds: float = 5.0, poll_interval: float = 2.0,
+                 on_result: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        初始化監看服務
+        :param projects_dir: 專案目錄
+        :param workers: 工作程序數量
+        :param max_queue: 等待處理的專案數上限
+        :param settle_seconds: 檔案需保持不變的秒數，用於避開仍在寫入中的檔案
+        :param poll_interval: 輪詢間隔（秒）
+        :param on_result: 每個專案處理完成後呼叫的函數（在工作執行緒中呼叫）
+        """
+        self.projects_dir = projects_dir
+        self.workers = max(1, int(workers))
+        self.settle_seconds = max(0.0, float(settle_seconds))
+        self.poll_interval = max(0.1, float(poll_interval))
+        self.on_result = on_result
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        self._queue: "queue.Queue[Tuple[str, FolderSnapshot]]" = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._lock = threading.Lock()
+        # 專案名稱 -> (最後看到的快照, 快照最後變化的時間)
+        self._seen: Dict[str, Tuple[FolderSnapshot, float]] = {}
+        # 專案名稱 -> 已處理（或正在處理）的快照
+        self._processed: Dict[str, FolderSnapshot] = {}
+        self._active = set()
+        self._stop_event = threading.Event()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._threads = []
+
+    def start(self, poll: bool = True) -> None:
+        """
+        啟動工作執行緒
+        :param poll: 是否同時啟動輪詢執行緒，False 時由呼叫者自行呼叫 scan
+        """
+        os.makedirs(self.projects_dir, exist_ok=True)
+        self._stop_event.clear()
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"WatchWorker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        if poll:
+            poller = threading.Thread(target=self._poll_loop, name="WatchPoller", daemon=True)
+            poller.start()
+            self._threads.append(poller)
+        self.logger.info(f"開始監看專案目錄: {self.projects_dir}")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        停止服務，正在處理的專案會完成，尚在佇列中的專案會被捨棄（下次啟動時重新偵測）
+        :param timeout: 等待每個執行緒結束的最長秒數
+        """
+        self._stop_event.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+            except queue.Empty:
+                break
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待佇列中的專案全部處理完成
+        :param timeout: 最長等待秒數
+        :return: 是否在時限內完成
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                idle = not self._active and self._queue.empty()
+            if idle:
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+
+    def scan(self, now: Optional[float] = None) -> int:
+        """
+        掃描一次專案目錄，把已穩定且有變化的專案排入佇列
+        :param now: 目前時間（time.monotonic），None 時取目前時間
+        :return: 本次排入佇列的專案數
+        """
+        now = time.monotonic() if now is None else now
+        try:
+            names = [entry.name for entry in os.scandir(self.projects_dir) if entry.is_dir()]
+        except OSError as e:
+            self.logger.error(f"讀取專案目錄時出錯: {e}")
+            return 0
+
+        queued = 0
+        for name in names:
+            snapshot = snapshot_folder(os.path.join(self.projects_dir, name))
+            if not snapshot:
+                continue
+
+            seen = self._seen.get(name)
+            if seen is None or seen[0] != snapshot:
+                # 檔案仍在變化，重新計算靜止時間
+                self._seen[name] = (snapshot, now)
+                if self.settle_seconds > 0:
+                    continue
+            elif now - seen[1] < self.settle_seconds:
+                continue
+
+            with self._lock:
+                if name in self._active or self._processed.get(name) == snapshot:
+                    continue
+                try:
+                    self._queue.put_nowait((name, snapshot))
+                except queue.Full:
+                    # 佇列已滿，留待下一輪
+                    break
+                self._active.add(name)
+                self._processed[name] = snapshot
+            queued += 1
+            self.logger.debug(f"已排入專案: {name}")
+
+        # 移除已刪除的專案
+        for name in set(self._seen) - set(names):
+            self._seen.pop(name, None)
+            with self._lock:
+                self._processed.pop(name, None)
+        return queued
+
+    def _poll_loop(self) -> None:
+        """輪詢執行緒主迴圈"""
+        while not self._stop_event.is_set():
+            try:
+                self.scan()
+            except Exception as e:
+                self.logger.error(f"掃描專案目錄時出錯: {e}", exc_info=True)
+            self._stop_event.wait(self.poll_interval)
+
+    def _work(self) -> None:
+        """工作執行緒主迴圈，把佇列中的專案交給工作程序處理"""
+        while not self._stop_event.is_set():
+            try:
+                name, snapshot = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            folder = os.path.join(self.projects_dir, name)
+            try:
+                result = self._executor.submit(warm_project_cache, folder).result()
+            except Exception as e:
+                result = {'name': name, 'folder': folder, 'status': 'failed',
+                          'error': f"{type(e).__name__}: {e}"}
+            finally:
+                self._queue.task_done()
+
+            # 失敗的專案保留已處理的快照，等檔案下次變化時再重試
+            with self._lock:
+                self._active.discard(name)
+
+            if result.get('status') == 'failed':
+                self.logger.error(f"預先處理專案 {name} 失敗: {result.get('error')}")
+            else:
+                self.logger.info(f"已預先處理專案 {name}: {', '.join(result.get('computed', [])) or '快取已是最新'}")
+            if self.on_result:
+                try:
+                    self.on_result(result)
+                except Exception as e:
+                    self.logger.error(f"處理結果回調時出錯: {e}")
+
+
+def main(argv=None) -> int:
+    """
+    命令列入口
+    :param argv: 命令列參數
+    :return: 結束代碼
+    """
+    parser = argparse.ArgumentParser(prog="python src/__main__.py watch",
+                                     description="監看專案目錄並預先計算專案快取")
+    parser.add_argument('--projects', help="專案目錄（預設為程式目錄下的 projects）")
+    parser.add_argument('--workers', type=int, default=2, help="工作程序數量")
+    parser.add_argument('--queue', type=int, default=8, help="等待處理的專案數上限")
+    parser.add_argument('--settle', type=float, default=5.0, help="檔案需保持不變的秒數")
+    parser.add_argument('--interval', type=float, default=2.0, help="輪詢間隔（秒）")
+    parser.add_argument('--once', action='store_true', help="處理目前所有專案後結束")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    projects_dir = args.projects
+    if not projects_dir:
+        from services.file.project_service import ProjectService
+        projects_dir = ProjectService().projects_dir
+
+    failures = []
+
+    def on_result(result):
+        if result.get('status') == 'failed':
+            failures.append(result)
+
+    if args.once:
+        # 一次性處理時不需要等待檔案穩定
+        args.settle = 0
+
+    service = ProjectWatchService(projects_dir, args.workers, args.queue, args.settle, args.interval,
+                                  on_result=on_result)
+    service.start(poll=not args.once)
+    try:
+        if args.once:
+            # 佇列有上限，需等到全部專案都排入並處理完成
+            while True:
+                service.wait_idle()
+                if not service.scan():
+                    service.wait_idle()
+                    break
+        else:
+            while True:
+                time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,21 +1,53 @@
 """配置管理器模組，負責加載和保存配置"""
 
+import atexit
+import copy
 import json
 import logging
 import os
+import threading
+import time
+import weakref
 from typing import Dict, Any, Optional
 
+from utils.file_utils import atomic_write_bytes
+
+# 最後一次修改後等待多久才寫入檔案（秒）
+DEFAULT_SAVE_DELAY = 1.0
+# 持續修改時，從第一次未保存的修改起最多延遲多久一定寫入（秒）
+DEFAULT_MAX_SAVE_DELAY = 5.0
+
+# 所有配置管理器實例，程式結束時寫入尚未保存的修改
+_instances: "weakref.WeakSet[ConfigManager]" = weakref.WeakSet()
+
 
 class ConfigManager:
-    """配置管理器類，處理配置加載和保存"""
+    """
+    配置管理器類，處理配置加載和保存
+    修改只更新記憶體中的配置並標記為未保存，由背景計時器合併後以原子方式寫入檔案；
+    需要立即寫入時呼叫 flush()
+    """
 
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, save_delay: float = DEFAULT_SAVE_DELAY,
+                 max_save_delay: float = DEFAULT_MAX_SAVE_DELAY):
         """
         初始化配置管理器
         :param config_path: 配置文件路徑，如果為None則使用默認路徑
+        :param save_delay: 最後一次修改後延遲寫入的秒數
+        :param max_save_delay: 持續修改時最長的延遲寫入秒數
         """
         self.logger = logging.getLogger(self.__class__.__name__)
 
+        # 延遲寫入狀態
+        self.save_delay = max(0.0, float(save_delay))
+        self.max_save_delay = max(self.save_delay, float(max_save_delay))
+        self._lock = threading.RLock()
+        # 序列化檔案寫入，避免較舊的快照覆蓋較新的快照
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._dirty_since = 0.0
+        self._save_timer: Optional[threading.Timer] = None
+
         # 設置配置文件路徑
         if config_path:
             self.config_path = config_path
@@ -30,12 +62,19 @@ class ConfigManager:
         # 確保每個配置部分都存在
         self._ensure_config_sections()
 
+        _instances.add(self)
+
     def _load_config(self) -> Dict[str, Any]:
         """
         加載配置文件
         :return: 配置字典
         """
         try:
+            # 同一個配置文件在其他實例中尚未保存的修改先寫入，避免讀到舊的內容
+            for manager in list(_instances):
+                if manager is not self and manager.config_path == self.config_path and manager.is_dirty:
+                    manager.flush()
+
             # 檢查配置文件是否存在
             if os.path.exists(self.config_path):
                 with open(self.config_path, 'r', encoding='utf-8') as f:
@@ -51,22 +90,65 @@ class ConfigManager:
 
     def _save_config(self) -> bool:
         """
-        保存配置到文件
-        :return: 是否成功保存
-        """
-        try:
-            # 確保目錄存在
-            os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-
-            # 寫入配置文件
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, ensure_ascii=False, indent=4)
-
-            self.logger.info(f"已保存配置到: {self.config_path}")
-            return True
-        except Exception as e:
-            self.logger.error(f"保存配置文件時出錯: {e}")
-            return False
+        標記配置為未保存並排程延遲寫入；短時間內的多次修改只會寫入一次
+        :return: 是否成功排程
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not self._dirty:
+                self._dirty = True
+                self._dirty_since = now
+
+            # 持續修改時不再延後，確保最長延遲內一定寫入
+            delay = min(self.save_delay, self._dirty_since + self.max_save_delay - now)
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            self._save_timer = threading.Timer(max(0.0, delay), self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+        return True
+
+    def flush(self) -> bool:
+        """
+        立即把尚未保存的修改寫入配置文件（先寫暫存檔再取代，寫入中斷時原檔案保持完整）
+        在鎖內複製配置的快照後才寫入檔案，寫入期間的修改會排程下一次保存；寫入失敗時重新排程
+        :return: 是否成功保存（沒有未保存的修改時返回 True）
+        """
+        with self._write_lock:
+            with self._lock:
+                if self._save_timer is not None:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                if not self._dirty:
+                    return True
+                snapshot = copy.deepcopy(self.config)
+                self._dirty = False
+
+            try:
+                data = json.dumps(snapshot, ensure_ascii=False, indent=4).encode('utf-8')
+
+                # 確保目錄存在
+                os.makedirs(os.path.dirname(os.path.abspath(self.config_path)), exist_ok=True)
+                atomic_write_bytes(self.config_path, data)
+
+                self.logger.info(f"已保存配置到: {self.config_path}")
+                return True
+            except Exception as e:
+                self.logger.error(f"保存配置文件時出錯: {e}")
+                # 恢復未保存狀態並重新排程，下一次修改或計時器觸發時重試
+                self._save_config()
+                return False
+
+    @property
+    def is_dirty(self) -> bool:
+        """是否有尚未寫入檔案的修改（包括正在寫入中的快照）"""
+        return self._dirty or self._write_lock.locked()
+
+    @staticmethod
+    def flush_all() -> None:
+        """寫入所有配置管理器尚未保存的修改"""
+        for manager in list(_instances):
+            manager.flush()
 
     def _get_default_config(self) -> Dict[str, Any]:
         """
@@ -114,6 +196,11 @@ class ConfigManager:
                 "repo_name": "",
                 "branch": "main",
                 "current_version": "1.0.0"
+            },
+            "diagnostics": {
+                "tracing": False,  # 記錄耗時操作，結束時匯出到 logs/trace_*.json
+                "trace_buffer_size": 20000,
+                "slow_span_ms": 500
             }
         }
 
@@ -220,8 +307,9 @@ class ConfigManager:
         :return: 是否成功設置
         """
         try:
-            self.config[section] = config
-            return self._save_config()
+            with self._lock:
+                self.config[section] = config
+                return self._save_config()
         except Exception as e:
             self.logger.error(f"設置配置區段時出錯: {section}, {e}")
             return False
@@ -235,12 +323,13 @@ class ConfigManager:
         :return: 是否成功設置
         """
         try:
-            # 如果區段不存在，創建它
-            if section not in self.config:
-                self.config[section] = {}
+            with self._lock:
+                # 如果區段不存在，創建它
+                if section not in self.config:
+                    self.config[section] = {}
 
-            self.config[section][option] = value
-            return self._save_config()
+                self.config[section][option] = value
+                return self._save_config()
         except Exception as e:
             self.logger.error(f"設置配置選項時出錯: {section}.{option}, {e}")
             return False
@@ -264,25 +353,26 @@ class ConfigManager:
         :return: 是否成功添加
         """
         try:
-            # 獲取最近項目列表
-            recent_projects = self.config.get("recent_projects", [])
+            with self._lock:
+                # 獲取最近項目列表
+                recent_projects = self.config.get("recent_projects", [])
 
-            # 如果項目已存在，先移除它
-            if project_path in recent_projects:
-                recent_projects.remove(project_path)
+                # 如果項目已存在，先移除它
+                if project_path in recent_projects:
+                    recent_projects.remove(project_path)
 
-            # 將新項目添加到列表頭部
-            recent_projects.insert(0, project_path)
+                # 將新項目添加到列表頭部
+                recent_projects.insert(0, project_path)
 
-            # 限制列表大小
-            if len(recent_projects) > max_size:
-                recent_projects = recent_projects[:max_size]
+                # 限制列表大小
+                if len(recent_projects) > max_size:
+                    recent_projects = recent_projects[:max_size]
 
-            # 更新配置
-            self.config["recent_projects"] = recent_projects
+                # 更新配置
+                self.config["recent_projects"] = recent_projects
 
-            # 保存配置
-            return self._save_config()
+                # 保存配置
+                return self._save_config()
         except Exception as e:
             self.logger.error(f"添加最近項目時出錯: {e}")
             return False
@@ -295,25 +385,26 @@ class ConfigManager:
         :return: 是否成功添加
         """
         try:
-            # 獲取最近文件列表
-            recent_files = self.config.get("recent_files", [])
+            with self._lock:
+                # 獲取最近文件列表
+                recent_files = self.config.get("recent_files", [])
 
-            # 如果文件已存在，先移除它
-            if file_path in recent_files:
-                recent_files.remove(file_path)
+                # 如果文件已存在，先移除它
+                if file_path in recent_files:
+                    recent_files.remove(file_path)
 
-            # 將新文件添加到列表頭部
-            recent_files.insert(0, file_path)
+                # 將新文件添加到列表頭部
+                recent_files.insert(0, file_path)
 
-            # 限制列表大小
-            if len(recent_files) > max_size:
-                recent_files = recent_files[:max_size]
+                # 限制列表大小
+                if len(recent_files) > max_size:
+                    recent_files = recent_files[:max_size]
 
-            # 更新配置
-            self.config["recent_files"] = recent_files
+                # 更新配置
+                self.config["recent_files"] = recent_files
 
-            # 保存配置
-            return self._save_config()
+                # 保存配置
+                return self._save_config()
         except Exception as e:
             self.logger.error(f"添加最近文件時出錯: {e}")
             return False
@@ -443,4 +534,7 @@ class ConfigManager:
         :param version: 版本字符串
         :return: 是否成功設置
         """
-        return self.set_option("update", "current_version", version)
\ No newline at end of file
+        return self.set_option("update", "current_version", version)
+
+
+atexit.register(ConfigManager.flush_all)
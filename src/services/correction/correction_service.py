@@ -341,24 +341,27 @@ class CorrectionService:
         updated_count = self.add_correction(error, correction, apply_to_existing=True)
         return updated_count
 
-    def update_display_status(self, tree_view, display_mode):
+    def update_display_status(self, tree_view, display_mode, tree_manager=None):
         """
-        更新樹視圖中的校正狀態顯示
+        更新樹視圖中的校正狀態顯示，只寫入內容有變化的項目
         :param tree_view: 樹狀視圖控件
         :param display_mode: 當前顯示模式
+        :param tree_manager: TreeView 管理器，提供時使用其批次更新
+        :return: 實際寫入的項目數
         """
         try:
+            # 獲取索引位置
+            if display_mode in ["all", "audio_srt"]:
+                index_pos = 1
+                text_pos = 4
+            else:  # "srt" 或 "srt_word" 模式
+                index_pos = 0
+                text_pos = 3
+
+            updates = {}
             for item in tree_view.get_children():
                 values = list(tree_view.item(item, 'values'))
 
-                # 獲取索引位置
-                if display_mode in ["all", "audio_srt"]:
-                    index_pos = 1
-                    text_pos = 4
-                else:  # "srt" 或 "srt_word" 模式
-                    index_pos = 0
-                    text_pos = 3
-
                 # 確保索引位置有效
                 if len(values) <= index_pos:
                     continue
@@ -377,11 +380,25 @@ class CorrectionService:
                     values[-1] = '❌'
                     if text_pos < len(values):
                         values[text_pos] = self.original_texts.get(index, values[text_pos])
+                else:
+                    continue
+
+                updates[item] = {'values': tuple(values)}
 
-                # 更新樹狀視圖顯示
-                tree_view.item(item, values=tuple(values))
+            # 更新樹狀視圖顯示
+            if tree_manager is not None:
+                return tree_manager.bulk_update(updates)
+
+            writes = 0
+            for item, changes in updates.items():
+                current = tuple(str(v) for v in tree_view.item(item, 'values'))
+                if current != tuple(str(v) for v in changes['values']):
+                    tree_view.item(item, values=changes['values'])
+                    writes += 1
+            return writes
         except Exception as e:
             self.logger.error(f"更新校正狀態顯示時出錯: {e}")
+            return 0
 
     def correct_text(self, text: str, corrections: Optional[Dict[str, str]] = None) -> Tuple[bool, str, str, List]:
         """
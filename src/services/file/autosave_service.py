@@ -0,0 +1,232 @@
+"""自動儲存服務模組，在背景執行緒中合併並寫出字幕的變更"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from services.file.srt_stream import SrtColumns, render_srt
+from utils.file_utils import atomic_write_bytes
+
+# 快照提供者回傳 (目標路徑, SrtColumns 或 SubRipItem 序列)，沒有可儲存的內容時回傳 None
+SnapshotProvider = Callable[[], Optional[Tuple[str, Any]]]
+
+
+class AutosaveService:
+    """
+    自動儲存服務
+    編輯時只標記為已變更，停止編輯一段時間（或距第一次變更超過上限時間）後才在 UI 執行緒擷取快照，
+    序列化、雜湊比對與寫檔都在背景執行緒進行；內容未變時不寫檔，寫檔時先寫暫存檔再原子替換
+    """
+
+    def __init__(self, master, snapshot_provider: SnapshotProvider,
+                 quiet_ms: int = 2000, max_delay_ms: int = 300000,
+                 encoding: str = 'utf-8', enabled: bool = True,
+                 on_saved: Optional[Callable[[str], None]] = None):
+        """
+        初始化自動儲存服務
+        :param master: Tk 元件，用於排程 UI 執行緒上的計時器
+        :param snapshot_provider: 在 UI 執行緒擷取快照的函數
+        :param quiet_ms: 最後一次變更後等待的靜止時間（毫秒）
+        :param max_delay_ms: 第一次變更後最長的等待時間（毫秒），持續編輯時也會在此時間內儲存
+        :param encoding: 輸出編碼
+        :param enabled: 是否啟用
+        :param on_saved: 寫檔完成後在 UI 執行緒呼叫的回調，參數為檔案路徑
+        """
+        self.master = master
+        self.snapshot_provider = snapshot_provider
+        self.quiet_ms = max(0, int(quiet_ms))
+        self.max_delay_ms = max(self.quiet_ms, int(max_delay_ms))
+        self.encoding = encoding
+        self.enabled = enabled
+        self.on_saved = on_saved
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+        # UI 執行緒狀態
+        self._dirty = False
+        self._first_dirty_time = 0.0
+        self._timer_id = None
+
+        # 背景執行緒狀態：只保留最新的快照
+        self._lock = threading.Condition()
+        self._pending: Optional[Tuple[str, Any]] = None
+        self._busy = False
+        self._stopped = False
+        self._digests: Dict[str, str] = {}
+        self.last_error: Optional[Exception] = None
+
+        self._worker = threading.Thread(target=self._run, name="AutosaveWorker", daemon=True)
+        self._worker.start()
+
+    @property
+    def is_dirty(self) -> bool:
+        """是否有尚未擷取快照的變更"""
+        return self._dirty
+
+    def mark_dirty(self) -> None:
+        """標記內容已變更（UI 執行緒呼叫），連續的變更會合併為一次儲存"""
+        if not self.enabled or self._stopped:
+            return
+
+        now = time.monotonic()
+        if not self._dirty:
+            self._dirty = True
+            self._first_dirty_time = now
+
+        # 重新計算靜止時間，但不超過第一次變更後的上限
+        elapsed_ms = (now - self._first_dirty_time) * 1000
+        delay = int(min(self.quiet_ms, max(0, self.max_delay_ms - elapsed_ms)))
+        self._cancel_timer()
+        try:
+            self._timer_id = self.master.after(delay, self._on_timer)
+        except Exception as e:
+            self.logger.error(f"排程自動儲存時出錯: {e}")
+
+    def mark_clean(self, path: Optional[str] = None) -> None:
+        """
+        標記內容已由其他途徑儲存（例如手動匯出），取消待處理的自動儲存
+        :param path: 已儲存的檔案路徑，提供時會重新計算該檔案的雜湊
+        """
+        self._cancel_timer()
+        self._dirty = False
+        if path:
+            with self._lock:
+                self._digests.pop(os.path.abspath(path), None)
+
+    def flush(self, wait: bool = False, timeout: Optional[float] = None) -> bool:
+        """
+        立即擷取快照並交給背景執行緒（UI 執行緒呼叫）
+        :param wait: 是否等待寫檔完成
+        :param timeout: 等待的最長秒數
+        :return: 等待時回傳是否在時限內完成，不等待時固定回傳 True
+        """
+        self._cancel_timer()
+        if self._dirty:
+            self._take_snapshot()
+        if not wait:
+            return True
+        with self._lock:
+            return self._lock.wait_for(lambda: self._pending is None and not self._busy, timeout)
+
+    def stop(self, flush: bool = True, timeout: float = 5.0) -> None:
+        """
+        停止服務
+        :param flush: 停止前是否先寫出尚未儲存的變更
+        :param timeout: 等待背景執行緒結束的最長秒數
+        """
+        if flush and self.enabled:
+            self.flush()
+        self._cancel_timer()
+        with self._lock:
+            self._stopped = True
+            if not flush:
+                self._pending = None
+            self._lock.notify_all()
+        self._worker.join(timeout)
+
+    # ------------------------------------------------------------------
+    # UI 執行緒
+    # ------------------------------------------------------------------
+    def _cancel_timer(self) -> None:
+        """取消已排程的計時器"""
+        if self._timer_id is not None:
+            try:
+                self.master.after_cancel(self._timer_id)
+            except Exception:
+                pass
+            self._timer_id = None
+
+    def _on_timer(self) -> None:
+        """計時器到期：擷取快照"""
+        self._timer_id = None
+        if self._dirty:
+            self._take_snapshot()
+
+    def _take_snapshot(self) -> None:
+        """在 UI 執行緒擷取快照並交給背景執行緒"""
+        self._dirty = False
+        try:
+            snapshot = self.snapshot_provider()
+        except Exception as e:
+            self.logger.error(f"擷取自動儲存快照時出錯: {e}", exc_info=True)
+            return
+        if not snapshot or not snapshot[0]:
+            return
+
+        with self._lock:
+            # 尚未寫出的舊快照直接被新的取代
+            self._pending = snapshot
+            self._lock.notify_all()
+
+    def _notify_saved(self, path: str) -> None:
+        """把寫檔完成的通知轉回 UI 執行緒"""
+        if not self.on_saved:
+            return
+        try:
+            self.master.after(0, lambda: self.on_saved(path))
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # 背景執行緒
+    # ------------------------------------------------------------------
+    def _run(self) -> None:
+        """背景執行緒主迴圈"""
+        while True:
+            with self._lock:
+                self._lock.wait_for(lambda: self._pending is not None or self._stopped)
+                if self._pending is None:
+                    return
+                path, data = self._pending
+                self._pending = None
+                self._busy = True
+
+            try:
+                if self._write_snapshot(path, data):
+                    self._notify_saved(path)
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+                self.logger.error(f"自動儲存 {path} 時出錯: {e}", exc_info=True)
+            finally:
+                with self._lock:
+                    self._busy = False
+                    self._lock.notify_all()
+
+    def _write_snapshot(self, path: str, data: Any) -> bool:
+        """
+        序列化快照並在內容變更時寫檔
+        :return: 是否實際寫入檔案
+        """
+        columns = data if isinstance(data, SrtColumns) else SrtColumns.from_items(data)
+        content = render_srt(columns).encode(self.encoding)
+        digest = hashlib.sha256(content).hexdigest()
+
+        key = os.path.abspath(path)
+        with self._lock:
+            previous = self._digests.get(key)
+        if previous is None:
+            previous = self._file_digest(key)
+
+        if digest == previous:
+            self.logger.debug(f"內容未變更，略過自動儲存: {path}")
+            with self._lock:
+                self._digests[key] = digest
+            return False
+
+        atomic_write_bytes(key, content)
+        with self._lock:
+            self._digests[key] = digest
+        self.logger.info(f"已自動儲存 {len(columns)} 筆字幕到 {path}")
+        return True
+
+    @staticmethod
+    def _file_digest(path: str) -> Optional[str]:
+        """計算現有檔案的雜湊，檔案不存在時回傳 None"""
+        try:
+            with open(path, 'rb') as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
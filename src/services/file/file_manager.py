@@ -8,6 +8,8 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 from typing import Dict, Optional, Tuple, List, Any, Callable, Union
 from gui.custom_messagebox import show_info, show_warning, show_error, ask_question
+from services.file.srt_stream import read_srt, write_srt
+from utils.tracing import traced
 class FileManager:
     """檔案管理類別，負責處理所有檔案相關操作"""
 
@@ -41,6 +43,7 @@ class FileManager:
             'get_corrections': None,         # 獲取校正數據，無參數，返回校正字典
             'get_srt_data': None,            # 獲取當前SRT數據，無參數，返回SRT數據
             'get_tree_data': None,           # 獲取樹視圖數據，無參數，返回樹視圖數據
+            'get_project_bundle': None,      # 獲取專案封裝檔，無參數，返回 ProjectBundleStore 或 None
             'update_tree_data': None,        # 更新樹視圖數據，參數: srt_data, corrections
             'segment_audio': None,           # 分割音頻，參數: srt_data
             'show_info': None,
@@ -68,6 +71,7 @@ class FileManager:
 
     # === SRT 檔案相關功能 ===
 
+    @traced("file.load_srt", category="file")
     def load_srt(self, event: Optional[tk.Event] = None, file_path: Optional[str] = None) -> Optional[pysrt.SubRipFile]:
         """載入 SRT 文件"""
         try:
@@ -87,10 +91,13 @@ class FileManager:
             # 載入 SRT 數據
             try:
                 self.logger.debug(f"嘗試載入檔案: {file_path}")
-                srt_data = pysrt.open(file_path, encoding='utf-8')
-                if not srt_data:
+                columns = self._read_srt_columns(file_path)
+                if not len(columns):
                     raise ValueError("SRT文件為空或格式無效")
-                self.logger.debug(f"成功載入 SRT 檔案，項目數: {len(srt_data)}")
+                for error in columns.errors:
+                    self.logger.warning(f"第 {error.line} 行的字幕區塊格式錯誤，已略過: {error.message}")
+                srt_data = columns.to_subrip_file(file_path)
+                self.logger.debug(f"成功載入 SRT 檔案，項目數: {len(srt_data)}，編碼: {columns.encoding}")
             except Exception as e:
                 self.logger.error(f"讀取 SRT 檔案失敗: {e}")
                 if 'show_error' in self.callbacks and self.callbacks['show_error']:
@@ -123,11 +130,16 @@ class FileManager:
             if 'on_status_updated' in self.callbacks and self.callbacks['on_status_updated']:
                 self.callbacks['on_status_updated'](f"已載入SRT檔案：{os.path.basename(file_path)}")
 
-            # 顯示成功消息
+            # 顯示成功消息（有略過的格式錯誤區塊時一併列出行號）
+            message = f"已成功載入SRT檔案：\n{os.path.basename(file_path)}"
+            if columns.errors:
+                lines = "、".join(str(error.line) for error in columns.errors[:10])
+                more = " 等" if len(columns.errors) > 10 else ""
+                message += f"\n\n已略過 {len(columns.errors)} 個格式錯誤的字幕區塊（第 {lines}{more} 行）"
             if 'show_info' in self.callbacks and self.callbacks['show_info']:
-                self.callbacks['show_info']("成功", f"已成功載入SRT檔案：\n{os.path.basename(file_path)}")
+                self.callbacks['show_info']("成功", message)
             else:
-                messagebox.showinfo("成功", f"已成功載入SRT檔案：\n{os.path.basename(file_path)}", parent=self.parent)
+                messagebox.showinfo("成功", message, parent=self.parent)
 
 
             # 更新所有相關狀態和界面
@@ -168,6 +180,27 @@ class FileManager:
         # 直接調用 export_srt 方法，參數為 False 表示不是從工具列呼叫
         return self.export_srt(from_toolbar=False)
 
+    def _read_srt_columns(self, file_path: str):
+        """
+        讀取 SRT 欄位陣列，優先使用專案封裝檔中仍然有效的快取
+        :param file_path: SRT 檔案路徑
+        :return: SrtColumns
+        """
+        bundle = None
+        if self.callbacks.get('get_project_bundle'):
+            bundle = self.callbacks['get_project_bundle']()
+
+        if bundle is not None:
+            columns = bundle.load_subtitles(file_path)
+            if columns is not None:
+                self.logger.debug(f"從專案封裝檔載入 SRT 快取: {file_path}")
+                return columns
+
+        columns = read_srt(file_path)
+        if bundle is not None and len(columns):
+            bundle.store_subtitles(file_path, columns)
+        return columns
+
     def save_srt_as(self) -> bool:
         """
         另存新檔
@@ -196,7 +229,7 @@ class FileManager:
                 return False
 
             # 保存文件
-            srt_data.save(file_path, encoding='utf-8')
+            write_srt(file_path, srt_data, encoding='utf-8')
 
             # 更新文件路徑
             self.srt_file_path = file_path
@@ -216,6 +249,7 @@ class FileManager:
                 show_error("錯誤", f"另存新檔失敗: {str(e)}", self.parent)
             return False
 
+    @traced("file.export_srt", category="file")
     def export_srt(self, from_toolbar: bool = False) -> bool:
         """
         匯出 SRT 檔案 - 直接覆蓋原始檔案
@@ -257,7 +291,7 @@ class FileManager:
                 return False
 
             # 保存文件
-            srt_data.save(file_path, encoding='utf-8')
+            write_srt(file_path, srt_data, encoding='utf-8')
             self.logger.info(f"已成功覆蓋 SRT 檔案，項目數: {len(srt_data)}")
 
             # 顯示成功訊息
@@ -0,0 +1,631 @@
+"""專案封裝檔模組，把專案的解析結果存成單一可記憶體映射的二進位檔，開啟專案時按需載入"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import time
+from array import array
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from services.file.srt_stream import SrtColumns
+from utils.file_utils import atomic_write_bytes
+
+BUNDLE_FILENAME = "project.tatb"
+# 更新封裝檔時持有的鎖定檔（監看服務與 GUI 可能同時更新同一個封裝檔）
+LOCK_SUFFIX = ".lock"
+LOCK_TIMEOUT = 10.0
+# 超過此秒數的鎖定檔視為持有者已異常結束
+LOCK_STALE_SECONDS = 60.0
+# 解碼後的音頻 PCM 體積大，另存為獨立檔案，避免每次更新封裝檔都要重寫
+AUDIO_CACHE_FILENAME = "audio.pcm"
+
+MAGIC = b'TATBUNDL'
+VERSION = 1
+
+# 檔頭：魔術字、版本、目錄長度
+_HEADER = struct.Struct('<8sII')
+_ALIGNMENT = 8
+
+KIND_JSON = 'json'
+KIND_STRINGS = 'strings'
+KIND_ARRAY = 'array'
+
+
+class BundleFormatError(Exception):
+    """封裝檔格式錯誤"""
+
+
+class BundleLockTimeout(Exception):
+    """等待封裝檔鎖定逾時"""
+
+
+@contextmanager
+def bundle_lock(path: str, timeout: float = LOCK_TIMEOUT) -> Iterator[None]:
+    """
+    以獨佔建立鎖定檔的方式鎖定封裝檔，跨程序（以及共用資料夾上的不同電腦）有效
+    :param path: 封裝檔路徑
+    :param timeout: 最長等待秒數
+    """
+    lock_path = path + LOCK_SUFFIX
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > LOCK_STALE_SECONDS:
+                    os.remove(lock_path)
+                    continue
+            except OSError:
+                continue
+            if time.monotonic() >= deadline:
+                raise BundleLockTimeout(f"等待封裝檔鎖定逾時: {lock_path}")
+            time.sleep(0.05)
+
+    try:
+        os.write(fd, str(os.getpid()).encode('ascii'))
+        os.close(fd)
+        yield
+    finally:
+        try:
+            os.remove(lock_path)
+        except OSError:
+            pass
+
+
+def _pack_strings(strings: Iterable[str]) -> bytes:
+    """把字串列表編碼為 [數量][偏移陣列][UTF-8 資料]"""
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = array('Q', [0])
+    total = 0
+    for data in encoded:
+        total += len(data)
+        offsets.append(total)
+    return struct.pack('<Q', len(encoded)) + offsets.tobytes() + b''.join(encoded)
+
+
+def _unpack_strings(buffer: bytes) -> List[str]:
+    """解碼 _pack_strings 產生的資料"""
+    (count,) = struct.unpack_from('<Q', buffer, 0)
+    offsets = array('Q')
+    offsets.frombytes(buffer[8:8 + (count + 1) * 8])
+    data = buffer[8 + (count + 1) * 8:]
+    return [data[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(count)]
+
+
+def source_signature(path: str) -> Optional[Dict[str, Any]]:
+    """
+    獲取來源檔案的簽章，用於判斷快取是否仍然有效
+    不包含目錄路徑：同一個專案資料夾可能經由不同的掛載路徑（對應磁碟機、UNC 路徑）開啟；
+    修改時間取到毫秒，不同的檔案系統回報的精度不同
+    :param path: 來源檔案路徑
+    :return: {'name', 'size', 'mtime_ms'}，檔案不存在時回傳 None
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return {'name': os.path.basename(path), 'size': stat.st_size, 'mtime_ms': stat.st_mtime_ns // 1_000_000}
+
+
+class ProjectBundle:
+    """
+    唯讀的專案封裝檔
+    開啟時只讀取檔頭與目錄，各區段在第一次存取時才從記憶體映射中解碼
+    """
+
+    def __init__(self, path: str):
+        """
+        開啟封裝檔
+        :param path: 封裝檔路徑
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise BundleFormatError(f"封裝檔為空: {path}")
+
+        try:
+            magic, version, toc_length = _HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise BundleFormatError(f"不是專案封裝檔: {path}")
+            if version != VERSION:
+                raise BundleFormatError(f"不支援的封裝檔版本: {version}")
+            toc = json.loads(self._map[_HEADER.size:_HEADER.size + toc_length].decode('utf-8'))
+        except (struct.error, ValueError) as e:
+            self.close()
+            raise BundleFormatError(f"封裝檔目錄損毀: {e}")
+        except BundleFormatError:
+            self.close()
+            raise
+
+        self.sections: Dict[str, Dict[str, Any]] = toc.get('sections', {})
+        self.sources: Dict[str, Dict[str, Any]] = toc.get('sources', {})
+        self._cache: Dict[str, Any] = {}
+
+    def __enter__(self) -> 'ProjectBundle':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """關閉記憶體映射與檔案"""
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def has(self, name: str) -> bool:
+        """是否包含指定區段"""
+        return name in self.sections
+
+    def raw(self, name: str) -> bytes:
+        """
+        讀取區段的原始位元組
+        :param name: 區段名稱
+        :return: 區段內容
+        """
+        section = self.sections.get(name)
+        if section is None:
+            raise KeyError(name)
+        start = section['offset']
+        end = start + section['length']
+        if end > len(self._map):
+            raise BundleFormatError(f"區段 {name} 超出檔案範圍")
+        return self._map[start:end]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """
+        讀取並解碼區段（結果會快取）
+        :param name: 區段名稱
+        :param default: 區段不存在時的回傳值
+        :return: JSON 物件、字串列表或 array
+        """
+        if name in self._cache:
+            return self._cache[name]
+        section = self.sections.get(name)
+        if section is None:
+            return default
+
+        buffer = self.raw(name)
+        kind = section['kind']
+        if kind == KIND_JSON:
+            value = json.loads(buffer.decode('utf-8'))
+        elif kind == KIND_STRINGS:
+            value = _unpack_strings(buffer)
+        elif kind == KIND_ARRAY:
+            value = array(section['typecode'])
+            value.frombytes(buffer)
+        else:
+            raise BundleFormatError(f"未知的區段類型: {kind}")
+
+        self._cache[name] = value
+        return value
+
+    def is_fresh(self, source: str, path: str) -> bool:
+        """
+        檢查區段對應的來源檔案是否未變更
+        :param source: 來源名稱（例如 'srt'、'word'）
+        :param path: 目前的來源檔案路徑
+        :return: 來源檔名、大小與修改時間都相同時回傳 True
+        """
+        recorded = self.sources.get(source)
+        return bool(recorded) and recorded == source_signature(path)
+
+
+class ProjectBundleWriter:
+    """專案封裝檔寫入器，收集各區段後一次寫出"""
+
+    def __init__(self):
+        self._sections: Dict[str, Tuple[Dict[str, Any], bytes]] = {}
+        self.sources: Dict[str, Dict[str, Any]] = {}
+
+    def add_json(self, name: str, value: Any) -> None:
+        """加入 JSON 區段"""
+        data = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self._sections[name] = ({'kind': KIND_JSON}, data)
+
+    def add_strings(self, name: str, strings: Iterable[str]) -> None:
+        """加入字串表區段"""
+        self._sections[name] = ({'kind': KIND_STRINGS}, _pack_strings(strings))
+
+    def add_array(self, name: str, values: array) -> None:
+        """加入數值陣列區段"""
+        self._sections[name] = ({'kind': KIND_ARRAY, 'typecode': values.typecode}, values.tobytes())
+
+    def add_raw(self, name: str, section: Dict[str, Any], data: bytes) -> None:
+        """加入已編碼的區段（用於保留既有封裝檔的內容）"""
+        info = {key: value for key, value in section.items() if key not in ('offset', 'length')}
+        self._sections[name] = (info, data)
+
+    def remove_prefix(self, prefix: str) -> None:
+        """移除指定前綴的所有區段"""
+        for name in [name for name in self._sections if name.startswith(prefix)]:
+            del self._sections[name]
+
+    def to_bytes(self) -> bytes:
+        """編碼整個封裝檔"""
+        # 目錄中的偏移量取決於目錄本身的長度，先以佔位偏移估算長度再回填
+        names = list(self._sections)
+        toc = {'sections': {}, 'sources': self.sources}
+        for name in names:
+            info, data = self._sections[name]
+            toc['sections'][name] = dict(info, offset=0, length=len(data))
+
+        offsets_width = 20  # 為偏移量的位數預留空間
+        toc_bytes = json.dumps(toc, ensure_ascii=False).encode('utf-8')
+        base = _HEADER.size + len(toc_bytes) + offsets_width * len(names)
+        position = base + (-base) % _ALIGNMENT
+
+        for name in names:
+            toc['sections'][name]['offset'] = position
+            length = toc['sections'][name]['length']
+            position += length + (-length) % _ALIGNMENT
+
+        toc_bytes = json.dumps(toc, ensure_ascii=False).encode('utf-8')
+        toc_bytes += b' ' * (base - _HEADER.size - len(toc_bytes))
+
+        chunks = [_HEADER.pack(MAGIC, VERSION, len(toc_bytes)), toc_bytes]
+        chunks.append(b'\0' * ((-base) % _ALIGNMENT))
+        for name in names:
+            data = self._sections[name][1]
+            chunks.append(data)
+            chunks.append(b'\0' * ((-len(data)) % _ALIGNMENT))
+        return b''.join(chunks)
+
+    def write(self, path: str) -> None:
+        """以原子方式寫出封裝檔"""
+        atomic_write_bytes(path, self.to_bytes())
+
+
+class ProjectBundleStore:
+    """
+    專案目錄中的封裝檔存取服務
+    快取 SRT 解析結果、Word 段落、繁體轉換、解碼音頻與比對結果；每個區段都記錄來源檔案的簽章或輸入的雜湊，
+    來源變更後快取自動失效。
+    封裝檔只在每次讀取期間映射（讀出的資料都是複本），不會長時間佔用檔案，
+    其他程序（例如監看服務）可以隨時以 os.replace 取代它；更新時持有鎖定檔，避免同時更新互相覆蓋
+    """
+
+    def __init__(self, project_path: str):
+        """
+        初始化封裝檔存取服務
+        :param project_path: 專案目錄
+        """
+        self.project_path = project_path
+        self.path = os.path.join(project_path, BUNDLE_FILENAME)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @contextmanager
+    def _open(self) -> Iterator[Optional[ProjectBundle]]:
+        """開啟封裝檔，離開時關閉；不存在或損毀時提供 None"""
+        bundle = None
+        if os.path.exists(self.path):
+            try:
+                bundle = ProjectBundle(self.path)
+            except (OSError, BundleFormatError) as e:
+                self.logger.warning(f"無法讀取專案封裝檔，將重新建立: {e}")
+        try:
+            yield bundle
+        finally:
+            if bundle is not None:
+                bundle.close()
+
+    def _update(self, prefix: str, source: Optional[str], source_path: Optional[str],
+                writer_callback) -> None:
+        """
+        以新的區段取代指定前綴的區段，其他區段原樣保留
+        :param prefix: 區段名稱前綴
+        :param source: 來源名稱，None 表示不記錄來源
+        :param source_path: 來源檔案路徑
+        :param writer_callback: 接收 ProjectBundleWriter 並加入新區段的函數
+        """
+        try:
+            os.makedirs(self.project_path, exist_ok=True)
+            with bundle_lock(self.path):
+                writer = ProjectBundleWriter()
+                with self._open() as bundle:
+                    if bundle is not None:
+                        for name, section in bundle.sections.items():
+                            if not name.startswith(prefix):
+                                writer.add_raw(name, section, bundle.raw(name))
+                        writer.sources.update(bundle.sources)
+
+                writer.remove_prefix(prefix)
+                writer_callback(writer)
+                if source:
+                    signature = source_signature(source_path) if source_path else None
+                    if signature:
+                        writer.sources[source] = signature
+                    else:
+                        writer.sources.pop(source, None)
+
+                writer.write(self.path)
+        except (OSError, BundleLockTimeout) as e:
+            self.logger.error(f"寫入專案封裝檔失敗: {e}")
+
+    # ------------------------------------------------------------------
+    # 字幕
+    # ------------------------------------------------------------------
+    def load_subtitles(self, srt_path: str) -> Optional[SrtColumns]:
+        """
+        讀取快取的 SRT 欄位陣列
+        :param srt_path: SRT 檔案路徑
+        :return: 欄位陣列，快取不存在或來源已變更時回傳 None
+        """
+        with self._open() as bundle:
+            if bundle is None or not bundle.has('subtitles.meta') or not bundle.is_fresh('srt', srt_path):
+                return None
+
+            try:
+                meta = bundle.get('subtitles.meta')
+                columns = SrtColumns(encoding=meta['encoding'], eol=meta['eol'])
+                columns.indices = bundle.get('subtitles.indices')
+                if meta.get('int_indices'):
+                    columns.indices = list(columns.indices)
+                columns.starts = bundle.get('subtitles.starts')
+                columns.ends = bundle.get('subtitles.ends')
+                columns.texts = bundle.get('subtitles.texts')
+                columns.positions = bundle.get('subtitles.positions')
+            except (KeyError, BundleFormatError, ValueError) as e:
+                self.logger.warning(f"專案封裝檔的字幕區段無效: {e}")
+                return None
+
+        if not (len(columns.indices) == len(columns.starts) == len(columns.ends) ==
+                len(columns.texts) == len(columns.positions)):
+            self.logger.warning("專案封裝檔的字幕區段長度不一致")
+            return None
+        return columns
+
+    def store_subtitles(self, srt_path: str, columns: SrtColumns) -> None:
+        """
+        快取 SRT 欄位陣列
+        :param srt_path: SRT 檔案路徑
+        :param columns: 從該檔案解析出的欄位陣列
+        """
+        int_indices = all(isinstance(index, int) for index in columns.indices)
+
+        def add_sections(writer: ProjectBundleWriter) -> None:
+            writer.add_json('subtitles.meta', {
+                'encoding': columns.encoding,
+                'eol': columns.eol,
+                'count': len(columns),
+                'int_indices': int_indices,
+            })
+            if int_indices:
+                writer.add_array('subtitles.indices', array('q', columns.indices))
+            else:
+                writer.add_json('subtitles.indices', columns.indices)
+            writer.add_array('subtitles.starts', array('q', columns.starts))
+            writer.add_array('subtitles.ends', array('q', columns.ends))
+            writer.add_strings('subtitles.texts', columns.texts)
+            writer.add_strings('subtitles.positions', columns.positions)
+
+        self._update('subtitles.', 'srt', srt_path, add_sections)
+
+    # ------------------------------------------------------------------
+    # Word 段落
+    # ------------------------------------------------------------------
+    def load_word_paragraphs(self, docx_path: str) -> Optional[List[str]]:
+        """
+        讀取快取的 Word 段落
+        :param docx_path: Word 文檔路徑
+        :return: 段落列表，快取不存在或來源已變更時回傳 None
+        """
+        with self._open() as bundle:
+            if bundle is None or not bundle.has('word.paragraphs') or not bundle.is_fresh('word', docx_path):
+                return None
+            try:
+                return list(bundle.get('word.paragraphs'))
+            except BundleFormatError as e:
+                self.logger.warning(f"專案封裝檔的 Word 區段無效: {e}")
+                return None
+
+    def store_word_paragraphs(self, docx_path: str, paragraphs: List[str]) -> None:
+        """
+        快取 Word 段落
+        :param docx_path: Word 文檔路徑
+        :param paragraphs: 解析後的段落
+        """
+        self._update('word.', 'word', docx_path,
+                     lambda writer: writer.add_strings('word.paragraphs', paragraphs))
+
+    # ------------------------------------------------------------------
+    # 繁體轉換
+    # ------------------------------------------------------------------
+    @staticmethod
+    def texts_key(texts: List[str]) -> str:
+        """
+        計算文本列表的雜湊
+        :param texts: 文本列表
+        :return: 雜湊字串
+        """
+        digest = hashlib.sha256()
+        for text in texts:
+            digest.update(text.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def load_traditional_texts(self, srt_texts: List[str]) -> Optional[List[str]]:
+        """
+        讀取預先轉換的繁體文本
+        :param srt_texts: SRT 原始文本列表
+        :return: 與 srt_texts 一一對應的 simplify_to_traditional(text.strip()) 結果，輸入不同時回傳 None
+        """
+        with self._open() as bundle:
+            if bundle is None or not bundle.has('prepass.meta'):
+                return None
+            try:
+                meta = bundle.get('prepass.meta')
+                if meta.get('key') != self.texts_key(srt_texts):
+                    return None
+                texts = bundle.get('prepass.traditional')
+            except (KeyError, BundleFormatError, ValueError):
+                return None
+            return list(texts) if len(texts) == len(srt_texts) else None
+
+    def store_traditional_texts(self, srt_texts: List[str], traditional: List[str]) -> None:
+        """
+        快取繁體轉換結果
+        :param srt_texts: SRT 原始文本列表
+        :param traditional: 對應的繁體文本
+        """
+        def add_sections(writer: ProjectBundleWriter) -> None:
+            writer.add_json('prepass.meta', {'key': self.texts_key(srt_texts)})
+            writer.add_strings('prepass.traditional', traditional)
+
+        self._update('prepass.', None, None, add_sections)
+
+    # ------------------------------------------------------------------
+    # 音頻
+    # ------------------------------------------------------------------
+    def get_audio_info(self, audio_path: str) -> Optional[Dict[str, Any]]:
+        """
+        獲取快取的音頻資訊
+        :param audio_path: 音頻檔案路徑
+        :return: {'frame_rate', 'channels', 'sample_width', 'duration_ms', 'size'}，快取無效時回傳 None
+        """
+        with self._open() as bundle:
+            if bundle is None or not bundle.has('audio.meta') or not bundle.is_fresh('audio', audio_path):
+                return None
+            try:
+                info = bundle.get('audio.meta')
+            except (BundleFormatError, ValueError):
+                return None
+        try:
+            if os.path.getsize(os.path.join(self.project_path, AUDIO_CACHE_FILENAME)) != info['size']:
+                return None
+        except (OSError, KeyError):
+            return None
+        return info
+
+    def load_audio(self, audio_path: str):
+        """
+        讀取快取的解碼音頻，不需要重新經過 ffmpeg 解碼
+        :param audio_path: 音頻檔案路徑
+        :return: AudioSegment，快取不存在或來源已變更時回傳 None
+        """
+        info = self.get_audio_info(audio_path)
+        if info is None:
+            return None
+
+        from pydub import AudioSegment
+        try:
+            with open(os.path.join(self.project_path, AUDIO_CACHE_FILENAME), 'rb') as f:
+                data = f.read()
+            return AudioSegment(data=data, sample_width=info['sample_width'],
+                                frame_rate=info['frame_rate'], channels=info['channels'])
+        except (OSError, KeyError, ValueError) as e:
+            self.logger.warning(f"無法讀取音頻快取: {e}")
+            return None
+
+    def store_audio(self, audio_path: str, audio) -> None:
+        """
+        快取解碼後的音頻
+        :param audio_path: 音頻檔案路徑
+        :param audio: 從該檔案解碼出的 AudioSegment
+        """
+        data = audio.raw_data
+        try:
+            os.makedirs(self.project_path, exist_ok=True)
+            atomic_write_bytes(os.path.join(self.project_path, AUDIO_CACHE_FILENAME), data)
+        except OSError as e:
+            self.logger.error(f"寫入音頻快取失敗: {e}")
+            return
+
+        self._update('audio.', 'audio', audio_path, lambda writer: writer.add_json('audio.meta', {
+            'frame_rate': audio.frame_rate,
+            'channels': audio.channels,
+            'sample_width': audio.sample_width,
+            'duration_ms': len(audio),
+            'size': len(data),
+        }))
+
+    # ------------------------------------------------------------------
+    # 比對結果
+    # ------------------------------------------------------------------
+    @staticmethod
+    def comparison_key(srt_texts: List[str], paragraphs: List[str]) -> str:
+        """
+        計算比對輸入的雜湊，輸入相同時比對結果也相同
+        :param srt_texts: SRT 文本列表
+        :param paragraphs: Word 段落列表
+        :return: 雜湊字串
+        """
+        digest = hashlib.sha256()
+        for text in srt_texts:
+            digest.update(text.encode('utf-8'))
+            digest.update(b'\0')
+        digest.update(b'\1')
+        for paragraph in paragraphs:
+            digest.update(paragraph.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def load_comparison(self, key: str) -> Optional[Dict[int, Dict[str, Any]]]:
+        """
+        讀取快取的比對結果
+        :param key: comparison_key 計算的雜湊
+        :return: {字幕位置: 比對結果}，輸入不同時回傳 None
+        """
+        with self._open() as bundle:
+            if bundle is None or not bundle.has('comparison.results'):
+                return None
+            try:
+                cached = bundle.get('comparison.results')
+            except (BundleFormatError, ValueError):
+                return None
+            if cached.get('key') != key:
+                return None
+            return {int(position): result for position, result in cached.get('results', {}).items()}
+
+    def store_comparison(self, key: str, results: Dict[int, Dict[str, Any]]) -> None:
+        """
+        快取比對結果
+        :param key: comparison_key 計算的雜湊
+        :param results: {字幕位置: 比對結果}
+        """
+        self._update('comparison.', None, None, lambda writer: writer.add_json(
+            'comparison.results', {'key': key, 'results': {str(k): v for k, v in results.items()}}))
+
+    # ------------------------------------------------------------------
+    # 摘要
+    # ------------------------------------------------------------------
+    def summarize(self, srt_path: Optional[str] = None, docx_path: Optional[str] = None,
+                  audio_path: Optional[str] = None) -> Dict[str, Optional[int]]:
+        """
+        從仍然有效的快取中取得專案摘要，不解析任何來源檔案
+        :param srt_path: SRT 檔案路徑
+        :param docx_path: Word 文檔路徑
+        :param audio_path: 音頻檔案路徑
+        :return: {'cue_count', 'audio_duration_ms', 'mismatch_count'}，沒有快取的項目為 None
+        """
+        summary: Dict[str, Optional[int]] = {'cue_count': None, 'audio_duration_ms': None, 'mismatch_count': None}
+
+        columns = self.load_subtitles(srt_path) if srt_path else None
+        if columns is not None:
+            summary['cue_count'] = len(columns)
+
+        if audio_path:
+            info = self.get_audio_info(audio_path)
+            if info is not None:
+                summary['audio_duration_ms'] = info.get('duration_ms')
+
+        if columns is not None and docx_path:
+            paragraphs = self.load_word_paragraphs(docx_path)
+            if paragraphs is not None:
+                comparison = self.load_comparison(self.comparison_key(list(columns.texts), paragraphs))
+                if comparison is not None:
+                    summary['mismatch_count'] = sum(
+                        1 for result in comparison.values() if not result.get('match', True))
+        return summary
@@ -0,0 +1,218 @@
+"""專案目錄索引模組，保存每個專案的摘要資訊，重新整理時只重新掃描有變動的專案"""
+
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from services.file.project_bundle import ProjectBundleStore
+from services.file.project_files import AUDIO_EXTENSIONS, WORD_EXTENSIONS, is_source_srt
+from services.file.srt_stream import read_srt
+from utils.file_utils import atomic_write_bytes
+
+CATALOG_FILENAME = ".catalog.json"
+CATALOG_VERSION = 2
+
+SORT_KEYS = ('name', 'modified', 'size', 'cue_count', 'audio_duration_ms', 'mismatch_count')
+
+
+class ProjectCatalog:
+    """
+    專案目錄索引
+    每個專案記錄資料夾的修改時間，資料夾修改時間未變的專案直接沿用索引中的資料，不進入資料夾；
+    專案目錄本身的修改時間未變時（沒有新增、刪除或改名的專案）也不重新列出專案目錄
+    """
+
+    def __init__(self, projects_dir: str, path: Optional[str] = None):
+        """
+        初始化專案目錄索引
+        :param projects_dir: 專案目錄
+        :param path: 索引檔案路徑，None 時存放在專案目錄中
+        """
+        self.projects_dir = projects_dir
+        self.path = path or os.path.join(projects_dir, CATALOG_FILENAME)
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        # 上次列出專案目錄時的修改時間
+        self._dir_mtime_ns: Optional[int] = None
+        self._load()
+
+    def _load(self) -> None:
+        """載入索引檔案，檔案不存在或版本不符時從空索引開始"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get('version') == CATALOG_VERSION:
+            self._entries = {entry['name']: entry for entry in data.get('projects', []) if 'name' in entry}
+            self._dir_mtime_ns = data.get('dir_mtime_ns')
+
+    def _save(self) -> None:
+        """寫出索引檔案"""
+        data = {'version': CATALOG_VERSION, 'dir_mtime_ns': self._dir_mtime_ns,
+                'projects': list(self._entries.values())}
+        try:
+            atomic_write_bytes(self.path, json.dumps(data, ensure_ascii=False).encode('utf-8'))
+        except OSError as e:
+            self.logger.error(f"寫入專案索引失敗: {e}")
+
+    def refresh(self, full: bool = False) -> List[Dict[str, Any]]:
+        """
+        重新整理索引
+        :param full: 是否重新掃描所有專案（資料夾中的檔案被原地覆寫時資料夾修改時間不會改變）
+        :return: 依名稱排序的專案資訊列表
+        """
+        with self._lock:
+            try:
+                dir_mtime_ns = os.stat(self.projects_dir).st_mtime_ns
+                if full or dir_mtime_ns != self._dir_mtime_ns:
+                    projects = [(entry.name, entry.path) for entry in os.scandir(self.projects_dir)
+                                if entry.is_dir()]
+                else:
+                    # 專案目錄沒有變動，只需檢查已知專案的資料夾
+                    projects = [(name, os.path.join(self.projects_dir, name)) for name in self._entries]
+            except OSError as e:
+                self.logger.error(f"讀取專案目錄時出錯: {e}")
+                return self.query()
+
+            # 索引檔案存放在專案目錄中，寫出索引也會改變目錄的修改時間，下次只會多列出一次目錄
+            self._dir_mtime_ns = dir_mtime_ns
+            seen = set()
+            changed = False
+            for name, path in projects:
+                try:
+                    project_mtime_ns = os.stat(path).st_mtime_ns
+                except OSError:
+                    continue
+                seen.add(name)
+                cached = self._entries.get(name)
+                if not full and cached and cached.get('dir_mtime_ns') == project_mtime_ns:
+                    continue
+                self._entries[name] = self._scan_project(name, path, project_mtime_ns)
+                changed = True
+
+            for name in set(self._entries) - seen:
+                del self._entries[name]
+                changed = True
+
+            if changed:
+                self._save()
+            return self.query()
+
+    def update_project(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        立即重新掃描單一專案
+        :param name: 專案名稱
+        :return: 專案資訊，專案不存在時回傳 None
+        """
+        project_path = os.path.join(self.projects_dir, name)
+        with self._lock:
+            try:
+                dir_mtime_ns = os.stat(project_path).st_mtime_ns
+            except OSError:
+                if self._entries.pop(name, None) is not None:
+                    self._save()
+                return None
+            self._entries[name] = self._scan_project(name, project_path, dir_mtime_ns)
+            self._save()
+            return dict(self._entries[name])
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        獲取專案資訊（不重新掃描）
+        :param name: 專案名稱
+        :return: 專案資訊，不在索引中時回傳 None
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            return dict(entry) if entry else None
+
+    def query(self, text: str = '', sort_key: str = 'name', reverse: bool = False,
+              predicate: Optional[Callable[[Dict[str, Any]], bool]] = None) -> List[Dict[str, Any]]:
+        """
+        篩選並排序索引中的專案（不重新掃描）
+        :param text: 專案名稱需包含的文字（不分大小寫）
+        :param sort_key: 排序欄位，見 SORT_KEYS
+        :param reverse: 是否反向排序
+        :param predicate: 額外的篩選函數
+        :return: 專案資訊列表，排序欄位沒有值的專案排在最後
+        """
+        if sort_key not in SORT_KEYS:
+            raise ValueError(f"不支援的排序欄位: {sort_key}")
+        needle = text.lower()
+        with self._lock:
+            entries = [dict(entry) for entry in self._entries.values()
+                       if needle in entry['name'].lower() and (predicate is None or predicate(entry))]
+
+        # 先依名稱排序，排序欄位相同的專案（穩定排序）維持名稱順序
+        entries.sort(key=lambda entry: entry['name'])
+        present = [entry for entry in entries if entry.get(sort_key) is not None]
+        missing = [entry for entry in entries if entry.get(sort_key) is None]
+        if sort_key != 'name':
+            present.sort(key=lambda entry: entry[sort_key], reverse=reverse)
+        elif reverse:
+            present.reverse()
+        return present + missing
+
+    def _scan_project(self, name: str, project_path: str, dir_mtime_ns: int) -> Dict[str, Any]:
+        """
+        掃描單一專案資料夾
+        :param name: 專案名稱
+        :param project_path: 專案資料夾
+        :param dir_mtime_ns: 資料夾修改時間
+        :return: 專案資訊
+        """
+        entry: Dict[str, Any] = {
+            'name': name,
+            'dir_mtime_ns': dir_mtime_ns,
+            'modified': dir_mtime_ns / 1e9,
+            'size': 0,
+            'srt': None,
+            'audio': None,
+            'word': None,
+            'cue_count': None,
+            'audio_duration_ms': None,
+            'mismatch_count': None,
+        }
+
+        files = []
+        try:
+            with os.scandir(project_path) as it:
+                for file_entry in it:
+                    if file_entry.is_file():
+                        stat = file_entry.stat()
+                        files.append(file_entry.name)
+                        entry['size'] += stat.st_size
+                        entry['modified'] = max(entry['modified'], stat.st_mtime)
+        except OSError as e:
+            self.logger.warning(f"讀取專案 {name} 時出錯: {e}")
+            return entry
+
+        # 與開啟專案時相同，各類型取排序後的第一個檔案
+        for file_name in sorted(files):
+            lower = file_name.lower()
+            if entry['srt'] is None and is_source_srt(file_name):
+                entry['srt'] = file_name
+            elif entry['audio'] is None and lower.endswith(AUDIO_EXTENSIONS):
+                entry['audio'] = file_name
+            elif entry['word'] is None and lower.endswith(WORD_EXTENSIONS):
+                entry['word'] = file_name
+
+        def full_path(file_name):
+            return os.path.join(project_path, file_name) if file_name else None
+
+        try:
+            entry.update(ProjectBundleStore(project_path).summarize(
+                full_path(entry['srt']), full_path(entry['word']), full_path(entry['audio'])))
+        except Exception as e:
+            self.logger.warning(f"讀取專案 {name} 的封裝檔時出錯: {e}")
+
+        if entry['cue_count'] is None and entry['srt']:
+            try:
+                entry['cue_count'] = len(read_srt(full_path(entry['srt'])))
+            except Exception as e:
+                self.logger.warning(f"讀取專案 {name} 的字幕時出錯: {e}")
+        return entry
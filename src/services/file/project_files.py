@@ -0,0 +1,46 @@
+"""專案資料夾中輸入檔案的辨識規則，開啟專案、專案目錄、批次處理與監看服務共用"""
+
+import os
+from typing import Optional
+
+# 專案資料夾中可作為音頻與 Word 文檔的檔案類型
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.m4a', '.aac', '.flac', '.ogg')
+WORD_EXTENSIONS = ('.docx',)
+
+# 批次處理輸出的字幕檔後綴，與來源字幕放在同一個資料夾，不可被當作來源字幕
+ALIGNED_SRT_SUFFIX = '.aligned.srt'
+
+
+def is_source_srt(file_name: str) -> bool:
+    """
+    判斷檔案是否為專案的來源字幕（排除批次處理的輸出）
+    :param file_name: 檔案名稱
+    :return: 是否為來源字幕
+    """
+    lower = file_name.lower()
+    return lower.endswith('.srt') and not lower.endswith(ALIGNED_SRT_SUFFIX)
+
+
+def aligned_output_path(srt_path: str) -> str:
+    """
+    獲取批次處理的預設輸出路徑
+    :param srt_path: 來源字幕路徑
+    :return: <名稱>.aligned.srt
+    """
+    return os.path.splitext(srt_path)[0] + ALIGNED_SRT_SUFFIX
+
+
+def find_project_srt(project_path: str) -> Optional[str]:
+    """
+    找出專案的來源字幕：排序後的第一個來源字幕
+    :param project_path: 專案資料夾
+    :return: 字幕路徑，沒有字幕或資料夾無法讀取時回傳 None
+    """
+    try:
+        names = sorted(os.listdir(project_path))
+    except OSError:
+        return None
+    for name in names:
+        if is_source_srt(name):
+            return os.path.join(project_path, name)
+    return None
@@ -2,7 +2,7 @@
 
 import os
 import logging
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 class ProjectService:
     """專案服務，提供統一的專案數據訪問接口"""
@@ -11,6 +11,7 @@ class ProjectService:
         """初始化專案服務"""
         self.logger = logging.getLogger(self.__class__.__name__)
         self.projects_dir = self.get_projects_directory()
+        self._catalog = None
 
     def get_projects_directory(self) -> str:
         """獲取專案目錄路徑"""
@@ -36,15 +37,45 @@ class ProjectService:
         從目錄獲取專案列表
         :return: 專案名稱列表
         """
+        return [entry['name'] for entry in self.get_project_catalog()]
+
+    @property
+    def catalog(self):
+        """專案目錄索引（第一次使用時建立）"""
+        if self._catalog is None:
+            from services.file.project_catalog import ProjectCatalog
+            self._catalog = ProjectCatalog(self.projects_dir)
+        return self._catalog
+
+    def get_project_catalog(self, text: str = '', sort_key: str = 'name',
+                            reverse: bool = False) -> List[Dict[str, Any]]:
+        """
+        獲取專案資訊列表（只重新掃描有變動的專案）
+        :param text: 專案名稱需包含的文字
+        :param sort_key: 排序欄位（name、modified、size、cue_count、audio_duration_ms、mismatch_count）
+        :param reverse: 是否反向排序
+        :return: 專案資訊列表
+        """
         try:
             self.ensure_projects_directory()
-            projects = [d for d in os.listdir(self.projects_dir)
-                     if os.path.isdir(os.path.join(self.projects_dir, d))]
-            return projects
+            self.catalog.refresh()
+            return self.catalog.query(text, sort_key, reverse)
         except Exception as e:
             self.logger.error(f"從目錄獲取專案列表時出錯: {e}")
             return []
 
+    def get_project_info(self, project_name: str) -> Optional[Dict[str, Any]]:
+        """
+        獲取單一專案的資訊（來自專案目錄索引）
+        :param project_name: 專案名稱
+        :return: 專案資訊，不存在時回傳 None
+        """
+        try:
+            return self.catalog.get(project_name)
+        except Exception as e:
+            self.logger.error(f"獲取專案資訊時出錯: {e}")
+            return None
+
     def add_project(self, project_name: str, user_id: Optional[int] = None) -> bool:
         """
         添加新專案
@@ -0,0 +1,349 @@
+"""串流式 SRT 讀寫模組，直接把字幕解析為欄位陣列並以批次方式寫出"""
+
+import codecs
+import logging
+import os
+import re
+from array import array
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional, Tuple
+
+import pysrt
+
+from utils.file_utils import atomic_write_bytes
+from utils.time_codec import format_ms, parse_srt_string
+
+# 與 pysrt 相同的 BOM 偵測順序（UTF-32 必須排在 UTF-16 之前）
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf_32_le'),
+    (codecs.BOM_UTF32_BE, 'utf_32_be'),
+    (codecs.BOM_UTF16_LE, 'utf_16_le'),
+    (codecs.BOM_UTF16_BE, 'utf_16_be'),
+    (codecs.BOM_UTF8, 'utf_8'),
+)
+
+# 沒有 BOM 時依序嘗試的編碼，最後的 latin-1 可解碼任何位元組
+FALLBACK_ENCODINGS = ('utf_8', 'cp950', 'gb18030', 'latin_1')
+
+TIMESTAMP_SEPARATOR = '-->'
+
+# 標準時間軸行的快速路徑：開始 --> 結束 [位置]
+_FAST_TIMING = re.compile(
+    r'\s*(\d+):(\d+):(\d+)[,.](\d+)\s*-->\s*(\d+):(\d+):(\d+)[,.](\d+)(?: +(.*?))?\s*$'
+)
+
+# 字幕區塊：連續的非空白行
+_BLOCK = re.compile(r'[^\n]*\S[^\n]*(?:\n[^\n]*\S[^\n]*)*')
+
+# 標準字幕區塊的快速路徑：序號行、時間軸行與文本
+_FAST_BLOCK = re.compile(
+    r'(\d+)[^\S\n]*\n'
+    r'(\d+):(\d+):(\d+)[,.](\d+) *--> *(\d+):(\d+):(\d+)[,.](\d+)(?: +([^\n]*?))?[^\S\n]*'
+    r'(?:\n(.*))?',
+    re.S
+)
+
+# 行尾空白（需要逐行去除的情況）
+_TRAILING_SPACE = re.compile(r'[^\S\n](?:\n|$)')
+
+
+@dataclass
+class SrtParseError:
+    """格式錯誤的字幕區塊"""
+    line: int
+    message: str
+    block: str
+
+
+class SrtColumns:
+    """
+    以欄位陣列儲存的字幕資料
+    每個字幕不建立物件，只在各欄位陣列中各佔一格；時間以整數毫秒儲存
+    """
+
+    def __init__(self, encoding: str = 'utf_8', eol: str = '\n'):
+        """
+        初始化欄位陣列
+        :param encoding: 來源檔案編碼
+        :param eol: 來源檔案使用的換行符
+        """
+        self.indices: List[Any] = []
+        self.starts = array('q')
+        self.ends = array('q')
+        self.texts: List[str] = []
+        self.positions: List[str] = []
+        self.errors: List[SrtParseError] = []
+        self.encoding = encoding
+        self.eol = eol
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def append(self, index: Any, start_ms: int, end_ms: int, text: str, position: str = '') -> None:
+        """
+        附加一筆字幕
+        :param index: 字幕序號
+        :param start_ms: 開始時間（毫秒）
+        :param end_ms: 結束時間（毫秒）
+        :param text: 字幕文本
+        :param position: 時間軸後的位置資訊
+        """
+        self.indices.append(index)
+        self.starts.append(start_ms)
+        self.ends.append(end_ms)
+        self.texts.append(text)
+        self.positions.append(position)
+
+    @classmethod
+    def from_items(cls, items: Iterable[Any], eol: Optional[str] = None) -> 'SrtColumns':
+        """
+        從 SubRipItem 序列建立欄位陣列
+        :param items: SubRipFile 或 SubRipItem 序列
+        :param eol: 換行符，None 時沿用 SubRipFile 的設定
+        :return: 欄位陣列
+        """
+        columns = cls(eol=eol or getattr(items, 'eol', None) or os.linesep)
+        for item in items:
+            columns.append(item.index, item.start.ordinal, item.end.ordinal,
+                           item.text, getattr(item, 'position', ''))
+        return columns
+
+    def to_subrip_file(self, path: Optional[str] = None) -> pysrt.SubRipFile:
+        """
+        轉換為 pysrt.SubRipFile，供仍以 SubRipItem 操作的程式使用
+        :param path: 來源檔案路徑
+        :return: SubRipFile
+        """
+        from_ordinal = pysrt.SubRipTime.from_ordinal
+        items = [
+            pysrt.SubRipItem(index, from_ordinal(start), from_ordinal(end), text, position)
+            for index, start, end, text, position in zip(
+                self.indices, self.starts, self.ends, self.texts, self.positions)
+        ]
+        return pysrt.SubRipFile(items=items, eol=self.eol, path=path, encoding=self.encoding)
+
+
+def detect_encoding(raw: bytes) -> Tuple[str, int]:
+    """
+    偵測位元組內容的編碼
+    :param raw: 檔案內容
+    :return: (編碼名稱, BOM 長度)
+    """
+    for bom, encoding in _BOMS:
+        if raw.startswith(bom):
+            return encoding, len(bom)
+
+    for encoding in FALLBACK_ENCODINGS:
+        try:
+            raw.decode(encoding)
+            return encoding, 0
+        except UnicodeDecodeError:
+            continue
+    return FALLBACK_ENCODINGS[-1], 0
+
+
+def _guess_eol(text: str) -> str:
+    """以第一個換行符判斷檔案使用的換行方式"""
+    position = text.find('\n')
+    if position > 0 and text[position - 1] == '\r':
+        return '\r\n'
+    if position < 0 and '\r' in text:
+        return '\r'
+    return '\n'
+
+
+def _parse_timing(line: str) -> Tuple[int, int, str]:
+    """
+    解析時間軸行，規則與 SubRipItem.split_timestamps 相同
+    :param line: 時間軸行（已去除行尾空白）
+    :return: (開始毫秒, 結束毫秒, 位置資訊)
+    """
+    match = _FAST_TIMING.match(line)
+    if match:
+        g = match.groups()
+        start = int(g[0]) * 3600000 + int(g[1]) * 60000 + int(g[2]) * 1000 + int(g[3])
+        end = int(g[4]) * 3600000 + int(g[5]) * 60000 + int(g[6]) * 1000 + int(g[7])
+        return start, end, g[8] or ''
+
+    timestamps = line.split(TIMESTAMP_SEPARATOR)
+    if len(timestamps) != 2:
+        raise ValueError("時間軸格式錯誤")
+    start, end_and_position = timestamps
+    end_and_position = end_and_position.lstrip().split(' ', 1)
+    position = end_and_position[1].strip() if len(end_and_position) > 1 else ''
+    return parse_srt_string(start.strip()), parse_srt_string(end_and_position[0].strip()), position
+
+
+def parse_lines(lines: Iterable[str], columns: Optional[SrtColumns] = None) -> SrtColumns:
+    """
+    串流解析 SRT 行，格式錯誤的區塊會被略過並記錄行號，不影響其他字幕
+    :param lines: 文字行序列（可以是檔案物件或任何行產生器）
+    :param columns: 要附加的欄位陣列，None 時建立新的
+    :return: 欄位陣列
+    """
+    if columns is None:
+        columns = SrtColumns()
+
+    indices = columns.indices
+    starts = columns.starts
+    ends = columns.ends
+    texts = columns.texts
+    positions = columns.positions
+
+    block: List[str] = []
+    block_line = 0
+
+    for line_number, line in enumerate(lines, 1):
+        line = line.rstrip()
+        if line:
+            if not block:
+                block_line = line_number
+            block.append(line)
+            continue
+        if not block:
+            continue
+
+        _parse_block(block, block_line, columns, indices, starts, ends, texts, positions)
+        block = []
+
+    if block:
+        _parse_block(block, block_line, columns, indices, starts, ends, texts, positions)
+
+    return columns
+
+
+def parse_text(text: str, columns: Optional[SrtColumns] = None) -> SrtColumns:
+    """
+    解析完整的 SRT 文字，結果與 parse_lines 相同
+    以正規表示式一次比對整個字幕區塊，只有非標準的區塊才逐行處理
+    :param text: SRT 文字
+    :param columns: 要附加的欄位陣列，None 時建立新的
+    :return: 欄位陣列
+    """
+    if columns is None:
+        columns = SrtColumns()
+
+    indices = columns.indices
+    starts = columns.starts
+    ends = columns.ends
+    texts = columns.texts
+    positions = columns.positions
+    fast_block = _FAST_BLOCK.fullmatch
+    trailing_space = _TRAILING_SPACE.search
+
+    for match in _BLOCK.finditer(text):
+        block = match.group()
+        fast = fast_block(block)
+        if fast is None:
+            lines = [line.rstrip() for line in block.split('\n')]
+            block_line = text.count('\n', 0, match.start()) + 1
+            _parse_block(lines, block_line, columns, indices, starts, ends, texts, positions)
+            continue
+
+        g = fast.groups()
+        body = g[10] or ''
+        if body and trailing_space(body):
+            body = '\n'.join(line.rstrip() for line in body.split('\n'))
+
+        indices.append(int(g[0]))
+        starts.append(int(g[1]) * 3600000 + int(g[2]) * 60000 + int(g[3]) * 1000 + int(g[4]))
+        ends.append(int(g[5]) * 3600000 + int(g[6]) * 60000 + int(g[7]) * 1000 + int(g[8]))
+        texts.append(body)
+        positions.append(g[9] or '')
+
+    return columns
+
+
+def _parse_block(block: List[str], block_line: int, columns: SrtColumns,
+                 indices: List[Any], starts: array, ends: array,
+                 texts: List[str], positions: List[str]) -> None:
+    """解析單一字幕區塊並附加到欄位陣列，失敗時記錄錯誤"""
+    timing_offset = 0 if TIMESTAMP_SEPARATOR in block[0] else 1
+    if len(block) < 2 or timing_offset >= len(block):
+        columns.errors.append(SrtParseError(block_line, "字幕區塊不完整", '\n'.join(block)))
+        return
+
+    try:
+        start, end, position = _parse_timing(block[timing_offset])
+    except ValueError as e:
+        columns.errors.append(SrtParseError(block_line + timing_offset, str(e), '\n'.join(block)))
+        return
+
+    index: Any = block[0] if timing_offset else None
+    if timing_offset:
+        try:
+            index = int(index)
+        except ValueError:
+            pass
+
+    indices.append(index)
+    starts.append(start)
+    ends.append(end)
+    texts.append('\n'.join(block[timing_offset + 1:]))
+    positions.append(position)
+
+
+def read_srt(path: str, encoding: Optional[str] = None) -> SrtColumns:
+    """
+    讀取 SRT 檔案到欄位陣列
+    :param path: 檔案路徑
+    :param encoding: 指定編碼，None 時依 BOM 與內容自動偵測
+    :return: 欄位陣列（格式錯誤的區塊記錄於 errors）
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+
+    if encoding is None:
+        encoding, bom_length = detect_encoding(raw)
+        text = raw[bom_length:].decode(encoding)
+    else:
+        text = raw.decode(encoding)
+        if text.startswith('\ufeff'):
+            text = text[1:]
+
+    # 與 pysrt 一樣只以 \n 分行，\r 由行尾空白處理去除
+    columns = SrtColumns(encoding=encoding, eol=_guess_eol(text))
+    parse_text(text, columns)
+
+    if columns.errors:
+        logging.getLogger(__name__).warning(
+            f"{os.path.basename(path)} 有 {len(columns.errors)} 個格式錯誤的字幕區塊已略過")
+    return columns
+
+
+def render_srt(columns: SrtColumns, eol: Optional[str] = None) -> str:
+    """
+    把欄位陣列組成 SRT 文字，輸出與 SubRipFile.write_into 相同
+    :param columns: 欄位陣列
+    :param eol: 換行符，None 時使用欄位陣列的設定
+    :return: SRT 文字
+    """
+    eol = eol or columns.eol
+    item_end = '\n\n'
+    chunks = []
+    append = chunks.append
+    for index, start, end, text, position in zip(
+            columns.indices, columns.starts, columns.ends, columns.texts, columns.positions):
+        position = ' ' + position if position.strip() else ''
+        chunk = f"{index}\n{format_ms(start)} --> {format_ms(end)}{position}\n{text}\n"
+        append(chunk if chunk.endswith(item_end) else chunk + '\n')
+
+    output = ''.join(chunks)
+    if eol != '\n':
+        output = output.replace('\n', eol)
+    return output
+
+
+def write_srt(path: str, data: Any, encoding: str = 'utf-8', eol: Optional[str] = None) -> int:
+    """
+    一次寫出整個 SRT 檔案（以原子方式取代，寫入中斷時原檔案保持原狀）
+    :param path: 檔案路徑
+    :param data: SrtColumns 或 SubRipFile / SubRipItem 序列
+    :param encoding: 輸出編碼
+    :param eol: 換行符，None 時沿用資料的設定
+    :return: 寫出的字幕數
+    """
+    columns = data if isinstance(data, SrtColumns) else SrtColumns.from_items(data)
+    content = render_srt(columns, eol)
+    atomic_write_bytes(path, content.encode(encoding))
+    return len(columns)
@@ -7,6 +7,7 @@ from dataclasses import dataclass
 from typing import List, Dict, Any, Optional, Callable, Type
 
 from .generic_state_manager import GenericStateManager, StateRecord
+from utils.tracing import traced
 
 @dataclass
 class EnhancedStateRecord(StateRecord):
@@ -130,6 +131,7 @@ class EnhancedStateManager(GenericStateManager):
         """設置對 GUI 的引用，使狀態管理器能夠操作界面元素"""
         self.gui = gui
 
+    @traced("state.save_state", category="state")
     def save_state(self, current_state: Dict[str, Any], operation_info: Dict[str, Any],
             correction_state: Optional[Dict[str, Any]] = None) -> None:
         """
@@ -315,6 +317,7 @@ class EnhancedStateManager(GenericStateManager):
             return None
         return self.states[self.current_state_index]['operation']
 
+    @traced("state.undo", category="state")
     def undo(self) -> bool:
         """
         執行撤銷操作
@@ -399,6 +402,7 @@ class EnhancedStateManager(GenericStateManager):
             self.logger.error(f"執行撤銷操作時出錯: {e}", exc_info=True)
             return False
 
+    @traced("state.redo", category="state")
     def redo(self) -> bool:
         """
         執行重做操作
@@ -492,12 +496,9 @@ class EnhancedStateManager(GenericStateManager):
 
             # 保存原始項目的位置
             original_item_position = -1
-            for item in self.gui.tree.get_children():
-                values = self.gui.tree.item(item, 'values')
-                index_pos = 1 if self.gui.display_mode in [self.gui.DISPLAY_MODE_ALL, self.gui.DISPLAY_MODE_AUDIO_SRT] else 0
-                if len(values) > index_pos and str(values[index_pos]) == str(srt_index):
-                    original_item_position = self.gui.tree.index(item)
-                    break
+            original_item = self.gui.tree_manager.find_item_by_index(srt_index)
+            if original_item:
+                original_item_position = self.gui.tree.index(original_item)
 
             # 如果找不到原始項目，使用索引來猜測位置
             if original_item_position == -1:
@@ -609,7 +610,7 @@ class EnhancedStateManager(GenericStateManager):
             if state.correction_state and hasattr(self.gui, 'correction_service'):
                 self.gui.correction_service.deserialize_state(state.correction_state, id_mapping)
                 # 更新校正狀態顯示
-                self.gui.correction_service.update_display_status(self.gui.tree, self.gui.display_mode)
+                self.gui.correction_service.update_display_status(self.gui.tree, self.gui.display_mode, self.gui.tree_manager)
 
             # 選擇合適的項目
             if 'new_item' in operation:
@@ -707,7 +708,7 @@ class EnhancedStateManager(GenericStateManager):
             if correction_state and hasattr(self.gui, 'correction_service'):
                 self.gui.correction_service.deserialize_state(correction_state, id_mapping)
                 # 更新校正狀態顯示
-                self.gui.correction_service.update_display_status(self.gui.tree, self.gui.display_mode)
+                self.gui.correction_service.update_display_status(self.gui.tree, self.gui.display_mode, self.gui.tree_manager)
 
             # 恢復視圖位置
             self._restore_view_position(visible_item, id_mapping, operation)
@@ -954,31 +955,26 @@ class EnhancedStateManager(GenericStateManager):
         positions = []
         first_item_position = -1
 
-        # 尋找所有相關項目
-        for item in self.gui.tree.get_children():
-            values = self.gui.tree.item(item, 'values')
-
-            # 根據顯示模式獲取索引位置
-            index_pos = 1 if self.gui.display_mode in [self.gui.DISPLAY_MODE_ALL, self.gui.DISPLAY_MODE_AUDIO_SRT] else 0
-
-            if len(values) > index_pos:
-                try:
-                    item_index = int(values[index_pos])
-                    # 檢查是否是拆分生成的項目 (原始索引或原始索引+偏移)
-                    is_split_item = (item_index == srt_index) or any(item_index == srt_index + i
-                                                                    for i in range(1, split_count))
+        # 拆分生成的項目序號為原始序號到原始序號 + 拆分數 - 1，直接以序號查找
+        try:
+            base_index = int(srt_index)
+        except (ValueError, TypeError):
+            return items_to_remove, positions, first_item_position
 
-                    if is_split_item:
-                        position = self.gui.tree.index(item)
-                        items_to_remove.append(item)
-                        positions.append(position)
+        found = []
+        for offset in range(max(1, split_count)):
+            item = self.gui.tree_manager.find_item_by_index(base_index + offset)
+            if item:
+                found.append((self.gui.tree.index(item), item))
 
-                        # 記錄第一個項目(最小位置)的位置
-                        if first_item_position == -1 or position < first_item_position:
-                            first_item_position = position
+        # 依位置排序，與逐列掃描的結果順序一致
+        for position, item in sorted(found):
+            items_to_remove.append(item)
+            positions.append(position)
 
-                except (ValueError, TypeError):
-                    continue
+            # 記錄第一個項目(最小位置)的位置
+            if first_item_position == -1 or position < first_item_position:
+                first_item_position = position
 
         return items_to_remove, positions, first_item_position
 
@@ -1123,12 +1119,10 @@ class EnhancedStateManager(GenericStateManager):
             if 'values' in first_item_data and len(first_item_data['values']) > index_pos:
                 target_index = first_item_data['values'][index_pos]
 
-                for item in self.gui.tree.get_children():
-                    values = self.gui.tree.item(item, 'values')
-                    if len(values) > index_pos and str(values[index_pos]) == str(target_index):
-                        merged_item = item
-                        merged_position = self.gui.tree.index(item)
-                        break
+                item = self.gui.tree_manager.find_item_by_index(target_index)
+                if item:
+                    merged_item = item
+                    merged_position = self.gui.tree.index(item)
 
         return merged_item, merged_position
 
@@ -1435,7 +1429,7 @@ class EnhancedStateManager(GenericStateManager):
             if state.correction_state and hasattr(self.gui, 'correction_service'):
                 self.gui.correction_service.deserialize_state(state.correction_state, id_mapping)
                 # 更新校正狀態顯示
-                self.gui.correction_service.update_display_status(self.gui.tree, self.gui.display_mode)
+                self.gui.correction_service.update_display_status(self.gui.tree, self.gui.display_mode, self.gui.tree_manager)
 
             # 如果有音頻，確保更新音頻段落
             if self.gui.audio_imported and hasattr(self.gui, 'audio_player'):
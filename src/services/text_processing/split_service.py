@@ -883,7 +883,8 @@ class SplitService:
             return [str(new_srt_index), new_start, new_end, text, ""]
 
 
-    def prepare_and_insert_subtitle_item(self, sub, corrections=None, tags=None, use_word=False):
+    def prepare_and_insert_subtitle_item(self, sub, corrections=None, tags=None, use_word=False,
+                                         traditional_text=None):
         """
         準備並插入字幕項目到樹狀視圖
 
@@ -892,6 +893,7 @@ class SplitService:
             corrections: 校正對照表，如果為 None 則自動載入
             tags: 要應用的標籤
             use_word: 是否使用 Word 文本
+            traditional_text: 已轉換為繁體的文本，提供時不再重新轉換
 
         Returns:
             新插入項目的 ID
@@ -902,7 +904,10 @@ class SplitService:
                 corrections = self.gui.load_corrections()
 
             # 轉換文本為繁體中文
-            text = simplify_to_traditional(sub.text.strip()) if sub.text else ""
+            if traditional_text is not None:
+                text = traditional_text
+            else:
+                text = simplify_to_traditional(sub.text.strip()) if sub.text else ""
 
             # 檢查校正需求
             needs_correction, corrected_text, original_text, _ = self.gui.correction_service.check_text_for_correction(text)
@@ -993,16 +998,27 @@ class SplitService:
             self.logger.error(f"準備並插入字幕項目時出錯: {e}", exc_info=True)
             return None
 
-    def process_srt_entries(self, srt_data, corrections):
-        """處理 SRT 條目"""
+    def process_srt_entries(self, srt_data, corrections, traditional_texts=None):
+        """
+        處理 SRT 條目
+
+        Args:
+            srt_data: SRT 數據
+            corrections: 校正對照表
+            traditional_texts: 與 srt_data 一一對應、已轉換為繁體的文本（可選）
+        """
         self.logger.debug(f"開始處理 SRT 條目，數量: {len(srt_data) if srt_data else 0}")
 
         if not srt_data:
             self.logger.warning("SRT 數據為空，無法處理")
             return
 
-        for sub in srt_data:
-            self.prepare_and_insert_subtitle_item(sub, corrections)
+        if traditional_texts is not None and len(traditional_texts) != len(srt_data):
+            traditional_texts = None
+
+        for i, sub in enumerate(srt_data):
+            traditional_text = traditional_texts[i] if traditional_texts is not None else None
+            self.prepare_and_insert_subtitle_item(sub, corrections, traditional_text=traditional_text)
 
 
     def _update_srt_for_undo_split(self, srt_index, text, start, end):
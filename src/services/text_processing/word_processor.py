@@ -1,10 +1,15 @@
 import difflib
 import logging
 import re
-import docx
 import difflib
 from typing import List, Dict, Any
 
+from utils.lazy_import import lazy_module
+from utils.tracing import traced
+
+# python-docx 在第一次匯入 Word 文檔時才載入
+docx = lazy_module('docx')
+
 
 """Word 文檔處理模組"""
 class WordProcessor:
@@ -37,6 +42,21 @@ class WordProcessor:
             self.logger.error(f"載入 Word 文檔失敗: {e}")
             return False
 
+    def load_paragraphs(self, file_path: str, paragraphs: List[str]) -> bool:
+        """
+        直接載入已解析的段落（例如專案封裝檔中的快取），不重新解析 Word 文檔
+        :param file_path: 段落來源的 Word 文檔路徑
+        :param paragraphs: 經過 preprocess_paragraphs 處理後的段落
+        :return: 是否成功載入
+        """
+        self.document = None
+        self.word_file_path = file_path
+        self.paragraphs = list(paragraphs)
+        self.processed_paragraphs = [self._remove_punctuation_and_spaces(p) for p in self.paragraphs]
+        self.text_content = "\n".join(self.paragraphs)
+        self.logger.info(f"已從快取載入 Word 段落: {file_path}, 共 {len(self.paragraphs)} 個段落")
+        return True
+
     def extract_text(self) -> None:
         """
         提取 Word 文檔中的純文本，每一段作為一個獨立條目
@@ -69,6 +89,7 @@ class WordProcessor:
         # 移除所有標點符號和空格
         return re.sub(r'[^\w\s]|[\s]', '', text)
 
+    @traced("word.compare_with_srt", category="text")
     def compare_with_srt(self, srt_texts: List[str]) -> Dict[int, Dict[str, Any]]:
         """
         比較 Word 文檔與 SRT 文本，一一對應
@@ -3,9 +3,11 @@
 from .update_manager import UpdateManager
 from .version_checker import VersionChecker
 from .file_downloader import FileDownloader
+from .delta_update import DeltaInstaller
 
 __all__ = [
     'UpdateManager',
     'VersionChecker',
-    'FileDownloader'
+    'FileDownloader',
+    'DeltaInstaller'
 ]
\ No newline at end of file
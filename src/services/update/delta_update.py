@@ -0,0 +1,355 @@
+"""差異更新模組，以二進位差異封包只更新兩個版本之間有變更的文件"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import struct
+import time
+import zipfile
+from typing import Any, Callable, Dict, List, Optional
+
+DELTA_FORMAT_VERSION = 1
+DELTA_MANIFEST_NAME = "delta_manifest.json"
+
+# 差異資料格式：標頭後接一連串操作，C 為從舊文件複製，I 為插入新資料
+PATCH_MAGIC = b"TATDELT1"
+_COPY = b"C"
+_INSERT = b"I"
+_COPY_STRUCT = struct.Struct(">QQ")
+_LENGTH_STRUCT = struct.Struct(">Q")
+
+# 比對時使用的區塊大小，區塊越小差異越精細但產生封包越慢
+PATCH_BLOCK_SIZE = 64
+
+# 不屬於程式本身、更新時不處理的目錄（與 UpdateManager._replace_with_new_version 相同）
+EXCLUDE_DIRS = ('__pycache__', 'backup', 'temp', 'logs', '.git', 'projects')
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class DeltaMismatchError(Exception):
+    """已安裝的文件與差異封包的基準版本不符，無法套用差異更新"""
+
+
+def file_sha256(path: str) -> str:
+    """
+    計算文件的 SHA-256
+    :param path: 文件路徑
+    :return: 十六進位雜湊字串
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_manifest(root: str, exclude_dirs=EXCLUDE_DIRS) -> Dict[str, Dict[str, Any]]:
+    """
+    建立目錄的文件清單
+    :param root: 根目錄
+    :param exclude_dirs: 略過的目錄名稱
+    :return: {相對路徑（以 / 分隔）: {'sha256', 'size'}}
+    """
+    manifest = {}
+    for current, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in exclude_dirs)
+        for name in sorted(files):
+            path = os.path.join(current, name)
+            rel_path = os.path.relpath(path, root).replace(os.sep, '/')
+            manifest[rel_path] = {'sha256': file_sha256(path), 'size': os.path.getsize(path)}
+    return manifest
+
+
+def make_patch(old: bytes, new: bytes, block_size: int = PATCH_BLOCK_SIZE) -> bytes:
+    """
+    產生把 old 轉為 new 的差異資料
+    以 old 中對齊區塊的內容建立索引，逐一位置比對 new，找到相同的區塊後盡量向後延伸為一次複製
+    :param old: 舊版本內容
+    :param new: 新版本內容
+    :param block_size: 比對區塊大小
+    :return: 差異資料
+    """
+    index: Dict[bytes, int] = {}
+    for offset in range(0, len(old) - block_size + 1, block_size):
+        index.setdefault(old[offset:offset + block_size], offset)
+
+    ops = [PATCH_MAGIC]
+    pending_start = 0
+    position = 0
+
+    def flush_insert(end: int):
+        if end > pending_start:
+            ops.append(_INSERT + _LENGTH_STRUCT.pack(end - pending_start) + new[pending_start:end])
+
+    while position + block_size <= len(new):
+        old_offset = index.get(new[position:position + block_size])
+        if old_offset is None:
+            position += 1
+            continue
+
+        # 向後延伸相同的部分（先以大區塊比較，再逐位元組）
+        length = block_size
+        step = 4096
+        while step:
+            while (position + length + step <= len(new) and old_offset + length + step <= len(old)
+                   and new[position + length:position + length + step]
+                   == old[old_offset + length:old_offset + length + step]):
+                length += step
+            step //= 8
+
+        flush_insert(position)
+        ops.append(_COPY + _COPY_STRUCT.pack(old_offset, length))
+        position += length
+        pending_start = position
+
+    flush_insert(len(new))
+    return b"".join(ops)
+
+
+def apply_patch(old: bytes, patch: bytes) -> bytes:
+    """
+    套用差異資料
+    :param old: 舊版本內容
+    :param patch: make_patch 產生的差異資料
+    :return: 新版本內容
+    """
+    if not patch.startswith(PATCH_MAGIC):
+        raise ValueError("不是有效的差異資料")
+
+    output = []
+    position = len(PATCH_MAGIC)
+    while position < len(patch):
+        op = patch[position:position + 1]
+        position += 1
+        if op == _COPY:
+            offset, length = _COPY_STRUCT.unpack_from(patch, position)
+            position += _COPY_STRUCT.size
+            if offset + length > len(old):
+                raise ValueError("差異資料超出舊文件範圍")
+            output.append(old[offset:offset + length])
+        elif op == _INSERT:
+            (length,) = _LENGTH_STRUCT.unpack_from(patch, position)
+            position += _LENGTH_STRUCT.size
+            output.append(patch[position:position + length])
+            position += length
+        else:
+            raise ValueError(f"未知的差異操作: {op!r}")
+    return b"".join(output)
+
+
+def build_delta_package(old_root: str, new_root: str, output_path: str,
+                        from_version: str, to_version: str) -> Dict[str, int]:
+    """
+    比較兩個版本的目錄並產生差異封包（發佈時使用）
+    新增的文件完整放入封包，修改的文件在差異資料比完整內容小時放入差異資料，刪除的文件只記錄在清單中
+    :param old_root: 舊版本目錄
+    :param new_root: 新版本目錄
+    :param output_path: 輸出的封包路徑（zip）
+    :param from_version: 舊版本號
+    :param to_version: 新版本號
+    :return: {'added', 'patched', 'replaced', 'deleted', 'unchanged'}
+    """
+    old_manifest = build_manifest(old_root)
+    new_manifest = build_manifest(new_root)
+    stats = {'added': 0, 'patched': 0, 'replaced': 0, 'deleted': 0, 'unchanged': 0}
+    files: List[Dict[str, Any]] = []
+
+    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as package:
+        for rel_path, info in new_manifest.items():
+            old_info = old_manifest.get(rel_path)
+            if old_info and old_info['sha256'] == info['sha256']:
+                stats['unchanged'] += 1
+                continue
+
+            entry = {'path': rel_path, 'sha256': info['sha256'], 'size': info['size']}
+            with open(os.path.join(new_root, rel_path), 'rb') as f:
+                new_data = f.read()
+
+            patch = None
+            if old_info:
+                with open(os.path.join(old_root, rel_path), 'rb') as f:
+                    patch = make_patch(f.read(), new_data)
+            if patch is not None and len(patch) < len(new_data):
+                entry.update(action='patch', base_sha256=old_info['sha256'], entry=f"patches/{rel_path}")
+                package.writestr(entry['entry'], patch)
+                stats['patched'] += 1
+            else:
+                entry.update(action='add', entry=f"files/{rel_path}")
+                package.writestr(entry['entry'], new_data)
+                stats['replaced' if old_info else 'added'] += 1
+            files.append(entry)
+
+        for rel_path, old_info in old_manifest.items():
+            if rel_path not in new_manifest:
+                files.append({'path': rel_path, 'action': 'delete', 'base_sha256': old_info['sha256']})
+                stats['deleted'] += 1
+
+        manifest = {
+            'format': DELTA_FORMAT_VERSION,
+            'from_version': from_version,
+            'to_version': to_version,
+            'files': files,
+        }
+        package.writestr(DELTA_MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2))
+
+    return stats
+
+
+def is_delta_package(path: str) -> bool:
+    """
+    檢查文件是否為差異封包
+    :param path: 文件路徑
+    :return: 是否為差異封包
+    """
+    try:
+        with zipfile.ZipFile(path) as package:
+            return DELTA_MANIFEST_NAME in package.namelist()
+    except (OSError, zipfile.BadZipFile):
+        return False
+
+
+class DeltaInstaller:
+    """
+    差異更新安裝器
+    先檢查所有要修改的文件與封包的基準版本一致，再把新內容寫到暫存文件並校驗雜湊值，
+    全部準備好後才逐一取代；取代過程中出錯時把已取代的文件還原
+    """
+
+    def __init__(self, app_path: str, backup_path: str):
+        """
+        初始化差異更新安裝器
+        :param app_path: 應用程式目錄
+        :param backup_path: 備份目錄，被修改或刪除的原文件會先移到這裡
+        """
+        self.app_path = app_path
+        self.backup_path = backup_path
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def _target(self, rel_path: str) -> str:
+        """把封包中的相對路徑轉為應用程式目錄中的路徑（拒絕跳出應用程式目錄的路徑）"""
+        target = os.path.normpath(os.path.join(self.app_path, *rel_path.split('/')))
+        if os.path.commonpath([os.path.abspath(target), os.path.abspath(self.app_path)]) != \
+                os.path.abspath(self.app_path):
+            raise ValueError(f"差異封包中有不合法的路徑: {rel_path}")
+        return target
+
+    def read_manifest(self, package: zipfile.ZipFile) -> Dict[str, Any]:
+        """
+        讀取並檢查差異封包的清單
+        :param package: 已開啟的封包
+        :return: 清單
+        """
+        manifest = json.loads(package.read(DELTA_MANIFEST_NAME).decode('utf-8'))
+        if manifest.get('format') != DELTA_FORMAT_VERSION:
+            raise DeltaMismatchError(f"不支援的差異封包格式: {manifest.get('format')}")
+        return manifest
+
+    def check(self, package_path: str, current_version: Optional[str] = None) -> Dict[str, Any]:
+        """
+        檢查差異封包能否套用到目前安裝的版本
+        :param package_path: 差異封包路徑
+        :param current_version: 目前版本，提供時必須與封包的基準版本相同
+        :return: 清單
+        :raises DeltaMismatchError: 版本或文件內容與基準版本不符
+        """
+        with zipfile.ZipFile(package_path) as package:
+            manifest = self.read_manifest(package)
+
+        if current_version and manifest.get('from_version') != current_version:
+            raise DeltaMismatchError(
+                f"差異封包的基準版本為 {manifest.get('from_version')}，目前版本為 {current_version}")
+
+        for entry in manifest['files']:
+            if entry['action'] != 'patch':
+                continue
+            target = self._target(entry['path'])
+            if not os.path.isfile(target) or file_sha256(target) != entry['base_sha256']:
+                raise DeltaMismatchError(f"已安裝的文件與基準版本不符: {entry['path']}")
+        return manifest
+
+    def apply(self, package_path: str, current_version: Optional[str] = None,
+              progress_callback: Optional[Callable[[int, int, str], None]] = None) -> Dict[str, int]:
+        """
+        套用差異封包
+        :param package_path: 差異封包路徑
+        :param current_version: 目前版本
+        :param progress_callback: 進度回調，接收(已處理數, 總數, 相對路徑)
+        :return: {'written', 'deleted'}
+        :raises DeltaMismatchError: 無法套用（應改用完整更新包）
+        """
+        started = time.time()
+        manifest = self.check(package_path, current_version)
+        entries = manifest['files']
+        total = len(entries)
+        staged: List[tuple] = []
+
+        try:
+            # 第一階段：產生新內容到暫存文件並校驗，不動到任何已安裝的文件
+            with zipfile.ZipFile(package_path) as package:
+                for number, entry in enumerate(entries, 1):
+                    target = self._target(entry['path'])
+                    if entry['action'] != 'delete':
+                        data = package.read(entry['entry'])
+                        if entry['action'] == 'patch':
+                            with open(target, 'rb') as f:
+                                data = apply_patch(f.read(), data)
+                        if hashlib.sha256(data).hexdigest() != entry['sha256']:
+                            raise DeltaMismatchError(f"套用差異後的內容校驗失敗: {entry['path']}")
+
+                        temp_path = f"{target}.delta-new"
+                        os.makedirs(os.path.dirname(target), exist_ok=True)
+                        with open(temp_path, 'wb') as f:
+                            f.write(data)
+                        staged.append((entry, target, temp_path))
+                    else:
+                        staged.append((entry, target, None))
+
+                    if progress_callback:
+                        progress_callback(number, total, entry['path'])
+        except Exception:
+            for _, _, temp_path in staged:
+                if temp_path and os.path.exists(temp_path):
+                    os.remove(temp_path)
+            raise
+
+        # 第二階段：把原文件移到備份目錄後取代，出錯時還原
+        backup_dir = os.path.join(self.backup_path, f"delta_{time.strftime('%Y%m%d%H%M%S')}")
+        replaced: List[tuple] = []
+        stats = {'written': 0, 'deleted': 0}
+        try:
+            for entry, target, temp_path in staged:
+                backup = None
+                if os.path.exists(target):
+                    backup = os.path.join(backup_dir, *entry['path'].split('/'))
+                    os.makedirs(os.path.dirname(backup), exist_ok=True)
+                    shutil.copy2(target, backup)
+                replaced.append((target, backup))
+
+                if temp_path:
+                    os.replace(temp_path, target)
+                    stats['written'] += 1
+                elif os.path.exists(target):
+                    os.remove(target)
+                    stats['deleted'] += 1
+        except Exception as e:
+            self.logger.error(f"套用差異更新時出錯，還原已修改的文件: {e}")
+            for target, backup in reversed(replaced):
+                try:
+                    if backup:
+                        shutil.copy2(backup, target)
+                    elif os.path.exists(target):
+                        os.remove(target)
+                except Exception as restore_error:
+                    self.logger.error(f"還原文件失敗 {target}: {restore_error}")
+            for _, _, temp_path in staged:
+                if temp_path and os.path.exists(temp_path):
+                    os.remove(temp_path)
+            raise
+
+        self.logger.info(f"已套用差異更新 {manifest.get('from_version')} -> {manifest.get('to_version')}: "
+                         f"寫入 {stats['written']} 個文件，刪除 {stats['deleted']} 個文件，"
+                         f"耗時 {time.time() - started:.1f} 秒")
+        return stats
@@ -1,42 +1,104 @@
 """文件下載器模組，負責下載更新文件和處理下載進度"""
 
+import hashlib
+import json
 import logging
 import os
 import threading
 import time
-from typing import Optional, Callable
-from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Callable
 
 import requests
+from urllib3.exceptions import HTTPError as Urllib3Error
+
+from utils.file_utils import atomic_write_bytes
+
+# 每次讀取的區塊大小範圍，依實際速度在範圍內調整
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 4 * 1024 * 1024
+# 每次讀取的目標耗時（秒）
+CHUNK_TARGET_SECONDS = 0.25
+
+# 每個平行分段至少的大小
+MIN_SEGMENT_SIZE = 4 * 1024 * 1024
+# 斷點狀態寫入間隔（秒）
+STATE_SAVE_INTERVAL = 1.0
+# 單一分段連線中斷時的重試次數
+SEGMENT_RETRIES = 3
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class DownloadCancelled(Exception):
+    """下載被取消"""
+
+
+class IntegrityError(Exception):
+    """下載的文件與預期的雜湊值不符"""
+
+
+def sha256_file(path: str) -> str:
+    """
+    計算文件的 SHA-256
+    :param path: 文件路徑
+    :return: 十六進位雜湊字串
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
 
 
 class FileDownloader:
-    """文件下載器類，提供下載功能和進度報告"""
+    """
+    文件下載器類，提供下載功能和進度報告
+    下載中的內容寫入 <目標>.download，並在 <目標>.download.json 記錄各分段的進度；
+    中斷後再次下載同一個 URL 時以 HTTP Range 從中斷處繼續（伺服器的 ETag/Last-Modified 改變時重新下載）
+    """
 
-    def __init__(self):
-        """初始化文件下載器"""
+    def __init__(self, timeout: float = 30):
+        """
+        初始化文件下載器
+        :param timeout: 連線與讀取逾時秒數
+        """
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.timeout = timeout
         self.active_downloads = {}  # 記錄活動的下載 {download_id: download_info}
         self.cancel_flags = {}  # 記錄取消標記 {download_id: is_cancelled}
 
     def download_file(self, url: str, destination_path: str,
                     progress_callback: Optional[Callable] = None,
-                    complete_callback: Optional[Callable] = None) -> str:
+                    complete_callback: Optional[Callable] = None,
+                    expected_sha256: Optional[str] = None, segments: int = 1) -> str:
         """
         開始下載文件（異步）
         :param url: 下載URL
         :param destination_path: 目標文件路徑
         :param progress_callback: 進度回調，接收(download_id, progress_percent, downloaded_size, total_size)
         :param complete_callback: 完成回調，接收(download_id, success, error_message, file_path)
+        :param expected_sha256: 預期的 SHA-256，提供時下載完成後校驗
+        :param segments: 平行下載的分段數（伺服器支援 Range 時才會分段）
         :return: 下載ID，可用於取消下載
         """
         # 生成唯一下載ID
         download_id = f"download_{int(time.time() * 1000)}"
+        self._register_download(download_id, url, destination_path)
 
-        # 確保目標目錄存在
-        os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+        # 啟動下載線程
+        thread = threading.Thread(
+            target=self._download_thread,
+            args=(download_id, url, destination_path, progress_callback, complete_callback,
+                  expected_sha256, segments)
+        )
+        thread.daemon = True
+        thread.start()
 
-        # 記錄下載信息
+        return download_id
+
+    def _register_download(self, download_id: str, url: str, destination_path: str) -> None:
+        """記錄下載信息並設置取消標誌"""
         self.active_downloads[download_id] = {
             'url': url,
             'path': destination_path,
@@ -46,23 +108,12 @@ class FileDownloader:
             'total_size': 0,
             'status': 'starting'
         }
-
-        # 設置取消標誌
         self.cancel_flags[download_id] = False
 
-        # 啟動下載線程
-        thread = threading.Thread(
-            target=self._download_thread,
-            args=(download_id, url, destination_path, progress_callback, complete_callback)
-        )
-        thread.daemon = True
-        thread.start()
-
-        return download_id
-
     def _download_thread(self, download_id: str, url: str, destination_path: str,
                        progress_callback: Optional[Callable],
-                       complete_callback: Optional[Callable]) -> None:
+                       complete_callback: Optional[Callable],
+                       expected_sha256: Optional[str] = None, segments: int = 1) -> None:
         """
         下載線程
         :param download_id: 下載ID
@@ -70,107 +121,292 @@ class FileDownloader:
         :param destination_path: 目標文件路徑
         :param progress_callback: 進度回調
         :param complete_callback: 完成回調
+        :param expected_sha256: 預期的 SHA-256
+        :param segments: 平行下載的分段數
         """
-        temp_file = f"{destination_path}.download"
         success = False
         error_message = ""
-
         try:
-            self.logger.info(f"開始下載 {url} 到 {destination_path}")
-            self.active_downloads[download_id]['status'] = 'downloading'
-
-            # 使用流式下載以報告進度
-            response = requests.get(url, stream=True, timeout=30)
-            response.raise_for_status()
-
-            # 獲取文件大小
-            total_size = int(response.headers.get('content-length', 0))
-            self.active_downloads[download_id]['total_size'] = total_size
-
-            # 設置下載塊大小
-            block_size = 8192  # 8KB
-            downloaded = 0
-
-            # 初始進度回調
-            if progress_callback:
-                progress_callback(download_id, 0, downloaded, total_size)
-
-            # 下載文件
-            with open(temp_file, 'wb') as f:
-                start_time = time.time()
-                last_progress_update = start_time
-
-                for chunk in response.iter_content(chunk_size=block_size):
-                    # 檢查取消標誌
-                    if self.cancel_flags.get(download_id, False):
-                        raise Exception("下載被取消")
-
-                    if chunk:  # 過濾空塊
-                        f.write(chunk)
-                        downloaded += len(chunk)
+            self.download(url, destination_path, progress_callback, expected_sha256, segments,
+                          download_id=download_id)
+            success = True
+        except Exception as e:
+            error_message = str(e)
+        finally:
+            # 完成回調
+            if complete_callback:
+                complete_callback(download_id, success, error_message, destination_path if success else "")
 
-                        # 更新下載信息
-                        self.active_downloads[download_id]['downloaded'] = downloaded
+    def download(self, url: str, destination_path: str, progress_callback: Optional[Callable] = None,
+                 expected_sha256: Optional[str] = None, segments: int = 1,
+                 download_id: Optional[str] = None) -> str:
+        """
+        下載文件（在呼叫的執行緒中同步執行）
+        :param url: 下載URL
+        :param destination_path: 目標文件路徑
+        :param progress_callback: 進度回調，接收(download_id, progress_percent, downloaded_size, total_size)
+        :param expected_sha256: 預期的 SHA-256，提供時下載完成後校驗，不符時刪除已下載的內容
+        :param segments: 平行下載的分段數（伺服器支援 Range 時才會分段）
+        :param download_id: 下載ID，未提供時自動產生
+        :return: 目標文件路徑
+        :raises DownloadCancelled: 下載被取消（已下載的部分保留，下次可繼續）
+        :raises IntegrityError: 雜湊值不符
+        """
+        if download_id is None:
+            download_id = f"download_{int(time.time() * 1000)}"
+        if download_id not in self.active_downloads:
+            self._register_download(download_id, url, destination_path)
+        info = self.active_downloads[download_id]
 
-                        # 計算進度
-                        progress = 0
-                        if total_size > 0:
-                            progress = (downloaded / total_size) * 100
-                            self.active_downloads[download_id]['progress'] = progress
+        # 確保目標目錄存在
+        os.makedirs(os.path.dirname(os.path.abspath(destination_path)), exist_ok=True)
+        temp_file = f"{destination_path}.download"
+        state_file = f"{temp_file}.json"
+        tracker = None
 
-                        # 調用進度回調（限制更新頻率以避免 UI 過載）
-                        current_time = time.time()
-                        if progress_callback and (current_time - last_progress_update) >= 0.1:  # 100ms間隔
-                            progress_callback(download_id, progress, downloaded, total_size)
-                            last_progress_update = current_time
+        try:
+            self.logger.info(f"開始下載 {url} 到 {destination_path}")
+            info['status'] = 'downloading'
+            start_time = time.time()
+
+            remote = self._probe(url)
+            state = self._load_state(state_file, url, remote, temp_file)
+            if state is None:
+                state = self._new_state(url, remote, segments)
+            elif any(done for _, _, done in state['segments']):
+                resumed = sum(done for _, _, done in state['segments'])
+                self.logger.info(f"從中斷處繼續下載，已完成 {self._format_size(resumed)}")
+
+            total_size = state['total_size']
+            info['total_size'] = total_size
+            tracker = _ProgressTracker(self, download_id, state, temp_file, state_file, progress_callback)
+            tracker.report(force=True)
+
+            self._download_segments(download_id, url, temp_file, state, tracker)
+            tracker.save_state()
+            downloaded = tracker.downloaded
+
+            # 校驗雜湊值
+            if expected_sha256:
+                actual = sha256_file(temp_file)
+                if actual.lower() != expected_sha256.lower():
+                    self._discard(temp_file, state_file)
+                    raise IntegrityError(f"SHA-256 不符: 預期 {expected_sha256}，實際 {actual}")
+                self.logger.info(f"SHA-256 校驗通過: {actual}")
 
             # 重命名臨時文件為目標文件
-            if os.path.exists(destination_path):
-                os.remove(destination_path)
-            os.rename(temp_file, destination_path)
+            os.replace(temp_file, destination_path)
+            self._discard(state_file)
 
             # 更新下載狀態
-            self.active_downloads[download_id]['status'] = 'completed'
-            self.active_downloads[download_id]['progress'] = 100
+            info['status'] = 'completed'
+            info['progress'] = 100
+            if progress_callback:
+                progress_callback(download_id, 100, downloaded, total_size or downloaded)
 
             # 記錄下載完成
             elapsed_time = time.time() - start_time
-            download_speed = downloaded / elapsed_time if elapsed_time > 0 else 0
+            download_speed = tracker.transferred / elapsed_time if elapsed_time > 0 else 0
             self.logger.info(f"下載完成 {url} -> {destination_path}, "
                            f"大小: {self._format_size(downloaded)}, "
                            f"時間: {elapsed_time:.1f}秒, "
                            f"速度: {self._format_size(download_speed)}/s")
-
-            success = True
+            return destination_path
 
         except Exception as e:
             self.logger.error(f"下載 {url} 時出錯: {e}")
+            info['status'] = 'cancelled' if isinstance(e, DownloadCancelled) else 'failed'
 
-            # 更新下載狀態
-            self.active_downloads[download_id]['status'] = 'failed'
-
-            # 刪除臨時文件
-            if os.path.exists(temp_file):
-                try:
-                    os.remove(temp_file)
-                except Exception:
-                    pass
-
-            error_message = str(e)
-            success = False
+            # 保留已下載的部分與斷點狀態，下次從中斷處繼續
+            if tracker is not None and not isinstance(e, IntegrityError):
+                tracker.save_state()
+            raise
 
         finally:
-            # 最後的進度回調
-            if progress_callback and success:
-                progress_callback(download_id, 100, downloaded, total_size)
+            # 清理
+            self.cancel_flags.pop(download_id, None)
 
-            # 完成回調
-            if complete_callback:
-                complete_callback(download_id, success, error_message, destination_path if success else "")
+    def _probe(self, url: str) -> Dict[str, Any]:
+        """
+        查詢遠端文件的大小、是否支援 Range 以及驗證標記
+        :param url: 下載URL
+        :return: {'total_size', 'accept_ranges', 'validator'}，無法查詢時大小為 0
+        """
+        try:
+            response = requests.head(url, allow_redirects=True, timeout=self.timeout,
+                                     headers={'Accept-Encoding': 'identity'})
+            if response.status_code >= 400:
+                raise requests.HTTPError(f"HTTP {response.status_code}")
+            headers = response.headers
+            return {
+                'total_size': int(headers.get('content-length', 0) or 0),
+                'accept_ranges': headers.get('accept-ranges', '').lower() == 'bytes',
+                'validator': headers.get('etag') or headers.get('last-modified') or '',
+            }
+        except Exception as e:
+            self.logger.debug(f"無法查詢文件資訊，改用單一連線下載: {e}")
+            return {'total_size': 0, 'accept_ranges': False, 'validator': ''}
 
-            # 清理
-            if download_id in self.cancel_flags:
-                del self.cancel_flags[download_id]
+    def _new_state(self, url: str, remote: Dict[str, Any], segments: int) -> Dict[str, Any]:
+        """
+        建立新的下載狀態並規劃分段
+        :return: {'url', 'total_size', 'validator', 'accept_ranges', 'segments': [[起點, 終點, 已完成]]}
+        """
+        total_size = remote['total_size']
+        count = 1
+        if remote['accept_ranges'] and total_size:
+            count = max(1, min(int(segments), total_size // MIN_SEGMENT_SIZE))
+
+        if total_size:
+            size = -(-total_size // count)
+            plan = [[start, min(start + size, total_size) - 1, 0] for start in range(0, total_size, size)]
+        else:
+            # 大小未知：單一連線讀到結束
+            plan = [[0, -1, 0]]
+        return dict(remote, url=url, segments=plan)
+
+    def _load_state(self, state_file: str, url: str, remote: Dict[str, Any],
+                    temp_file: str) -> Optional[Dict[str, Any]]:
+        """
+        讀取上次中斷時的下載狀態，遠端文件已改變或無法續傳時返回 None
+        """
+        try:
+            with open(state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if (state.get('url') != url or not remote['accept_ranges'] or not remote['total_size']
+                or state.get('total_size') != remote['total_size']
+                or state.get('validator') != remote['validator']
+                or not os.path.exists(temp_file)):
+            self.logger.info("遠端文件已改變或無法續傳，重新下載")
+            self._discard(temp_file, state_file)
+            return None
+        return state
+
+    def _download_segments(self, download_id: str, url: str, temp_file: str,
+                           state: Dict[str, Any], tracker: "_ProgressTracker") -> None:
+        """
+        下載所有未完成的分段，多個分段時平行下載到暫存文件的對應位置
+        """
+        total_size = state['total_size']
+        if total_size:
+            # 預先配置文件大小，各分段寫入自己的位置
+            mode = 'r+b' if os.path.exists(temp_file) else 'wb'
+            with open(temp_file, mode) as f:
+                f.truncate(total_size)
+        else:
+            open(temp_file, 'wb').close()
+
+        pending = [segment for segment in state['segments']
+                   if segment[1] < 0 or segment[0] + segment[2] <= segment[1]]
+        if len(pending) <= 1:
+            for segment in pending:
+                self._download_segment(download_id, url, temp_file, state, segment, tracker)
+            return
+
+        stop_event = threading.Event()
+        with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="FileDownloader") as executor:
+            futures = [executor.submit(self._download_segment, download_id, url, temp_file, state,
+                                       segment, tracker, stop_event)
+                       for segment in pending]
+            errors = []
+            for future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    # 一個分段失敗時讓其他分段停止
+                    stop_event.set()
+                    errors.append(e)
+        if errors:
+            raise next((e for e in errors if not isinstance(e, DownloadCancelled)), errors[0])
+
+    def _download_segment(self, download_id: str, url: str, temp_file: str, state: Dict[str, Any],
+                          segment: List[int], tracker: "_ProgressTracker",
+                          stop_event: Optional[threading.Event] = None) -> None:
+        """
+        下載一個分段，連線中斷時從已寫入的位置重試
+        :param segment: [起點, 終點（-1 表示讀到結束）, 已完成的位元組數]，下載時就地更新
+        """
+        attempt = 0
+        while True:
+            try:
+                self._stream_segment(download_id, url, temp_file, state, segment, tracker, stop_event)
+                return
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                attempt += 1
+                if attempt > SEGMENT_RETRIES or not state['accept_ranges']:
+                    raise
+                self.logger.warning(f"分段 {segment[0]}-{segment[1]} 連線中斷，第 {attempt} 次重試: {e}")
+                time.sleep(min(2 ** attempt, 10))
+
+    def _stream_segment(self, download_id: str, url: str, temp_file: str, state: Dict[str, Any],
+                        segment: List[int], tracker: "_ProgressTracker",
+                        stop_event: Optional[threading.Event]) -> None:
+        """以一個連線下載分段的剩餘部分"""
+        start, end, done = segment
+        headers = {'Accept-Encoding': 'identity'}
+        if state['accept_ranges']:
+            headers['Range'] = f"bytes={start + done}-{end}"
+            if state['validator']:
+                # 遠端文件已改變時伺服器返回完整內容（200）而不是分段
+                headers['If-Range'] = state['validator']
+
+        with requests.get(url, stream=True, timeout=self.timeout, headers=headers) as response:
+            response.raise_for_status()
+            if 'Range' in headers and response.status_code != 206:
+                raise IOError(f"伺服器未返回請求的分段（HTTP {response.status_code}），遠端文件可能已改變")
+            if 'Range' not in headers and done:
+                # 不支援 Range 時只能從頭開始
+                tracker.add(segment, -done)
+
+            chunk_size = MIN_CHUNK_SIZE
+            with open(temp_file, 'r+b') as f:
+                f.seek(start + segment[2])
+                while True:
+                    # 檢查取消標誌
+                    if self.cancel_flags.get(download_id, False):
+                        raise DownloadCancelled("下載被取消")
+                    if stop_event is not None and stop_event.is_set():
+                        return
+
+                    if end >= 0:
+                        remaining = end + 1 - start - segment[2]
+                        if remaining <= 0:
+                            return
+                        read_size = min(chunk_size, remaining)
+                    else:
+                        read_size = chunk_size
+
+                    read_started = time.monotonic()
+                    try:
+                        chunk = response.raw.read(read_size, decode_content=True)
+                    except Urllib3Error as e:
+                        # 連線中斷或讀取逾時，交給 _download_segment 重試
+                        raise requests.ConnectionError(e)
+                    if not chunk:
+                        if end >= 0:
+                            raise requests.exceptions.ChunkedEncodingError("連線提前結束")
+                        return
+                    f.write(chunk)
+                    f.flush()
+                    tracker.add(segment, len(chunk))
+
+                    # 依實際速度調整區塊大小，讓每次讀取約耗時 CHUNK_TARGET_SECONDS
+                    elapsed = time.monotonic() - read_started
+                    if len(chunk) == read_size and elapsed < CHUNK_TARGET_SECONDS / 2:
+                        chunk_size = min(chunk_size * 2, MAX_CHUNK_SIZE)
+                    elif elapsed > CHUNK_TARGET_SECONDS * 2:
+                        chunk_size = max(chunk_size // 2, MIN_CHUNK_SIZE)
+
+    def _discard(self, *paths: str) -> None:
+        """刪除文件（不存在時忽略）"""
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
 
     def cancel_download(self, download_id: str) -> bool:
         """
@@ -270,4 +506,67 @@ class FileDownloader:
         elif eta_seconds < 3600:
             return f"{eta_seconds/60:.1f}分鐘"
         else:
-            return f"{eta_seconds/3600:.1f}小時"
\ No newline at end of file
+            return f"{eta_seconds/3600:.1f}小時"
+
+
+class _ProgressTracker:
+    """彙總各分段的下載進度，定期回報進度並寫入斷點狀態"""
+
+    def __init__(self, downloader: FileDownloader, download_id: str, state: Dict[str, Any],
+                 temp_file: str, state_file: str, progress_callback: Optional[Callable]):
+        self.downloader = downloader
+        self.download_id = download_id
+        self.state = state
+        self.temp_file = temp_file
+        self.state_file = state_file
+        self.progress_callback = progress_callback
+        self.downloaded = sum(done for _, _, done in state['segments'])
+        self.transferred = 0  # 本次實際傳輸的位元組數
+        self._lock = threading.Lock()
+        self._last_report = 0.0
+        self._last_save = time.monotonic()
+
+    def add(self, segment: List[int], size: int) -> None:
+        """記錄分段新寫入的位元組數（已寫入文件後才呼叫）"""
+        with self._lock:
+            segment[2] += size
+            self.downloaded += size
+            self.transferred += max(0, size)
+            save = self.state['accept_ranges'] and time.monotonic() - self._last_save >= STATE_SAVE_INTERVAL
+        if save:
+            self.save_state()
+        self.report()
+
+    def report(self, force: bool = False) -> None:
+        """調用進度回調（限制更新頻率以避免 UI 過載）"""
+        now = time.monotonic()
+        if not force and now - self._last_report < 0.1:  # 100ms間隔
+            return
+        self._last_report = now
+
+        total_size = self.state['total_size']
+        progress = (self.downloaded / total_size) * 100 if total_size > 0 else 0
+        info = self.downloader.active_downloads.get(self.download_id, {})
+        info['downloaded'] = self.downloaded
+        info['progress'] = progress
+        if self.progress_callback:
+            self.progress_callback(self.download_id, progress, self.downloaded, total_size)
+
+    def save_state(self) -> None:
+        """
+        寫入斷點狀態（只有支援 Range 的下載才能續傳）
+        狀態中記錄的位元組在 add 之前都已 flush 到作業系統，寫入狀態前先把暫存文件同步到磁碟，
+        避免斷電後狀態記錄了實際上沒有寫入磁碟的內容
+        """
+        if not self.state['accept_ranges']:
+            return
+        with self._lock:
+            data = json.dumps(self.state).encode('utf-8')
+            self._last_save = time.monotonic()
+        try:
+            if os.path.exists(self.temp_file):
+                with open(self.temp_file, 'r+b') as f:
+                    os.fsync(f.fileno())
+            atomic_write_bytes(self.state_file, data)
+        except OSError as e:
+            self.downloader.logger.warning(f"寫入下載狀態時出錯: {e}")
@@ -0,0 +1,250 @@
+"""更新包解壓模組，把壓縮包的內容直接串流寫到暫存目錄並同時計算雜湊值"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import tarfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, IO, List, Optional, Tuple
+
+# 更新包中可選的文件清單（格式同 delta_update.build_manifest），存在時逐一校驗解壓後的文件
+RELEASE_MANIFEST_NAME = "release_manifest.json"
+
+# 不屬於程式本身、更新時不處理的目錄（與 UpdateManager._replace_with_new_version 相同）
+EXCLUDE_DIRS = ('__pycache__', 'backup', 'temp', 'logs', '.git', 'projects')
+# 任何層級都略過的目錄
+SKIP_ANYWHERE = ('__pycache__', '.git')
+
+# 程式運行時不會原地修改的文件類型，備份時可以使用硬連結
+LINKABLE_EXTENSIONS = frozenset((
+    '.py', '.pyc', '.pyd', '.so', '.dll', '.exe', '.dylib',
+    '.png', '.ico', '.gif', '.jpg', '.jpeg', '.icns', '.ttf', '.otf', '.qm', '.zip',
+))
+
+COPY_BLOCK_SIZE = 1024 * 1024
+# Linux FICLONE ioctl：在支援的文件系統（Btrfs、XFS 等）上建立寫入時複製的副本
+_FICLONE = 0x40049409
+
+
+class PackageIntegrityError(Exception):
+    """解壓後的文件與更新包的文件清單不符"""
+
+
+def _reflink(src: str, dst: str) -> bool:
+    """嘗試以寫入時複製的方式複製文件，不支援時返回 False"""
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        import fcntl
+        with open(src, 'rb') as source, open(dst, 'wb') as target:
+            fcntl.ioctl(target.fileno(), _FICLONE, source.fileno())
+        shutil.copystat(src, dst)
+        return True
+    except (OSError, ImportError):
+        try:
+            os.remove(dst)
+        except OSError:
+            pass
+        return False
+
+
+def link_or_copy(src: str, dst: str) -> str:
+    """
+    以最省空間的方式複製文件：寫入時複製 > 硬連結（僅限程式文件）> 一般複製
+    硬連結與原文件共用內容，只用於更新時以取代（而非原地寫入）方式變更的程式文件
+    :param src: 來源文件
+    :param dst: 目標文件
+    :return: 目標文件
+    """
+    if _reflink(src, dst):
+        return dst
+    if os.path.splitext(src)[1].lower() in LINKABLE_EXTENSIONS:
+        try:
+            os.link(src, dst)
+            return dst
+        except OSError:
+            pass
+    return shutil.copy2(src, dst)
+
+
+def copy_tree_linked(src: str, dst: str) -> None:
+    """
+    以 link_or_copy 複製目錄或文件
+    :param src: 來源路徑
+    :param dst: 目標路徑
+    """
+    if os.path.isdir(src):
+        shutil.copytree(src, dst, copy_function=link_or_copy)
+    else:
+        link_or_copy(src, dst)
+
+
+def _split_member(name: str) -> Optional[List[str]]:
+    """把壓縮包中的成員名稱拆成路徑元件，不合法（絕對路徑或包含 ..）時返回 None"""
+    name = name.replace('\\', '/')
+    if name.startswith('/') or (len(name) > 1 and name[1] == ':'):
+        return None
+    parts = [part for part in name.split('/') if part not in ('', '.')]
+    if not parts or '..' in parts:
+        return None
+    return parts
+
+
+def _common_root(names: List[List[str]]) -> int:
+    """更新包只有一個頂層目錄時（例如 app-1.2.0/...）返回 1，表示要去掉第一層"""
+    tops = {parts[0] for parts in names}
+    if len(tops) == 1 and any(len(parts) > 1 for parts in names):
+        return 1
+    return 0
+
+
+class PackageStager:
+    """
+    更新包解壓器
+    不先完整解壓再複製：每個成員直接串流寫到暫存目錄的最終位置，寫入時計算 SHA-256；
+    ZIP 的成員以多個執行緒平行解壓（每個執行緒使用自己的 ZipFile），tar 依序串流
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        """
+        初始化更新包解壓器
+        :param workers: ZIP 平行解壓的執行緒數，預設依 CPU 數量
+        """
+        self.workers = workers or min(8, (os.cpu_count() or 2) + 2)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @staticmethod
+    def _should_skip(parts: List[str]) -> bool:
+        """是否略過這個成員（快取與版本控制目錄）"""
+        return any(part in SKIP_ANYWHERE for part in parts)
+
+    @staticmethod
+    def _write_stream(stream: IO[bytes], path: str) -> Tuple[str, int]:
+        """把資料流寫入文件並計算雜湊值，返回 (SHA-256, 大小)"""
+        digest = hashlib.sha256()
+        size = 0
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            for block in iter(lambda: stream.read(COPY_BLOCK_SIZE), b''):
+                f.write(block)
+                digest.update(block)
+                size += len(block)
+        return digest.hexdigest(), size
+
+    def stage_zip(self, zip_path: str, staging_dir: str,
+                  progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Dict]:
+        """
+        平行解壓 ZIP 更新包到暫存目錄（ZIP 的 CRC 由 zipfile 在讀取時校驗）
+        :param zip_path: 更新包路徑
+        :param staging_dir: 暫存目錄（應與應用程式目錄在同一個文件系統）
+        :param progress_callback: 進度回調，接收(已解壓位元組數, 總位元組數)
+        :return: 解壓後的文件清單 {壓縮包中的相對路徑: {'sha256', 'size'}}
+        """
+        with zipfile.ZipFile(zip_path) as package:
+            infos = [info for info in package.infolist() if not info.is_dir()]
+
+        jobs = []
+        for info in infos:
+            parts = _split_member(info.filename)
+            if parts is None:
+                raise PackageIntegrityError(f"更新包中有不合法的路徑: {info.filename}")
+            if not self._should_skip(parts):
+                jobs.append((info, parts))
+
+        total = sum(info.file_size for info, _ in jobs)
+        done = [0]
+        lock = threading.Lock()
+        local = threading.local()
+        handles = []
+
+        def extract(job):
+            info, parts = job
+            package = getattr(local, 'package', None)
+            if package is None:
+                package = local.package = zipfile.ZipFile(zip_path)
+                with lock:
+                    handles.append(package)
+            with package.open(info) as stream:
+                result = self._write_stream(stream, os.path.join(staging_dir, *parts))
+            with lock:
+                done[0] += info.file_size
+                current = done[0]
+            if progress_callback:
+                progress_callback(current, total)
+            return '/'.join(parts), result
+
+        staged = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="PackageStager") as executor:
+                for rel_path, (sha256, size) in executor.map(extract, jobs):
+                    staged[rel_path] = {'sha256': sha256, 'size': size}
+        finally:
+            for package in handles:
+                package.close()
+
+        self._verify(staging_dir, staged)
+        self.logger.info(f"已解壓 {len(staged)} 個文件（{total} 位元組）到 {staging_dir}")
+        return staged
+
+    def stage_tarball(self, tarball_path: str, staging_dir: str,
+                      progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Dict]:
+        """
+        串流解壓 tar 更新包到暫存目錄（只處理一般文件，略過連結與裝置文件）
+        :param tarball_path: 更新包路徑
+        :param staging_dir: 暫存目錄（應與應用程式目錄在同一個文件系統）
+        :param progress_callback: 進度回調，接收(已讀取的壓縮位元組數, 更新包大小)
+        :return: 解壓後的文件清單 {壓縮包中的相對路徑: {'sha256', 'size'}}
+        """
+        total = os.path.getsize(tarball_path)
+        staged = {}
+        with open(tarball_path, 'rb') as raw, tarfile.open(fileobj=raw, mode='r|*') as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                parts = _split_member(member.name)
+                if parts is None:
+                    raise PackageIntegrityError(f"更新包中有不合法的路徑: {member.name}")
+                if self._should_skip(parts):
+                    continue
+
+                path = os.path.join(staging_dir, *parts)
+                sha256, size = self._write_stream(tar.extractfile(member), path)
+                # 保留執行權限等模式位元
+                os.chmod(path, (member.mode & 0o777) | 0o600)
+                staged['/'.join(parts)] = {'sha256': sha256, 'size': size}
+
+                if progress_callback:
+                    progress_callback(raw.tell(), total)
+
+        self._verify(staging_dir, staged)
+        self.logger.info(f"已解壓 {len(staged)} 個文件到 {staging_dir}")
+        return staged
+
+    def _verify(self, staging_dir: str, staged: Dict[str, Dict]) -> None:
+        """
+        與更新包的文件清單比對（沒有清單時只依靠壓縮格式本身的校驗）
+        清單位於內容根目錄，路徑相對於內容根目錄（更新包只有一個頂層目錄時為該目錄）
+        """
+        names = [rel_path.split('/') for rel_path in staged]
+        prefix = names[0][0] + '/' if names and _common_root(names) else ''
+        manifest_path = os.path.join(staging_dir, *(prefix + RELEASE_MANIFEST_NAME).split('/'))
+        if not os.path.exists(manifest_path):
+            return
+
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            expected = json.load(f)
+        for rel_path, info in expected.items():
+            parts = _split_member(rel_path)
+            if parts is None or parts[0] in EXCLUDE_DIRS or self._should_skip(parts):
+                continue
+            actual = staged.get(prefix + rel_path)
+            if actual is None:
+                raise PackageIntegrityError(f"更新包缺少文件: {rel_path}")
+            if actual['sha256'] != info.get('sha256'):
+                raise PackageIntegrityError(f"文件校驗失敗: {rel_path}")
+        self.logger.info(f"已依文件清單校驗 {len(expected)} 個文件")
@@ -11,13 +11,21 @@ import sys
 import tempfile
 import threading
 import time
-import zipfile
 from urllib.parse import urlparse
 from typing import Dict, List, Optional, Tuple, Callable, Any
 
 import requests
 
 from services.config_manager import ConfigManager
+from services.update.delta_update import DeltaInstaller, is_delta_package
+from services.update.file_downloader import FileDownloader
+from services.update.package_installer import PackageStager, copy_tree_linked
+from services.update.version_checker import VersionChecker
+
+# 平行下載更新的預設分段數（可在配置 update.download_segments 調整）
+DEFAULT_DOWNLOAD_SEGMENTS = 4
+# 發佈資產中的校驗和文件名稱
+CHECKSUM_ASSET_NAMES = ('SHA256SUMS', 'SHA256SUMS.txt', 'checksums.txt')
 
 
 class UpdateManager:
@@ -39,6 +47,11 @@ class UpdateManager:
         self.repo_name = self.update_settings.get('repo_name', '')
         self.branch = self.update_settings.get('branch', 'main')
         self.github_api_url = f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}"
+        # 以條件請求查詢發佈資料（快取在磁碟上）
+        self.version_checker = VersionChecker(self.github_api_url)
+        # 上次處理的發佈資料與當時的版本，資料未改變時不必重新比對資產
+        self._last_release_data = None
+        self._last_checked_version = None
 
         # 獲取當前版本
         self.current_version = self._get_current_version()
@@ -49,6 +62,12 @@ class UpdateManager:
         self.release_notes = ""
         self.download_url = ""
         self.update_size = 0
+        self.update_sha256 = ""
+        self.checksum_url = ""
+        # 從目前版本到最新版本的差異更新封包（發佈中有提供時）
+        self.delta_url = ""
+        self.delta_size = 0
+        self.delta_sha256 = ""
         self.background_thread = None
         self.update_in_progress = False
         self.update_progress_callback = None
@@ -96,37 +115,40 @@ class UpdateManager:
         # 如果都沒有，返回默認版本
         return "1.0.0"
 
-    def check_for_updates(self, callback: Optional[Callable] = None) -> bool:
+    def check_for_updates(self, callback: Optional[Callable] = None, force: bool = False) -> bool:
         """
         檢查更新並通過回調返回結果
         :param callback: 完成後的回調函數，接收(has_update, version, release_notes)
+        :param force: 使用者手動檢查時為 True，忽略連線失敗後的等待時間
         :return: 是否有更新可用
         """
         self.check_update_callback = callback
 
         try:
-            # 發送請求獲取最新版本
-            releases_url = f"{self.github_api_url}/releases/latest"
-            self.logger.debug(f"檢查更新，API URL: {releases_url}")
-
-            response = requests.get(releases_url, timeout=10)
-            response.raise_for_status()
-
-            release_data = response.json()
-            self.latest_version = release_data.get('tag_name', '').lstrip('v')
-            self.release_notes = release_data.get('body', '')
-
-            # 找到適合當前系統的資產
-            assets = release_data.get('assets', [])
-            for asset in assets:
-                if self._is_suitable_asset(asset['name']):
-                    self.download_url = asset['browser_download_url']
-                    self.update_size = asset['size']
-                    break
-
-            # 檢查版本比較
-            has_update = self._compare_versions(self.latest_version, self.current_version) > 0
-            self.update_available = has_update and self.download_url
+            # 以條件請求獲取最新版本（未改變時返回與上次相同的資料物件）
+            release_data = self.version_checker.fetch_latest_release(force)
+
+            if release_data is not self._last_release_data or self._last_checked_version != self.current_version:
+                self.latest_version = release_data.get('tag_name', '').lstrip('v')
+                self.release_notes = release_data.get('body', '')
+
+                # 找到適合當前系統的資產
+                assets = release_data.get('assets', [])
+                for asset in assets:
+                    if self._is_suitable_asset(asset['name']):
+                        self.download_url = asset['browser_download_url']
+                        self.update_size = asset['size']
+                        self._find_asset_checksum(asset, assets)
+                        break
+                self._find_delta_asset(assets)
+
+                # 檢查版本比較
+                has_update = self._compare_versions(self.latest_version, self.current_version) > 0
+                self.update_available = has_update and self.download_url
+                self._last_release_data = release_data
+                self._last_checked_version = self.current_version
+            else:
+                self.logger.debug("發佈資料未改變，沿用上次的檢查結果")
 
             self.logger.info(f"更新檢查結果: 當前版本={self.current_version}, 最新版本={self.latest_version}, "
                            f"有更新={self.update_available}")
@@ -143,6 +165,76 @@ class UpdateManager:
                 callback(False, "", f"檢查更新時出錯: {str(e)}")
             return False
 
+    def _find_asset_checksum(self, asset: Dict[str, Any], assets: List[Dict[str, Any]]) -> None:
+        """
+        從發佈資料找出資產的 SHA-256：優先使用 API 提供的 digest，否則記錄校驗和文件的下載位址
+        :param asset: 要下載的資產
+        :param assets: 發佈中的所有資產
+        """
+        self.update_sha256 = ""
+        self.checksum_url = ""
+
+        digest = asset.get('digest') or ''
+        if digest.lower().startswith('sha256:'):
+            self.update_sha256 = digest.split(':', 1)[1].lower()
+            return
+
+        names = {f"{asset['name']}.sha256"} | set(CHECKSUM_ASSET_NAMES)
+        for item in assets:
+            if item.get('name') in names:
+                self.checksum_url = item.get('browser_download_url', '')
+                return
+
+    def _find_delta_asset(self, assets: List[Dict[str, Any]]) -> None:
+        """
+        找出從目前版本更新到最新版本的差異封包，名稱格式為 *delta-<目前版本>-to-<最新版本>.zip
+        :param assets: 發佈中的所有資產
+        """
+        self.delta_url = ""
+        self.delta_size = 0
+        self.delta_sha256 = ""
+        if not self.latest_version:
+            return
+
+        pattern = re.compile(rf"delta[-_]v?{re.escape(self.current_version)}[-_]to[-_]v?"
+                             rf"{re.escape(self.latest_version)}\.zip$", re.IGNORECASE)
+        for asset in assets:
+            if pattern.search(asset.get('name', '')):
+                self.delta_url = asset['browser_download_url']
+                self.delta_size = asset.get('size', 0)
+                digest = asset.get('digest') or ''
+                if digest.lower().startswith('sha256:'):
+                    self.delta_sha256 = digest.split(':', 1)[1].lower()
+                self.logger.info(f"找到差異更新封包: {asset['name']}（{self.delta_size} 位元組）")
+                return
+
+    def _resolve_expected_sha256(self) -> str:
+        """
+        獲取更新文件預期的 SHA-256（需要時下載校驗和文件）
+        :return: 十六進位雜湊字串，發佈中沒有校驗資訊時返回空字串
+        """
+        if self.update_sha256 or not self.checksum_url:
+            return self.update_sha256
+
+        response = requests.get(self.checksum_url, timeout=10)
+        response.raise_for_status()
+
+        # 格式為 "<雜湊>  <文件名>" 的列，只有一列時文件名可省略
+        file_name = os.path.basename(urlparse(self.download_url).path)
+        lines = [line.split() for line in response.text.splitlines() if line.strip()]
+        for parts in lines:
+            if (len(parts) == 1 and len(lines) == 1) or (len(parts) > 1 and parts[-1].lstrip('*') == file_name):
+                self.update_sha256 = parts[0].lower()
+                break
+        return self.update_sha256
+
+    def _get_download_dir(self) -> str:
+        """
+        獲取更新文件的下載目錄，同一個版本固定使用同一個目錄，中斷後可繼續下載
+        :return: 目錄路徑
+        """
+        return os.path.join(tempfile.gettempdir(), "text_alignment_tool_updates", self.latest_version or "latest")
+
     def _is_suitable_asset(self, asset_name: str) -> bool:
         """
         檢查資產是否適合當前系統
@@ -225,31 +317,26 @@ class UpdateManager:
         :param complete_callback: 完成回調
         """
         self.update_in_progress = True
-        temp_dir = tempfile.mkdtemp()
-        file_name = os.path.basename(urlparse(url).path)
-        download_path = os.path.join(temp_dir, file_name)
-
-        try:
-            self.logger.info(f"開始下載更新: {url}")
 
-            # 使用流式下載以便報告進度
-            response = requests.get(url, stream=True, timeout=30)
-            response.raise_for_status()
+        def on_progress(progress, downloaded, total_size):
+            # 更新下載進度
+            if progress_callback and total_size > 0:
+                progress_callback(progress, downloaded, total_size)
 
-            total_size = int(response.headers.get('content-length', 0))
-            block_size = 8192  # 8KB 塊大小
-            downloaded = 0
+        try:
+            download_path = None
 
-            with open(download_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=block_size):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
+            # 有差異封包時先下載差異封包，失敗時改為下載完整更新包
+            if self.delta_url:
+                try:
+                    self.logger.info(f"開始下載差異更新: {self.delta_url}")
+                    download_path = self._download_asset(self.delta_url, self.delta_sha256, on_progress)
+                except Exception as e:
+                    self.logger.warning(f"下載差異更新失敗，改為下載完整更新包: {e}")
 
-                        # 更新下載進度
-                        if progress_callback and total_size > 0:
-                            progress = (downloaded / total_size) * 100
-                            progress_callback(progress, downloaded, total_size)
+            if download_path is None:
+                self.logger.info(f"開始下載更新: {url}")
+                download_path = self._download_asset(url, self._resolve_expected_sha256(), on_progress)
 
             self.logger.info(f"更新下載完成: {download_path}")
 
@@ -264,6 +351,27 @@ class UpdateManager:
         finally:
             self.update_in_progress = False
 
+    def _download_asset(self, url: str, expected_sha256: str,
+                        progress_callback: Optional[Callable] = None) -> str:
+        """
+        下載發佈資產到固定的下載目錄（在呼叫的執行緒中同步執行，中斷後可繼續）
+        :param url: 下載URL
+        :param expected_sha256: 預期的 SHA-256，空字串時不校驗
+        :param progress_callback: 進度回調，接收(progress_percent, downloaded_size, total_size)
+        :return: 下載的文件路徑
+        """
+        file_name = os.path.basename(urlparse(url).path)
+        download_path = os.path.join(self._get_download_dir(), file_name)
+        if not expected_sha256:
+            self.logger.warning(f"發佈資料中沒有 {file_name} 的 SHA-256，略過完整性校驗")
+
+        def on_progress(_download_id, progress, downloaded, total_size):
+            if progress_callback:
+                progress_callback(progress, downloaded, total_size)
+
+        segments = self.update_settings.get('download_segments', DEFAULT_DOWNLOAD_SEGMENTS)
+        return FileDownloader().download(url, download_path, on_progress, expected_sha256 or None, segments)
+
     def install_update(self, download_path: str, progress_callback: Optional[Callable] = None,
                      complete_callback: Optional[Callable] = None) -> None:
         """
@@ -294,18 +402,26 @@ class UpdateManager:
         :param complete_callback: 完成回調
         """
         self.update_in_progress = True
-        temp_dir = os.path.dirname(download_path)
-        extract_dir = os.path.join(temp_dir, "extract")
+        # 解壓到與應用程式同一個文件系統的暫存目錄，安裝時只需移動而不必再複製
+        extract_dir = self._get_staging_dir()
 
         try:
-            # 創建提取目錄
-            if not os.path.exists(extract_dir):
-                os.makedirs(extract_dir)
+            # 創建提取目錄（先清除上次留下的內容）
+            shutil.rmtree(extract_dir, ignore_errors=True)
+            os.makedirs(extract_dir)
 
             # 更新進度：10%
             if progress_callback:
                 progress_callback(10, "準備安裝更新...")
 
+            # 差異封包：只更新有變更的文件，無法套用時改為下載並安裝完整更新包
+            if is_delta_package(download_path):
+                if self._install_from_delta(download_path, progress_callback, complete_callback):
+                    return
+                if progress_callback:
+                    progress_callback(10, "差異更新無法套用，下載完整更新包...")
+                download_path = self._download_asset(self.download_url, self._resolve_expected_sha256())
+
             # 檢查文件類型並安裝
             file_ext = os.path.splitext(download_path)[1].lower()
 
@@ -326,22 +442,40 @@ class UpdateManager:
             if complete_callback:
                 complete_callback(False, f"安裝更新時出錯: {str(e)}")
         finally:
+            shutil.rmtree(extract_dir, ignore_errors=True)
             self.update_in_progress = False
 
+    def _get_staging_dir(self) -> str:
+        """
+        獲取更新包的解壓目錄（位於應用程式目錄旁，與應用程式在同一個文件系統）
+        :return: 目錄路徑
+        """
+        return os.path.join(os.path.dirname(self.app_path), ".update_staging")
+
+    @staticmethod
+    def _extract_progress(progress_callback: Optional[Callable]) -> Optional[Callable]:
+        """把解壓進度換算為安裝進度的 20% 到 40%"""
+        if not progress_callback:
+            return None
+
+        def on_progress(done, total):
+            progress_callback(20 + int(20 * done / max(1, total)), "解壓縮更新文件...")
+        return on_progress
+
     def _install_from_zip(self, zip_path: str, extract_dir: str,
                         progress_callback: Optional[Callable],
                         complete_callback: Optional[Callable]) -> None:
         """
         從ZIP文件安裝更新
         """
+        backed_up = False
         try:
             # 更新進度：20%
             if progress_callback:
                 progress_callback(20, "解壓縮更新文件...")
 
-            # 解壓文件
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(extract_dir)
+            # 平行串流解壓到暫存目錄並校驗
+            PackageStager().stage_zip(zip_path, extract_dir, self._extract_progress(progress_callback))
 
             # 更新進度：40%
             if progress_callback:
@@ -349,13 +483,14 @@ class UpdateManager:
 
             # 備份當前版本
             self._backup_current_version()
+            backed_up = True
 
             # 更新進度：60%
             if progress_callback:
                 progress_callback(60, "安裝新版本...")
 
-            # 安裝新版本
-            self._replace_with_new_version(extract_dir)
+            # 安裝新版本（從暫存目錄移動到位）
+            self._replace_with_new_version(extract_dir, move=True)
 
             # 更新進度：80%
             if progress_callback:
@@ -375,6 +510,12 @@ class UpdateManager:
         except Exception as e:
             self.logger.error(f"從ZIP安裝更新時出錯: {e}")
 
+            # 解壓或校驗失敗時尚未修改已安裝的文件，不需要恢復
+            if not backed_up:
+                if complete_callback:
+                    complete_callback(False, f"更新失敗，未修改已安裝的文件: {str(e)}")
+                return
+
             # 如果有錯誤，嘗試恢復備份
             try:
                 self._restore_from_backup()
@@ -385,6 +526,43 @@ class UpdateManager:
             if complete_callback:
                 complete_callback(False, error_msg)
 
+    def _install_from_delta(self, package_path: str, progress_callback: Optional[Callable],
+                            complete_callback: Optional[Callable]) -> bool:
+        """
+        從差異封包安裝更新
+        :return: 是否成功；失敗時已安裝的文件保持原狀，呼叫端應改用完整更新包
+        """
+        try:
+            if progress_callback:
+                progress_callback(20, "套用差異更新...")
+
+            def on_progress(done, total, rel_path):
+                if progress_callback:
+                    progress_callback(20 + int(60 * done / max(1, total)), f"更新 {rel_path}")
+
+            installer = DeltaInstaller(self.app_path, self.backup_path)
+            installer.apply(package_path, self.current_version, on_progress)
+
+            # 更新進度：80%
+            if progress_callback:
+                progress_callback(80, "更新版本信息...")
+
+            # 更新版本號
+            self._update_version_info()
+
+            # 更新進度：100%
+            if progress_callback:
+                progress_callback(100, "更新完成")
+
+            # 完成回調
+            if complete_callback:
+                complete_callback(True, "")
+            return True
+
+        except Exception as e:
+            self.logger.warning(f"無法套用差異更新，改用完整更新包: {e}")
+            return False
+
     def _install_from_exe(self, exe_path: str, progress_callback: Optional[Callable],
                         complete_callback: Optional[Callable]) -> None:
         """
@@ -496,16 +674,14 @@ class UpdateManager:
         """
         從tarball文件安裝更新 (Linux)
         """
+        backed_up = False
         try:
-            import tarfile
-
             # 更新進度：20%
             if progress_callback:
                 progress_callback(20, "解壓縮更新文件...")
 
-            # 解壓文件
-            with tarfile.open(tarball_path) as tar:
-                tar.extractall(path=extract_dir)
+            # 串流解壓到暫存目錄並校驗
+            PackageStager().stage_tarball(tarball_path, extract_dir, self._extract_progress(progress_callback))
 
             # 與_install_from_zip類似的其餘步驟
             # 更新進度：40%
@@ -514,13 +690,14 @@ class UpdateManager:
 
             # 備份當前版本
             self._backup_current_version()
+            backed_up = True
 
             # 更新進度：60%
             if progress_callback:
                 progress_callback(60, "安裝新版本...")
 
-            # 安裝新版本
-            self._replace_with_new_version(extract_dir)
+            # 安裝新版本（從暫存目錄移動到位）
+            self._replace_with_new_version(extract_dir, move=True)
 
             # 更新進度：80%
             if progress_callback:
@@ -540,6 +717,12 @@ class UpdateManager:
         except Exception as e:
             self.logger.error(f"從tarball安裝更新時出錯: {e}")
 
+            # 解壓或校驗失敗時尚未修改已安裝的文件，不需要恢復
+            if not backed_up:
+                if complete_callback:
+                    complete_callback(False, f"更新失敗，未修改已安裝的文件: {str(e)}")
+                return
+
             # 如果有錯誤，嘗試恢復備份
             try:
                 self._restore_from_backup()
@@ -571,8 +754,9 @@ class UpdateManager:
         backup_dir = os.path.join(self.backup_path, f"backup_{timestamp}")
         os.makedirs(backup_dir)
 
-        # 複製當前文件到備份目錄（排除某些不需要備份的目錄和文件）
-        exclude_dirs = ['__pycache__', 'backup', 'temp', 'logs', '.git']
+        # 複製當前文件到備份目錄（排除某些不需要備份的目錄和文件；projects 不會被更新或恢復，也不必備份）
+        # 文件系統支援時使用寫入時複製或硬連結，不實際複製內容
+        exclude_dirs = ['__pycache__', 'backup', 'temp', 'logs', '.git', 'projects']
 
         for item in os.listdir(self.app_path):
             # 跳過排除的目錄
@@ -583,10 +767,7 @@ class UpdateManager:
             dst_path = os.path.join(backup_dir, item)
 
             try:
-                if os.path.isdir(src_path):
-                    shutil.copytree(src_path, dst_path)
-                else:
-                    shutil.copy2(src_path, dst_path)
+                copy_tree_linked(src_path, dst_path)
             except Exception as e:
                 self.logger.warning(f"備份時跳過 {src_path}: {e}")
 
@@ -602,10 +783,11 @@ class UpdateManager:
 
         self.logger.info(f"已備份當前版本到 {backup_dir}")
 
-    def _replace_with_new_version(self, extract_dir: str) -> None:
+    def _replace_with_new_version(self, extract_dir: str, move: bool = False) -> None:
         """
         用新版本替換當前版本
         :param extract_dir: 解壓縮的新版本路徑
+        :param move: 是否直接移動新文件（用於可丟棄的暫存目錄），否則複製（例如從備份恢復）
         """
         # 查找目錄中的主要內容
         # 有時解壓後會有一個嵌套目錄
@@ -616,34 +798,49 @@ class UpdateManager:
         if len(dir_contents) == 1 and os.path.isdir(os.path.join(extract_dir, dir_contents[0])):
             content_dir = os.path.join(extract_dir, dir_contents[0])
 
+        # 被取代的舊文件暫存位置（每次使用新的目錄，避免上次失敗留下的文件造成衝突）
+        replaced_dir = None
+        if move:
+            replaced_dir = tempfile.mkdtemp(prefix=".update_replaced_", dir=os.path.dirname(self.app_path))
+
         # 複製新文件到目標路徑（排除某些目錄）
         exclude_dirs = ['__pycache__', 'backup', 'temp', 'logs', '.git', 'projects']
 
-        for item in os.listdir(content_dir):
-            # 跳過排除的目錄
-            if item in exclude_dirs:
-                continue
-
-            src_path = os.path.join(content_dir, item)
-            dst_path = os.path.join(self.app_path, item)
-
-            try:
-                # 如果目標存在，先移除
-                if os.path.exists(dst_path):
-                    if os.path.isdir(dst_path):
-                        shutil.rmtree(dst_path)
+        try:
+            for item in os.listdir(content_dir):
+                # 跳過排除的目錄
+                if item in exclude_dirs:
+                    continue
+
+                src_path = os.path.join(content_dir, item)
+                dst_path = os.path.join(self.app_path, item)
+
+                try:
+                    # 如果目標存在，先移開（移動時先改名，最後再刪除，縮短應用程式缺少文件的時間）
+                    if os.path.exists(dst_path):
+                        if move:
+                            os.replace(dst_path, os.path.join(replaced_dir, item))
+                        elif os.path.isdir(dst_path):
+                            shutil.rmtree(dst_path)
+                        else:
+                            os.remove(dst_path)
+
+                    # 移動或複製新文件
+                    if move:
+                        try:
+                            os.replace(src_path, dst_path)
+                        except OSError:
+                            # 不同文件系統時無法移動
+                            copy_tree_linked(src_path, dst_path)
                     else:
-                        os.remove(dst_path)
-
-                # 複製新文件
-                if os.path.isdir(src_path):
-                    shutil.copytree(src_path, dst_path)
-                else:
-                    shutil.copy2(src_path, dst_path)
+                        copy_tree_linked(src_path, dst_path)
 
-            except Exception as e:
-                self.logger.error(f"替換文件時出錯 {src_path} -> {dst_path}: {e}")
-                raise
+                except Exception as e:
+                    self.logger.error(f"替換文件時出錯 {src_path} -> {dst_path}: {e}")
+                    raise
+        finally:
+            if replaced_dir:
+                shutil.rmtree(replaced_dir, ignore_errors=True)
 
         self.logger.info("已用新版本替換當前文件")
 
@@ -759,6 +956,9 @@ class UpdateManager:
             python = sys.executable
             script_path = sys.argv[0]
 
+            # 新進程啟動前先寫入尚未保存的配置
+            ConfigManager.flush_all()
+
             # 使用subprocess啟動新進程
             subprocess.Popen([python, script_path], close_fds=True, start_new_session=True)
 
@@ -1,37 +1,191 @@
 """版本檢查模組，負責檢查版本信息和比較版本號"""
 
+import json
 import logging
+import os
 import re
+import threading
+import time
 from typing import Dict, Any, Optional, Tuple
 
 import requests
 
+from utils.file_utils import atomic_write_bytes, get_current_directory
+
+# 發佈資料快取文件（位於程式目錄的 temp 下）
+RELEASE_CACHE_NAME = "release_cache.json"
+
+# 連線失敗時的重試間隔（秒），每次失敗加倍直到上限
+FAILURE_BACKOFF_BASE = 60
+FAILURE_BACKOFF_MAX = 6 * 3600
+# 被限流但回應中沒有重設時間時的等待秒數
+RATE_LIMIT_DEFAULT_WAIT = 3600
+
+# 等待原因（記錄在快取的 retry_reason）
+RETRY_RATE_LIMIT = 'rate_limit'
+RETRY_FAILURE = 'failure'
+
+
+class RateLimitedError(Exception):
+    """GitHub API 限流中，在 retry_at 之前不再發送請求"""
+
+    def __init__(self, message: str, retry_at: float):
+        super().__init__(message)
+        self.retry_at = retry_at
+
 
 class VersionChecker:
-    """版本檢查類，提供版本檢查和比較功能"""
+    """
+    版本檢查類，提供版本檢查和比較功能
+    發佈資料連同 ETag/Last-Modified 快取在磁碟上，之後以條件請求檢查，
+    伺服器返回 304 時直接使用記憶體中已解析的資料（不計入 GitHub 的請求額度）；
+    被限流或連線失敗時在等待期間內不發送請求，改用快取的資料
+    """
 
-    def __init__(self, github_api_url: str):
+    def __init__(self, github_api_url: str, cache_path: Optional[str] = None, timeout: float = 10):
         """
         初始化版本檢查器
         :param github_api_url: GitHub API URL
+        :param cache_path: 發佈資料快取文件路徑，預設為程式目錄下的 temp/release_cache.json
+        :param timeout: 請求逾時秒數
         """
         self.logger = logging.getLogger(self.__class__.__name__)
         self.github_api_url = github_api_url
+        self.cache_path = cache_path or os.path.join(get_current_directory(), "temp", RELEASE_CACHE_NAME)
+        self.timeout = timeout
+
+        # 快取內容：{'url', 'etag', 'last_modified', 'release', 'fetched_at', 'retry_at', 'retry_reason', 'failures'}
+        self._cache: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        # 最後一次查詢是否為 304（資料未改變）
+        self.not_modified = False
+
+    @property
+    def releases_url(self) -> str:
+        """最新發佈的 API URL"""
+        return f"{self.github_api_url}/releases/latest"
+
+    def _load_cache(self) -> Dict[str, Any]:
+        """讀取快取（每個程式只從磁碟讀取一次），URL 不同時視為沒有快取"""
+        if self._cache is None:
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+            except (OSError, ValueError):
+                cache = {}
+            self._cache = cache if cache.get('url') == self.releases_url else {'url': self.releases_url}
+        return self._cache
+
+    def _save_cache(self) -> None:
+        """寫入快取"""
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            atomic_write_bytes(self.cache_path, json.dumps(self._cache, ensure_ascii=False).encode('utf-8'))
+        except OSError as e:
+            self.logger.warning(f"寫入發佈資料快取時出錯: {e}")
+
+    def _rate_limit_retry_at(self, response) -> Optional[float]:
+        """從回應判斷是否被限流，返回可以再次請求的時間"""
+        headers = response.headers
+        if response.status_code not in (403, 429):
+            return None
+        retry_after = headers.get('retry-after')
+        if retry_after and retry_after.isdigit():
+            return time.time() + int(retry_after)
+        if headers.get('x-ratelimit-remaining') == '0':
+            reset = headers.get('x-ratelimit-reset', '')
+            return float(reset) if reset.isdigit() else time.time() + RATE_LIMIT_DEFAULT_WAIT
+        if response.status_code == 429:
+            return time.time() + RATE_LIMIT_DEFAULT_WAIT
+        return None
 
-    def check_latest_version(self) -> Tuple[bool, Dict[str, Any]]:
+    def fetch_latest_release(self, force: bool = False) -> Dict[str, Any]:
+        """
+        獲取最新發佈的原始資料（GitHub API 格式）
+        :param force: 是否忽略連線失敗後的等待時間（使用者手動檢查時）；GitHub 限流期間仍不發送請求
+        :return: 發佈資料；304 或等待期間返回快取的同一個物件
+        :raises RateLimitedError: 限流期間且沒有快取
+        :raises requests.RequestException: 請求失敗（或連線失敗後的等待期間）且沒有快取
+        """
+        with self._lock:
+            cache = self._load_cache()
+            self.not_modified = False
+            now = time.time()
+
+            retry_at = cache.get('retry_at', 0)
+            rate_limited = cache.get('retry_reason', RETRY_RATE_LIMIT) == RETRY_RATE_LIMIT
+            if now < retry_at and (rate_limited or not force):
+                if cache.get('release') is not None:
+                    self.logger.debug("等待期間內，使用快取的發佈資料")
+                    self.not_modified = True
+                    return cache['release']
+                if rate_limited:
+                    raise RateLimitedError(f"GitHub API 限流，{int(retry_at - now)} 秒後再試", retry_at)
+                raise requests.ConnectionError(f"最近連線失敗，{int(retry_at - now)} 秒後再自動重試")
+
+            headers = {'Accept': 'application/vnd.github+json'}
+            if cache.get('release') is not None:
+                if cache.get('etag'):
+                    headers['If-None-Match'] = cache['etag']
+                if cache.get('last_modified'):
+                    headers['If-Modified-Since'] = cache['last_modified']
+
+            self.logger.debug(f"檢查最新版本，API URL: {self.releases_url}")
+            try:
+                response = requests.get(self.releases_url, headers=headers, timeout=self.timeout)
+
+                if response.status_code == 304 and cache.get('release') is not None:
+                    # 資料未改變：不解析任何內容，也不需要重寫快取
+                    self.not_modified = True
+                    cache['fetched_at'] = now
+                    if cache.get('failures') or cache.get('retry_at'):
+                        cache.update(failures=0, retry_at=0)
+                        self._save_cache()
+                    return cache['release']
+
+                retry_at = self._rate_limit_retry_at(response)
+                if retry_at is not None:
+                    cache.update(retry_at=retry_at, retry_reason=RETRY_RATE_LIMIT)
+                    self._save_cache()
+                    self.logger.warning(f"GitHub API 限流，{int(retry_at - now)} 秒後再試")
+                    if cache.get('release') is not None:
+                        self.not_modified = True
+                        return cache['release']
+                    raise RateLimitedError("GitHub API 限流", retry_at)
+
+                response.raise_for_status()
+                release = response.json()
+                cache.update(
+                    etag=response.headers.get('etag', ''),
+                    last_modified=response.headers.get('last-modified', ''),
+                    release=release,
+                    fetched_at=now,
+                    retry_at=0,
+                    failures=0,
+                )
+                self._save_cache()
+                return release
+
+            except requests.RequestException as e:
+                # 連線失敗：指數退避，期間內使用快取
+                failures = cache.get('failures', 0) + 1
+                cache.update(failures=failures, retry_reason=RETRY_FAILURE,
+                             retry_at=now + min(FAILURE_BACKOFF_BASE * 2 ** (failures - 1), FAILURE_BACKOFF_MAX))
+                self._save_cache()
+                if cache.get('release') is not None:
+                    self.logger.warning(f"檢查最新版本失敗，使用快取的發佈資料: {e}")
+                    self.not_modified = True
+                    return cache['release']
+                raise
+
+    def check_latest_version(self, force: bool = False) -> Tuple[bool, Dict[str, Any]]:
         """
         檢查最新版本
+        :param force: 是否忽略連線失敗後的等待時間
         :return: 元組 (成功, 版本信息)
         """
         try:
-            # 發送請求獲取最新版本信息
-            releases_url = f"{self.github_api_url}/releases/latest"
-            self.logger.debug(f"檢查最新版本，API URL: {releases_url}")
-
-            response = requests.get(releases_url, timeout=10)
-            response.raise_for_status()
-
-            release_data = response.json()
+            release_data = self.fetch_latest_release(force)
 
             # 解析版本信息
             version_info = {
@@ -59,9 +213,11 @@ class VersionChecker:
         for asset in assets:
             name = asset.get('name', '')
             if name:
+                digest = asset.get('digest') or ''
                 result[name] = {
                     'url': asset.get('browser_download_url', ''),
                     'size': asset.get('size', 0),
+                    'sha256': digest.split(':', 1)[1].lower() if digest.lower().startswith('sha256:') else '',
                     'created_at': asset.get('created_at', ''),
                     'download_count': asset.get('download_count', 0),
                     'content_type': asset.get('content_type', ''),
@@ -0,0 +1,282 @@
+# cue_index.py
+"""字幕時間區間索引，提供時間點到字幕的 O(log n) 查詢"""
+import logging
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+_NEG_INF = float('-inf')
+
+
+class CueIntervalIndex:
+    """
+    字幕區間索引
+    以開始時間排序的陣列搭配結束時間的最大值線段樹，
+    支援時間點、時間範圍與相鄰字幕查詢，並可在邊界移動時增量更新
+    """
+
+    def __init__(self, cues: Optional[Iterable[Tuple[int, int, Hashable]]] = None):
+        """
+        初始化區間索引
+        :param cues: (開始毫秒, 結束毫秒, 鍵) 的序列，鍵通常為樹狀視圖項目 ID
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._keys: List[Hashable] = []
+        self._positions: Dict[Hashable, int] = {}
+        self._size = 1
+        self._max_end: List[float] = [_NEG_INF, _NEG_INF]
+
+        if cues is not None:
+            self.build(cues)
+
+    def build(self, cues: Iterable[Tuple[int, int, Hashable]]) -> None:
+        """
+        重建索引
+        :param cues: (開始毫秒, 結束毫秒, 鍵) 的序列
+        """
+        ordered = sorted(cues, key=lambda cue: (cue[0], cue[1]))
+        self._starts = [int(cue[0]) for cue in ordered]
+        self._ends = [int(cue[1]) for cue in ordered]
+        self._keys = [cue[2] for cue in ordered]
+        self._positions = {key: i for i, key in enumerate(self._keys)}
+        self._build_tree()
+
+    def clear(self) -> None:
+        """清空索引"""
+        self.build([])
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._positions
+
+    def get_interval(self, key: Hashable) -> Optional[Tuple[int, int]]:
+        """
+        獲取字幕的時間區間
+        :param key: 字幕鍵
+        :return: (開始毫秒, 結束毫秒)，不存在時回傳 None
+        """
+        position = self._positions.get(key)
+        if position is None:
+            return None
+        return self._starts[position], self._ends[position]
+
+    # ------------------------------------------------------------------
+    # 查詢
+    # ------------------------------------------------------------------
+    def find_at(self, time_ms: int) -> Optional[Hashable]:
+        """
+        查詢包含指定時間點的字幕（區間為 [開始, 結束)），重疊時回傳開始時間最晚者
+        :param time_ms: 時間（毫秒）
+        :return: 字幕鍵，沒有包含該時間的字幕時回傳 None
+        """
+        last = bisect_right(self._starts, time_ms) - 1
+        if last < 0:
+            return None
+        position = self._rightmost_ending_after(1, 0, self._size, last, time_ms)
+        return self._keys[position] if position >= 0 else None
+
+    def find_range(self, start_ms: int, end_ms: int) -> List[Hashable]:
+        """
+        查詢與時間範圍 [start_ms, end_ms) 相交的所有字幕
+        :param start_ms: 範圍開始（毫秒）
+        :param end_ms: 範圍結束（毫秒）
+        :return: 依開始時間排序的字幕鍵列表
+        """
+        limit = bisect_left(self._starts, end_ms) - 1
+        result: List[int] = []
+        if limit >= 0:
+            self._collect_ending_after(1, 0, self._size, limit, start_ms, result)
+        return [self._keys[position] for position in result]
+
+    def previous(self, time_ms: int) -> Optional[Hashable]:
+        """
+        查詢在指定時間之前（含）開始的最後一個字幕
+        :param time_ms: 時間（毫秒）
+        :return: 字幕鍵或 None
+        """
+        position = bisect_right(self._starts, time_ms) - 1
+        return self._keys[position] if position >= 0 else None
+
+    def next(self, time_ms: int) -> Optional[Hashable]:
+        """
+        查詢在指定時間之後開始的第一個字幕
+        :param time_ms: 時間（毫秒）
+        :return: 字幕鍵或 None
+        """
+        position = bisect_right(self._starts, time_ms)
+        return self._keys[position] if position < len(self._keys) else None
+
+    def nearest(self, time_ms: int) -> Optional[Hashable]:
+        """
+        查詢最接近指定時間的字幕：優先回傳包含該時間的字幕，
+        否則比較前一字幕的結束與下一字幕的開始，取距離較近者
+        :param time_ms: 時間（毫秒）
+        :return: 字幕鍵或 None
+        """
+        containing = self.find_at(time_ms)
+        if containing is not None:
+            return containing
+
+        after = bisect_right(self._starts, time_ms)
+        before = after - 1
+        if before < 0:
+            return self._keys[after] if after < len(self._keys) else None
+        if after >= len(self._keys):
+            return self._keys[before]
+
+        if time_ms - self._ends[before] <= self._starts[after] - time_ms:
+            return self._keys[before]
+        return self._keys[after]
+
+    def neighbours(self, key: Hashable) -> Tuple[Optional[Hashable], Optional[Hashable]]:
+        """
+        查詢字幕在時間順序上的前一個與後一個字幕
+        :param key: 字幕鍵
+        :return: (前一個字幕鍵, 後一個字幕鍵)
+        """
+        position = self._positions.get(key)
+        if position is None:
+            return None, None
+        prev_key = self._keys[position - 1] if position > 0 else None
+        next_key = self._keys[position + 1] if position + 1 < len(self._keys) else None
+        return prev_key, next_key
+
+    def find_overlaps(self) -> List[Tuple[Hashable, Hashable]]:
+        """
+        找出所有與先前字幕重疊的字幕
+        :return: (先前字幕鍵, 重疊字幕鍵) 列表，先前字幕為目前結束最晚者
+        """
+        overlaps = []
+        latest_end = _NEG_INF
+        latest_position = -1
+        for position, start in enumerate(self._starts):
+            if start < latest_end:
+                overlaps.append((self._keys[latest_position], self._keys[position]))
+            if self._ends[position] > latest_end:
+                latest_end = self._ends[position]
+                latest_position = position
+        return overlaps
+
+    # ------------------------------------------------------------------
+    # 增量更新
+    # ------------------------------------------------------------------
+    def update(self, key: Hashable, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> None:
+        """
+        更新字幕邊界
+        只移動結束時間或開始時間未改變排序時為 O(log n)，否則重新定位該字幕
+        :param key: 字幕鍵
+        :param start_ms: 新的開始時間，None 表示不變
+        :param end_ms: 新的結束時間，None 表示不變
+        """
+        position = self._positions.get(key)
+        if position is None:
+            if start_ms is not None and end_ms is not None:
+                self.insert(start_ms, end_ms, key)
+            return
+
+        new_start = self._starts[position] if start_ms is None else int(start_ms)
+        new_end = self._ends[position] if end_ms is None else int(end_ms)
+
+        if new_start != self._starts[position]:
+            in_order = ((position == 0 or self._starts[position - 1] <= new_start) and
+                        (position + 1 == len(self._starts) or new_start <= self._starts[position + 1]))
+            if not in_order:
+                self.remove(key)
+                self.insert(new_start, new_end, key)
+                return
+            self._starts[position] = new_start
+
+        if new_end != self._ends[position]:
+            self._ends[position] = new_end
+            self._set_leaf(position, new_end)
+
+    def insert(self, start_ms: int, end_ms: int, key: Hashable) -> None:
+        """
+        插入字幕
+        :param start_ms: 開始時間（毫秒）
+        :param end_ms: 結束時間（毫秒）
+        :param key: 字幕鍵
+        """
+        if key in self._positions:
+            self.remove(key)
+
+        position = bisect_right(self._starts, start_ms)
+        self._starts.insert(position, int(start_ms))
+        self._ends.insert(position, int(end_ms))
+        self._keys.insert(position, key)
+        self._reindex_from(position)
+        self._build_tree()
+
+    def remove(self, key: Hashable) -> None:
+        """
+        移除字幕
+        :param key: 字幕鍵
+        """
+        position = self._positions.pop(key, None)
+        if position is None:
+            return
+        del self._starts[position]
+        del self._ends[position]
+        del self._keys[position]
+        self._reindex_from(position)
+        self._build_tree()
+
+    # ------------------------------------------------------------------
+    # 線段樹
+    # ------------------------------------------------------------------
+    def _reindex_from(self, position: int) -> None:
+        """更新指定位置之後的鍵位置映射"""
+        for i in range(position, len(self._keys)):
+            self._positions[self._keys[i]] = i
+
+    def _build_tree(self) -> None:
+        """以結束時間建立最大值線段樹"""
+        size = 1
+        while size < len(self._ends):
+            size *= 2
+        self._size = size
+
+        tree = [_NEG_INF] * (2 * size)
+        tree[size:size + len(self._ends)] = self._ends
+        for node in range(size - 1, 0, -1):
+            left, right = tree[2 * node], tree[2 * node + 1]
+            tree[node] = left if left > right else right
+        self._max_end = tree
+
+    def _set_leaf(self, position: int, value: int) -> None:
+        """更新單一葉節點並向上維護最大值"""
+        tree = self._max_end
+        node = self._size + position
+        tree[node] = value
+        node //= 2
+        while node:
+            left, right = tree[2 * node], tree[2 * node + 1]
+            tree[node] = left if left > right else right
+            node //= 2
+
+    def _rightmost_ending_after(self, node: int, lo: int, hi: int, limit: int, time_ms: int) -> int:
+        """在 [0, limit] 中找出結束時間大於 time_ms 的最右位置"""
+        if lo > limit or self._max_end[node] <= time_ms:
+            return -1
+        if hi - lo == 1:
+            return lo
+        mid = (lo + hi) // 2
+        found = self._rightmost_ending_after(2 * node + 1, mid, hi, limit, time_ms)
+        if found >= 0:
+            return found
+        return self._rightmost_ending_after(2 * node, lo, mid, limit, time_ms)
+
+    def _collect_ending_after(self, node: int, lo: int, hi: int, limit: int, time_ms: int,
+                              result: List[int]) -> None:
+        """依序收集 [0, limit] 中結束時間大於 time_ms 的所有位置"""
+        if lo > limit or self._max_end[node] <= time_ms:
+            return
+        if hi - lo == 1:
+            result.append(lo)
+            return
+        mid = (lo + hi) // 2
+        self._collect_ending_after(2 * node, lo, mid, limit, time_ms, result)
+        self._collect_ending_after(2 * node + 1, mid, hi, limit, time_ms, result)
@@ -1,6 +1,7 @@
 import os
 import sys
 import logging
+import tempfile
 
 def get_current_directory() -> str:
     """
@@ -37,4 +38,46 @@ def ensure_directories(base_dir=None) -> None:
         dir_path = os.path.join(base_dir, directory)
         if not os.path.exists(dir_path):
             os.makedirs(dir_path)
-            logger.info(f"創建目錄：{dir_path}")
\ No newline at end of file
+            logger.info(f"創建目錄：{dir_path}")
+
+
+_default_mode = None
+
+
+def _default_file_mode() -> int:
+    """新檔案的預設權限（0o666 扣除 umask，與 open() 建立的檔案相同）；umask 只能以設定的方式讀取，因此只讀一次"""
+    global _default_mode
+    if _default_mode is None:
+        umask = os.umask(0o022)
+        os.umask(umask)
+        _default_mode = 0o666 & ~umask
+    return _default_mode
+
+
+def atomic_write_bytes(path: str, data: bytes) -> None:
+    """
+    以原子方式寫入檔案：先寫到同目錄的暫存檔並同步到磁碟，再以 os.replace 取代目標檔案，
+    寫入過程中斷時目標檔案保持原狀，也不會留下暫存檔；
+    暫存檔由 mkstemp 以 0600 建立，取代前改為原檔案的權限（新檔案依 umask），避免共用資料夾中的檔案變成僅擁有者可讀
+    :param path: 目標檔案路徑
+    :param data: 檔案內容
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except OSError:
+        mode = _default_file_mode()
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
@@ -1,20 +1,90 @@
 """字型管理模組，負責統一管理應用程式中的字型設定"""
 
+import hashlib
+import json
 import logging
+import os
+import sys
+import threading
 import tkinter.font as tkfont
+from concurrent.futures import Future
 from tkinter import ttk
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 from services.config_manager import ConfigManager
+from utils.file_utils import atomic_write_bytes, get_current_directory
+from utils.tk_async import resolve_in_tk
+
+# 字型探測結果（偏好字型、實際使用的字型與目錄指紋）所在的配置區段
+FONT_CACHE_SECTION = "font_cache"
+FONT_CACHE_VERSION = 2
+# 完整的系統字型列表另存於快取目錄，不寫入 config.json
+FONT_FAMILIES_CACHE_NAME = "font_families.json"
+
+# 第一個視窗顯示後多久才在背景重新驗證字型快取（毫秒）
+FONT_REVALIDATE_DELAY_MS = 1500
+
+# 適合中文顯示且較清晰的字型，依偏好排序
+CLEAR_FONTS = (
+    "Microsoft JhengHei",  # 微軟正黑體
+    "Microsoft YaHei",     # 微軟雅黑
+    "PingFang TC",         # 蘋方繁體中文
+    "Noto Sans TC",        # Google Noto Sans 繁體中文
+    "Heiti TC",            # 黑體繁體中文
+    "Arial Unicode MS",    # 具有完整 Unicode 支持的 Arial
+    "Tahoma",              # 較清晰的通用字體
+    "Segoe UI"             # Windows 默認 UI 字體
+)
+
+
+def get_font_directories() -> List[str]:
+    """
+    獲取目前平台的系統與使用者字型目錄
+    :return: 目錄列表（不一定存在）
+    """
+    home = os.path.expanduser("~")
+    if sys.platform.startswith('win'):
+        windows_dir = os.environ.get('WINDIR', r"C:\Windows")
+        local_app_data = os.environ.get('LOCALAPPDATA', os.path.join(home, "AppData", "Local"))
+        return [os.path.join(windows_dir, "Fonts"),
+                os.path.join(local_app_data, "Microsoft", "Windows", "Fonts")]
+    if sys.platform == 'darwin':
+        return ["/System/Library/Fonts", "/Library/Fonts", os.path.join(home, "Library", "Fonts")]
+    return ["/usr/share/fonts", "/usr/local/share/fonts", os.path.join(home, ".fonts"),
+            os.path.join(home, ".local", "share", "fonts")]
+
+
+def font_directories_fingerprint(directories: Optional[List[str]] = None) -> str:
+    """
+    計算字型目錄的指紋：只讀取各目錄與其第一層子目錄的修改時間，不列舉字型檔案，
+    安裝或移除字型時目錄的修改時間會改變
+    :param directories: 字型目錄，預設為 get_font_directories()
+    :return: 指紋字串
+    """
+    digest = hashlib.sha1()
+    for directory in directories or get_font_directories():
+        try:
+            digest.update(f"{directory}:{os.stat(directory).st_mtime_ns}\n".encode('utf-8'))
+            with os.scandir(directory) as entries:
+                for entry in sorted(entries, key=lambda item: item.name):
+                    if entry.is_dir(follow_symlinks=False):
+                        digest.update(f"{entry.name}:{entry.stat().st_mtime_ns}\n".encode('utf-8'))
+        except OSError:
+            digest.update(f"{directory}:-\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+_revalidation_scheduled = False
 
 
 class FontManager:
     """字型管理類別，提供統一的字型設定和管理"""
 
-    def __init__(self, config_manager: Optional[ConfigManager] = None):
+    def __init__(self, config_manager: Optional[ConfigManager] = None, cache_dir: Optional[str] = None):
         """
         初始化字型管理器
         :param config_manager: 配置管理器實例
+        :param cache_dir: 系統字型列表快取的存放目錄，預設為程式目錄下的 temp
         """
         # 設置日誌
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -33,6 +103,13 @@ class FontManager:
         # 從配置文件加載設定
         self.load_from_config()
 
+        # 使用上次探測的結果替換不存在的字型，啟動時不列舉系統字型
+        self.preferred_family = self.default_family
+        self._cache_store: Optional[ConfigManager] = None
+        self.families_cache_path = os.path.join(cache_dir or os.path.join(get_current_directory(), "temp"),
+                                                FONT_FAMILIES_CACHE_NAME)
+        self.apply_cached_font_choice()
+
         self.logger.debug(f"字型管理器初始化完成，默認字型：{self.default_family}, 大小：{self.default_size}")
 
     def load_from_config(self) -> None:
@@ -107,27 +184,15 @@ class FontManager:
     def get_clear_fonts(self) -> List[str]:
         """
         獲取系統上較清晰的適合中文顯示的字體列表
+        優先使用快取中的字型列表，沒有快取時才列舉系統字型並寫入快取
         :return: 字體列表
         """
-        clear_fonts = [
-            "Microsoft JhengHei",  # 微軟正黑體
-            "Microsoft YaHei",     # 微軟雅黑
-            "PingFang TC",         # 蘋方繁體中文
-            "Noto Sans TC",        # Google Noto Sans 繁體中文
-            "Heiti TC",            # 黑體繁體中文
-            "Arial Unicode MS",    # 具有完整 Unicode 支持的 Arial
-            "Tahoma",              # 較清晰的通用字體
-            "Segoe UI"             # Windows 默認 UI 字體
-        ]
-
-        # 獲取系統可用字體
-        available_fonts = []
         try:
-            system_fonts = list(tkfont.families())
-            for font in clear_fonts:
-                if font in system_fonts:
-                    available_fonts.append(font)
+            families = self.get_cached_families()
+            if families is None:
+                families = self.probe_fonts(font_directories_fingerprint())['families']
 
+            available_fonts = [font for font in CLEAR_FONTS if font in families]
             if not available_fonts:
                 # 如果沒有找到推薦字型，使用系統默認
                 self.logger.warning("找不到推薦的清晰字型，使用系統默認字型")
@@ -139,6 +204,148 @@ class FontManager:
             self.logger.error(f"獲取清晰字型列表時出錯: {e}")
             return ["TkDefaultFont"]  # 如果出錯，使用 Tk 默認字型
 
+    def _get_cache_store(self) -> ConfigManager:
+        """獲取存放字型快取的配置管理器"""
+        if self._cache_store is None:
+            self._cache_store = self.config or ConfigManager()
+        return self._cache_store
+
+    def _load_font_cache(self) -> Dict:
+        """
+        讀取字型探測快取
+        :return: 快取內容，版本不符或不存在時返回空字典
+        """
+        try:
+            cache = self._get_cache_store().get_config().get(FONT_CACHE_SECTION) or {}
+            if cache.get('version') != FONT_CACHE_VERSION:
+                return {}
+            return cache
+        except Exception as e:
+            self.logger.error(f"讀取字型快取時出錯: {e}")
+            return {}
+
+    def get_cached_families(self) -> Optional[List[str]]:
+        """
+        獲取快取中的系統字型列表
+        :return: 字型列表，尚未探測過或列表與配置中的指紋不一致時返回 None
+        """
+        fingerprint = self._load_font_cache().get('fingerprint')
+        if not fingerprint:
+            return None
+        try:
+            with open(self.families_cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            families = cache.get('families')
+            if cache.get('version') != FONT_CACHE_VERSION or cache.get('fingerprint') != fingerprint:
+                return None
+            return list(families) if isinstance(families, list) else None
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def _store_families(self, fingerprint: str, families: List[str]) -> None:
+        """把系統字型列表寫入快取目錄"""
+        data = {'version': FONT_CACHE_VERSION, 'fingerprint': fingerprint, 'families': families}
+        try:
+            os.makedirs(os.path.dirname(self.families_cache_path), exist_ok=True)
+            atomic_write_bytes(self.families_cache_path, json.dumps(data, ensure_ascii=False).encode('utf-8'))
+        except OSError as e:
+            self.logger.error(f"保存字型列表快取時出錯: {e}")
+
+    def _resolve_family(self, families: List[str]) -> str:
+        """
+        依系統字型列表決定實際使用的字型
+        :param families: 系統字型列表
+        :return: 偏好字型存在時返回偏好字型，否則返回第一個可用的清晰字型
+        """
+        if self.preferred_family in families:
+            return self.preferred_family
+        for font in CLEAR_FONTS:
+            if font in families:
+                return font
+        return self.preferred_family
+
+    def _set_family(self, family: str) -> None:
+        """更新目前使用的字型並清除字型緩存"""
+        if family != self.default_family:
+            self.logger.debug(f"字型 {self.default_family} 改為 {family}")
+            self.default_family = family
+            self.fonts = {}
+
+    def apply_cached_font_choice(self) -> None:
+        """使用快取中對應目前偏好字型的探測結果，沒有快取時維持偏好字型"""
+        cache = self._load_font_cache()
+        if cache.get('preferred') == self.preferred_family and cache.get('resolved'):
+            self._set_family(cache['resolved'])
+
+    def probe_fonts(self, fingerprint: str, master=None) -> Dict:
+        """
+        列舉系統字型並更新快取（必須在 Tk 執行緒中呼叫）
+        :param fingerprint: 字型目錄指紋
+        :param master: Tk 元件，預設為目前的根視窗
+        :return: 新的快取內容，另外以 families 附上系統字型列表
+        """
+        families = sorted(set(tkfont.families(master)))
+        cache = {
+            'version': FONT_CACHE_VERSION,
+            'fingerprint': fingerprint,
+            'preferred': self.preferred_family,
+            'resolved': self._resolve_family(families),
+        }
+        self._store_families(fingerprint, families)
+        self._get_cache_store().set_section(FONT_CACHE_SECTION, cache)
+        self._set_family(cache['resolved'])
+        self.logger.info(f"已更新字型快取: {len(families)} 個字型，使用 {cache['resolved']}")
+        return dict(cache, families=families)
+
+    def revalidate_cache(self, master) -> None:
+        """
+        在背景重新驗證字型快取：背景執行緒計算字型目錄指紋，
+        指紋改變時才回到 Tk 執行緒重新列舉字型；偏好字型改變時以快取的字型列表重新決定
+        :param master: Tk 元件
+        """
+        future: Future = Future()
+
+        def compute():
+            try:
+                future.set_result(font_directories_fingerprint())
+            except Exception as e:
+                future.set_exception(e)
+
+        def on_fingerprint(fingerprint: str):
+            try:
+                cache = self._load_font_cache()
+                families = self.get_cached_families()
+                if cache.get('fingerprint') != fingerprint or families is None:
+                    self.probe_fonts(fingerprint, master)
+                elif cache.get('preferred') != self.preferred_family:
+                    cache = dict(cache, preferred=self.preferred_family,
+                                 resolved=self._resolve_family(families))
+                    self._get_cache_store().set_section(FONT_CACHE_SECTION, cache)
+                    self._set_family(cache['resolved'])
+                else:
+                    self.logger.debug("字型快取仍然有效")
+            except Exception as e:
+                self.logger.error(f"重新驗證字型快取時出錯: {e}")
+
+        threading.Thread(target=compute, name="FontCacheRevalidate", daemon=True).start()
+        resolve_in_tk(master, future, on_fingerprint,
+                      lambda e: self.logger.error(f"計算字型目錄指紋時出錯: {e}"), poll_ms=50)
+
+    def schedule_revalidation(self, master, delay_ms: int = FONT_REVALIDATE_DELAY_MS) -> None:
+        """
+        在視窗顯示後排程一次字型快取驗證（整個程式只執行一次）
+        :param master: Tk 元件
+        :param delay_ms: 延遲毫秒數
+        """
+        global _revalidation_scheduled
+        if _revalidation_scheduled:
+            return
+        _revalidation_scheduled = True
+        try:
+            master.after(delay_ms, lambda: self.revalidate_cache(master))
+        except Exception as e:
+            self.logger.error(f"排程字型快取驗證時出錯: {e}")
+
     def save_settings(self, family: str, size: int) -> bool:
         """
         保存字型設定到配置文件
@@ -158,6 +365,7 @@ class FontManager:
             self.config.save_config()
 
             # 更新當前設定
+            self.preferred_family = family
             self.default_family = family
             self.default_size = size
 
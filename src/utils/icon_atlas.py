@@ -0,0 +1,246 @@
+"""圖示圖集模組，把各尺寸的圖示預先縮放後合併為一張圖片並快取在磁碟上"""
+
+import io
+import json
+import logging
+import os
+import threading
+import tkinter as tk
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.file_utils import atomic_write_bytes, get_current_directory
+
+ATLAS_VERSION = 1
+ATLAS_IMAGE_NAME = "icon_atlas.png"
+ATLAS_INDEX_NAME = "icon_atlas.json"
+ATLAS_MAX_WIDTH = 1024
+ATLAS_PADDING = 1
+
+# 圖示尺寸：(寬, 高)，其中一項為 None 時依原圖比例計算，兩項皆為 None 時使用原始尺寸
+IconSize = Tuple[Optional[int], Optional[int]]
+IconRequest = Tuple[str, IconSize]
+
+
+def _entry_key(path: str, size: IconSize) -> str:
+    """圖集索引中的鍵：來源路徑與要求的尺寸"""
+    width, height = size
+    return f"{os.path.normcase(os.path.abspath(path))}|{width or 'auto'}x{height or 'auto'}"
+
+
+def _source_signature(path: str) -> Optional[Tuple[int, int]]:
+    """來源檔案的 (修改時間, 大小)，檔案不存在時返回 None"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _target_size(source_size: Tuple[int, int], size: IconSize) -> Tuple[int, int]:
+    """依要求的尺寸計算縮放後的尺寸（與 ImageManager.get_image 的規則相同）"""
+    width, height = size
+    source_width, source_height = source_size
+    if width and height:
+        return width, height
+    if width:
+        return width, max(1, int(source_height * width / source_width))
+    if height:
+        return max(1, int(source_width * height / source_height)), height
+    return source_width, source_height
+
+
+class IconAtlas:
+    """
+    圖示圖集
+    第一次要求某個圖示尺寸時以 PIL 縮放並重建圖集，之後啟動時只需載入圖集一次，
+    以 Tk 原生的 PNG 支援讀取並切出各個 PhotoImage，不需開啟個別圖檔也不需載入 PIL；
+    每個項目記錄來源檔案的修改時間與大小，來源變更時重新產生
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        初始化圖示圖集
+        :param cache_dir: 圖集存放目錄，預設為程式目錄下的 temp
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.cache_dir = cache_dir or os.path.join(get_current_directory(), "temp")
+        self.image_path = os.path.join(self.cache_dir, ATLAS_IMAGE_NAME)
+        self.index_path = os.path.join(self.cache_dir, ATLAS_INDEX_NAME)
+
+        self._entries: Dict[str, Dict] = self._load_index()
+        # 目前 Tk 直譯器中的圖集圖片與已切出的圖示
+        self._interp = None
+        self._atlas_photo: Optional[tk.PhotoImage] = None
+        self._photos: Dict[str, tk.PhotoImage] = {}
+
+    def _load_index(self) -> Dict[str, Dict]:
+        """載入圖集索引，索引與圖集圖片不一致時視為空圖集"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('version') != ATLAS_VERSION:
+                return {}
+            if os.path.getsize(self.image_path) != index.get('image_size'):
+                return {}
+            return index.get('entries', {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def _is_valid(self, key: str, path: str) -> bool:
+        """檢查圖集中的項目是否存在且來源檔案未變更"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        signature = _source_signature(path)
+        return signature is not None and [entry['mtime_ns'], entry['source_size']] == list(signature)
+
+    def get_icon(self, path: str, size: IconSize, master: Optional[tk.Misc] = None) -> Optional[tk.PhotoImage]:
+        """
+        獲取單一圖示
+        :param path: 來源圖檔路徑
+        :param size: 要求的尺寸
+        :param master: Tk 元件，預設為目前的根視窗
+        :return: PhotoImage，來源不存在或無法產生時返回 None
+        """
+        return self.get_icons([(path, size)], master).get((path, size))
+
+    def get_icons(self, requests: Iterable[IconRequest],
+                  master: Optional[tk.Misc] = None) -> Dict[IconRequest, tk.PhotoImage]:
+        """
+        一次獲取多個圖示，缺少或過期的項目會一起產生並只重建圖集一次
+        :param requests: [(來源圖檔路徑, 尺寸)]
+        :param master: Tk 元件，預設為目前的根視窗
+        :return: {(來源圖檔路徑, 尺寸): PhotoImage}，無法產生的圖示不在結果中
+        """
+        requests = [(path, tuple(size)) for path, size in requests]
+        missing = [(path, size) for path, size in requests
+                   if os.path.exists(path) and not self._is_valid(_entry_key(path, size), path)]
+        if missing and not self._rebuild(missing):
+            return {}
+
+        result = {}
+        for path, size in requests:
+            photo = self._slice(_entry_key(path, size), master)
+            if photo is not None:
+                result[(path, size)] = photo
+        return result
+
+    def _slice(self, key: str, master: Optional[tk.Misc]) -> Optional[tk.PhotoImage]:
+        """從圖集切出一個圖示"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        master = master or tk._default_root
+        if master is None:
+            return None
+        interp = master.tk
+        try:
+            if self._interp is not interp or self._atlas_photo is None:
+                # 換了 Tk 直譯器（例如登入視窗關閉後開啟新的根視窗）時重新載入圖集
+                self._atlas_photo = tk.PhotoImage(master=master, file=self.image_path)
+                self._interp = interp
+                self._photos = {}
+
+            photo = self._photos.get(key)
+            if photo is None:
+                x, y, width, height = entry['x'], entry['y'], entry['width'], entry['height']
+                photo = tk.PhotoImage(master=master, width=width, height=height)
+                photo.tk.call(photo, 'copy', self._atlas_photo, '-from', x, y, x + width, y + height, '-to', 0, 0)
+                self._photos[key] = photo
+            return photo
+        except tk.TclError as e:
+            self.logger.warning(f"從圖示圖集切出圖示時出錯: {e}")
+            return None
+
+    def _rebuild(self, missing: List[IconRequest]) -> bool:
+        """
+        產生缺少的圖示並重建圖集（保留仍有效的項目）
+        :param missing: 需要產生的圖示
+        :return: 是否成功
+        """
+        try:
+            from PIL import Image
+        except ImportError as e:
+            self.logger.warning(f"無法建立圖示圖集: {e}")
+            return False
+
+        images: Dict[str, Tuple[Image.Image, Dict]] = {}
+        try:
+            # 保留仍有效的項目
+            if self._entries and os.path.exists(self.image_path):
+                with Image.open(self.image_path) as atlas:
+                    atlas.load()
+                    for key, entry in self._entries.items():
+                        if self._is_valid(key, entry['source']):
+                            x, y = entry['x'], entry['y']
+                            crop = atlas.crop((x, y, x + entry['width'], y + entry['height']))
+                            images[key] = (crop, entry)
+
+            for path, size in missing:
+                signature = _source_signature(path)
+                if signature is None:
+                    continue
+                with Image.open(path) as source:
+                    source = source.convert('RGBA')
+                    target_size = _target_size(source.size, size)
+                    if target_size != source.size:
+                        source = source.resize(target_size, Image.LANCZOS)
+                images[_entry_key(path, size)] = (source, {
+                    'source': os.path.abspath(path),
+                    'mtime_ns': signature[0],
+                    'source_size': signature[1],
+                })
+        except Exception as e:
+            self.logger.error(f"產生圖示時出錯: {e}")
+            return False
+
+        # 依高度排序後逐列排放
+        entries = {}
+        x = y = row_height = atlas_width = 0
+        for key, (image, entry) in sorted(images.items(), key=lambda item: -item[1][0].height):
+            if x and x + image.width > ATLAS_MAX_WIDTH:
+                x, y = 0, y + row_height + ATLAS_PADDING
+                row_height = 0
+            entries[key] = dict(entry, x=x, y=y, width=image.width, height=image.height)
+            x += image.width + ATLAS_PADDING
+            row_height = max(row_height, image.height)
+            atlas_width = max(atlas_width, x)
+
+        atlas = Image.new('RGBA', (max(1, atlas_width), max(1, y + row_height)), (0, 0, 0, 0))
+        for key, (image, _) in images.items():
+            atlas.paste(image, (entries[key]['x'], entries[key]['y']))
+
+        buffer = io.BytesIO()
+        atlas.save(buffer, format='PNG')
+        data = buffer.getvalue()
+        index = {'version': ATLAS_VERSION, 'image_size': len(data), 'entries': entries}
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            atomic_write_bytes(self.image_path, data)
+            atomic_write_bytes(self.index_path, json.dumps(index, ensure_ascii=False).encode('utf-8'))
+        except OSError as e:
+            self.logger.error(f"寫入圖示圖集失敗: {e}")
+            return False
+
+        self._entries = entries
+        self._atlas_photo = None
+        self._photos = {}
+        self.logger.info(f"已重建圖示圖集: {len(entries)} 個圖示")
+        return True
+
+
+_shared_atlas: Optional[IconAtlas] = None
+_shared_lock = threading.Lock()
+
+
+def get_icon_atlas() -> IconAtlas:
+    """
+    獲取程式共用的圖示圖集
+    :return: IconAtlas
+    """
+    global _shared_atlas
+    with _shared_lock:
+        if _shared_atlas is None:
+            _shared_atlas = IconAtlas()
+        return _shared_atlas
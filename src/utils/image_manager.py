@@ -2,10 +2,15 @@
 
 import os
 import logging
-from typing import Dict, Optional, Tuple
-from PIL import Image, ImageTk
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 import tkinter as tk
 
+from utils.icon_atlas import get_icon_atlas
+
+# PIL 只在圖集無法提供圖片或需要重新縮放時才載入，不在啟動時匯入
+if TYPE_CHECKING:
+    from PIL import Image, ImageTk
+
 class ImageManager:
     """圖片資源管理類別，提供統一的圖片資源管理和大小調整功能"""
 
@@ -27,8 +32,8 @@ class ImageManager:
             self.root_dir = root_dir
 
         # 圖片緩存
-        self.images: Dict[str, ImageTk.PhotoImage] = {}
-        self.pil_images: Dict[str, Image.Image] = {}  # 保存 PIL 圖片對象
+        self.images: Dict[str, "ImageTk.PhotoImage"] = {}
+        self.pil_images: Dict[str, "Image.Image"] = {}  # 保存 PIL 圖片對象
 
         # 按鈕圖片配置 - 正常和按下狀態的圖片
         self.button_images = {
@@ -48,6 +53,11 @@ class ImageManager:
         :param height: 指定高度，如不指定則使用原始高度
         """
         try:
+            # 一次從圖示圖集取得所有按鈕圖片（缺少的尺寸只重建圖集一次）
+            size = (width, height)
+            get_icon_atlas().get_icons([(os.path.join(self.root_dir, name), size)
+                                        for names in self.button_images.values() for name in names])
+
             for button_id, (normal_img, pressed_img) in self.button_images.items():
                 self.get_image(normal_img, f"{button_id}_normal", width, height)
                 self.get_image(pressed_img, f"{button_id}_pressed", width, height)
@@ -56,7 +66,7 @@ class ImageManager:
             self.logger.error(f"預載入按鈕圖片時出錯: {e}")
 
     def get_image(self, image_name: str, cache_key: Optional[str] = None,
-                  width: Optional[int] = None, height: Optional[int] = None) -> Optional[ImageTk.PhotoImage]:
+                  width: Optional[int] = None, height: Optional[int] = None) -> Optional["ImageTk.PhotoImage"]:
         """
         獲取圖片，可選擇調整大小，如果已經緩存則直接返回緩存的圖片
         :param image_name: 圖片文件名
@@ -81,7 +91,14 @@ class ImageManager:
                 self.logger.error(f"圖片文件不存在: {image_path}")
                 return None
 
-            # 使用 PIL 載入圖片，以便調整大小
+            # 優先使用圖示圖集中預先縮放的圖片
+            tk_image = get_icon_atlas().get_icon(image_path, (width, height))
+            if tk_image is not None:
+                self.images[key] = tk_image
+                return tk_image
+
+            # 圖集無法使用時才以 PIL 載入圖片，以便調整大小
+            from PIL import Image, ImageTk
             pil_image = Image.open(image_path)
             self.pil_images[image_name] = pil_image
 
@@ -108,7 +125,7 @@ class ImageManager:
             self.logger.error(f"載入圖片 {image_name} 失敗: {e}")
             return None
 
-    def get_button_images(self, button_id: str, width=None, height=None) -> Tuple[Optional[ImageTk.PhotoImage], Optional[ImageTk.PhotoImage]]:
+    def get_button_images(self, button_id: str, width=None, height=None) -> Tuple[Optional["ImageTk.PhotoImage"], Optional["ImageTk.PhotoImage"]]:
         """
         獲取按鈕的正常和按下狀態圖片
         :param button_id: 按鈕 ID
@@ -130,7 +147,7 @@ class ImageManager:
 
         return normal_photo, pressed_photo
 
-    def resize_image(self, image_name: str, width: int, height: int, cache_key: Optional[str] = None) -> Optional[ImageTk.PhotoImage]:
+    def resize_image(self, image_name: str, width: int, height: int, cache_key: Optional[str] = None) -> Optional["ImageTk.PhotoImage"]:
         """
         調整圖片大小
         :param image_name: 圖片文件名或緩存鍵
@@ -147,6 +164,8 @@ class ImageManager:
             return self.images[key]
 
         try:
+            from PIL import Image, ImageTk
+
             # 先檢查是否已經載入原始 PIL 圖片
             if image_name in self.pil_images:
                 pil_image = self.pil_images[image_name]
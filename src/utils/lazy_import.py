@@ -0,0 +1,70 @@
+"""延遲匯入工具模組，讓較重的第三方套件在第一次使用時才載入"""
+
+import importlib
+import sys
+import threading
+from typing import Any
+
+
+class LazyModule:
+    """
+    模組代理
+    第一次存取屬性時才匯入真正的模組，之後的存取直接轉交給該模組；
+    套件未安裝時在第一次使用時才拋出 ImportError
+    """
+
+    __slots__ = ('_name', '_module', '_lock')
+
+    def __init__(self, name: str):
+        """
+        初始化模組代理
+        :param name: 模組完整名稱，例如 'numpy'、'PIL.Image'
+        """
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_module', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def _load(self):
+        """匯入並返回真正的模組"""
+        module = self._module
+        if module is None:
+            with self._lock:
+                module = self._module
+                if module is None:
+                    module = importlib.import_module(self._name)
+                    object.__setattr__(self, '_module', module)
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_module(name: str) -> Any:
+    """
+    獲取延遲匯入的模組
+    :param name: 模組完整名稱
+    :return: 模組已匯入時直接返回該模組，否則返回 LazyModule 代理
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def is_loaded(name: str) -> bool:
+    """
+    檢查模組是否已實際匯入
+    :param name: 模組完整名稱
+    :return: 是否已匯入
+    """
+    return name in sys.modules
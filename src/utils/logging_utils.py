@@ -1,14 +1,25 @@
-from asyncio.log import logger
 import logging
+import os
 import sys
 
-def setup_logging(log_file="debug.log"):
-
+from utils.file_utils import get_current_directory
 
+# 與 asyncio.log.logger 為同一個記錄器，不需要為此載入 asyncio
+logger = logging.getLogger("asyncio")
 
+def setup_logging(log_file=None):
+    """
+    設定應用程式日誌
+    :param log_file: 日誌檔案路徑，預設為 logs/debug.log（不寫到目前的工作目錄）
+    :return: 記錄器
+    """
     if not logger.handlers:  # 避免重複添加處理器
         logger.setLevel(logging.DEBUG)
 
+        if log_file is None:
+            log_file = os.path.join(get_current_directory(), "logs", "debug.log")
+        os.makedirs(os.path.dirname(os.path.abspath(log_file)), exist_ok=True)
+
         # 檔案處理器
         file_handler = logging.FileHandler(log_file, encoding='utf-8')
         file_handler.setLevel(logging.DEBUG)
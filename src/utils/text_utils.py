@@ -1,17 +1,26 @@
-import opencc
 import csv
 import os
 import logging
+from functools import lru_cache
 from typing import Dict
 
+from utils.lazy_import import lazy_module
+
+# opencc 在第一次轉換時才載入
+opencc = lazy_module('opencc')
+
+@lru_cache(maxsize=None)
+def _get_converter(config: str) -> "opencc.OpenCC":
+    """獲取共用的 OpenCC 轉換器（建立時需要載入字典，只建立一次）"""
+    return opencc.OpenCC(config)
+
 def simplify_to_traditional(simplified_text: str) -> str:
     """
     將簡體中文轉換為繁體中文
     :param simplified_text: 簡體中文文本
     :return: 繁體中文文本
     """
-    converter = opencc.OpenCC('s2twp')
-    return converter.convert(simplified_text)
+    return _get_converter('s2twp').convert(simplified_text)
 
 def load_correction_database(database_file: str) -> Dict[str, str]:
     """
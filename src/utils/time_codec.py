@@ -0,0 +1,143 @@
+# time_codec.py
+"""
+整數毫秒與 SRT 時間字符串 (HH:MM:SS,mmm) 之間的快速轉換
+結果與 pysrt.SubRipTime 的解析與格式化完全一致，但不建立 SubRipTime 物件
+"""
+import re
+from functools import lru_cache
+from typing import Any, Iterable, List
+
+HOURS_MS = 3600000
+MINUTES_MS = 60000
+SECONDS_MS = 1000
+
+# 標準格式快速路徑：四段純數字，以 : : 與 , 或 . 分隔
+_FAST_TIME = re.compile(r'(\d+):(\d+):(\d+)[,.](\d+)')
+# 與 pysrt.SubRipTime.RE_TIME_SEP 相同的分隔符
+_TIME_SEP = re.compile(r'\:|\.|\,')
+_LEADING_INT = re.compile(r'^(\d+)')
+
+ZERO_TIME = "00:00:00,000"
+
+
+def _parse_int(digits: str) -> int:
+    """與 pysrt.SubRipTime.parse_int 相同：無法轉換時取開頭數字，否則為 0"""
+    try:
+        return int(digits)
+    except ValueError:
+        match = _LEADING_INT.match(digits)
+        if match:
+            return int(match.group())
+        return 0
+
+
+def _split_ms(time_str: str) -> int:
+    """
+    以 pysrt.SubRipTime.from_string 的規則解析時間字符串
+    :param time_str: 時間字符串
+    :return: 毫秒數
+    """
+    items = _TIME_SEP.split(time_str)
+    if len(items) != 4:
+        raise ValueError(f"無效的時間格式: {time_str}")
+    hours, minutes, seconds, milliseconds = (_parse_int(i) for i in items)
+    return hours * HOURS_MS + minutes * MINUTES_MS + seconds * SECONDS_MS + milliseconds
+
+
+def parse_srt_string(time_str: str) -> int:
+    """
+    解析嚴格的 SRT 時間字符串（等同 SubRipTime.from_string）
+    :param time_str: 時間字符串
+    :return: 毫秒數
+    """
+    match = _FAST_TIME.fullmatch(time_str)
+    if match:
+        hours, minutes, seconds, milliseconds = match.groups()
+        return (int(hours) * HOURS_MS + int(minutes) * MINUTES_MS +
+                int(seconds) * SECONDS_MS + int(milliseconds))
+    return _split_ms(time_str)
+
+
+def parse_ms(value: Any) -> int:
+    """
+    將時間值解析為毫秒，規則與 time_utils.parse_time 相同
+    :param value: 時間字符串或帶有 ordinal 屬性的時間對象
+    :return: 毫秒數
+    """
+    # SubRipTime 等時間對象直接取其序數
+    ordinal = getattr(value, 'ordinal', None)
+    if ordinal is not None:
+        return ordinal
+
+    time_str = str(value).strip()
+    if not time_str:
+        return 0
+
+    match = _FAST_TIME.fullmatch(time_str)
+    if match:
+        hours, minutes, seconds, milliseconds = match.groups()
+        return (int(hours) * HOURS_MS + int(minutes) * MINUTES_MS +
+                int(seconds) * SECONDS_MS + int(milliseconds))
+
+    try:
+        if ',' in time_str or '.' in time_str:
+            return _split_ms(time_str)
+
+        parts = time_str.split(':')
+        if len(parts) == 3:  # 00:00:00
+            hours, minutes, seconds = map(float, parts)
+        elif len(parts) == 2:  # 00:00
+            hours = 0
+            minutes, seconds = map(float, parts)
+        else:
+            raise ValueError("無效的時間格式")
+
+        return (int(hours) * HOURS_MS + int(minutes) * MINUTES_MS +
+                int(seconds) * SECONDS_MS + int((seconds % 1) * 1000))
+    except Exception as e:
+        raise ValueError(f"無法解析時間格式: {time_str}, 錯誤: {str(e)}")
+
+
+@lru_cache(maxsize=65536)
+def format_ms(milliseconds: int) -> str:
+    """
+    將毫秒格式化為 SRT 時間字符串，負數與 SubRipTime 一樣顯示為零
+    :param milliseconds: 毫秒數
+    :return: HH:MM:SS,mmm 格式的字符串
+    """
+    if milliseconds < 0:
+        return ZERO_TIME
+    hours, remainder = divmod(milliseconds, HOURS_MS)
+    minutes, remainder = divmod(remainder, MINUTES_MS)
+    seconds, millis = divmod(remainder, SECONDS_MS)
+    return '%02d:%02d:%02d,%03d' % (hours, minutes, seconds, millis)
+
+
+def parse_many(values: Iterable[Any]) -> List[int]:
+    """
+    批次解析時間值，用於整個檔案的處理
+    :param values: 時間字符串或時間對象的序列
+    :return: 毫秒數列表
+    """
+    fast = _FAST_TIME.fullmatch
+    result = []
+    append = result.append
+    for value in values:
+        if isinstance(value, str):
+            match = fast(value)
+            if match:
+                hours, minutes, seconds, milliseconds = match.groups()
+                append(int(hours) * HOURS_MS + int(minutes) * MINUTES_MS +
+                       int(seconds) * SECONDS_MS + int(milliseconds))
+                continue
+        append(parse_ms(value))
+    return result
+
+
+def format_many(values: Iterable[int]) -> List[str]:
+    """
+    批次格式化毫秒數
+    :param values: 毫秒數序列（支援 numpy 陣列）
+    :return: 時間字符串列表
+    """
+    return [format_ms(int(value)) for value in values]
@@ -3,6 +3,8 @@ import logging
 import pysrt
 from typing import Any, Union
 
+from utils.time_codec import format_ms, parse_ms, parse_srt_string
+
 
 def parse_time(time_str: str) -> Any:
     """
@@ -10,48 +12,12 @@ def parse_time(time_str: str) -> Any:
     :param time_str: 時間字符串
     :return: 解析後的時間對象
     """
-    try:
-        # 如果已經是 SubRipTime 對象則直接返回
-        if isinstance(time_str, pysrt.SubRipTime):
-            return time_str
-
-        # 清理時間字符串
-        time_str = str(time_str).strip()
-
-        # 處理空字符串
-        if not time_str:
-            return pysrt.SubRipTime(0, 0, 0, 0)
-
-        # 標準 SRT 時間格式處理
-        try:
-            if ',' in time_str:  # 標準 SRT 格式 (00:00:00,000)
-                return pysrt.SubRipTime.from_string(time_str)
-            elif '.' in time_str:  # 替代格式 (00:00:00.000)
-                time_str = time_str.replace('.', ',')
-                return pysrt.SubRipTime.from_string(time_str)
-            else:  # 嘗試解析其他格式
-                parts = time_str.split(':')
-                if len(parts) == 3:  # 00:00:00
-                    hours, minutes, seconds = map(float, parts)
-                    return pysrt.SubRipTime(
-                        hours=int(hours),
-                        minutes=int(minutes),
-                        seconds=int(seconds),
-                        milliseconds=int((seconds % 1) * 1000)
-                    )
-                elif len(parts) == 2:  # 00:00
-                    minutes, seconds = map(float, parts)
-                    return pysrt.SubRipTime(
-                        hours=0,
-                        minutes=int(minutes),
-                        seconds=int(seconds),
-                        milliseconds=int((seconds % 1) * 1000)
-                    )
-                else:
-                    raise ValueError("無效的時間格式")
-        except Exception as e:
-            raise ValueError(f"無法解析時間格式: {time_str}, 錯誤: {str(e)}")
+    # 如果已經是 SubRipTime 對象則直接返回
+    if isinstance(time_str, pysrt.SubRipTime):
+        return time_str
 
+    try:
+        return pysrt.SubRipTime.from_ordinal(parse_ms(time_str))
     except Exception as e:
         raise ValueError(f"時間解析錯誤: {str(e)}")
 
@@ -63,14 +29,11 @@ def format_time(time_obj: Any) -> str:
     :return: 格式化的時間字符串
     """
     try:
-        # 如果是 SubRipTime 對象，直接轉換為字符串
+        # 如果是 SubRipTime 對象，直接使用其毫秒序數格式化
         if isinstance(time_obj, pysrt.SubRipTime):
-            time_str = str(time_obj)
-            if not time_str:
-                return "00:00:00,000"
-            return time_str
+            return format_ms(time_obj.ordinal)
 
-        # 如果是數字，轉換為 SubRipTime
+        # 如果是數字（秒數），轉換為時間字符串
         elif isinstance(time_obj, (int, float)):
             total_seconds = float(time_obj)
             hours = int(total_seconds // 3600)
@@ -79,8 +42,8 @@ def format_time(time_obj: Any) -> str:
             milliseconds = int((total_seconds * 1000) % 1000)
             return f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds:03d}"
 
-        # 其他情況，嘗試轉換為字符串格式
-        return str(pysrt.SubRipTime.from_string(str(time_obj)))
+        # 其他情況，按照 SRT 格式解析後再格式化
+        return format_ms(parse_srt_string(str(time_obj)))
 
     except Exception as e:
         logging.error(f"時間格式化錯誤: {e}")
@@ -94,7 +57,7 @@ def time_to_milliseconds(time_obj: Union[pysrt.SubRipTime, Any]) -> int:
     :return: 毫秒數
     """
     if isinstance(time_obj, pysrt.SubRipTime):
-        return (time_obj.hours * 3600 + time_obj.minutes * 60 + time_obj.seconds) * 1000 + time_obj.milliseconds
+        return time_obj.ordinal
 
     # 如果不是 SubRipTime，嘗試獲取 hours、minutes、seconds、milliseconds 屬性
     try:
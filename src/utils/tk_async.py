@@ -0,0 +1,35 @@
+"""在 Tk 執行緒中接收背景工作結果的工具，資料庫、字型等背景工作共用"""
+
+import logging
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+
+def resolve_in_tk(master, future: Future, on_success: Callable[[Any], None],
+                  on_error: Optional[Callable[[BaseException], None]] = None, poll_ms: int = 20) -> None:
+    """
+    在 Tk 執行緒中處理 Future 的結果（以 after 輪詢，不從背景執行緒呼叫 Tk）
+    :param master: Tk 元件
+    :param future: 要等待的 Future
+    :param on_success: 成功時呼叫，參數為結果
+    :param on_error: 失敗時呼叫，參數為例外
+    :param poll_ms: 輪詢間隔（毫秒）
+    """
+    def check():
+        if not future.done():
+            try:
+                master.after(poll_ms, check)
+            except Exception:
+                pass
+            return
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            on_success(future.result())
+        elif on_error:
+            on_error(error)
+        else:
+            logging.getLogger(__name__).error(f"背景工作失敗: {error}")
+
+    check()
@@ -0,0 +1,250 @@
+"""效能追蹤模組，記錄耗時操作的時間區段，可匯出為 Chrome trace_event 格式
+
+用法:
+    from utils.tracing import span, traced
+
+    @traced("load_srt")
+    def load_srt(...): ...
+
+    with span("segment_audio", items=len(srt_data)):
+        ...
+
+停用時（預設）traced 只多一次布林判斷，span 返回共用的空物件，不記錄任何資料。
+匯出的 JSON 可在 chrome://tracing 或 https://ui.perfetto.dev 開啟。
+"""
+
+import atexit
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.file_utils import atomic_write_bytes, get_current_directory
+
+# 環形緩衝區大小（保留最近的區段數）
+DEFAULT_CAPACITY = 20000
+# 超過此毫秒數的區段另外寫入警告日誌，0 表示不記錄
+DEFAULT_SLOW_SPAN_MS = 500.0
+
+_enabled = False
+_slow_span_ns = int(DEFAULT_SLOW_SPAN_MS * 1_000_000)
+# 每個事件為 (名稱, 分類, 開始時間 ns, 持續時間 ns, 執行緒 ID, 參數)
+_events: deque = deque(maxlen=DEFAULT_CAPACITY)
+# 執行緒 ID 對應的名稱（在記錄時取得，匯出時執行緒可能已結束）
+_thread_names: Dict[int, str] = {}
+_origin_ns = time.perf_counter_ns()
+_exit_dump_registered = False
+_logger = logging.getLogger(__name__)
+
+
+def configure(enabled: bool, capacity: Optional[int] = None,
+              slow_span_ms: Optional[float] = None) -> None:
+    """
+    設定追蹤
+    :param enabled: 是否啟用
+    :param capacity: 環形緩衝區大小，改變時清除已記錄的區段
+    :param slow_span_ms: 慢操作警告門檻（毫秒），0 表示不警告
+    """
+    global _enabled, _events, _slow_span_ns
+    if capacity and capacity != _events.maxlen:
+        _events = deque(maxlen=int(capacity))
+    if slow_span_ms is not None:
+        _slow_span_ns = int(float(slow_span_ms) * 1_000_000)
+    _enabled = bool(enabled)
+
+
+def configure_from_config(config_manager) -> None:
+    """
+    依配置的 diagnostics 區段設定追蹤，啟用時在程式結束時把記錄匯出到 logs 目錄
+    :param config_manager: 配置管理器
+    """
+    try:
+        diagnostics = config_manager.get_section("diagnostics") or {}
+        configure(diagnostics.get('tracing', False),
+                  diagnostics.get('trace_buffer_size', DEFAULT_CAPACITY),
+                  diagnostics.get('slow_span_ms', DEFAULT_SLOW_SPAN_MS))
+        if _enabled:
+            _register_exit_dump()
+            _logger.info("已啟用效能追蹤")
+    except Exception as e:
+        _logger.error(f"設定效能追蹤時出錯: {e}")
+
+
+def is_enabled() -> bool:
+    """是否啟用追蹤"""
+    return _enabled
+
+
+def _record(name: str, category: str, start_ns: int, end_ns: int, args: Optional[Dict[str, Any]]) -> None:
+    """記錄一個區段（deque.append 本身是執行緒安全的）"""
+    duration = end_ns - start_ns
+    thread_id = threading.get_ident()
+    if thread_id not in _thread_names:
+        _thread_names[thread_id] = threading.current_thread().name
+    _events.append((name, category, start_ns, duration, thread_id, args))
+    if _slow_span_ns and duration >= _slow_span_ns:
+        _logger.warning(f"耗時操作 {name}: {duration / 1_000_000:.0f} ms")
+
+
+class _Span:
+    """記錄一個時間區段的上下文管理器"""
+
+    __slots__ = ('name', 'category', 'args', 'start_ns')
+
+    def __init__(self, name: str, category: str, args: Optional[Dict[str, Any]]):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start_ns = 0
+
+    def __enter__(self) -> "_Span":
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        args = self.args
+        if exc_type is not None:
+            args = dict(args or {}, error=exc_type.__name__)
+        _record(self.name, self.category, self.start_ns, time.perf_counter_ns(), args)
+        return False
+
+
+class _NullSpan:
+    """停用時使用的空區段"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, category: str = "app", **args):
+    """
+    建立時間區段
+    :param name: 區段名稱
+    :param category: 分類（例如 audio、text、state、file）
+    :param args: 附加在區段上的資料，會顯示在追蹤檢視器中
+    :return: 上下文管理器
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, category, args or None)
+
+
+def traced(name: Optional[str] = None, category: str = "app") -> Callable:
+    """
+    把函數的每次呼叫記錄為時間區段的裝飾器
+    :param name: 區段名稱，預設為函數的限定名稱
+    :param category: 分類
+    :return: 裝飾器
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start_ns = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record(span_name, category, start_ns, time.perf_counter_ns(), None)
+
+        return wrapper
+
+    return decorator
+
+
+def get_events() -> List[Dict[str, Any]]:
+    """
+    獲取已記錄的區段
+    :return: [{'name', 'category', 'start_ms', 'duration_ms', 'thread_id', 'args'}]，依開始時間排序
+    """
+    return [{
+        'name': name,
+        'category': category,
+        'start_ms': (start_ns - _origin_ns) / 1_000_000,
+        'duration_ms': duration_ns / 1_000_000,
+        'thread_id': thread_id,
+        'args': args or {},
+    } for name, category, start_ns, duration_ns, thread_id, args in sorted(list(_events), key=lambda e: e[2])]
+
+
+def clear() -> None:
+    """清除已記錄的區段"""
+    _events.clear()
+
+
+def export_chrome_trace(path: str) -> int:
+    """
+    把已記錄的區段匯出為 Chrome trace_event JSON
+    :param path: 輸出路徑
+    :return: 匯出的區段數
+    """
+    pid = os.getpid()
+    events = list(_events)
+
+    trace_events = []
+    for thread_id in sorted({event[4] for event in events}):
+        trace_events.append({
+            'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': thread_id,
+            'args': {'name': _thread_names.get(thread_id, f"Thread-{thread_id}")},
+        })
+    for name, category, start_ns, duration_ns, thread_id, args in events:
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (start_ns - _origin_ns) / 1000,
+            'dur': duration_ns / 1000,
+            'pid': pid,
+            'tid': thread_id,
+        }
+        if args:
+            event['args'] = {key: value if isinstance(value, (int, float, str, bool)) or value is None
+                             else str(value) for key, value in args.items()}
+        trace_events.append(event)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    data = json.dumps({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, ensure_ascii=False)
+    atomic_write_bytes(path, data.encode('utf-8'))
+    return len(events)
+
+
+def default_trace_path() -> str:
+    """
+    獲取預設的匯出路徑
+    :return: logs/trace_<時間>.json
+    """
+    return os.path.join(get_current_directory(), "logs", f"trace_{time.strftime('%Y%m%d_%H%M%S')}.json")
+
+
+def _dump_on_exit() -> None:
+    """程式結束時匯出追蹤記錄"""
+    if not _enabled or not _events:
+        return
+    try:
+        path = default_trace_path()
+        count = export_chrome_trace(path)
+        _logger.info(f"已匯出 {count} 個追蹤區段到 {path}")
+    except Exception as e:
+        _logger.error(f"匯出追蹤記錄時出錯: {e}")
+
+
+def _register_exit_dump() -> None:
+    """註冊程式結束時的匯出（只註冊一次）"""
+    global _exit_dump_registered
+    if not _exit_dump_registered:
+        atexit.register(_dump_on_exit)
+        _exit_dump_registered = True
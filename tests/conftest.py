@@ -0,0 +1,8 @@
+"""測試共用設定：程式以 src 為根目錄的絕對匯入（例如 from services... import ...）"""
+
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
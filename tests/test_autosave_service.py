@@ -0,0 +1,157 @@
+"""AutosaveService 的合併寫入、內容比對、最長延遲、停止時寫出與寫入失敗測試"""
+
+import types
+
+import pytest
+
+from services.file import autosave_service
+from services.file.autosave_service import AutosaveService
+from services.file.srt_stream import parse_text, render_srt
+from utils import file_utils
+
+SRT = ("1\n00:00:01,000 --> 00:00:02,000\n第一句\n\n"
+       "2\n00:00:03,000 --> 00:00:04,000\n第二句\n")
+
+
+class FakeMaster:
+    """記錄 after 排程的回調，由測試決定何時執行"""
+
+    def __init__(self):
+        self.timers = {}
+        self.delays = []
+        self._next_id = 0
+
+    def after(self, delay, callback):
+        self._next_id += 1
+        self.timers[self._next_id] = callback
+        self.delays.append(delay)
+        return self._next_id
+
+    def after_cancel(self, timer_id):
+        self.timers.pop(timer_id, None)
+
+    def run_timers(self):
+        while self.timers:
+            timer_id = min(self.timers)
+            self.timers.pop(timer_id)()
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    written = []
+
+    def recording_write(path, data):
+        written.append(path)
+        file_utils.atomic_write_bytes(path, data)
+
+    monkeypatch.setattr(autosave_service, 'atomic_write_bytes', recording_write)
+    return written
+
+
+@pytest.fixture
+def target(tmp_path):
+    return tmp_path / 'ep01.srt'
+
+
+@pytest.fixture
+def make_service(target):
+    services = []
+    state = {'columns': parse_text(SRT), 'snapshots': 0}
+
+    def snapshot():
+        state['snapshots'] += 1
+        return str(target), state['columns']
+
+    def factory(**kw):
+        master = FakeMaster()
+        service = AutosaveService(master, snapshot, **kw)
+        services.append(service)
+        return master, service, state
+
+    yield factory
+    for service in services:
+        service.stop(flush=False)
+
+
+def test_burst_of_changes_writes_once(make_service, target, writes):
+    master, service, state = make_service(quiet_ms=2000)
+
+    for _ in range(10):
+        service.mark_dirty()
+
+    assert len(master.timers) == 1 and writes == []
+    master.run_timers()
+    assert service.flush(wait=True, timeout=5)
+
+    assert state['snapshots'] == 1
+    assert writes == [str(target)]
+    assert target.read_text(encoding='utf-8') == render_srt(parse_text(SRT))
+
+
+def test_identical_content_is_not_written(make_service, target, writes):
+    target.write_text(render_srt(parse_text(SRT)), encoding='utf-8')
+    master, service, state = make_service()
+
+    service.mark_dirty()
+    master.run_timers()
+    assert service.flush(wait=True, timeout=5)
+    assert writes == []
+
+    state['columns'].texts[0] = '改過'
+    service.mark_dirty()
+    master.run_timers()
+    service.mark_dirty()
+    master.run_timers()
+    assert service.flush(wait=True, timeout=5)
+    assert writes == [str(target)]
+
+
+def test_max_delay_caps_the_wait(make_service, monkeypatch):
+    clock = types.SimpleNamespace(now=100.0)
+    monkeypatch.setattr(autosave_service, 'time', types.SimpleNamespace(monotonic=lambda: clock.now))
+    master, service, _ = make_service(quiet_ms=2000, max_delay_ms=5000)
+
+    for _ in range(7):
+        service.mark_dirty()
+        clock.now += 1.0
+
+    assert master.delays == [2000, 2000, 2000, 2000, 1000, 0, 0]
+    assert len(master.timers) == 1
+
+
+def test_stop_with_flush_writes_pending_changes(make_service, target, writes):
+    master, service, _ = make_service(quiet_ms=60000)
+    service.mark_dirty()
+
+    service.stop(flush=True)
+
+    assert writes == [str(target)]
+    assert not master.timers
+    service.mark_dirty()
+    assert not master.timers
+
+
+def test_stop_without_flush_discards_changes(make_service, target, writes):
+    master, service, _ = make_service()
+    service.mark_dirty()
+
+    service.stop(flush=False)
+
+    assert writes == [] and not target.exists()
+
+
+def test_failed_write_keeps_target_and_leaves_no_temp_file(make_service, target, monkeypatch):
+    target.write_text('原本的內容', encoding='utf-8')
+    master, service, _ = make_service()
+
+    def failing_replace(src, dst):
+        raise OSError("磁碟已滿")
+
+    monkeypatch.setattr(file_utils.os, 'replace', failing_replace)
+    service.mark_dirty()
+    master.run_timers()
+    assert service.flush(wait=True, timeout=5)
+
+    assert isinstance(service.last_error, OSError)
+    assert target.read_text(encoding='utf-8') == '原本的內容'
+    assert [path.name for path in target.parent.iterdir()] == ['ep01.srt']
@@ -0,0 +1,149 @@
+"""批次工作的探索、處理流程與監看服務排程測試"""
+
+import os
+
+import pytest
+
+from services.batch import batch_job
+from services.batch.batch_job import align_end_times, discover_job, run_job
+from services.batch.watch_service import ProjectWatchService
+from services.file.srt_stream import parse_text, read_srt
+
+SRT = ("1\n00:00:01,000 --> 00:00:02,000\n在見\n\n"
+       "2\n00:00:03,000 --> 00:00:04,000\n第二句\n\n"
+       "3\n00:00:05,000 --> 00:00:09,000\n第三句\n")
+
+
+@pytest.fixture
+def project(tmp_path):
+    folder = tmp_path / 'ep01'
+    folder.mkdir()
+    (folder / 'ep01.srt').write_text(SRT, encoding='utf-8')
+    (folder / 'ep01.mp3').write_bytes(b'audio')
+    (folder / batch_job.CORRECTIONS_FILENAME).write_text("錯誤字,校正字\n在見,再見\n", encoding='utf-8')
+    return folder
+
+
+@pytest.fixture
+def no_conversion(monkeypatch):
+    """繁簡轉換需要 OpenCC，這裡只驗證批次流程本身"""
+    from utils import text_utils
+    monkeypatch.setattr(text_utils, 'simplify_to_traditional', lambda text: text)
+
+
+def test_discover_ignores_existing_output(project):
+    (project / 'ep01.aligned.srt').write_text(SRT, encoding='utf-8')
+
+    job = discover_job(str(project))
+
+    assert job['srt'] == str(project / 'ep01.srt')
+    assert job['output'] == str(project / 'ep01.aligned.srt')
+    assert job['audio'] == str(project / 'ep01.mp3')
+    assert job['corrections'] == str(project / batch_job.CORRECTIONS_FILENAME)
+    assert job['word'] is None
+
+
+def test_discover_without_srt(tmp_path):
+    (tmp_path / 'notes.txt').write_text('x')
+    assert discover_job(str(tmp_path)) is None
+    assert discover_job(str(tmp_path / 'missing')) is None
+
+
+def test_run_job_with_missing_srt(tmp_path):
+    result = run_job({'name': 'ep01', 'srt': str(tmp_path / 'missing.srt'), 'output': str(tmp_path / 'out.srt')})
+
+    assert result['status'] == 'failed'
+    assert not (tmp_path / 'out.srt').exists()
+
+
+def test_run_job_overwrites_output_and_caps_last_cue(project, monkeypatch, no_conversion):
+    (project / 'ep01.aligned.srt').write_text('舊的輸出', encoding='utf-8')
+    monkeypatch.setattr(batch_job, 'probe_audio_duration', lambda path: 7000)
+
+    result = run_job(discover_job(str(project)))
+
+    assert result['status'] == 'ok', result.get('error')
+    assert (result['cues'], result['corrected'], result['audio_duration_ms']) == (3, 1, 7000)
+    output = read_srt(str(project / 'ep01.aligned.srt'))
+    assert output.texts == ['再見', '第二句', '第三句']
+    assert list(output.ends) == [3000, 5000, 7000]
+
+
+def test_align_end_times_with_audio_duration():
+    columns = parse_text(SRT)
+    assert align_end_times(columns, 8000) == 3
+    assert list(columns.ends) == [3000, 5000, 8000]
+
+    # 音頻比最後一句的開始還短時，結束時間不早於開始時間
+    columns = parse_text(SRT)
+    align_end_times(columns, 4000)
+    assert columns.ends[-1] == columns.starts[-1]
+
+    columns = parse_text(SRT)
+    assert align_end_times(columns) == 2
+    assert columns.ends[-1] == 9000
+
+
+def make_project(root, name):
+    folder = root / name
+    folder.mkdir()
+    (folder / f"{name}.srt").write_text(SRT, encoding='utf-8')
+    return folder
+
+
+def finish(service):
+    """模擬工作執行緒取出並完成佇列中的專案"""
+    names = []
+    while not service._queue.empty():
+        name, _ = service._queue.get_nowait()
+        service._queue.task_done()
+        service._active.discard(name)
+        names.append(name)
+    return names
+
+
+def test_scan_waits_for_files_to_settle(tmp_path):
+    make_project(tmp_path, 'ep01')
+    service = ProjectWatchService(str(tmp_path), settle_seconds=5)
+
+    assert service.scan(now=0) == 0
+    assert service.scan(now=3) == 0
+    # 檔案在等待期間變化，重新計算靜止時間
+    (tmp_path / 'ep01' / 'ep01.mp3').write_bytes(b'audio')
+    assert service.scan(now=6) == 0
+    assert service.scan(now=10) == 0
+    assert service.scan(now=11) == 1
+    assert finish(service) == ['ep01']
+
+
+def test_full_queue_defers_projects(tmp_path):
+    for name in ('ep01', 'ep02', 'ep03'):
+        make_project(tmp_path, name)
+    service = ProjectWatchService(str(tmp_path), max_queue=1, settle_seconds=0)
+
+    processed = []
+    for _ in range(3):
+        assert service.scan() == 1
+        processed += finish(service)
+
+    assert sorted(processed) == ['ep01', 'ep02', 'ep03']
+    assert service.scan() == 0
+
+
+def test_changed_project_is_requeued(tmp_path):
+    folder = make_project(tmp_path, 'ep01')
+    service = ProjectWatchService(str(tmp_path), settle_seconds=0)
+
+    assert service.scan() == 1
+    # 處理中的專案不會重複排入
+    assert service.scan() == 0
+    finish(service)
+    assert service.scan() == 0
+
+    (folder / 'ep01.docx').write_bytes(b'word')
+    assert service.scan() == 1
+    assert finish(service) == ['ep01']
+
+    # 輸出檔案不算輸入變化
+    (folder / 'ep01.aligned.srt').write_text(SRT, encoding='utf-8')
+    assert service.scan() == 0
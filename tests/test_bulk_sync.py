@@ -0,0 +1,80 @@
+"""BulkSync 以 SQLite 驗證新增、更新、刪除與未變更列的處理"""
+
+import pysrt
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from database.base import init_db
+from database.bulk_sync import BulkSync
+from database.models import Project, User
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = init_db(f"sqlite:///{tmp_path / 'test.db'}")
+    session = sessionmaker(bind=engine)()
+    user = User(username='tester', password_hash='x', email='tester@example.com')
+    session.add(user)
+    session.flush()
+    session.add_all([Project(id=1, name='ep01', owner_id=user.id), Project(id=2, name='ep02', owner_id=user.id)])
+    session.commit()
+    session.close()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def statements(engine):
+    executed = []
+    event.listen(engine, 'before_cursor_execute',
+                 lambda conn, cursor, statement, *args: executed.append(statement.split()[0].upper()))
+    return executed
+
+
+def subtitles(count, text='字幕'):
+    return [{'index': i, 'start_time': f"00:00:{i:02d},000", 'end_time': f"00:00:{i:02d},500",
+             'text': f"{text}{i}", 'word_text': None, 'is_corrected': False} for i in range(1, count + 1)]
+
+
+def test_sync_inserts_updates_and_deletes(engine):
+    sync = BulkSync(engine, chunk_size=7)
+    assert sync.sync_subtitles(1, subtitles(20)) == {'inserted': 20, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+
+    changed = subtitles(18)
+    changed[4]['text'] = '改過'
+    changed[9]['is_corrected'] = True
+    assert sync.sync_subtitles(1, changed) == {'inserted': 0, 'updated': 2, 'deleted': 2, 'unchanged': 16}
+
+    assert sync.load_subtitles(1) == changed
+
+
+def test_unchanged_sync_only_reads(engine, statements):
+    sync = BulkSync(engine)
+    sync.sync_subtitles(1, subtitles(10))
+    statements.clear()
+
+    assert sync.sync_subtitles(1, subtitles(10))['unchanged'] == 10
+    assert 'INSERT' not in statements and 'UPDATE' not in statements and 'DELETE' not in statements
+
+
+def test_projects_are_isolated_and_subrip_items_accepted(engine):
+    sync = BulkSync(engine)
+    sync.sync_subtitles(2, subtitles(3, text='其他'))
+    items = pysrt.SubRipFile.from_string("1\n00:00:01,000 --> 00:00:02,000\nfirst\n\n"
+                                         "2\n00:00:03,000 --> 00:00:04,000\nsecond\n")
+
+    assert sync.sync_subtitles(1, items)['inserted'] == 2
+    assert [row['text'] for row in sync.load_subtitles(1)] == ['first', 'second']
+    assert sync.load_subtitles(1)[0]['start_time'] == '00:00:01,000'
+    assert [row['text'] for row in sync.load_subtitles(2)] == ['其他1', '其他2', '其他3']
+
+
+def test_sync_corrections(engine):
+    sync = BulkSync(engine)
+    assert sync.sync_corrections(1, {'在': '再', '以': '已'})['inserted'] == 2
+
+    stats = sync.sync_corrections(1, {'在': '在', '的': '得'})
+
+    assert stats == {'inserted': 1, 'updated': 1, 'deleted': 1, 'unchanged': 0}
+    assert sync.load_corrections(1) == {'在': '在', '的': '得'}
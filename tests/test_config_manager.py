@@ -0,0 +1,118 @@
+"""ConfigManager 延遲寫入、最長延遲、原子取代與 flush_all 測試"""
+
+import json
+import os
+import time
+
+import pytest
+
+from services import config_manager
+from services.config_manager import ConfigManager
+from utils import file_utils
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """記錄每次寫入配置文件的內容"""
+    written = []
+
+    def recording_write(path, data):
+        written.append(json.loads(data))
+        file_utils.atomic_write_bytes(path, data)
+
+    monkeypatch.setattr(config_manager, 'atomic_write_bytes', recording_write)
+    return written
+
+
+def wait_until(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def read_config(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_burst_of_changes_is_written_once(tmp_path, writes):
+    manager = ConfigManager(str(tmp_path / 'config.json'), save_delay=0.1, max_save_delay=5)
+
+    for size in range(10, 20):
+        manager.set_option('display', 'font_size', size)
+
+    assert manager.is_dirty and writes == []
+    assert wait_until(lambda: not manager.is_dirty)
+    time.sleep(0.2)
+    assert len(writes) == 1
+    assert read_config(tmp_path / 'config.json')['display']['font_size'] == 19
+
+
+def test_continuous_changes_are_written_within_max_delay(tmp_path, writes):
+    manager = ConfigManager(str(tmp_path / 'config.json'), save_delay=0.2, max_save_delay=0.4)
+
+    started = time.monotonic()
+    while not writes and time.monotonic() - started < 2:
+        manager.set_option('window', 'width', int((time.monotonic() - started) * 1000))
+        time.sleep(0.05)
+
+    assert writes
+    assert time.monotonic() - started < 1.0
+    manager.flush()
+
+
+def test_failed_write_keeps_file_and_retries(tmp_path, monkeypatch):
+    path = tmp_path / 'config.json'
+    manager = ConfigManager(str(path), save_delay=0.05)
+    manager.set_option('display', 'font_size', 12)
+    assert manager.flush()
+    original = path.read_bytes()
+
+    def failing_replace(src, dst):
+        raise OSError("磁碟已滿")
+
+    monkeypatch.setattr(file_utils.os, 'replace', failing_replace)
+    manager.set_option('display', 'font_size', 30)
+    assert not manager.flush()
+
+    assert path.read_bytes() == original
+    assert os.listdir(tmp_path) == ['config.json']
+    assert manager.is_dirty
+
+    # 重新排程的保存在寫入恢復正常後完成
+    monkeypatch.undo()
+    assert wait_until(lambda: not manager.is_dirty)
+    assert read_config(path)['display']['font_size'] == 30
+
+
+def test_flush_writes_a_snapshot(tmp_path, monkeypatch):
+    manager = ConfigManager(str(tmp_path / 'config.json'), save_delay=10)
+    manager.set_option('display', 'font_size', 12)
+
+    def write_while_editing(path, data):
+        # 寫入期間的修改不影響正在寫入的快照，並留待下一次保存
+        manager.set_option('display', 'font_size', 14)
+        file_utils.atomic_write_bytes(path, data)
+
+    monkeypatch.setattr(config_manager, 'atomic_write_bytes', write_while_editing)
+    assert manager.flush()
+
+    assert read_config(tmp_path / 'config.json')['display']['font_size'] == 12
+    assert manager.is_dirty
+    monkeypatch.undo()
+    assert manager.flush()
+    assert read_config(tmp_path / 'config.json')['display']['font_size'] == 14
+
+
+def test_flush_all_writes_every_manager(tmp_path, writes):
+    first = ConfigManager(str(tmp_path / 'a.json'), save_delay=10)
+    second = ConfigManager(str(tmp_path / 'b.json'), save_delay=10)
+    first.set_option('display', 'theme', 'dark')
+    second.set_option('display', 'theme', 'light')
+
+    ConfigManager.flush_all()
+
+    assert not first.is_dirty and not second.is_dirty
+    assert read_config(tmp_path / 'a.json')['display']['theme'] == 'dark'
+    assert read_config(tmp_path / 'b.json')['display']['theme'] == 'light'
@@ -0,0 +1,132 @@
+"""CueIntervalIndex 與逐一比對（暴力搜尋）結果一致性測試"""
+
+import random
+
+import pytest
+
+from utils.cue_index import CueIntervalIndex
+
+
+def random_cues(rng, count):
+    """產生開始時間互不相同、可能重疊的字幕"""
+    starts = rng.sample(range(0, count * 1000), count)
+    return [(start, start + rng.randint(1, 3000), f"I{i:03d}") for i, start in enumerate(starts)]
+
+
+class BruteForce:
+    """以排序後的列表逐一比對的參考實作"""
+
+    def __init__(self, cues):
+        self.cues = {key: (start, end) for start, end, key in cues}
+
+    def ordered(self):
+        return sorted(self.cues.items(), key=lambda item: item[1])
+
+    def find_at(self, t):
+        containing = [(start, key) for key, (start, end) in self.cues.items() if start <= t < end]
+        return max(containing)[1] if containing else None
+
+    def find_range(self, lo, hi):
+        return [key for key, (start, end) in self.ordered() if start < hi and end > lo]
+
+    def previous(self, t):
+        before = [key for key, (start, _) in self.ordered() if start <= t]
+        return before[-1] if before else None
+
+    def next(self, t):
+        after = [key for key, (start, _) in self.ordered() if start > t]
+        return after[0] if after else None
+
+    def neighbours(self, key):
+        keys = [k for k, _ in self.ordered()]
+        position = keys.index(key)
+        return (keys[position - 1] if position > 0 else None,
+                keys[position + 1] if position + 1 < len(keys) else None)
+
+    def overlaps(self):
+        result = []
+        latest_end, latest_key = float('-inf'), None
+        for key, (start, end) in self.ordered():
+            if start < latest_end:
+                result.append((latest_key, key))
+            if end > latest_end:
+                latest_end, latest_key = end, key
+        return result
+
+
+def assert_same(index, reference, rng, span):
+    for _ in range(200):
+        t = rng.randrange(-100, span)
+        assert index.find_at(t) == reference.find_at(t)
+        assert index.previous(t) == reference.previous(t)
+        assert index.next(t) == reference.next(t)
+        width = rng.randrange(1, 5000)
+        assert index.find_range(t, t + width) == reference.find_range(t, t + width)
+    for key in reference.cues:
+        assert index.neighbours(key) == reference.neighbours(key)
+        assert index.get_interval(key) == reference.cues[key]
+    assert index.find_overlaps() == reference.overlaps()
+    assert len(index) == len(reference.cues)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_queries_match_brute_force(seed):
+    rng = random.Random(seed)
+    cues = random_cues(rng, 150)
+    assert_same(CueIntervalIndex(cues), BruteForce(cues), rng, 160_000)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_incremental_updates_match_brute_force(seed):
+    rng = random.Random(seed)
+    cues = random_cues(rng, 80)
+    index = CueIntervalIndex(cues)
+    reference = BruteForce(cues)
+    used_starts = {start for start, _, _ in cues}
+
+    for step in range(150):
+        action = rng.random()
+        key = rng.choice(list(reference.cues))
+        start, end = reference.cues[key]
+        if action < 0.5:
+            # 拖動邊界：結束時間或開始時間（開始時間保持唯一，避免相同開始時間的排序歧義）
+            new_end = start + rng.randint(1, 3000)
+            new_start = start
+            if rng.random() < 0.5:
+                new_start = rng.choice([s for s in range(start - 2000, start + 2000) if s not in used_starts])
+                used_starts.discard(start)
+                used_starts.add(new_start)
+                new_end = max(new_end, new_start + 1)
+            index.update(key, new_start, new_end)
+            reference.cues[key] = (new_start, new_end)
+        elif action < 0.75 and len(reference.cues) > 1:
+            index.remove(key)
+            del reference.cues[key]
+            used_starts.discard(start)
+        else:
+            new_start = rng.choice([s for s in range(0, 100_000) if s not in used_starts][:5000])
+            used_starts.add(new_start)
+            new_key = f"N{step:03d}"
+            index.insert(new_start, new_start + rng.randint(1, 3000), new_key)
+            reference.cues[new_key] = index.get_interval(new_key)
+
+    assert_same(index, reference, rng, 110_000)
+
+
+def test_nearest_prefers_containing_then_closest():
+    index = CueIntervalIndex([(1000, 2000, 'a'), (5000, 6000, 'b')])
+    assert index.nearest(1500) == 'a'
+    assert index.nearest(2500) == 'a'
+    assert index.nearest(4500) == 'b'
+    assert index.nearest(0) == 'a'
+    assert index.nearest(9000) == 'b'
+    assert CueIntervalIndex().nearest(10) is None
+
+
+def test_unknown_key_and_update_inserts():
+    index = CueIntervalIndex()
+    assert index.neighbours('x') == (None, None)
+    index.update('x', 100, 200)
+    assert 'x' in index and index.find_at(150) == 'x'
+    index.remove('x')
+    assert index.find_at(150) is None
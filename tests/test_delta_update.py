@@ -0,0 +1,147 @@
+"""差異更新的 make_patch/apply_patch 與 DeltaInstaller 往返測試"""
+
+import json
+import os
+import random
+import zipfile
+
+import pytest
+
+from services.update import delta_update
+from services.update.delta_update import (DELTA_MANIFEST_NAME, DeltaInstaller, DeltaMismatchError, apply_patch,
+                                          build_delta_package, build_manifest, is_delta_package, make_patch)
+
+
+def mutate(rng, data):
+    """對資料做隨機的插入、刪除、覆寫與區段搬移"""
+    data = bytearray(data)
+    for _ in range(rng.randint(1, 8)):
+        position = rng.randint(0, len(data))
+        action = rng.choice(('insert', 'delete', 'overwrite', 'move'))
+        chunk = bytes(rng.getrandbits(8) for _ in range(rng.randint(1, 300)))
+        if action == 'insert':
+            data[position:position] = chunk
+        elif action == 'delete':
+            del data[position:position + len(chunk)]
+        elif action == 'overwrite':
+            data[position:position + len(chunk)] = chunk
+        else:
+            moved = data[position:position + 500]
+            del data[position:position + 500]
+            target = rng.randint(0, len(data))
+            data[target:target] = moved
+    return bytes(data)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_patch_round_trip(seed):
+    rng = random.Random(seed)
+    old = bytes(rng.getrandbits(8) for _ in range(rng.randint(0, 20000)))
+    new = mutate(rng, old)
+
+    patch = make_patch(old, new)
+
+    assert apply_patch(old, patch) == new
+
+
+def test_patch_of_small_edit_is_small():
+    old = os.urandom(200_000)
+    new = old[:1000] + b'edited' + old[1000:]
+    assert len(make_patch(old, new)) < 2000
+    assert apply_patch(old, make_patch(old, b'')) == b''
+    assert apply_patch(b'', make_patch(b'', new)) == new
+
+
+def write_tree(root, files):
+    for rel_path, data in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+
+@pytest.fixture
+def versions(tmp_path):
+    rng = random.Random(7)
+    base = bytes(rng.getrandbits(8) for _ in range(50_000))
+    old_files = {
+        'main.py': b'print("v1")\n' * 200,
+        'lib/core.bin': base,
+        'lib/removed.txt': b'old file',
+        'assets/same.png': b'unchanged' * 100,
+    }
+    new_files = {
+        'main.py': b'print("v2")\n' * 200,
+        'lib/core.bin': mutate(rng, base),
+        'lib/added.txt': b'new file',
+        'assets/same.png': b'unchanged' * 100,
+    }
+    old_root, new_root, app_root = tmp_path / 'old', tmp_path / 'new', tmp_path / 'app'
+    write_tree(old_root, old_files)
+    write_tree(new_root, new_files)
+    write_tree(app_root, old_files)
+    write_tree(app_root, {'projects/ep01/ep01.srt': b'user data'})
+
+    package = tmp_path / 'delta.zip'
+    stats = build_delta_package(str(old_root), str(new_root), str(package), '1.0.0', '1.1.0')
+    return {'old': old_root, 'new': new_root, 'app': app_root, 'package': package, 'stats': stats,
+            'backup': tmp_path / 'backup'}
+
+
+def test_install_produces_new_version(versions):
+    assert versions['stats'] == {'added': 1, 'patched': 1, 'replaced': 1, 'deleted': 1, 'unchanged': 1}
+    assert is_delta_package(str(versions['package']))
+
+    installer = DeltaInstaller(str(versions['app']), str(versions['backup']))
+    stats = installer.apply(str(versions['package']), '1.0.0')
+
+    assert stats == {'written': 3, 'deleted': 1}
+    assert build_manifest(str(versions['app'])) == build_manifest(str(versions['new']))
+    assert (versions['app'] / 'projects/ep01/ep01.srt').read_bytes() == b'user data'
+    assert not list(versions['app'].rglob('*.delta-new'))
+
+
+def test_mismatched_base_is_rejected_without_changes(versions):
+    (versions['app'] / 'lib/core.bin').write_bytes(b'locally modified')
+    before = build_manifest(str(versions['app']))
+    installer = DeltaInstaller(str(versions['app']), str(versions['backup']))
+
+    with pytest.raises(DeltaMismatchError):
+        installer.apply(str(versions['package']), '1.0.0')
+    with pytest.raises(DeltaMismatchError):
+        installer.check(str(versions['package']), '0.9.0')
+    assert build_manifest(str(versions['app'])) == before
+
+
+def test_failed_replace_restores_original_files(versions, monkeypatch):
+    before = build_manifest(str(versions['app']))
+    replace = os.replace
+    calls = []
+
+    def failing_replace(src, dst):
+        calls.append(dst)
+        if len(calls) == 2:
+            raise OSError("磁碟已滿")
+        replace(src, dst)
+
+    monkeypatch.setattr(delta_update.os, 'replace', failing_replace)
+    with pytest.raises(OSError):
+        DeltaInstaller(str(versions['app']), str(versions['backup'])).apply(str(versions['package']), '1.0.0')
+
+    assert build_manifest(str(versions['app'])) == before
+    assert not list(versions['app'].rglob('*.delta-new'))
+
+
+def test_path_outside_app_is_rejected(tmp_path):
+    app = tmp_path / 'app'
+    app.mkdir()
+    package = tmp_path / 'evil.zip'
+    with zipfile.ZipFile(package, 'w') as z:
+        z.writestr('files/evil', b'x')
+        z.writestr(DELTA_MANIFEST_NAME, json.dumps({
+            'format': delta_update.DELTA_FORMAT_VERSION, 'from_version': '1', 'to_version': '2',
+            'files': [{'path': '../evil', 'action': 'add', 'entry': 'files/evil', 'sha256': '', 'size': 1}],
+        }))
+
+    with pytest.raises(ValueError):
+        DeltaInstaller(str(app), str(tmp_path / 'backup')).apply(str(package))
+    assert not (tmp_path / 'evil').exists()
@@ -0,0 +1,159 @@
+"""FileDownloader 的斷點續傳、平行分段與 SHA-256 校驗測試（以本機支援 Range 的 HTTP 伺服器代替發佈伺服器）"""
+
+import hashlib
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from services.update import file_downloader
+from services.update.file_downloader import DownloadCancelled, FileDownloader, IntegrityError
+
+PAYLOAD = os.urandom(1024 * 1024 + 123)
+ETAG = '"payload-v1"'
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """支援 HEAD、Range 與 If-Range 的處理器（標準庫的 SimpleHTTPRequestHandler 不支援 Range）"""
+
+    def log_message(self, *args):
+        pass
+
+    def _send_headers(self, status, start, end):
+        self.send_response(status)
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('ETag', ETAG)
+        if status == 206:
+            self.send_header('Content-Range', f"bytes {start}-{end}/{len(PAYLOAD)}")
+        self.end_headers()
+
+    def _range(self):
+        header = self.headers.get('Range')
+        if_range = self.headers.get('If-Range')
+        if not header or (if_range and if_range != ETAG):
+            return 200, 0, len(PAYLOAD) - 1
+        match = re.fullmatch(r'bytes=(\d+)-(\d*)', header)
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else len(PAYLOAD) - 1
+        return 206, start, min(end, len(PAYLOAD) - 1)
+
+    def do_HEAD(self):
+        self._send_headers(200, 0, len(PAYLOAD) - 1)
+
+    def do_GET(self):
+        status, start, end = self._range()
+        server = self.server
+        with server.lock:
+            server.ranges.append(self.headers.get('Range'))
+            drop_after = server.drop_after
+            server.drop_after = None
+            on_get = server.on_get
+        if on_get:
+            on_get(len(server.ranges))
+        self._send_headers(status, start, end)
+        body = PAYLOAD[start:end + 1]
+        if drop_after is not None:
+            # 模擬連線中斷：只送出部分內容就關閉連線
+            self.wfile.write(body[:drop_after])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), RangeHandler)
+    httpd.lock = threading.Lock()
+    httpd.ranges = []
+    httpd.drop_after = None
+    httpd.on_get = None
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield httpd
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(file_downloader.time, 'sleep', lambda seconds: None)
+
+
+def url_of(httpd):
+    return f"http://127.0.0.1:{httpd.server_address[1]}/package.zip"
+
+
+def test_download_verifies_sha256(server, tmp_path):
+    destination = str(tmp_path / 'package.zip')
+    FileDownloader().download(url_of(server), destination,
+                              expected_sha256=hashlib.sha256(PAYLOAD).hexdigest())
+
+    with open(destination, 'rb') as f:
+        assert f.read() == PAYLOAD
+    assert not os.path.exists(destination + '.download')
+    assert not os.path.exists(destination + '.download.json')
+
+
+def test_cancelled_download_resumes_with_range(server, tmp_path):
+    destination = str(tmp_path / 'package.zip')
+    downloader = FileDownloader()
+    # 第一個連線送出部分內容後中斷，下載器重試時取消下載
+    server.drop_after = 256 * 1024
+    server.on_get = lambda count: count == 2 and downloader.cancel_download('first')
+
+    with pytest.raises(DownloadCancelled):
+        downloader.download(url_of(server), destination, download_id='first')
+    assert os.path.exists(destination + '.download.json')
+
+    server.on_get = None
+
+    server.ranges.clear()
+    FileDownloader().download(url_of(server), destination,
+                              expected_sha256=hashlib.sha256(PAYLOAD).hexdigest())
+
+    resumed_from = int(re.match(r'bytes=(\d+)-', server.ranges[0]).group(1))
+    assert resumed_from > 0
+    with open(destination, 'rb') as f:
+        assert f.read() == PAYLOAD
+
+
+def test_interrupted_connection_is_retried_from_written_offset(server, tmp_path):
+    destination = str(tmp_path / 'package.zip')
+    server.drop_after = 200 * 1024
+
+    FileDownloader().download(url_of(server), destination)
+
+    assert server.ranges[0] == f"bytes=0-{len(PAYLOAD) - 1}"
+    resumed_from = int(re.match(r'bytes=(\d+)-', server.ranges[1]).group(1))
+    assert 0 < resumed_from <= 200 * 1024
+    with open(destination, 'rb') as f:
+        assert f.read() == PAYLOAD
+
+
+def test_parallel_segments(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(file_downloader, 'MIN_SEGMENT_SIZE', 256 * 1024)
+    destination = str(tmp_path / 'package.zip')
+
+    FileDownloader().download(url_of(server), destination, segments=4,
+                              expected_sha256=hashlib.sha256(PAYLOAD).hexdigest())
+
+    assert len(server.ranges) == 4
+    with open(destination, 'rb') as f:
+        assert f.read() == PAYLOAD
+
+
+def test_sha256_mismatch_discards_download(server, tmp_path):
+    destination = str(tmp_path / 'package.zip')
+
+    with pytest.raises(IntegrityError):
+        FileDownloader().download(url_of(server), destination, expected_sha256='0' * 64)
+
+    assert not os.path.exists(destination)
+    assert not os.path.exists(destination + '.download')
+    assert not os.path.exists(destination + '.download.json')
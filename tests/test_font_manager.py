@@ -0,0 +1,57 @@
+"""FontManager 字型探測快取測試：config.json 只保存探測結果，字型列表另存於快取目錄"""
+
+import json
+
+import pytest
+
+from services.config_manager import ConfigManager
+from utils import font_manager
+from utils.font_manager import FONT_CACHE_SECTION, FontManager
+
+FAMILIES = ['Arial', 'Noto Sans TC', 'Tahoma', 'Arial']
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(font_manager.tkfont, 'families', lambda master=None: FAMILIES)
+    config = ConfigManager(str(tmp_path / 'config.json'))
+    return FontManager(config, cache_dir=str(tmp_path / 'temp'))
+
+
+def test_probe_keeps_family_list_out_of_config(tmp_path, manager):
+    result = manager.probe_fonts('fp1')
+    manager.config.flush()
+
+    section = json.loads((tmp_path / 'config.json').read_text(encoding='utf-8'))[FONT_CACHE_SECTION]
+    assert set(section) == {'version', 'fingerprint', 'preferred', 'resolved'}
+    assert section['resolved'] == 'Arial'
+    assert result['families'] == ['Arial', 'Noto Sans TC', 'Tahoma']
+    assert manager.get_cached_families() == ['Arial', 'Noto Sans TC', 'Tahoma']
+    assert (tmp_path / 'temp' / font_manager.FONT_FAMILIES_CACHE_NAME).exists()
+
+
+def test_family_list_must_match_config_fingerprint(tmp_path, manager):
+    assert manager.get_cached_families() is None
+    manager.probe_fonts('fp1')
+
+    manager.config.set_section(FONT_CACHE_SECTION, dict(manager.config.get_config()[FONT_CACHE_SECTION],
+                                                        fingerprint='fp2'))
+    assert manager.get_cached_families() is None
+
+    (tmp_path / 'temp' / font_manager.FONT_FAMILIES_CACHE_NAME).write_text('not json', encoding='utf-8')
+    manager.probe_fonts('fp2')
+    assert manager.get_cached_families() == ['Arial', 'Noto Sans TC', 'Tahoma']
+
+
+def test_cached_choice_is_applied_without_probing(tmp_path, manager, monkeypatch):
+    manager.preferred_family = 'Missing Font'
+    manager.probe_fonts('fp1')
+    manager.config.flush()
+    monkeypatch.setattr(font_manager.tkfont, 'families', lambda master=None: pytest.fail("不應列舉字型"))
+
+    config = ConfigManager(str(tmp_path / 'config.json'))
+    config.set_option('display', 'font_family', 'Missing Font')
+    restarted = FontManager(config, cache_dir=str(tmp_path / 'temp'))
+
+    assert restarted.default_family == 'Noto Sans TC'
+    assert restarted.get_clear_fonts() == ['Noto Sans TC', 'Tahoma']
@@ -0,0 +1,103 @@
+"""IconAtlas 的排放、來源變更失效與索引校驗測試（不需要 Tk 視窗）"""
+
+import os
+
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+
+from utils import icon_atlas  # noqa: E402
+from utils.icon_atlas import ATLAS_MAX_WIDTH, IconAtlas, _entry_key  # noqa: E402
+
+
+def make_icon(path, size, color):
+    Image.new('RGBA', size, color).save(path, format='PNG')
+    return str(path)
+
+
+@pytest.fixture
+def icons(tmp_path):
+    return {
+        'play': make_icon(tmp_path / 'play.png', (64, 64), (255, 0, 0, 255)),
+        'wide': make_icon(tmp_path / 'wide.png', (400, 100), (0, 255, 0, 255)),
+        'tall': make_icon(tmp_path / 'tall.png', (30, 120), (0, 0, 255, 255)),
+    }
+
+
+def overlaps(a, b):
+    return (a['x'] < b['x'] + b['width'] and b['x'] < a['x'] + a['width'] and
+            a['y'] < b['y'] + b['height'] and b['y'] < a['y'] + a['height'])
+
+
+def test_packing_keeps_every_requested_size(tmp_path, icons):
+    requests = [
+        (icons['play'], (16, 16)), (icons['play'], (32, None)), (icons['play'], (None, None)),
+        (icons['wide'], (None, 50)), (icons['wide'], (None, None)), (icons['wide'], (300, None)),
+        (icons['tall'], (None, 60)), (icons['tall'], (24, 24)),
+    ]
+    expected = {
+        (icons['play'], (16, 16)): (16, 16), (icons['play'], (32, None)): (32, 32),
+        (icons['play'], (None, None)): (64, 64), (icons['wide'], (None, 50)): (200, 50),
+        (icons['wide'], (None, None)): (400, 100), (icons['wide'], (300, None)): (300, 75),
+        (icons['tall'], (None, 60)): (15, 60), (icons['tall'], (24, 24)): (24, 24),
+    }
+    atlas = IconAtlas(str(tmp_path / 'temp'))
+    atlas.get_icons(requests)
+
+    entries = [atlas._entries[_entry_key(path, size)] for path, size in requests]
+    assert [(entry['width'], entry['height']) for entry in entries] == [expected[r] for r in requests]
+
+    with Image.open(atlas.image_path) as image:
+        image.load()
+        assert image.width <= ATLAS_MAX_WIDTH
+        for entry in entries:
+            assert entry['x'] + entry['width'] <= image.width
+            assert entry['y'] + entry['height'] <= image.height
+        # 每個圖示的區域只包含自己的像素
+        red = atlas._entries[_entry_key(icons['play'], (16, 16))]
+        assert image.getpixel((red['x'] + 8, red['y'] + 8)) == (255, 0, 0, 255)
+    for i, a in enumerate(entries):
+        for b in entries[i + 1:]:
+            assert not overlaps(a, b)
+
+
+def test_changed_source_invalidates_only_that_entry(tmp_path, icons, monkeypatch):
+    requests = [(icons['play'], (16, 16)), (icons['wide'], (None, 50))]
+    IconAtlas(str(tmp_path / 'temp')).get_icons(requests)
+
+    stat = os.stat(icons['play'])
+    os.utime(icons['play'], ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    atlas = IconAtlas(str(tmp_path / 'temp'))
+    play_key, wide_key = (_entry_key(path, size) for path, size in requests)
+    assert not atlas._is_valid(play_key, icons['play'])
+    assert atlas._is_valid(wide_key, icons['wide'])
+
+    opened = []
+    real_open = Image.open
+
+    def recording_open(path, *args, **kwargs):
+        opened.append(os.path.abspath(path))
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(Image, 'open', recording_open)
+    wide_entry = dict(atlas._entries[wide_key])
+    atlas.get_icons(requests)
+
+    # 只重新讀取變更的來源（另外讀取一次既有的圖集），未變更的項目沿用原本的內容
+    assert os.path.abspath(icons['wide']) not in opened
+    assert opened.count(os.path.abspath(icons['play'])) == 1
+    assert atlas._entries[play_key]['mtime_ns'] == stat.st_mtime_ns + 5_000_000_000
+    assert atlas._entries[wide_key]['mtime_ns'] == wide_entry['mtime_ns']
+
+
+def test_index_and_image_size_mismatch_discards_atlas(tmp_path, icons):
+    cache_dir = str(tmp_path / 'temp')
+    atlas = IconAtlas(cache_dir)
+    atlas.get_icons([(icons['play'], (16, 16))])
+    assert IconAtlas(cache_dir)._entries
+
+    with open(atlas.image_path, 'ab') as f:
+        f.write(b'truncated write')
+
+    assert IconAtlas(cache_dir)._entries == {}
+    assert icon_atlas.ATLAS_INDEX_NAME in os.listdir(cache_dir)
@@ -0,0 +1,146 @@
+"""PackageStager 的解壓、路徑檢查與文件清單校驗測試"""
+
+import hashlib
+import io
+import json
+import os
+import tarfile
+import zipfile
+
+import pytest
+
+from services.update.package_installer import (RELEASE_MANIFEST_NAME, PackageIntegrityError, PackageStager,
+                                               copy_tree_linked)
+
+FILES = {
+    'app-1.2.0/main.py': b'print("hello")\n',
+    'app-1.2.0/lib/core.bin': os.urandom(300_000),
+    'app-1.2.0/assets/icon.png': b'png' * 1000,
+}
+
+
+def manifest_for(files, prefix='app-1.2.0/'):
+    return {name[len(prefix):]: {'sha256': hashlib.sha256(data).hexdigest(), 'size': len(data)}
+            for name, data in files.items()}
+
+
+def make_zip(path, files):
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as package:
+        for name, data in files.items():
+            package.writestr(name, data)
+    return str(path)
+
+
+def make_tar(path, files, symlinks=()):
+    with tarfile.open(path, 'w:gz') as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mode = 0o755 if name.endswith('.py') else 0o644
+            tar.addfile(info, io.BytesIO(data))
+        for name, target in symlinks:
+            info = tarfile.TarInfo(name)
+            info.type = tarfile.SYMTYPE
+            info.linkname = target
+            tar.addfile(info)
+    return str(path)
+
+
+def read_tree(root):
+    result = {}
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            with open(path, 'rb') as f:
+                result[os.path.relpath(path, root).replace(os.sep, '/')] = f.read()
+    return result
+
+
+@pytest.mark.parametrize('kind', ['zip', 'tar'])
+def test_stage_writes_files_and_verifies_manifest(tmp_path, kind):
+    files = dict(FILES)
+    files['app-1.2.0/' + RELEASE_MANIFEST_NAME] = json.dumps(manifest_for(FILES)).encode('utf-8')
+    files['app-1.2.0/__pycache__/main.cpython-311.pyc'] = b'cache'
+    staging = tmp_path / 'staging'
+    progress = []
+
+    stager = PackageStager(workers=4)
+    if kind == 'zip':
+        staged = stager.stage_zip(make_zip(tmp_path / 'p.zip', files), str(staging),
+                                  lambda done, total: progress.append((done, total)))
+    else:
+        staged = stager.stage_tarball(make_tar(tmp_path / 'p.tar.gz', files), str(staging),
+                                      lambda done, total: progress.append((done, total)))
+
+    expected = {name: data for name, data in files.items() if '__pycache__' not in name}
+    assert read_tree(staging) == expected
+    assert staged['app-1.2.0/lib/core.bin']['sha256'] == hashlib.sha256(FILES['app-1.2.0/lib/core.bin']).hexdigest()
+    assert progress and progress[-1][0] <= progress[-1][1]
+
+
+@pytest.mark.parametrize('kind', ['zip', 'tar'])
+def test_manifest_mismatch_is_rejected(tmp_path, kind):
+    manifest = manifest_for(FILES)
+    manifest['main.py']['sha256'] = '0' * 64
+    files = dict(FILES)
+    files['app-1.2.0/' + RELEASE_MANIFEST_NAME] = json.dumps(manifest).encode('utf-8')
+
+    stager = PackageStager()
+    with pytest.raises(PackageIntegrityError):
+        if kind == 'zip':
+            stager.stage_zip(make_zip(tmp_path / 'p.zip', files), str(tmp_path / 'staging'))
+        else:
+            stager.stage_tarball(make_tar(tmp_path / 'p.tar.gz', files), str(tmp_path / 'staging'))
+
+
+def test_missing_file_is_rejected(tmp_path):
+    files = {name: data for name, data in FILES.items() if not name.endswith('icon.png')}
+    files['app-1.2.0/' + RELEASE_MANIFEST_NAME] = json.dumps(manifest_for(FILES)).encode('utf-8')
+
+    with pytest.raises(PackageIntegrityError):
+        PackageStager().stage_zip(make_zip(tmp_path / 'p.zip', files), str(tmp_path / 'staging'))
+
+
+@pytest.mark.parametrize('name', ['../evil.py', 'app/../../evil.py', '/tmp/evil.py', 'C:/evil.py', '..\\evil.py'])
+@pytest.mark.parametrize('kind', ['zip', 'tar'])
+def test_path_traversal_is_rejected(tmp_path, name, kind):
+    files = {'app/main.py': b'ok', name: b'evil'}
+    staging = tmp_path / 'stage' / 'staging'
+
+    stager = PackageStager()
+    with pytest.raises(PackageIntegrityError):
+        if kind == 'zip':
+            stager.stage_zip(make_zip(tmp_path / 'p.zip', files), str(staging))
+        else:
+            stager.stage_tarball(make_tar(tmp_path / 'p.tar.gz', files), str(staging))
+
+    assert not (tmp_path / 'evil.py').exists()
+    assert not (tmp_path / 'stage' / 'evil.py').exists()
+    # ZIP 在寫入任何文件前就檢查所有路徑
+    if kind == 'zip':
+        assert not staging.exists()
+
+
+def test_tar_links_are_skipped(tmp_path):
+    staging = tmp_path / 'staging'
+    package = make_tar(tmp_path / 'p.tar.gz', {'app/main.py': b'ok'}, symlinks=[('app/link', '/etc/passwd')])
+
+    staged = PackageStager().stage_tarball(package, str(staging))
+
+    assert list(staged) == ['app/main.py']
+    assert not os.path.lexists(staging / 'app' / 'link')
+    assert os.stat(staging / 'app' / 'main.py').st_mode & 0o111
+
+
+def test_copy_tree_linked_copies_everything(tmp_path):
+    source = tmp_path / 'source'
+    (source / 'lib').mkdir(parents=True)
+    (source / 'main.py').write_bytes(b'code')
+    (source / 'lib' / 'config.json').write_bytes(b'{}')
+
+    copy_tree_linked(str(source), str(tmp_path / 'copy'))
+
+    assert read_tree(tmp_path / 'copy') == read_tree(source)
+    # 設定文件可能被原地修改，不能與原文件共用內容
+    (tmp_path / 'copy' / 'lib' / 'config.json').write_bytes(b'{"changed": 1}')
+    assert (source / 'lib' / 'config.json').read_bytes() == b'{}'
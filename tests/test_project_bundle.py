@@ -0,0 +1,148 @@
+"""ProjectBundleStore 的快取、失效與並行更新測試"""
+
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+from services.file import project_bundle
+from services.file.project_bundle import BundleLockTimeout, ProjectBundleStore, bundle_lock
+from services.file.srt_stream import parse_text, read_srt
+
+SRT = "1\n00:00:01,000 --> 00:00:02,000\n第一句\n\n2\n00:00:03,000 --> 00:00:04,500 X1:1\n第二句\n第二行\n"
+
+
+@pytest.fixture
+def project(tmp_path):
+    path = tmp_path / 'ep01'
+    path.mkdir()
+    srt = path / 'ep01.srt'
+    srt.write_text(SRT, encoding='utf-8')
+    docx = path / 'ep01.docx'
+    docx.write_bytes(b'docx')
+    return path
+
+
+def columns_tuple(columns):
+    return (list(columns.indices), list(columns.starts), list(columns.ends), columns.texts, columns.positions,
+            columns.encoding, columns.eol)
+
+
+def test_subtitles_round_trip(project):
+    srt_path = str(project / 'ep01.srt')
+    columns = read_srt(srt_path)
+    store = ProjectBundleStore(str(project))
+    assert store.load_subtitles(srt_path) is None
+
+    store.store_subtitles(srt_path, columns)
+
+    assert columns_tuple(ProjectBundleStore(str(project)).load_subtitles(srt_path)) == columns_tuple(columns)
+
+
+def test_modified_source_invalidates_only_its_sections(project):
+    srt_path = str(project / 'ep01.srt')
+    docx_path = str(project / 'ep01.docx')
+    store = ProjectBundleStore(str(project))
+    store.store_subtitles(srt_path, read_srt(srt_path))
+    store.store_word_paragraphs(docx_path, ['段落一', '段落二'])
+
+    stat = os.stat(srt_path)
+    with open(srt_path, 'a', encoding='utf-8') as f:
+        f.write("\n3\n00:00:05,000 --> 00:00:06,000\n第三句\n")
+    os.utime(srt_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+
+    assert store.load_subtitles(srt_path) is None
+    assert store.load_word_paragraphs(docx_path) == ['段落一', '段落二']
+
+
+def test_cache_survives_moving_the_project(project, tmp_path):
+    srt_path = str(project / 'ep01.srt')
+    ProjectBundleStore(str(project)).store_subtitles(srt_path, read_srt(srt_path))
+
+    # 同一個專案經由其他路徑開啟（例如對應的網路磁碟機）時快取仍然有效
+    moved = tmp_path / 'mounted' / 'ep01'
+    shutil.copytree(project, moved)
+
+    assert ProjectBundleStore(str(moved)).load_subtitles(str(moved / 'ep01.srt')) is not None
+
+
+def test_keyed_sections_and_summary(project):
+    srt_path = str(project / 'ep01.srt')
+    docx_path = str(project / 'ep01.docx')
+    columns = read_srt(srt_path)
+    paragraphs = ['第一句', '第二句']
+    store = ProjectBundleStore(str(project))
+    store.store_subtitles(srt_path, columns)
+    store.store_word_paragraphs(docx_path, paragraphs)
+
+    store.store_traditional_texts(columns.texts, ['甲', '乙'])
+    assert store.load_traditional_texts(columns.texts) == ['甲', '乙']
+    assert store.load_traditional_texts(['其他']) is None
+
+    key = store.comparison_key(list(columns.texts), paragraphs)
+    store.store_comparison(key, {0: {'match': True}, 1: {'match': False}})
+    assert store.load_comparison(key) == {0: {'match': True}, 1: {'match': False}}
+    assert store.load_comparison('other') is None
+
+    assert store.summarize(srt_path, docx_path) == {'cue_count': 2, 'audio_duration_ms': None, 'mismatch_count': 1}
+
+
+def test_corrupt_bundle_is_rebuilt(project):
+    srt_path = str(project / 'ep01.srt')
+    (project / project_bundle.BUNDLE_FILENAME).write_bytes(b'not a bundle')
+    store = ProjectBundleStore(str(project))
+
+    assert store.load_subtitles(srt_path) is None
+    store.store_subtitles(srt_path, parse_text(SRT))
+    assert store.load_subtitles(srt_path) is not None
+
+
+def test_concurrent_updates_keep_every_section(project):
+    srt_path = str(project / 'ep01.srt')
+    docx_path = str(project / 'ep01.docx')
+    columns = read_srt(srt_path)
+    barrier = threading.Barrier(4)
+
+    def run(action):
+        barrier.wait()
+        for _ in range(5):
+            action(ProjectBundleStore(str(project)))
+
+    actions = [
+        lambda store: store.store_subtitles(srt_path, columns),
+        lambda store: store.store_word_paragraphs(docx_path, ['段落']),
+        lambda store: store.store_traditional_texts(columns.texts, ['甲', '乙']),
+        lambda store: store.store_comparison('key', {0: {'match': True}}),
+    ]
+    threads = [threading.Thread(target=run, args=(action,)) for action in actions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    store = ProjectBundleStore(str(project))
+    assert store.load_subtitles(srt_path) is not None
+    assert store.load_word_paragraphs(docx_path) == ['段落']
+    assert store.load_traditional_texts(columns.texts) == ['甲', '乙']
+    assert store.load_comparison('key') == {0: {'match': True}}
+    assert not os.path.exists(store.path + project_bundle.LOCK_SUFFIX)
+
+
+def test_bundle_lock_timeout_and_stale_lock(tmp_path):
+    path = str(tmp_path / project_bundle.BUNDLE_FILENAME)
+    with bundle_lock(path):
+        with pytest.raises(BundleLockTimeout):
+            with bundle_lock(path, timeout=0.1):
+                pass
+
+    # 程序中斷留下的鎖定檔超過時限後視為失效
+    lock_path = path + project_bundle.LOCK_SUFFIX
+    with open(lock_path, 'w') as f:
+        f.write('12345')
+    old = time.time() - project_bundle.LOCK_STALE_SECONDS - 5
+    os.utime(lock_path, (old, old))
+    with bundle_lock(path, timeout=0.1):
+        pass
+    assert not os.path.exists(lock_path)
@@ -0,0 +1,116 @@
+"""ProjectCatalog 的增量重新整理測試"""
+
+import os
+
+import pytest
+
+from services.file import project_catalog
+from services.file.project_catalog import ProjectCatalog
+
+SRT = "1\n00:00:01,000 --> 00:00:02,000\n第一句\n\n2\n00:00:03,000 --> 00:00:04,000\n第二句\n"
+
+
+def make_project(projects_dir, name, files):
+    path = projects_dir / name
+    path.mkdir()
+    for file_name, content in files.items():
+        (path / file_name).write_text(content, encoding='utf-8')
+    return path
+
+
+def touch_later(path):
+    """讓修改時間確實改變（部分檔案系統的時間精度較低）"""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def counters(monkeypatch):
+    counts = {'scan_project': 0, 'scandir': 0}
+    scan_project = ProjectCatalog._scan_project
+    scandir = os.scandir
+
+    def counting_scan_project(self, *args):
+        counts['scan_project'] += 1
+        return scan_project(self, *args)
+
+    def counting_scandir(path='.'):
+        if os.path.basename(os.fspath(path)) == 'projects':
+            counts['scandir'] += 1
+        return scandir(path)
+
+    monkeypatch.setattr(ProjectCatalog, '_scan_project', counting_scan_project)
+    monkeypatch.setattr(project_catalog.os, 'scandir', counting_scandir)
+    return counts
+
+
+def test_refresh_reads_project_files(tmp_path):
+    projects_dir = tmp_path / 'projects'
+    projects_dir.mkdir()
+    make_project(projects_dir, 'ep01', {'ep01.srt': SRT, 'ep01.aligned.srt': SRT, 'ep01.docx': '', 'ep01.mp3': ''})
+
+    entry, = ProjectCatalog(str(projects_dir)).refresh()
+
+    assert entry['name'] == 'ep01'
+    assert entry['srt'] == 'ep01.srt'
+    assert entry['word'] == 'ep01.docx'
+    assert entry['audio'] == 'ep01.mp3'
+    assert entry['cue_count'] == 2
+
+
+def test_unchanged_projects_are_not_rescanned(tmp_path, counters):
+    projects_dir = tmp_path / 'projects'
+    projects_dir.mkdir()
+    make_project(projects_dir, 'ep01', {'ep01.srt': SRT})
+    ep02 = make_project(projects_dir, 'ep02', {'ep02.srt': SRT})
+
+    catalog = ProjectCatalog(str(projects_dir))
+    catalog.refresh()
+    assert counters['scan_project'] == 2
+
+    # 寫出索引後專案目錄只會再列出一次，之後不再列出也不進入任何專案
+    catalog.refresh()
+    listings = counters['scandir']
+    catalog.refresh()
+    assert counters['scandir'] == listings
+    assert counters['scan_project'] == 2
+
+    # 只有內容變動的專案重新掃描
+    (ep02 / 'ep02.docx').write_text('', encoding='utf-8')
+    touch_later(ep02)
+    assert catalog.refresh()[1]['word'] == 'ep02.docx'
+    assert counters['scan_project'] == 3
+    assert counters['scandir'] == listings
+
+    # 新增專案時重新列出專案目錄
+    make_project(projects_dir, 'ep03', {})
+    touch_later(projects_dir)
+    assert [entry['name'] for entry in catalog.refresh()] == ['ep01', 'ep02', 'ep03']
+    assert counters['scan_project'] == 4
+
+
+def test_catalog_persists_between_instances(tmp_path, counters):
+    projects_dir = tmp_path / 'projects'
+    projects_dir.mkdir()
+    make_project(projects_dir, 'ep01', {'ep01.srt': SRT})
+    ProjectCatalog(str(projects_dir)).refresh()
+
+    entries = ProjectCatalog(str(projects_dir)).refresh()
+
+    assert entries[0]['cue_count'] == 2
+    assert counters['scan_project'] == 1
+
+
+def test_removed_project_is_dropped(tmp_path):
+    projects_dir = tmp_path / 'projects'
+    projects_dir.mkdir()
+    ep01 = make_project(projects_dir, 'ep01', {})
+    make_project(projects_dir, 'ep02', {})
+    catalog = ProjectCatalog(str(projects_dir))
+    catalog.refresh()
+
+    os.rmdir(ep01)
+    touch_later(projects_dir)
+
+    assert [entry['name'] for entry in catalog.refresh()] == ['ep02']
+    assert catalog.get('ep01') is None
@@ -0,0 +1,105 @@
+"""srt_stream 與 pysrt 解析、輸出一致性測試"""
+
+import codecs
+import random
+
+import pysrt
+import pytest
+
+from services.file.srt_stream import SrtColumns, parse_text, read_srt, render_srt, write_srt
+
+SAMPLES = {
+    'basic': "1\n00:00:01,000 --> 00:00:02,500\n第一句\n\n2\n00:00:03,000 --> 00:00:04,000\n第二句\n",
+    'multiline_and_position': "1\n00:00:01,000 --> 00:00:02,000 X1:40 X2:600 Y1:20 Y2:50\n上行\n下行\n\n"
+                              "2\n00:00:02,000 --> 00:00:03,000\nsecond\n",
+    'crlf_and_trailing_space': "1\r\n00:00:01,000 --> 00:00:02,000  \r\nline  \r\n\r\n"
+                               "2\r\n00:00:02,500 --> 00:00:03,000\r\nnext\r\n",
+    'dot_millis_and_extra_blanks': "\n\n1\n0:0:1.5 --> 0:0:2.25\nshort\n\n\n\n2\n00:00:03,000 --> 00:00:04,000\nlast",
+    'broken_block': "1\n00:00:01,000 --> 00:00:02,000\nok\n\nnot a block\n\n"
+                    "3\n00:00:05,000 --> 00:00:06,000\nafter\n",
+    'empty_text': "1\n00:00:01,000 --> 00:00:02,000\n\n2\n00:00:03,000 --> 00:00:04,000\nx\n",
+}
+
+
+def as_tuples(items):
+    return [(str(item.index), item.start.ordinal, item.end.ordinal, item.text, item.position or '')
+            for item in items]
+
+
+def columns_as_tuples(columns):
+    return [(str(index), start, end, text, position or '') for index, start, end, text, position in zip(
+        columns.indices, columns.starts, columns.ends, columns.texts, columns.positions)]
+
+
+def random_srt(rng, count):
+    lines = []
+    time_ms = 0
+    for i in range(1, count + 1):
+        start = time_ms + rng.randint(0, 2000)
+        end = start + rng.randint(1, 5000)
+        time_ms = end
+        text = '\n'.join(''.join(rng.choice('字幕測試abc ,.!') for _ in range(rng.randint(1, 20))).strip() or 'x'
+                         for _ in range(rng.randint(1, 3)))
+        lines.append(f"{i}\n{pysrt.SubRipTime.from_ordinal(start)} --> {pysrt.SubRipTime.from_ordinal(end)}\n{text}\n")
+    return '\n'.join(lines)
+
+
+@pytest.mark.parametrize('name', sorted(SAMPLES))
+def test_parse_matches_pysrt(name):
+    text = SAMPLES[name]
+    expected = pysrt.SubRipFile.from_string(text, error_handling=pysrt.ERROR_PASS)
+
+    assert columns_as_tuples(parse_text(text)) == as_tuples(expected)
+
+
+def test_broken_block_is_reported():
+    columns = parse_text(SAMPLES['broken_block'])
+    assert columns.texts == ['ok', 'after']
+    assert len(columns.errors) == 1
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_random_files_render_like_pysrt(seed, tmp_path):
+    text = random_srt(random.Random(seed), 300)
+    path = tmp_path / 'random.srt'
+    path.write_text(text, encoding='utf-8')
+
+    columns = read_srt(str(path))
+    expected = pysrt.open(str(path), encoding='utf-8')
+    assert columns_as_tuples(columns) == as_tuples(expected)
+
+    pysrt_out = tmp_path / 'pysrt.srt'
+    expected.save(str(pysrt_out), encoding='utf-8')
+    assert render_srt(columns) == pysrt_out.read_text(encoding='utf-8')
+
+
+@pytest.mark.parametrize('bom, encoding', [
+    (codecs.BOM_UTF8, 'utf_8'), (codecs.BOM_UTF16_LE, 'utf_16_le'), (b'', 'cp950'),
+])
+def test_encoding_detection(tmp_path, bom, encoding):
+    path = tmp_path / 'encoded.srt'
+    path.write_bytes(bom + SAMPLES['basic'].encode(encoding))
+
+    columns = read_srt(str(path))
+
+    assert columns.encoding == encoding
+    assert columns.texts == ['第一句', '第二句']
+
+
+def test_write_round_trip_keeps_crlf(tmp_path):
+    source = tmp_path / 'source.srt'
+    source.write_bytes(SAMPLES['crlf_and_trailing_space'].encode('utf-8'))
+    columns = read_srt(str(source))
+    assert columns.eol == '\r\n'
+
+    target = tmp_path / 'target.srt'
+    assert write_srt(str(target), columns) == 2
+    assert b'\r\n' in target.read_bytes()
+    assert columns_as_tuples(read_srt(str(target))) == columns_as_tuples(columns)
+
+
+def test_subrip_file_conversion():
+    columns = parse_text(SAMPLES['multiline_and_position'])
+    subrip = columns.to_subrip_file()
+    assert as_tuples(subrip) == columns_as_tuples(columns)
+    assert columns_as_tuples(SrtColumns.from_items(subrip)) == columns_as_tuples(columns)
@@ -0,0 +1,75 @@
+"""time_codec 與 pysrt.SubRipTime（原本 time_utils 的實作）一致性測試"""
+
+import random
+
+import pysrt
+import pytest
+
+from utils import time_codec, time_utils
+
+
+def legacy_parse_ms(value):
+    """原本 time_utils.parse_time 的規則：以 pysrt 解析後取序數"""
+    time_str = str(value).strip()
+    if not time_str:
+        return 0
+    if ',' in time_str or '.' in time_str:
+        return pysrt.SubRipTime.from_string(time_str.replace('.', ',')).ordinal
+    parts = time_str.split(':')
+    if len(parts) == 3:
+        hours, minutes, seconds = map(float, parts)
+    elif len(parts) == 2:
+        hours = 0
+        minutes, seconds = map(float, parts)
+    else:
+        raise ValueError(time_str)
+    return pysrt.SubRipTime(hours=int(hours), minutes=int(minutes), seconds=int(seconds),
+                            milliseconds=int((seconds % 1) * 1000)).ordinal
+
+
+SAMPLES = [
+    '00:00:00,000', '00:00:01,500', '01:02:03,004', '99:59:59,999', '00:00:00.250',
+    '1:2:3,4', '00:61:00,000', '00:00:75,1234', ' 00:00:05,000 ', '00:01:02', '01:02', '00:00:01.5',
+    '00:00:0a,100', '12:34:56,7x',
+]
+
+
+@pytest.mark.parametrize('text', SAMPLES)
+def test_parse_matches_legacy(text):
+    assert time_codec.parse_ms(text) == legacy_parse_ms(text)
+
+
+def test_random_round_trip_matches_subriptime():
+    rng = random.Random(42)
+    values = [rng.randrange(0, 100 * 3600 * 1000) for _ in range(2000)] + [0, 999, 1000, 3599999, 3600000]
+    texts = time_codec.format_many(values)
+
+    assert texts == [str(pysrt.SubRipTime.from_ordinal(value)) for value in values]
+    assert time_codec.parse_many(texts) == values
+    assert [time_codec.parse_srt_string(text) for text in texts] == values
+
+
+def test_negative_and_objects():
+    assert time_codec.format_ms(-5) == str(pysrt.SubRipTime.from_ordinal(-5)) == time_codec.ZERO_TIME
+    assert time_codec.parse_ms(pysrt.SubRipTime(0, 0, 2, 5)) == 2005
+    assert time_codec.parse_ms('') == 0
+
+
+@pytest.mark.parametrize('text', ['abc', '1:2:3:4:5', '00:00'])
+def test_invalid_strings_raise_like_legacy(text):
+    try:
+        expected = legacy_parse_ms(text)
+    except Exception:
+        with pytest.raises(ValueError):
+            time_codec.parse_ms(text)
+    else:
+        assert time_codec.parse_ms(text) == expected
+
+
+def test_time_utils_wrappers():
+    parsed = time_utils.parse_time('00:01:02,003')
+    assert isinstance(parsed, pysrt.SubRipTime)
+    assert parsed.ordinal == 62003
+    assert time_utils.format_time(parsed) == '00:01:02,003'
+    assert time_utils.time_to_milliseconds(pysrt.SubRipTime(0, 0, 1, 250)) == 1250
+    assert time_utils.milliseconds_to_time(1250) == pysrt.SubRipTime(0, 0, 1, 250)
@@ -0,0 +1,88 @@
+"""效能追蹤的停用行為、環形緩衝區上限與 Chrome trace_event 匯出測試"""
+
+import json
+import threading
+
+import pytest
+
+from utils import tracing
+
+
+@pytest.fixture(autouse=True)
+def reset_tracing():
+    tracing.clear()
+    yield
+    tracing.configure(False, tracing.DEFAULT_CAPACITY, tracing.DEFAULT_SLOW_SPAN_MS)
+    tracing.clear()
+
+
+@tracing.traced("work")
+def work(value):
+    return value * 2
+
+
+def test_disabled_tracing_records_nothing():
+    tracing.configure(False)
+
+    assert work(2) == 4
+    with tracing.span("block", items=3) as block:
+        pass
+
+    assert block is tracing.span("other")
+    assert tracing.get_events() == []
+
+
+def test_spans_and_traced_calls_are_recorded():
+    tracing.configure(True, slow_span_ms=0)
+
+    with tracing.span("outer", category="file", items=3):
+        work(1)
+    with pytest.raises(ValueError):
+        with tracing.span("failing"):
+            raise ValueError("失敗")
+
+    events = {event['name']: event for event in tracing.get_events()}
+    assert set(events) == {'outer', 'work', 'failing'}
+    assert events['outer']['category'] == 'file' and events['outer']['args'] == {'items': 3}
+    assert events['outer']['duration_ms'] >= events['work']['duration_ms']
+    assert events['failing']['args'] == {'error': 'ValueError'}
+
+
+def test_buffer_keeps_only_latest_spans():
+    tracing.configure(True, capacity=5, slow_span_ms=0)
+
+    for i in range(12):
+        with tracing.span(f"span{i}"):
+            pass
+
+    assert [event['name'] for event in tracing.get_events()] == [f"span{i}" for i in range(7, 12)]
+
+
+def test_export_is_valid_trace_event_json(tmp_path):
+    tracing.configure(True, slow_span_ms=0)
+
+    with tracing.span("main", path=tmp_path, count=2):
+        pass
+    thread = threading.Thread(target=work, args=(1,), name="Worker")
+    thread.start()
+    thread.join()
+
+    path = tmp_path / 'trace' / 'trace.json'
+    assert tracing.export_chrome_trace(str(path)) == 2
+
+    trace = json.loads(path.read_text(encoding='utf-8'))
+    assert trace['displayTimeUnit'] == 'ms'
+    complete = [event for event in trace['traceEvents'] if event['ph'] == 'X']
+    metadata = [event for event in trace['traceEvents'] if event['ph'] == 'M']
+
+    assert sorted(event['name'] for event in complete) == ['main', 'work']
+    for event in complete:
+        assert isinstance(event['ts'], (int, float)) and event['ts'] >= 0
+        assert isinstance(event['dur'], (int, float)) and event['dur'] >= 0
+        assert isinstance(event['pid'], int) and isinstance(event['tid'], int)
+    main = next(event for event in complete if event['name'] == 'main')
+    assert main['args'] == {'path': str(tmp_path), 'count': 2}
+
+    thread_names = {event['tid']: event['args']['name'] for event in metadata}
+    assert {event['tid'] for event in complete} == set(thread_names)
+    assert 'Worker' in thread_names.values()
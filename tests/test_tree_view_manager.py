@@ -0,0 +1,70 @@
+"""TreeViewManager.bulk_update 的差異比對與寫入次數測試（使用假的樹狀視圖）"""
+
+import pytest
+
+from gui.components.tree_view_manager import TreeViewManager
+
+
+class FakeTree:
+    """只實作 bulk_update 需要的介面，並模擬 Tk 把數字字串轉成整數"""
+
+    def __init__(self, rows):
+        self.rows = {item_id: {'values': tuple(values), 'tags': ''} for item_id, values in rows.items()}
+        self.writes = []
+
+    def exists(self, item_id):
+        return item_id in self.rows
+
+    def item(self, item_id, option=None, **kw):
+        row = self.rows[item_id]
+        if option is not None:
+            return row[option]
+        if 'values' in kw:
+            row['values'] = tuple(int(v) if str(v).isdigit() else v for v in kw['values'])
+        if 'tags' in kw:
+            row['tags'] = tuple(kw['tags']) or ''
+        self.writes.append((item_id, kw))
+        return None
+
+
+@pytest.fixture
+def tree():
+    return FakeTree({f"I{i}": (i, f"第{i}句") for i in range(1, 6)})
+
+
+def test_only_changed_rows_are_written(tree):
+    manager = TreeViewManager(tree)
+
+    writes = manager.bulk_update({
+        'I1': {'values': ('1', '第1句')},              # 數字字串與整數視為相同
+        'I2': {'values': (2, '改過')},
+        'I3': {'tags': ('mismatch',)},
+        'I4': {'values': (4, '第4句'), 'tags': None},
+        'missing': {'values': (9, 'x')},
+    })
+
+    assert writes == 2
+    assert [item_id for item_id, _ in tree.writes] == ['I2', 'I3']
+    assert tree.writes[1][1] == {'tags': ('mismatch',)}
+    assert tree.rows['I2']['values'] == (2, '改過')
+
+
+def test_repeated_update_writes_nothing(tree):
+    manager = TreeViewManager(tree)
+    updates = {item_id: {'values': (int(item_id[1:]), '新'), 'tags': ('a', 'b')} for item_id in tree.rows}
+
+    assert manager.bulk_update(updates) == 5
+    assert manager.bulk_update(updates) == 0
+    assert len(tree.writes) == 5
+
+
+def test_external_write_is_detected(tree):
+    manager = TreeViewManager(tree)
+    manager.bulk_update({'I1': {'values': (1, '新')}})
+
+    # 繞過管理器直接修改 TreeView 後，相同的更新仍需寫回
+    tree.item('I1', values=(1, '別處改過'))
+    tree.writes.clear()
+
+    assert manager.bulk_update({'I1': {'values': (1, '新')}}) == 1
+    assert tree.rows['I1']['values'] == (1, '新')
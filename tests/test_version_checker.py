@@ -0,0 +1,124 @@
+"""VersionChecker 的條件請求、限流與失敗退避測試（以本機 HTTP 伺服器代替 GitHub API）"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from services.update.version_checker import RateLimitedError, VersionChecker
+
+RELEASE = {
+    'tag_name': 'v1.2.0',
+    'body': 'notes',
+    'assets': [{'name': 'app-universal.zip', 'browser_download_url': 'http://example/app-universal.zip',
+                'size': 10, 'digest': 'sha256:ab'}],
+}
+ETAG = '"release-1"'
+
+
+class ReleaseHandler(BaseHTTPRequestHandler):
+    """依伺服器的 mode 返回 200/304、限流（403）或 503"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        if server.mode == 'rate_limited':
+            self.send_response(403)
+            self.send_header('X-RateLimit-Remaining', '0')
+            self.send_header('X-RateLimit-Reset', str(int(time.time()) + 600))
+            self.end_headers()
+            return
+        if server.mode == 'down':
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps(RELEASE).encode('utf-8')
+        self.send_response(200)
+        self.send_header('ETag', ETAG)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), ReleaseHandler)
+    httpd.mode = 'ok'
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield httpd
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def make_checker(httpd, tmp_path, name='release_cache.json'):
+    api_url = f"http://127.0.0.1:{httpd.server_address[1]}/repos/owner/repo"
+    return VersionChecker(api_url, cache_path=str(tmp_path / name))
+
+
+def test_etag_and_not_modified(server, tmp_path):
+    checker = make_checker(server, tmp_path)
+    first = checker.fetch_latest_release()
+    assert first['tag_name'] == 'v1.2.0'
+    assert not checker.not_modified
+
+    second = checker.fetch_latest_release()
+    assert second is first
+    assert checker.not_modified
+    assert server.requests[1].get('If-None-Match') == ETAG
+
+    # 新的程序從磁碟快取讀取 ETag，同樣得到 304
+    restarted = make_checker(server, tmp_path)
+    assert restarted.fetch_latest_release()['tag_name'] == 'v1.2.0'
+    assert restarted.not_modified
+    assert server.requests[2].get('If-None-Match') == ETAG
+
+
+def test_rate_limit_suppresses_requests(server, tmp_path):
+    checker = make_checker(server, tmp_path)
+    release = checker.fetch_latest_release()
+
+    server.mode = 'rate_limited'
+    assert checker.fetch_latest_release() is release
+    count = len(server.requests)
+    # 限流期間即使強制檢查也不發送請求
+    assert checker.fetch_latest_release(force=True) is release
+    assert len(server.requests) == count
+
+    empty = make_checker(server, tmp_path, 'empty.json')
+    with pytest.raises(RateLimitedError):
+        empty.fetch_latest_release()
+
+
+def test_failure_backoff_and_forced_check(server, tmp_path):
+    server.mode = 'down'
+    checker = make_checker(server, tmp_path)
+    with pytest.raises(requests.HTTPError):
+        checker.fetch_latest_release()
+    count = len(server.requests)
+
+    # 退避期間不發送請求，錯誤不應被描述為限流
+    with pytest.raises(requests.ConnectionError):
+        checker.fetch_latest_release()
+    assert len(server.requests) == count
+    success, info = checker.check_latest_version()
+    assert not success and '限流' not in info['error']
+
+    # 使用者手動檢查時忽略退避
+    server.mode = 'ok'
+    assert checker.fetch_latest_release(force=True)['tag_name'] == 'v1.2.0'
+    assert len(server.requests) == count + 1
@@ -0,0 +1,187 @@
+"""VirtualRowModel 的列操作、位置快取、鍵索引、欄位投影與窗口計算測試（不需要 Tk）"""
+
+import random
+import tkinter as tk
+
+import pytest
+
+from gui.components.virtual_row_model import VirtualRowModel
+
+SCHEMA = ['Index', 'Start', 'End', 'Text', 'V.O']
+
+
+def make_model(count=0, key_column='Index'):
+    model = VirtualRowModel()
+    model.set_schema(SCHEMA, {'V.O': '▶'}, key_column=key_column)
+    for i in range(1, count + 1):
+        model.insert('end', values=(i, f"00:00:{i:02d},000", f"00:00:{i:02d},500", f"第{i}句"))
+    return model
+
+
+def assert_positions(model):
+    assert [model.index(iid) for iid in model.order] == list(range(len(model.order)))
+
+
+def test_insert_generates_ids_and_keeps_positions():
+    model = make_model(3)
+    first, second, third = model.order
+
+    inserted = model.insert(1, values=(9,))
+    explicit = model.insert(0, iid='mine', values=(10,))
+
+    assert model.order == ['mine', first, inserted, second, third]
+    assert len({first, second, third, inserted}) == 4
+    assert_positions(model)
+    with pytest.raises(tk.TclError):
+        model.insert('end', iid='mine')
+
+
+def test_delete_and_move_keep_positions():
+    rng = random.Random(3)
+    model = make_model(50)
+    expected = list(model.order)
+
+    for _ in range(200):
+        action = rng.choice(('insert', 'delete', 'delete_many', 'move'))
+        if action == 'insert' or not expected:
+            position = rng.randint(0, len(expected))
+            expected.insert(position, model.insert(position))
+        elif action == 'delete':
+            item = rng.choice(expected)
+            assert model.delete([item]) == {item}
+            expected.remove(item)
+        elif action == 'delete_many':
+            items = rng.sample(expected, min(len(expected), 3))
+            model.delete(items)
+            expected = [iid for iid in expected if iid not in items]
+        else:
+            item = rng.choice(expected)
+            position = rng.randint(0, len(expected) - 1)
+            model.move(item, position)
+            expected.remove(item)
+            expected.insert(position, item)
+        # 每隔幾步才查詢位置，驗證延遲重建的快取
+        if rng.random() < 0.3:
+            assert model.order == expected
+            assert_positions(model)
+
+    assert model.order == expected
+    assert_positions(model)
+    assert set(model.rows) == set(expected)
+
+
+def test_delete_missing_item_changes_nothing():
+    model = make_model(3)
+    before = list(model.order)
+
+    with pytest.raises(tk.TclError):
+        model.delete([before[0], 'missing'])
+
+    assert model.order == before
+    assert model.find_by_key(1) == before[0]
+
+
+def test_delete_all_and_neighbours():
+    model = make_model(3)
+    first, second, third = model.order
+
+    assert (model.prev(first), model.next(first), model.next(third)) == ('', second, '')
+    assert model.item_at(1) == second and model.item_at(3) == ''
+    model.move(first, 'end')
+    assert model.next(third) == first
+
+    model.delete(list(model.order))
+    assert len(model) == 0 and model.get_key_map() == {}
+    assert model.insert('end', values=(1,)) in model
+
+
+def test_key_index_follows_updates_and_deletes():
+    model = make_model(3)
+    first, second, third = model.order
+
+    assert model.find_by_key('2') == second and model.find_by_key(2) == second
+    model.update(second, values=(5, '', '', 'x', ''))
+    assert model.find_by_key(2) is None and model.get_key(second) == '5'
+
+    # 重新編號過程中暫時重複的鍵值回傳位置最前者
+    model.update(third, values=(1, '', '', 'y', ''))
+    assert model.find_by_key(1) == first
+    model.delete([first])
+    assert model.find_by_key(1) == third
+    assert model.get_key_map() == {'1': third, '5': second}
+
+    model.update(third, text='只改文字')
+    assert model.get_key(third) == '1'
+
+
+def test_model_without_key_column():
+    model = make_model(2, key_column=None)
+    assert not model.has_key_index()
+    assert model.find_by_key(1) is None and model.get_key(model.order[0]) is None
+
+
+def test_projection_hides_columns_without_losing_values():
+    model = make_model()
+    item = model.insert('end', values=(1, '00:00:01,000', '00:00:02,000', '第一句', '▶'))
+
+    model.set_projection(['Index', 'Text'])
+    assert model.option(item, 'values') == (1, '第一句')
+
+    # 以可見欄位寫入時，隱藏欄位保留原值
+    model.update(item, values=(1, '改過'))
+    model.set_projection(SCHEMA)
+    assert model.option(item, 'values') == (1, '00:00:01,000', '00:00:02,000', '改過', '▶')
+
+    # 投影下插入的列，隱藏欄位使用預設值
+    model.set_projection(['Index', 'Text'])
+    other = model.insert('end', values=(2, '第二句'))
+    assert model.rows[other]['values'] == (2, '', '', '第二句', '▶')
+
+
+def test_projection_extends_schema():
+    model = make_model(1)
+    item = model.order[0]
+    version = model.rows[item]['version']
+
+    assert not model.set_projection(['Index', 'Text'])
+    assert model.set_projection(['Index', 'Text', 'Extra'])
+
+    assert model.schema == SCHEMA + ['Extra']
+    assert model.option(item, 'values') == (1, '第1句', '')
+    assert model.rows[item]['version'] == version + 1
+    with pytest.raises(tk.TclError):
+        model.set_schema(SCHEMA)
+
+
+def test_update_bumps_version_and_normalizes_options():
+    model = make_model(1)
+    item = model.order[0]
+
+    model.update(item, tags='a b', open=1)
+    model.update(item, image='icon')
+
+    row = model.get(item)
+    assert row['version'] == 2
+    assert model.option(item, 'tags') == ('a', 'b') and model.option(item, 'open') == 1
+    assert model.option(item, 'image') == 'icon'
+    assert model.tagged('b') == (item,)
+    with pytest.raises(tk.TclError):
+        model.option(item, 'color')
+    with pytest.raises(tk.TclError):
+        model.update('missing', text='x')
+
+
+@pytest.mark.parametrize('top, visible, margin, expected', [
+    (0, 10, 5, (0, 0, 15)),
+    (50, 10, 5, (50, 45, 65)),
+    (95, 10, 5, (90, 85, 100)),
+    (-3, 10, 5, (0, 0, 15)),
+    (0, 200, 5, (0, 0, 100)),
+])
+def test_window(top, visible, margin, expected):
+    model = make_model(100)
+    assert model.window(top, visible, margin) == expected
+
+
+def test_window_of_empty_model():
+    assert VirtualRowModel().window(10, 20, 5) == (0, 0, 0)
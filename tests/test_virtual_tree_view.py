@@ -0,0 +1,130 @@
+"""VirtualTreeView 與 ttk.Treeview 相容性測試"""
+
+import tkinter as tk
+from tkinter import ttk
+
+import pytest
+
+from gui.components.virtual_tree_view import VirtualTreeView
+
+COLUMNS = ['Index', 'Start', 'End', 'Text']
+
+
+@pytest.mark.parametrize('column, expected', [
+    ('Start', 1), ('#1', 0), ('#4', 3), (0, 0), ('2', 2),
+])
+def test_column_index_matches_tk(column, expected):
+    assert VirtualTreeView._column_index(column, COLUMNS) == expected
+
+
+@pytest.mark.parametrize('column', ['#0', '#5', 4, 'Missing'])
+def test_invalid_column_is_rejected(column):
+    with pytest.raises(tk.TclError):
+        VirtualTreeView._column_index(column, COLUMNS)
+
+
+@pytest.fixture
+def root():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("需要圖形介面")
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+def test_set_and_selection_behave_like_treeview(root):
+    for cls in (VirtualTreeView, ttk.Treeview):
+        widget = cls(root, columns=COLUMNS, show='headings')
+        item = widget.insert('', 'end', values=(1, '00:00:01,000', '00:00:02,000', '第一句'))
+        widget.set(item, '#4', '改過')
+        widget.set(item, 'Start', '00:00:01,500')
+        assert widget.set(item)['Text'] == '改過'
+        assert widget.set(item, '#2') == '00:00:01,500'
+        with pytest.raises(tk.TclError):
+            widget.set(item, '#0', 'x')
+        with pytest.raises(TypeError):
+            widget.selection('set', (item,))
+
+
+@pytest.fixture
+def tree(root):
+    widget = VirtualTreeView(root, margin=5, columns=COLUMNS, show='headings', height=10)
+    widget.pack()
+    for i in range(1, 201):
+        widget.insert('', 'end', values=(i, f"00:00:{i % 60:02d},000", f"00:00:{i % 60:02d},500", f"第{i}句"))
+    root.update()
+    return widget
+
+
+def test_only_window_is_materialized(tree):
+    top, end = tree.get_visible_range()
+    materialized = tree.get_materialized_items()
+
+    assert top == 0
+    assert len(materialized) <= end - top + 5
+    assert materialized == list(tree.get_children()[:len(materialized)])
+    assert len(ttk.Treeview.get_children(tree)) == len(materialized)
+
+
+def test_scroll_recycles_physical_rows(tree):
+    physical = set(ttk.Treeview.get_children(tree))
+
+    tree.yview_moveto(0.5)
+    top, _ = tree.get_visible_range()
+
+    assert top == 100
+    assert set(ttk.Treeview.get_children(tree)) == physical
+    assert tree.get_materialized_items()[0] == tree.get_children()[95]
+    assert tree.yview()[0] == pytest.approx(0.5)
+
+
+def test_identify_bbox_focus_and_selection_map_to_virtual_ids(tree):
+    tree.yview_moveto(0.5)
+    tree.update()
+    item = tree.get_children()[101]
+
+    box = tree.bbox(item)
+    assert box and tree.identify_row(box[1] + 1) == item
+    assert tree.bbox(tree.get_children()[0]) == ''
+
+    tree.focus(item)
+    tree.selection_set(item, tree.get_children()[0])
+    assert tree.focus() == item
+    assert tree.selection() == (item, tree.get_children()[0])
+
+    tree.yview_moveto(0)
+    assert set(tree.selection()) == {item, tree.get_children()[0]}
+
+
+def test_displaycolumns_projection_keeps_hidden_values(tree):
+    item = tree.get_children()[0]
+
+    tree.configure(columns=['Index', 'Text'])
+    assert tree.item(item, 'values') == (1, '第1句')
+    tree.set(item, 'Text', '改過')
+    tree.configure(columns=COLUMNS)
+
+    assert tree.item(item, 'values') == (1, '00:00:01,000', '00:00:01,500', '改過')
+
+
+def test_batch_update_defers_physical_writes(tree):
+    item = tree.get_children()[0]
+    pool_id = tree._virtual_to_pool[item]
+
+    with tree.batch_update():
+        tree.item(item, values=(1, '', '', '批次'))
+        assert ttk.Treeview.item(tree, pool_id, 'values')[3] == '第1句'
+
+    assert ttk.Treeview.item(tree, pool_id, 'values')[3] == '批次'
+
+
+def test_delete_and_move_update_window(tree):
+    children = tree.get_children()
+    tree.delete(children[0])
+    tree.move(children[10], '', 0)
+
+    assert tree.index(children[10]) == 0
+    assert tree.index(children[1]) == 1
+    assert tree.get_materialized_items()[0] == children[10]
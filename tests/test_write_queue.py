@@ -0,0 +1,126 @@
+"""DatabaseWriteQueue 的批次提交與 SAVEPOINT 隔離測試（SQLite）"""
+
+import threading
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from database.base import init_db
+from database.models import Correction, Project, User
+from database.write_queue import DatabaseQueueFull, DatabaseWriteQueue
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = init_db(f"sqlite:///{tmp_path / 'test.db'}")
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    session = factory()
+    user = User(username='tester', password_hash='x', email='tester@example.com')
+    session.add(user)
+    session.flush()
+    session.add(Project(id=1, name='ep01', owner_id=user.id))
+    session.commit()
+    session.close()
+    yield factory
+    engine.dispose()
+
+
+def add_correction(session, error, correction):
+    session.add(Correction(error_text=error, correction_text=correction, project_id=1))
+    session.flush()
+    return error
+
+
+def failing_job(session):
+    session.add(Correction(error_text='壞', correction_text='好', project_id=1))
+    session.flush()
+    raise ValueError("工作失敗")
+
+
+def stored_corrections(factory):
+    session = factory()
+    try:
+        return sorted(c.error_text for c in session.query(Correction).all())
+    finally:
+        session.close()
+
+
+def test_failed_job_rolls_back_only_itself(session_factory):
+    write_queue = DatabaseWriteQueue(session_factory, batch_delay=0.2)
+    try:
+        first = write_queue.submit(add_correction, '在', '再')
+        failed = write_queue.submit(failing_job)
+        last = write_queue.submit(add_correction, '以', '已')
+
+        assert first.result(timeout=5) == '在'
+        assert last.result(timeout=5) == '以'
+        with pytest.raises(ValueError):
+            failed.result(timeout=5)
+    finally:
+        write_queue.stop()
+
+    assert stored_corrections(session_factory) == ['以', '在']
+
+
+def test_jobs_are_batched_into_one_commit(session_factory):
+    sessions = []
+
+    def tracking_factory():
+        session = session_factory()
+        sessions.append(session)
+        return session
+
+    write_queue = DatabaseWriteQueue(tracking_factory, batch_size=50, batch_delay=0.2)
+    try:
+        futures = [write_queue.submit(add_correction, f"字{i}", f"詞{i}") for i in range(10)]
+        for future in futures:
+            future.result(timeout=5)
+    finally:
+        write_queue.stop()
+
+    assert len(sessions) == 1
+    assert len(stored_corrections(session_factory)) == 10
+
+
+def test_commit_failure_fails_whole_batch(session_factory):
+    class FailingCommit:
+        def __init__(self):
+            self.session = session_factory()
+
+        def __getattr__(self, name):
+            return getattr(self.session, name)
+
+        def commit(self):
+            raise RuntimeError("提交失敗")
+
+    write_queue = DatabaseWriteQueue(FailingCommit, batch_delay=0.2)
+    try:
+        futures = [write_queue.submit(add_correction, '在', '再'), write_queue.submit(add_correction, '以', '已')]
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                future.result(timeout=5)
+    finally:
+        write_queue.stop()
+
+    assert stored_corrections(session_factory) == []
+
+
+def test_full_queue_and_stop(session_factory):
+    release = threading.Event()
+    write_queue = DatabaseWriteQueue(session_factory, max_pending=1, batch_size=1, batch_delay=0)
+    try:
+        blocking = write_queue.submit(lambda session: release.wait(5))
+        # 等背景執行緒取出第一個工作，之後佇列只容納一個工作
+        while not blocking.running() and not blocking.done():
+            pass
+        queued = write_queue.submit(add_correction, '在', '再')
+        with pytest.raises(DatabaseQueueFull):
+            write_queue.submit(add_correction, '以', '已').result(timeout=1)
+        release.set()
+        assert queued.result(timeout=5) == '在'
+    finally:
+        release.set()
+        write_queue.stop()
+
+    with pytest.raises(RuntimeError):
+        write_queue.submit(add_correction, '的', '得').result(timeout=1)